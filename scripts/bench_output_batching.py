@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Benchmark the PTY output -> UI batching path with many busy sessions.
+
+Streams synthetic output from N sessions at once (default 50) into
+``TAMEApp._handle_pty_output``, flushing the UI queue every ``--frame-chunks``
+reads as the 16ms timer would on a loaded event loop.  Compares the current
+handler (running character counters, chunk kind classified by the session
+layer) with the previous one (re-summing every queued chunk and regex-scanning
+each chunk in the app).
+
+    uv run python scripts/bench_output_batching.py
+    uv run python scripts/bench_output_batching.py --sessions 100 --frame-chunks 5000
+
+The current variant includes the session layer's ``classify_output`` call for
+the focused session's reads; decoding and pattern scanning in ``SessionManager`` are left out,
+since neither variant changes them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections.abc import Callable
+
+from tame.app import TAMEApp
+from tame.session.manager import REDRAW_CONTROL_RE, classify_output
+from tame.session.state import OutputKind
+
+
+class _NoTimer:
+    def stop(self) -> None:
+        pass
+
+
+def _log_chunks(rng: random.Random, count: int) -> list[str]:
+    """Colored build/test log lines, a few KB per read."""
+    chunks = []
+    for i in range(count):
+        lines = rng.randint(5, 40)
+        chunks.append(
+            "".join(
+                f"\x1b[32mPASSED\x1b[0m tests/test_{i % 40}.py::case_{n} "
+                f"[{(i + n) % 100:3d}%]\r\n"
+                for n in range(lines)
+            )
+        )
+    return chunks
+
+
+def _spinner_chunks(rng: random.Random, count: int) -> list[str]:
+    """Progress lines redrawn in place with a bare CR."""
+    frames = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+    return [
+        f"\r{frames[i % len(frames)]} Thinking… {rng.randint(1, 99)}s"
+        for i in range(count)
+    ]
+
+
+def _legacy_handle_pty_output(app: TAMEApp, session_id: str, text: str) -> None:
+    """The handler before running counters, kept here for comparison."""
+    if session_id != app._active_session_id:
+        app._output_stale.add(session_id)
+    else:
+        chars = app._output_pending_chars.get(session_id, 0) + len(text)
+        if chars > app._PENDING_MAX_CHARS:
+            app._drop_pending_output(session_id, chars)
+        else:
+            app._output_pending.setdefault(session_id, []).append(text)
+            app._output_pending_chars[session_id] = chars
+    if not app._app_focused:
+        return
+    if session_id == app._active_session_id and REDRAW_CONTROL_RE.search(text):
+        app._flush_pending_output()
+        return
+    total = sum(len(c) for chunks in app._output_pending.values() for c in chunks)
+    if total <= 64:
+        app._flush_pending_output()
+    elif app._output_flush_timer is None:
+        app._output_flush_timer = _NoTimer()  # type: ignore[assignment]
+
+
+def _make_app() -> TAMEApp:
+    app = TAMEApp()
+    app._active_session_id = "s0"
+    app._app_focused = True
+    app.set_timer = lambda *_args, **_kwargs: _NoTimer()  # type: ignore[method-assign]
+
+    def _flush() -> None:
+        # Only the queue bookkeeping; rendering isn't what's measured here
+        app._output_flush_timer = None
+        app._output_pending = {}
+        app._output_pending_chars = {}
+        app._output_pending_total = 0
+        app._output_stale = set()
+
+    app._flush_pending_output = _flush  # type: ignore[method-assign]
+    return app
+
+
+def _run(
+    handler: Callable[[TAMEApp, str, str], None],
+    streams: dict[str, list[str]],
+    frame_chunks: int,
+) -> tuple[float, int]:
+    app = _make_app()
+    # Interleave reads the way add_reader callbacks arrive for busy PTYs
+    order = [
+        (session_id, chunks[step])
+        for step in range(max(len(c) for c in streams.values()))
+        for session_id, chunks in streams.items()
+        if step < len(chunks)
+    ]
+    start = time.perf_counter()
+    for i, (session_id, text) in enumerate(order, 1):
+        handler(app, session_id, text)
+        if i % frame_chunks == 0:
+            app._flush_pending_output()
+    return time.perf_counter() - start, len(order)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--reads", type=int, default=400, help="reads per session")
+    parser.add_argument("--frame-chunks", type=int, default=2500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Keep TAMEApp away from the user's real config
+    home = tempfile.mkdtemp(prefix="tame-bench-")
+    os.environ["HOME"] = home
+    os.environ["XDG_CONFIG_HOME"] = os.path.join(home, "config")
+
+    rng = random.Random(1)
+    streams = {
+        f"s{i}": (_spinner_chunks if i % 5 == 4 else _log_chunks)(rng, args.reads)
+        for i in range(args.sessions)
+    }
+
+    def _current(app: TAMEApp, session_id: str, text: str) -> None:
+        # As SessionManager does: only the focused session's chunks are scanned
+        kind = (
+            classify_output(text)
+            if session_id == app._active_session_id
+            else OutputKind.BACKGROUND
+        )
+        app._handle_pty_output(session_id, text, kind)
+
+    variants = {"previous": _legacy_handle_pty_output, "current": _current}
+    print(
+        f"{args.sessions} sessions x {args.reads} reads, "
+        f"flush every {args.frame_chunks} reads"
+    )
+    results = {}
+    for name, handler in variants.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            elapsed, reads = _run(handler, streams, args.frame_chunks)
+            best = min(best, elapsed)
+        results[name] = best
+        print(f"  {name:<9} {best * 1000:8.1f} ms  {best / reads * 1e6:7.2f} µs/read")
+    print(f"  speedup   {results['previous'] / results['current']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Benchmark per-session resource polling over many process trees.
+
+Spawns N sleeping process trees (default 50 sessions, 4 processes each) and
+times repeated polls with the psutil monitor (cached handles, one
+``children(recursive=True)`` walk per session) against the ``/proc`` sampler
+(one stat pass per poll, fds and I/O only for the active session).
+
+    uv run python scripts/bench_resource_poll.py
+    uv run python scripts/bench_resource_poll.py --sessions 100 --procs 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import time
+
+from tame.session.resource_monitor import ProcSampler, ResourceMonitor
+
+
+def _spawn_tree(procs: int) -> subprocess.Popen[bytes]:
+    # A shell with procs-1 sleeping children, in its own process group
+    command = "sleep 120 & " * (procs - 1) + "wait"
+    return subprocess.Popen(["sh", "-c", command], start_new_session=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--procs", type=int, default=4, help="processes per tree")
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    trees = [_spawn_tree(args.procs) for _ in range(args.sessions)]
+    try:
+        time.sleep(1.0)  # let the shells fork their children
+        roots = {f"s{i}": proc.pid for i, proc in enumerate(trees)}
+        variants = {
+            "psutil": (ResourceMonitor(), None),
+            "/proc": (ProcSampler(), {"s0"}),
+        }
+        print(f"{args.sessions} sessions x {args.procs} processes, {args.polls} polls")
+        results = {}
+        for name, (monitor, detail) in variants.items():
+            monitor.sample(roots, detail)  # warm the handle cache / baseline
+            start = time.perf_counter()
+            for _ in range(args.polls):
+                monitor.sample(roots, detail)
+            per_poll = (time.perf_counter() - start) / args.polls
+            results[name] = per_poll
+            print(
+                f"  {name:<7} {per_poll * 1000:7.2f} ms/poll  "
+                f"({monitor.last_poll_processes} processes)"
+            )
+        print(f"  speedup {results['psutil'] / results['/proc']:7.2f}x")
+    finally:
+        for proc in trees:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Benchmark feeding agent output into the viewer's terminal emulator.
+
+Compares pyte's stock ``HistoryScreen`` + ``Stream.feed`` against TAME's
+``_TerminalState.feed`` on synthetic streams shaped like common agent CLIs,
+or on a captured PTY stream.
+
+    uv run python scripts/bench_terminal_feed.py
+    uv run python scripts/bench_terminal_feed.py --capture session.typescript
+
+A capture is any raw byte dump of a session, e.g. from ``script -q -O FILE``
+while running ``claude`` or ``codex``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pyte
+
+from tame.ui.widgets.session_viewer import TAMEScreen, _TerminalState
+
+_CHUNK_CHARS = 4096  # roughly one PTY read
+
+
+def claude_like(frames: int = 400, cols: int = 120) -> str:
+    """Full-screen TUI redraws: boxes, spinners, 256/truecolor SGR."""
+    rng = random.Random(1)
+    words = ["reading", "file", "tool", "call", "edit", "patch", "tests", "running"]
+    out = []
+    for frame in range(frames):
+        out.append("\x1b[?2026h\x1b[?25l\x1b[H")
+        out.append("\x1b[38;5;174m╭" + "─" * (cols - 2) + "╮\x1b[0m\r\n")
+        for row in range(12):
+            text = " ".join(rng.choice(words) for _ in range(8))[: cols - 6]
+            out.append(
+                f"\x1b[38;5;174m│\x1b[0m \x1b[1m●\x1b[22m "
+                f"\x1b[38;2;200;200;{row * 20}m{text}\x1b[39m\x1b[K"
+                f"\x1b[{row + 2};{cols}H\x1b[38;5;174m│\x1b[0m\r\n"
+            )
+        out.append("\x1b[38;5;174m╰" + "─" * (cols - 2) + "╯\x1b[0m\r\n")
+        spinner = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"[frame % 10]
+        out.append(f"\r\x1b[2K\x1b[38;5;209m{spinner}\x1b[0m Thinking… ({frame}s)")
+        out.append("\x1b[?25h\x1b[?2026l")
+    return "".join(out)
+
+
+def codex_like(lines: int = 6000) -> str:
+    """Streaming transcript: mostly plain text with sparse bold/diff colors."""
+    rng = random.Random(2)
+    words = ["the", "function", "returns", "a", "list", "of", "sessions", "sorted"]
+    out = []
+    for i in range(lines):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(4, 16)))
+        kind = i % 20
+        if kind == 0:
+            out.append(f"\x1b[1m## Step {i // 20}\x1b[0m\r\n")
+        elif kind in (5, 6):
+            out.append(f"\x1b[32m+    {text}\x1b[0m\r\n")
+        elif kind == 7:
+            out.append(f"\x1b[31m-    {text}\x1b[0m\r\n")
+        else:
+            out.append(f"{text}\r\n")
+    return "".join(out)
+
+
+def build_log(lines: int = 10000) -> str:
+    """Plain build/test log output."""
+    return "".join(
+        f"tests/test_module_{i % 40}.py::test_case_{i} PASSED [{i % 100:3d}%]\r\n"
+        for i in range(lines)
+    )
+
+
+def _feed_stock(text: str, rows: int, cols: int) -> pyte.HistoryScreen:
+    screen = pyte.HistoryScreen(cols, rows, history=10000)
+    stream = pyte.Stream(screen)
+    for i in range(0, len(text), _CHUNK_CHARS):
+        stream.feed(text[i : i + _CHUNK_CHARS])
+    return screen
+
+
+def _feed_reference(text: str, rows: int, cols: int) -> TAMEScreen:
+    screen = TAMEScreen(cols, rows, history=10000)
+    stream = pyte.Stream(screen)
+    for i in range(0, len(text), _CHUNK_CHARS):
+        stream.feed(text[i : i + _CHUNK_CHARS])
+    return screen
+
+
+def _feed_tame(text: str, rows: int, cols: int) -> TAMEScreen:
+    terminal = _TerminalState("bench", rows, cols)
+    for i in range(0, len(text), _CHUNK_CHARS):
+        terminal.feed(text[i : i + _CHUNK_CHARS])
+    return terminal.screen
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--capture", type=Path, action="append", default=[])
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--cols", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    streams: dict[str, str] = {}
+    for path in args.capture:
+        streams[path.name] = path.read_bytes().decode("utf-8", errors="replace")
+    if not streams:
+        streams = {
+            "claude-like": claude_like(cols=args.cols),
+            "codex-like": codex_like(),
+            "build-log": build_log(),
+        }
+
+    print(
+        f"{'stream':<16}{'chars':>10}{'pyte s':>10}{'tame s':>10}{'speedup':>9}  same"
+    )
+    for name, text in streams.items():
+        stock = _best_of(
+            lambda text=text: _feed_stock(text, args.rows, args.cols), args.repeat
+        )
+        tame = _best_of(
+            lambda text=text: _feed_tame(text, args.rows, args.cols), args.repeat
+        )
+        same = (
+            _feed_tame(text, args.rows, args.cols).display
+            == _feed_reference(text, args.rows, args.cols).display
+        )
+        print(
+            f"{name:<16}{len(text):>10}{stock:>10.3f}{tame:>10.3f}"
+            f"{stock / tame:>8.1f}x  {'yes' if same else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
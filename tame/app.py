@@ -6,20 +6,30 @@ import os
 import re
 import shutil
 import subprocess
+import time
 from datetime import datetime
 
 from textual import events
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
+from textual.css.query import NoMatches
 from textual.timer import Timer
 from textual.widgets import Input
 
 from tame.config.manager import ConfigManager
 from tame.notifications.engine import NotificationEngine
 from tame.notifications.models import EventType
-from tame.session.manager import SessionManager
-from tame.session.state import SessionState
+from tame.session.governor import LoadGovernor, read_pressure
+from tame.session.manager import SessionManager, classify_output
+from tame.session.resource_class import parse_resource_classes
+from tame.session.resource_monitor import (
+    ResourceHistory,
+    ResourceUsage,
+    create_resource_monitor,
+)
+from tame.session.state import OutputKind, SessionState
+from tame.session.tmux_control import TmuxCommandError, TmuxControlClient
 from tame.ui.events import (
     SearchDismissed,
     SearchNavigate,
@@ -27,6 +37,7 @@ from tame.ui.events import (
     SessionSelected,
     SessionStatusChanged,
     SidebarFlash,
+    ViewerFastForward,
     ViewerResized,
 )
 from tame.ui.keys.manager import KeybindManager
@@ -39,8 +50,11 @@ from tame.ui.widgets import (
     GroupDialog,
     HeaderBar,
     HistoryPicker,
+    JumpDialog,
     NameDialog,
     NotificationPanel,
+    ResourceClassPicker,
+    ResourceGraphs,
     SearchDialog,
     SessionSearchBar,
     SessionSidebar,
@@ -48,7 +62,9 @@ from tame.ui.widgets import (
     StatusBar,
     ToastOverlay,
 )
+from tame.utils.latency import LatencyHistogram
 from tame.utils.logger import setup_logging
+from tame.utils.timeseries import format_bytes, sparkline
 
 log = logging.getLogger("tame.app")
 
@@ -66,7 +82,6 @@ BROAD_RATE_LIMIT_PATTERNS = {
 REFINED_RATE_LIMIT_PATTERN = (
     r"(?i)rate.?limit(?:ed|ing)?(?:\s+(?:exceeded|reached|hit)|\s*[:\-])"
 )
-REDRAW_CONTROL_RE = re.compile(r"\x1b\[[0-9;?]*(?:[ABCDHfJK])|\x1bc|\x0c|\r(?!\n)")
 SGR_RE = re.compile(r"\x1b\[([0-9;]*)m")
 
 SPECIAL_KEY_SEQUENCES: dict[str, str] = {
@@ -117,6 +132,9 @@ class TAMEApp(App):
     }
     """
 
+    # CPU samples shown per sidebar row
+    _SIDEBAR_SPARKLINE_WIDTH = 8
+
     COMMAND_MODE_MAP: dict[str, str] = {
         "c": "new_session",
         "d": "delete_session",
@@ -124,6 +142,7 @@ class TAMEApp(App):
         "f": "session_search",
         "g": "global_search",
         "h": "show_history",
+        "j": "jump_to_line",
         "l": "notification_history",
         "m": "rename_session",
         "n": "next_session",
@@ -143,6 +162,9 @@ class TAMEApp(App):
         "r": "resume_all",
         "z": "pause_all",
         "u": "check_usage",
+        "k": "echo_latency",
+        "o": "resource_graphs",
+        "b": "resource_class",
         "x": "clear_notifications",
         "w": "set_group",
         "v": "show_diff",
@@ -174,6 +196,12 @@ class TAMEApp(App):
         "session_9": ("Session 9", False, False),
     }
 
+    # Pane captures in flight at once while restoring tmux sessions
+    _RESTORE_CAPTURE_CONCURRENCY: int = 8
+    # Characters of active-session output held for the viewer between
+    # flushes; beyond this the viewer is rebuilt from the OutputBuffer
+    _PENDING_MAX_CHARS: int = 1_000_000
+
     # Hardcoded bindings that are not user-configurable.
     BINDINGS = [
         Binding("ctrl+c", "send_sigint", "Send SIGINT", show=False, priority=True),
@@ -188,6 +216,22 @@ class TAMEApp(App):
             "f5", "notification_history", "Notification Log", show=True, priority=False
         ),
         Binding("tab", "send_tab", "Tab Complete", show=False, priority=True),
+        Binding(
+            "shift+pageup", "scroll_page_up", "Scroll Up", show=False, priority=True
+        ),
+        Binding(
+            "shift+pagedown",
+            "scroll_page_down",
+            "Scroll Down",
+            show=False,
+            priority=True,
+        ),
+        Binding(
+            "shift+home", "scroll_home", "Scroll to Top", show=False, priority=True
+        ),
+        Binding(
+            "shift+end", "scroll_end", "Scroll to Bottom", show=False, priority=True
+        ),
     ]
 
     def __init__(
@@ -246,7 +290,20 @@ class TAMEApp(App):
             idle_threshold_seconds=idle_threshold,
             idle_prompt_timeout=idle_prompt_timeout,
             state_debounce_ms=state_debounce_ms,
+            max_concurrent_sessions=int(sessions_cfg.get("max_concurrent_sessions", 0)),
+            resource_classes=parse_resource_classes(
+                sessions_cfg.get("resource_classes", {})
+            ),
         )
+        self._default_resource_class = str(
+            sessions_cfg.get("default_resource_class", "")
+        ).strip()
+        # Tree root each session's resource class was last applied to
+        self._class_roots: dict[str, tuple[int, str]] = {}
+        # Root pid per session from the last resource poll
+        self._resource_roots_cache: dict[str, int] = {}
+        # Whether the sidebar currently shows queue positions
+        self._queue_shown: bool = False
         default_working_dir = str(
             sessions_cfg.get("default_working_directory", "")
         ).strip()
@@ -272,6 +329,20 @@ class TAMEApp(App):
             log.warning(
                 "sessions.start_in_tmux=true but tmux is not installed; falling back to shell"
             )
+        # Control-mode client answering snapshot captures (started on mount)
+        self._tmux_control: TmuxControlClient | None = None
+        self._tmux_control_start: asyncio.Task[None] | None = None
+        self._snapshot_task: asyncio.Task[None] | None = None
+        self._snapshot_again: bool = False
+        # Keeps psutil handles across polls so CPU% has a baseline
+        self._resource_monitor = create_resource_monitor()
+        # Per-session ring buffers of resource samples for the sparklines
+        self._resource_history: dict[str, ResourceHistory] = {}
+        self._resource_history_samples = max(
+            1, int(sessions_cfg.get("resource_history_samples", 120))
+        )
+        # Stops low-priority sessions under load; runs on each resource poll
+        self._governor = LoadGovernor(sessions_cfg.get("governor", {}))
 
         notif_cfg = cfg.get("notifications", {})
         self._notification_engine = NotificationEngine(notif_cfg)
@@ -291,10 +362,25 @@ class TAMEApp(App):
         self._pending_status_updates: set[str] = set()
         self._status_update_scheduled: bool = False
 
-        # Batched PTY output: accumulate chunks per session, flush on timer
+        # Batched PTY output: accumulate chunks per session, flush on timer.
+        # Only the active session's chunks are kept; background sessions (and
+        # an active one whose queue overflowed) are just marked stale and
+        # rebuilt from their OutputBuffer.
         self._output_pending: dict[str, list[str]] = {}
+        self._output_pending_chars: dict[str, int] = {}
+        # Sum of _output_pending_chars, kept alongside it
+        self._output_pending_total: int = 0
+        self._output_stale: set[str] = set()
+        # UTF-8 bytes dropped from the UI path per session (never from the
+        # OutputBuffer or pattern scanning); the status bar shows the active
+        # session's
+        self._output_dropped_bytes: dict[str, int] = {}
         self._output_flush_timer: Timer | None = None
         self._app_focused: bool = True
+        # Keystroke -> echo latency: time from the first unanswered keystroke
+        # to the active session's next output reaching the viewer
+        self._echo_latency = LatencyHistogram()
+        self._echo_sent_at: float | None = None
 
         # Input history: accumulate typed chars per session, flush on Enter
         self._input_line_buffer: dict[str, list[str]] = {}
@@ -419,15 +505,26 @@ class TAMEApp(App):
             sidebar.update_session(session)
             if sid == self._active_session_id:
                 header.update_from_session(session)
+        self._refresh_queue_info()
         self._update_status_bar()
 
-    def on_sidebar_flash(self, event: SidebarFlash) -> None:
+    def _refresh_queue_info(self) -> None:
+        """Show queued sessions' position and estimated start in the sidebar."""
+        queue = self._session_manager.pending_queue()
+        if not queue and not self._queue_shown:
+            return
+        self._queue_shown = bool(queue)
         try:
-            from tame.ui.widgets.session_list_item import SessionListItem
+            sidebar = self.query_one(SessionSidebar)
+        except NoMatches:
+            return
+        sidebar.update_queue(
+            {sid: (position, eta) for position, (sid, eta) in enumerate(queue, 1)}
+        )
 
-            item = self.query_one(f"#session-item-{event.session_id}", SessionListItem)
-            item.add_class("flash")
-            self.set_timer(2.0, lambda: item.remove_class("flash"))
+    def on_sidebar_flash(self, event: SidebarFlash) -> None:
+        try:
+            self.query_one(SessionSidebar).flash_session(event.session_id)
         except Exception:
             pass
 
@@ -451,6 +548,9 @@ class TAMEApp(App):
         except (KeyError, RuntimeError):
             pass
 
+    def on_viewer_fast_forward(self, message: ViewerFastForward) -> None:
+        self.query_one(StatusBar).set_fast_forward(message.active)
+
     def on_key(self, event: events.Key) -> None:
         # --- Open command palette overlay ---
         if event.key in ("ctrl+@", "ctrl+space"):
@@ -494,6 +594,9 @@ class TAMEApp(App):
             self._session_manager.send_input(self._active_session_id, pty_input)
         except OSError:
             log.debug("Send to dead session %s ignored", self._active_session_id)
+        else:
+            if self._echo_sent_at is None:
+                self._echo_sent_at = time.monotonic()
         event.stop()
 
     # ------------------------------------------------------------------
@@ -585,7 +688,12 @@ class TAMEApp(App):
             rows=rows,
             cols=cols,
             profile=profile,
+            # A tmux client may fork the tmux server, which would inherit the
+            # class; tmux sessions get it on their pane tree instead
+            resource_class="" if command else self._default_resource_class,
         )
+        if command:
+            session.resource_class = self._default_resource_class
         tmux_session_name = self._build_tmux_session_name(name)
         if command and tmux_session_name:
             session.metadata["tmux_session_name"] = tmux_session_name
@@ -596,8 +704,23 @@ class TAMEApp(App):
         sidebar = self.query_one(SessionSidebar)
         sidebar.add_session(session)
         self._select_session(session.id)
+        self._refresh_queue_info()
         self._update_status_bar()
         log.info("Created session %s (%s)", session.name, session.id)
+        if session.status is not SessionState.PENDING:
+            return
+        try:
+            toast = self.query_one(ToastOverlay)
+        except NoMatches:
+            return
+        toast.show_toast(
+            title="Session Queued",
+            message=(
+                f"'{session.name}' starts when one of the "
+                f"{self._session_manager.max_concurrent_sessions} "
+                "running sessions exits or pauses"
+            ),
+        )
 
     def action_toggle_sidebar(self) -> None:
         sidebar = self.query_one(SessionSidebar)
@@ -695,6 +818,7 @@ class TAMEApp(App):
             self._session_manager.delete_session(session_id)
         except KeyError:
             pass
+        self._output_dropped_bytes.pop(session_id, None)
 
         sidebar = self.query_one(SessionSidebar)
         viewer = self.query_one(SessionViewer)
@@ -706,9 +830,12 @@ class TAMEApp(App):
         if next_session_id is not None:
             self._select_session(next_session_id)
         else:
+            self._session_manager.focused_session_id = None
             self._active_session_id = None
+            self._echo_sent_at = None
             header = self.query_one(HeaderBar)
             header.clear_session()
+            self.query_one(StatusBar).set_output_dropped(0)
 
         self._update_status_bar()
         log.info("Killed session %s", session_id)
@@ -805,12 +932,7 @@ class TAMEApp(App):
             except Exception:
                 pass
             return
-        safe_name = re.sub(r"[^A-Za-z0-9_-]", "_", session.name).strip("_") or "session"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{safe_name}_{timestamp}.txt"
-        export_dir = os.path.expanduser("~/.local/share/tame/exports")
-        os.makedirs(export_dir, exist_ok=True)
-        filepath = os.path.join(export_dir, filename)
+        filepath = self._export_path(session.name, "txt")
         # Strip ANSI escape sequences for clean text export
         clean_text = re.sub(
             r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~]|\][^\x1B\x07]*(?:\x07|\x1B\\))",
@@ -826,6 +948,15 @@ class TAMEApp(App):
             pass
         log.info("Exported session '%s' to %s", session.name, filepath)
 
+    @staticmethod
+    def _export_path(session_name: str, suffix: str) -> str:
+        """Timestamped file path under the exports directory."""
+        safe_name = re.sub(r"[^A-Za-z0-9_-]", "_", session_name).strip("_") or "session"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        export_dir = os.path.expanduser("~/.local/share/tame/exports")
+        os.makedirs(export_dir, exist_ok=True)
+        return os.path.join(export_dir, f"{safe_name}_{timestamp}.{suffix}")
+
     def _record_input_history(self, session_id: str, line: str) -> None:
         """Save a line to the session's input history (deduplicated at head)."""
         try:
@@ -881,6 +1012,114 @@ class TAMEApp(App):
             except Exception:
                 pass
 
+    def action_resource_graphs(self) -> None:
+        """Show the active session's CPU, memory and output-rate history."""
+        if isinstance(
+            self.screen, (NameDialog, ConfirmDialog, CommandPalette, ResourceGraphs)
+        ):
+            return
+        session_id = self._active_session_id
+        if session_id is None:
+            return
+        try:
+            session = self._session_manager.get_session(session_id)
+        except KeyError:
+            return
+        history = self._resource_history.get(session_id)
+        if history is None:
+            history = ResourceHistory(self._resource_history_samples)
+            self._resource_history[session_id] = history
+
+        def _on_close(result: str | None) -> None:
+            if result == "export":
+                self._export_resource_history(session_id)
+
+        self.push_screen(ResourceGraphs(session.name, history), callback=_on_close)
+
+    def action_resource_class(self) -> None:
+        """Pick the resource class the active session runs under."""
+        if isinstance(
+            self.screen,
+            (NameDialog, ConfirmDialog, CommandPalette, ResourceClassPicker),
+        ):
+            return
+        session_id = self._active_session_id
+        if session_id is None:
+            return
+        try:
+            session = self._session_manager.get_session(session_id)
+        except KeyError:
+            return
+
+        def _on_pick(name: str | None) -> None:
+            if name is not None:
+                self._set_resource_class(session_id, name)
+
+        self.push_screen(
+            ResourceClassPicker(
+                self._session_manager.resource_classes, session.resource_class
+            ),
+            callback=_on_pick,
+        )
+
+    def _set_resource_class(self, session_id: str, name: str) -> None:
+        """Move a session's processes into resource class *name*."""
+        try:
+            session = self._session_manager.get_session(session_id)
+        except KeyError:
+            return
+        root = None
+        if session.metadata.get("tmux_session_name"):
+            # Falls back to the client; the next poll finds the pane tree
+            root = self._resource_roots_cache.get(session_id)
+            if root is not None:
+                self._class_roots[session_id] = (root, name)
+        try:
+            failed = self._session_manager.set_resource_class(session_id, name, root)
+        except KeyError:
+            return
+        message = f"'{session.name}' now runs as {name}"
+        if failed:
+            message += f" (not applied: {', '.join(failed)})"
+        log.info("Resource class: %s", message)
+        try:
+            toast = self.query_one(ToastOverlay)
+        except NoMatches:
+            return
+        toast.show_toast(title="Resource Class", message=message)
+
+    def _export_resource_history(self, session_id: str) -> None:
+        """Write a session's resource history to a CSV file."""
+        history = self._resource_history.get(session_id)
+        try:
+            session = self._session_manager.get_session(session_id)
+        except KeyError:
+            return
+        try:
+            toast = self.query_one(ToastOverlay)
+        except NoMatches:
+            toast = None
+        if history is None or not len(history):
+            if toast is not None:
+                toast.show_toast(title="Export", message="No resource samples yet")
+            return
+        filepath = self._export_path(session.name, "resources.csv")
+        with open(filepath, "w", newline="") as f:
+            rows = history.write_csv(f)
+        if toast is not None:
+            toast.show_toast(title="Export", message=f"Saved to {filepath}")
+        log.info(
+            "Exported %d resource samples of '%s' to %s", rows, session.name, filepath
+        )
+
+    def action_echo_latency(self) -> None:
+        """Show the keystroke-to-echo latency histogram summary."""
+        try:
+            toast = self.query_one(ToastOverlay)
+        except NoMatches:
+            return
+        toast.show_toast(title="Echo Latency", message=self._echo_latency.summary())
+
     def action_send_sigint(self) -> None:
         """Forward Ctrl+C as SIGINT to the active PTY session."""
         if isinstance(self.screen, (NameDialog, ConfirmDialog, CommandPalette)):
@@ -924,9 +1163,14 @@ class TAMEApp(App):
             callback=self._handle_search_result,
         )
 
-    def _handle_search_result(self, session_id: str | None) -> None:
-        if session_id is not None:
-            self._select_session(session_id)
+    def _handle_search_result(self, result: tuple[str, int, str] | None) -> None:
+        if result is None:
+            return
+        session_id, lines_from_end, line_text = result
+        self._select_session(session_id)
+        if self._active_session_id == session_id:
+            viewer = self.query_one(SessionViewer)
+            viewer.reveal_output_line(lines_from_end, line_text)
 
     def action_show_diff(self) -> None:
         """Show git diff for the active session's working directory."""
@@ -992,6 +1236,45 @@ class TAMEApp(App):
         viewer.clear_search_highlights()
         viewer.focus()
 
+    # ------------------------------------------------------------------
+    # Scrollback navigation
+    # ------------------------------------------------------------------
+
+    def action_scroll_page_up(self) -> None:
+        self.query_one(SessionViewer).scroll_page(up=True)
+
+    def action_scroll_page_down(self) -> None:
+        self.query_one(SessionViewer).scroll_page(up=False)
+
+    def action_scroll_home(self) -> None:
+        self.query_one(SessionViewer).scroll_to_top()
+
+    def action_scroll_end(self) -> None:
+        self.query_one(SessionViewer).scroll_to_bottom()
+
+    def action_jump_to_line(self) -> None:
+        """Ask for an absolute scrollback line and scroll the viewer to it."""
+        if isinstance(
+            self.screen, (NameDialog, ConfirmDialog, CommandPalette, JumpDialog)
+        ):
+            return
+        if self._active_session_id is None:
+            return
+        viewer = self.query_one(SessionViewer)
+        total = viewer.history_length + max(1, viewer.size.height)
+        self.push_screen(
+            JumpDialog(viewer.first_visible_line + 1, total),
+            callback=self._confirm_jump_to_line,
+        )
+
+    def _confirm_jump_to_line(self, line: int | None) -> None:
+        if line is None:
+            return
+        viewer = self.query_one(SessionViewer)
+        # Dialog is 1-based; the viewer counts from 0
+        viewer.jump_to_line(line - 1)
+        viewer.focus()
+
     def action_focus_search(self) -> None:
         if isinstance(self.screen, (NameDialog, ConfirmDialog, CommandPalette)):
             return
@@ -1045,7 +1328,14 @@ class TAMEApp(App):
     # ------------------------------------------------------------------
 
     def _select_session(self, session_id: str) -> None:
+        # Focus first: any deferred output of the session is handled while
+        # it still counts as background, so the viewer rebuilds from it
+        self._session_manager.focused_session_id = session_id
         self._active_session_id = session_id
+        self._echo_sent_at = None
+        self.query_one(StatusBar).set_output_dropped(
+            self._output_dropped_bytes.get(session_id, 0)
+        )
 
         sidebar = self.query_one(SessionSidebar)
         sidebar.highlight_session(session_id)
@@ -1086,31 +1376,46 @@ class TAMEApp(App):
         waiting = sum(1 for s in sessions if s.status == SessionState.WAITING)
         errors = sum(1 for s in sessions if s.status == SessionState.ERROR)
         bar = self.query_one(StatusBar)
-        bar.update_stats(total, active, waiting, errors)
+        bar.update_stats(
+            total, active, waiting, errors, self._session_manager.pending_count
+        )
 
     # ------------------------------------------------------------------
     # PTY output -> UI (batched, focus-aware)
     # ------------------------------------------------------------------
 
-    def _handle_pty_output(self, session_id: str, text: str) -> None:
+    def _handle_pty_output(
+        self, session_id: str, text: str, kind: OutputKind | None = None
+    ) -> None:
         """Accumulate PTY output; flush immediately for small output (echo),
-        batch at 16ms for bulk output."""
-        self._output_pending.setdefault(session_id, []).append(text)
+        batch at 16ms for bulk output.
+
+        *kind* comes pre-classified from the session layer, which only scans
+        the focused session's chunks; per-chunk work here is constant-time
+        bookkeeping on running character counts.
+        """
+        if session_id != self._active_session_id:
+            self._output_stale.add(session_id)
+        else:
+            chars = self._output_pending_chars.get(session_id, 0) + len(text)
+            if chars > self._PENDING_MAX_CHARS:
+                self._drop_pending_output(session_id, text)
+            else:
+                self._output_pending.setdefault(session_id, []).append(text)
+                self._output_pending_chars[session_id] = chars
+                self._output_pending_total += len(text)
         if not self._app_focused:
             return
+        if kind is None or (
+            kind is OutputKind.BACKGROUND and session_id == self._active_session_id
+        ):
+            kind = classify_output(text)
         # Redraw-heavy control chunks (cursor movement / clear / CR redraw)
         # are latency-sensitive and can artifact if delayed behind batching.
-        if session_id == self._active_session_id and self._is_redraw_control_chunk(
-            text
-        ):
-            if self._output_flush_timer is not None:
-                self._output_flush_timer.stop()
-                self._output_flush_timer = None
-            self._flush_pending_output()
-            return
-        # Small output (keystroke echo): flush immediately
-        total = sum(len(c) for chunks in self._output_pending.values() for c in chunks)
-        if total <= 64:
+        # Small output (keystroke echo) is flushed immediately too.
+        if (
+            session_id == self._active_session_id and kind is OutputKind.REDRAW
+        ) or self._output_pending_total <= 64:
             if self._output_flush_timer is not None:
                 self._output_flush_timer.stop()
                 self._output_flush_timer = None
@@ -1120,32 +1425,72 @@ class TAMEApp(App):
                 0.016, self._flush_pending_output, name="output_flush"
             )
 
-    @staticmethod
-    def _is_redraw_control_chunk(text: str) -> bool:
-        return bool(REDRAW_CONTROL_RE.search(text))
+    def _drop_pending_output(self, session_id: str, overflow: str = "") -> None:
+        """Give up on feeding *session_id*'s queued output to the viewer.
+
+        *overflow* is the chunk that didn't fit; it's dropped and counted too.
+        """
+        chunks = self._output_pending.pop(session_id, [])
+        self._output_pending_total -= self._output_pending_chars.pop(session_id, 0)
+        self._output_stale.add(session_id)
+        # Only runs once per overflowing queue, so encoding here is cheap
+        dropped = sum(len(chunk.encode()) for chunk in chunks) + len(overflow.encode())
+        self._output_dropped_bytes[session_id] = (
+            self._output_dropped_bytes.get(session_id, 0) + dropped
+        )
 
     def _flush_pending_output(self) -> None:
         """Drain accumulated output — one pyte.feed() per session."""
         self._output_flush_timer = None
         pending = self._output_pending
-        if not pending:
+        stale = self._output_stale
+        if not pending and not stale:
             return
         self._output_pending = {}
+        self._output_pending_chars = {}
+        self._output_pending_total = 0
+        self._output_stale = set()
 
         viewer = self.query_one(SessionViewer)
-        for session_id, chunks in pending.items():
-            combined = "".join(chunks)
-            if session_id == self._active_session_id:
-                try:
-                    session = self._session_manager.get_session(session_id)
-                except KeyError:
-                    continue
-                if not self._refresh_viewer_from_tmux_snapshot(session):
-                    viewer.append_output(combined)
-            else:
+        for session_id in stale:
+            if session_id != self._active_session_id:
                 # Background session: discard cached pyte state so it
                 # rebuilds from OutputBuffer when the user switches to it.
                 viewer.invalidate_session(session_id)
+                continue
+            pending.pop(session_id, None)  # the buffer has it all
+            try:
+                session = self._session_manager.get_session(session_id)
+            except KeyError:
+                continue
+            dropped = self._output_dropped_bytes.get(session_id, 0)
+            if dropped:
+                self.query_one(StatusBar).set_output_dropped(dropped)
+            if not self._refresh_viewer_from_tmux_snapshot(session):
+                log.debug(
+                    "Reloading viewer for %s from its buffer "
+                    "(%d bytes dropped from the UI path so far)",
+                    session_id,
+                    dropped,
+                )
+                viewer.reload_session(session_id, session.output_buffer)
+            self._record_echo_latency()
+        for session_id, chunks in pending.items():
+            if session_id != self._active_session_id:
+                viewer.invalidate_session(session_id)  # switched meanwhile
+                continue
+            try:
+                session = self._session_manager.get_session(session_id)
+            except KeyError:
+                continue
+            if not self._refresh_viewer_from_tmux_snapshot(session):
+                viewer.append_output("".join(chunks))
+            self._record_echo_latency()
+
+    def _record_echo_latency(self) -> None:
+        if self._echo_sent_at is not None:
+            self._echo_latency.record(time.monotonic() - self._echo_sent_at)
+            self._echo_sent_at = None
 
     def on_app_blur(self, event: events.AppBlur) -> None:
         """App lost focus — pause output processing to avoid hidden work."""
@@ -1164,7 +1509,13 @@ class TAMEApp(App):
     # ------------------------------------------------------------------
 
     async def _restore_tmux_sessions_async(self) -> None:
-        """Non-blocking tmux session restore — runs subprocess calls in executor."""
+        """Non-blocking tmux session restore.
+
+        Pane captures for all sessions start up front (pipelined over the
+        control client, or in the executor with bounded parallelism) while
+        the sessions are created, and are scanned once everything is in the
+        sidebar.
+        """
         if not (
             self._start_in_tmux
             and self._tmux_available
@@ -1183,8 +1534,17 @@ class TAMEApp(App):
         if not os.path.isdir(working_dir):
             working_dir = os.path.expanduser("~")
 
+        await self._start_tmux_control()
+        limit = asyncio.Semaphore(self._RESTORE_CAPTURE_CONCURRENCY)
+        captures = {
+            tmux_session: asyncio.ensure_future(
+                self._capture_tmux_pane_async(tmux_session, limit)
+            )
+            for tmux_session in tmux_sessions
+        }
+
         sidebar = self.query_one(SessionSidebar)
-        restored_count = 0
+        restored: list[tuple[str, str]] = []  # (session id, tmux session)
         viewer = self.query_one(SessionViewer)
         rows = max(1, viewer.size.height) if viewer.size.height else 24
         cols = max(1, viewer.size.width) if viewer.size.width else 80
@@ -1198,27 +1558,44 @@ class TAMEApp(App):
                     command=["tmux", "attach-session", "-t", tmux_session],
                     rows=rows,
                     cols=cols,
+                    queue_if_full=False,
                 )
             except Exception:
                 log.exception("Failed to restore tmux session '%s'", tmux_session)
                 continue
 
             session.metadata["tmux_session_name"] = tmux_session
-
-            pane_text = await loop.run_in_executor(
-                None, self._capture_tmux_pane, tmux_session
-            )
-            if pane_text:
-                self._session_manager.scan_pane_content(session.id, pane_text)
-
             sidebar.add_session(session)
             if self._active_session_id is None:
                 self._select_session(session.id)
-            restored_count += 1
+            restored.append((session.id, tmux_session))
+            await asyncio.sleep(0)  # let capture replies in between spawns
 
-        if restored_count:
+        for session_id, tmux_session in restored:
+            pane_text = await captures[tmux_session]
+            if pane_text:
+                self._session_manager.scan_pane_content(session_id, pane_text)
+        for capture in captures.values():
+            capture.cancel()  # sessions that failed to start
+
+        if restored:
             self._update_status_bar()
-            log.info("Restored %d tmux session(s)", restored_count)
+            log.info("Restored %d tmux session(s)", len(restored))
+
+    async def _capture_tmux_pane_async(
+        self, tmux_session: str, limit: asyncio.Semaphore
+    ) -> str:
+        async with limit:
+            client = self._tmux_control
+            if client is not None and client.is_running:
+                try:
+                    return await client.capture_pane(tmux_session)
+                except TmuxCommandError:
+                    return ""
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, self._capture_tmux_pane, tmux_session
+            )
 
     def _restore_tmux_sessions(self) -> None:
         """Synchronous tmux session restore (used by tests)."""
@@ -1252,6 +1629,7 @@ class TAMEApp(App):
                     command=["tmux", "attach-session", "-t", tmux_session],
                     rows=rows,
                     cols=cols,
+                    queue_if_full=False,
                 )
             except Exception:
                 log.exception("Failed to restore tmux session '%s'", tmux_session)
@@ -1283,18 +1661,6 @@ class TAMEApp(App):
             return ""
         return proc.stdout
 
-    def _capture_tmux_pane_render(self, tmux_session: str) -> str | None:
-        """Capture a tmux pane snapshot for stable text rendering."""
-        proc = subprocess.run(
-            ["tmux", "capture-pane", "-p", "-e", "-t", tmux_session],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if proc.returncode != 0:
-            return None
-        return self._sanitize_tmux_snapshot_ansi(proc.stdout)
-
     @staticmethod
     def _sanitize_tmux_snapshot_ansi(text: str) -> str:
         """Keep foreground styling while stripping background/reverse SGR attrs."""
@@ -1354,19 +1720,84 @@ class TAMEApp(App):
 
         return SGR_RE.sub(_repl, text)
 
+    async def _start_tmux_control(self) -> None:
+        """Start the shared control client once; concurrent callers wait."""
+        if self._tmux_control_start is None:
+            self._tmux_control_start = asyncio.ensure_future(self._spawn_tmux_control())
+        await asyncio.shield(self._tmux_control_start)
+
+    async def _spawn_tmux_control(self) -> None:
+        if not self._tmux_available:
+            return
+        client = TmuxControlClient(f"{self._tmux_session_prefix}_control")
+        try:
+            await client.start()
+        except (OSError, TmuxCommandError) as exc:
+            log.warning("tmux control client unavailable: %s", exc)
+            client.close()
+            return
+        self._tmux_control = client
+
     def _refresh_viewer_from_tmux_snapshot(self, session) -> bool:
+        """Request a tmux snapshot of the active session over the control client.
+
+        Returns False (the caller renders the PTY stream itself) when
+        snapshots are off or the control client isn't running.  Captures
+        are asynchronous and coalesced: requests made while one is in
+        flight collapse into a single follow-up capture.
+        """
         if not (self._tmux_snapshot_render and self._tmux_available):
             return False
-        tmux_session = session.metadata.get("tmux_session_name")
-        if not tmux_session:
+        if not session.metadata.get("tmux_session_name"):
             return False
-        snapshot = self._capture_tmux_pane_render(str(tmux_session))
-        if snapshot is None:
+        client = self._tmux_control
+        if client is None or not client.is_running:
+            # Render the PTY stream until the client is up
+            if self._tmux_control_start is None:
+                self._tmux_control_start = asyncio.ensure_future(
+                    self._spawn_tmux_control()
+                )
             return False
-        self.query_one(SessionViewer).show_snapshot(snapshot)
+        if self._snapshot_task is not None and not self._snapshot_task.done():
+            self._snapshot_again = True
+        else:
+            self._snapshot_task = asyncio.create_task(self._capture_active_snapshot())
         return True
 
-    def _list_existing_tmux_sessions(self) -> list[str]:
+    async def _capture_active_snapshot(self) -> None:
+        self._snapshot_again = True
+        while self._snapshot_again:
+            self._snapshot_again = False
+            session_id = self._active_session_id
+            client = self._tmux_control
+            if session_id is None or client is None:
+                return
+            try:
+                session = self._session_manager.get_session(session_id)
+            except KeyError:
+                return
+            tmux_session = session.metadata.get("tmux_session_name")
+            if not tmux_session:
+                return
+            try:
+                text = await client.capture_pane(str(tmux_session), escapes=True)
+            except TmuxCommandError as exc:
+                log.debug("tmux capture of %r failed: %s", tmux_session, exc)
+                text = None
+            if session_id != self._active_session_id:
+                continue  # switched meanwhile; the new session asked again
+            viewer = self.query_one(SessionViewer)
+            if text is None:
+                # Output since the last snapshot only reached the
+                # OutputBuffer; rebuild the emulator from it instead.
+                viewer.invalidate_session(session_id)
+                viewer.load_session(session_id, session.output_buffer)
+                return
+            viewer.show_snapshot(self._sanitize_tmux_snapshot_ansi(text))
+
+    @staticmethod
+    def _list_tmux_session_names() -> list[str] | None:
+        """All tmux session names; empty without a server, None on error."""
         proc = subprocess.run(
             ["tmux", "list-sessions", "-F", "#{session_name}"],
             capture_output=True,
@@ -1378,11 +1809,13 @@ class TAMEApp(App):
             if "no server running" in stderr or "failed to connect" in stderr:
                 return []
             log.warning("Unable to list tmux sessions: %s", proc.stderr.strip())
-            return []
+            return None
+        return proc.stdout.splitlines()
 
+    def _list_existing_tmux_sessions(self) -> list[str]:
         prefix = f"{self._tmux_session_prefix}-"
         sessions: list[str] = []
-        for line in proc.stdout.splitlines():
+        for line in self._list_tmux_session_names() or []:
             name = line.strip()
             if not name:
                 continue
@@ -1465,51 +1898,178 @@ class TAMEApp(App):
 
     async def _poll_resources_async(self) -> None:
         """Run resource polling in executor to avoid blocking the event loop."""
+        roots = await self._resource_roots()
+        self._resource_roots_cache = roots
+        self._apply_tree_resource_classes(roots)
+        # Only the header shows fds and I/O, so skip them for other sessions
+        detail = {self._active_session_id} if self._active_session_id else set()
         loop = asyncio.get_running_loop()
-        results = await loop.run_in_executor(None, self._collect_resource_data)
-        self._apply_resource_data(results)
-
-    def _collect_resource_data(self) -> list[tuple[str, float, str]]:
-        """Collect CPU/MEM data for all sessions (runs in thread)."""
-        try:
-            import psutil
-        except ImportError:
-            return []
-
-        data: list[tuple[str, float, str]] = []
+        usage = await loop.run_in_executor(
+            None, self._resource_monitor.sample, roots, detail
+        )
+        self._apply_resource_data(usage)
+        self._record_resource_history(usage)
+        self._apply_terminal_memory()
+        self._run_governor(roots, usage)
+        self._refresh_queue_info()  # estimates count down between admissions
+
+    async def _resource_roots(self) -> dict[str, int]:
+        """Root pid of each session's process tree.
+
+        A tmux-backed session's own pid is the attached client; the shell and
+        everything it runs hang off the pane process in the tmux server.
+        """
+        pane_pids: dict[str, int] = {}
+        client = self._tmux_control
+        if client is not None and client.is_running:
+            try:
+                pane_pids = await client.pane_pids()
+            except TmuxCommandError as exc:
+                log.debug("tmux pane pid listing failed: %s", exc)
+        roots: dict[str, int] = {}
+        for session in self._session_manager.list_sessions():
+            tmux_session = session.metadata.get("tmux_session_name")
+            pid = pane_pids.get(str(tmux_session)) if tmux_session else None
+            if pid is None:
+                pid = session.pid
+            if pid is not None:
+                roots[session.id] = pid
+        return roots
+
+    def _apply_tree_resource_classes(self, roots: dict[str, int]) -> None:
+        """Apply sessions' resource classes to their (new) process trees.
+
+        tmux panes never get the class at spawn.  A PTY child gets it just
+        after it starts, so anything its startup files forked first is only
+        caught here, on the first poll after the session starts.
+        """
+        applied: dict[str, tuple[int, str]] = {}
         for session in self._session_manager.list_sessions():
-            if session.pid is None:
+            root = roots.get(session.id)
+            if not session.resource_class or root is None:
                 continue
-            try:
-                proc = psutil.Process(session.pid)
-                cpu = proc.cpu_percent(interval=0)
-                mem_info = proc.memory_info()
-                mem_mb = mem_info.rss / (1024 * 1024)
-                if mem_mb >= 1024:
-                    mem_str = f"{mem_mb / 1024:.1f}GB"
-                else:
-                    mem_str = f"{mem_mb:.0f}MB"
-                data.append((session.id, cpu, mem_str))
-            except Exception:
-                pass
-        return data
+            target = (root, session.resource_class)
+            if self._class_roots.get(session.id) != target:
+                try:
+                    self._session_manager.set_resource_class(
+                        session.id, session.resource_class, root
+                    )
+                except KeyError:
+                    continue
+            applied[session.id] = target
+        self._class_roots = applied
 
-    def _apply_resource_data(self, results: list[tuple[str, float, str]]) -> None:
+    def _apply_resource_data(self, usage: dict[str, ResourceUsage]) -> None:
         """Apply collected resource data to UI widgets (runs on main thread)."""
-        from tame.ui.widgets.session_list_item import SessionListItem
+        try:
+            sidebar = self.query_one(SessionSidebar)
+        except NoMatches:
+            return
+        sidebar.update_resources(
+            [
+                (session_id, u.cpu_percent, format_bytes(u.rss_bytes))
+                for session_id, u in usage.items()
+            ]
+        )
+        active = usage.get(self._active_session_id or "")
+        if active is not None:
+            try:
+                header = self.query_one(HeaderBar)
+            except NoMatches:
+                return
+            header.update_system_stats(
+                active.cpu_percent,
+                format_bytes(active.rss_bytes),
+                f"{active.num_processes}p {active.num_fds}fd "
+                f"IO:{format_bytes(int(active.io_bytes_per_sec))}/s",
+            )
 
-        for session_id, cpu, mem_str in results:
+    def _run_governor(
+        self, roots: dict[str, int], usage: dict[str, ResourceUsage]
+    ) -> None:
+        """Stop or resume low-priority sessions as system load dictates."""
+        manager = self._session_manager
+        throttled = manager.throttled_session_ids
+        if not self._governor.enabled and not throttled:
+            return
+        decision = self._governor.tick(
+            read_pressure(),
+            manager.list_sessions(),
+            {sid: u.cpu_percent for sid, u in usage.items()},
+            throttled,
+            time.monotonic(),
+        )
+        paused: list[str] = []
+        for sid in decision.pause:
+            # Stop the pane's tree for tmux sessions, not just the client
+            if manager.throttle_session(sid, roots.get(sid)):
+                paused.append(manager.get_session(sid).name)
+        resumed: list[str] = []
+        for sid in decision.resume:
+            if manager.unthrottle_session(sid):
+                resumed.append(manager.get_session(sid).name)
+        if not paused and not resumed:
+            return
+        if paused:
+            title = "Session Paused"
+            message = f"'{', '.join(paused)}' paused under load ({decision.reason})"
+        else:
+            title = "Session Resumed"
+            message = f"'{', '.join(resumed)}' resumed, load has eased"
+        log.info("Governor: %s", message)
+        self._update_status_bar()
+        try:
+            toast = self.query_one(ToastOverlay)
+        except NoMatches:
+            return
+        toast.show_toast(title=title, message=message)
+
+    def _record_resource_history(self, usage: dict[str, ResourceUsage]) -> None:
+        """Append this poll to each session's history; redraw the sparklines."""
+        now = time.time()
+        histories: dict[str, ResourceHistory] = {}
+        sparklines: dict[str, str] = {}
+        for session in self._session_manager.list_sessions():
+            history = self._resource_history.get(session.id)
+            if history is None:
+                history = ResourceHistory(self._resource_history_samples)
+            history.record(
+                now,
+                usage.get(session.id, ResourceUsage()),
+                session.output_buffer.total_bytes_received,
+            )
+            histories[session.id] = history
+            sparklines[session.id] = sparkline(
+                history.cpu.last(self._SIDEBAR_SPARKLINE_WIDTH), 0, 100
+            )
+        # Rebuilt each poll, so deleted sessions' histories go with them
+        self._resource_history = histories
+        try:
+            sidebar = self.query_one(SessionSidebar)
+        except NoMatches:
+            return
+        sidebar.update_sparklines(sparklines)
+
+    def _apply_terminal_memory(self) -> None:
+        """Show how much memory each cached terminal emulator is holding."""
+        try:
+            viewer = self.query_one(SessionViewer)
+            sidebar = self.query_one(SessionSidebar)
+        except NoMatches:
+            return
+        usage = viewer.terminal_memory()
+        sidebar.update_terminal_memory(
+            {sid: format_bytes(nbytes) for sid, nbytes in usage.items()}
+        )
+        if self._active_session_id is not None:
+            nbytes = usage.get(self._active_session_id)
             try:
-                item = self.query_one(f"#session-item-{session_id}", SessionListItem)
-                item.update_resources(cpu, mem_str)
-            except Exception:
-                pass
-            if session_id == self._active_session_id:
-                try:
-                    header = self.query_one(HeaderBar)
-                    header.update_system_stats(cpu, mem_str)
-                except Exception:
-                    pass
+                header = self.query_one(HeaderBar)
+            except NoMatches:
+                return
+            header.update_terminal_memory(
+                format_bytes(nbytes) if nbytes is not None else ""
+            )
 
     # ------------------------------------------------------------------
     # Tmux health check
@@ -1522,33 +2082,52 @@ class TAMEApp(App):
         self.set_interval(30.0, self._check_tmux_health, name="tmux_health")
 
     async def _check_tmux_health(self) -> None:
-        """Check each tmux-backed session is still alive."""
-        loop = asyncio.get_running_loop()
+        """Mark sessions whose tmux session is gone as EXITED.
+
+        One ``list-sessions`` (over the control client when it is running)
+        is diffed against the known sessions.
+        """
+        client = self._tmux_control
+        if client is not None and not client.is_running:
+            # Let the next caller start a fresh control client
+            self._tmux_control = None
+            self._tmux_control_start = None
+        alive = await self._list_tmux_session_names_async()
+        if alive is None:
+            return  # couldn't ask tmux; don't guess
         for session in self._session_manager.list_sessions():
             tmux_name = session.metadata.get("tmux_session_name")
             if not tmux_name:
                 continue
-            if session.status in (SessionState.DONE, SessionState.ERROR):
+            if session.status in (
+                SessionState.DONE,
+                SessionState.ERROR,
+                SessionState.PENDING,  # its tmux session isn't created yet
+            ):
                 continue
-            alive = await loop.run_in_executor(
-                None, self._tmux_session_alive, str(tmux_name)
-            )
-            if not alive:
+            if str(tmux_name) not in alive:
                 log.warning("Tmux session %r gone — marking EXITED", tmux_name)
                 self._session_manager.mark_session_exited(session.id)
 
-    @staticmethod
-    def _tmux_session_alive(tmux_name: str) -> bool:
-        proc = subprocess.run(
-            ["tmux", "has-session", "-t", tmux_name],
-            capture_output=True,
-            check=False,
-        )
-        return proc.returncode == 0
+    async def _list_tmux_session_names_async(self) -> set[str] | None:
+        client = self._tmux_control
+        if client is not None and client.is_running:
+            try:
+                return set(await client.list_sessions())
+            except TmuxCommandError as exc:
+                log.debug("tmux list-sessions over control client failed: %s", exc)
+        loop = asyncio.get_running_loop()
+        names = await loop.run_in_executor(None, self._list_tmux_session_names)
+        return None if names is None else set(names)
 
     # ------------------------------------------------------------------
     # Cleanup
     # ------------------------------------------------------------------
 
     def on_unmount(self) -> None:
+        if self._echo_latency.count:
+            log.info("Keystroke echo latency: %s", self._echo_latency.summary())
+        if self._tmux_control is not None:
+            self._tmux_control.close()
         self._session_manager.close_all()
+        self._notification_engine.close()
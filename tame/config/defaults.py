@@ -58,6 +58,28 @@ DEFAULT_CONFIG: dict = {
         "max_concurrent_sessions": 0,
         "idle_threshold_seconds": 300,
         "resource_poll_seconds": 5,
+        "resource_history_samples": 120,
+        "default_resource_class": "",
+        "resource_classes": {
+            "interactive": {"nice": 0, "io_class": "best-effort", "io_level": 4},
+            "batch": {"nice": 10, "io_class": "best-effort", "io_level": 7},
+            "training": {
+                "nice": 19,
+                "io_class": "idle",
+                "max_memory_mb": 0,
+                "max_processes": 0,
+            },
+        },
+        "governor": {
+            "enabled": False,
+            "low_priority_groups": ["batch"],
+            "load_per_cpu_high": 1.5,
+            "load_per_cpu_low": 1.0,
+            "memory_pressure_high": 20.0,
+            "memory_pressure_low": 5.0,
+            "min_session_cpu": 5.0,
+            "resume_delay_seconds": 30,
+        },
     },
     "patterns": {
         "prompt": {
@@ -121,7 +143,9 @@ DEFAULT_CONFIG: dict = {
             "end": "",
         },
         "history": {
-            "max_size": 500,
+            "max_size": 200000,
+            "path": "~/.local/share/tame/notifications.db",
+            "retention_days": 365,
         },
         "desktop": {
             "enabled": True,
@@ -145,12 +169,44 @@ DEFAULT_CONFIG: dict = {
             "webhook_url": "",
             "verbosity": 10,
             "sessions": [],
+            "concurrency": 2,
+            "digest_seconds": 5.0,
+            "digest_max_events": 50,
         },
         "webhook": {
             "enabled": False,
             "url": "",
             "headers": {},
             "timeout": 5.0,
+            "concurrency": 2,
+            "digest_seconds": 0.0,
+            "digest_max_events": 50,
+        },
+        "outbox": {
+            "enabled": True,
+            "path": "~/.local/share/tame/outbox",
+            "max_mb": 10,
+        },
+        "throttle": {
+            "cooldowns": {"error": 60, "session_idle": 120},
+            "dedup_seconds": 60,
+            "max_keys": 4096,
+            "rate_limits": {
+                "desktop": {"per_minute": 6, "burst": 3},
+                "audio": {"per_minute": 6, "burst": 3},
+                "slack": {"per_minute": 20, "burst": 10},
+                "webhook": {"per_minute": 60, "burst": 20},
+            },
+        },
+        "http": {
+            "max_concurrent": 4,
+            "idle_seconds": 30,
+        },
+        "dispatch": {
+            "queue_size": 100,
+            "max_retries": 3,
+            "backoff_seconds": 1.0,
+            "max_replay_attempts": 100,
         },
         "toast": {
             "enabled": True,
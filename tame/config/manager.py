@@ -17,6 +17,26 @@ _CLAMP_NON_NEGATIVE: dict[str, float] = {
     "idle_prompt_timeout": 0,
     "state_debounce_ms": 0,
     "resource_poll_seconds": 1,
+    "resource_history_samples": 1,
+    "max_concurrent_sessions": 0,
+    "resume_delay_seconds": 0,
+    "max_memory_mb": 0,
+    "max_processes": 0,
+    "queue_size": 1,
+    "max_retries": 0,
+    "backoff_seconds": 0,
+    "max_replay_attempts": 0,
+    "concurrency": 1,
+    "max_concurrent": 1,
+    "idle_seconds": 0,
+    "digest_seconds": 0,
+    "digest_max_events": 1,
+    "max_mb": 1,
+    "dedup_seconds": 0,
+    "max_keys": 1,
+    "per_minute": 0,
+    "burst": 1,
+    "retention_days": 0,
     "timeout_ms": 0,
     "volume": 0,
     "max_size": 1,
@@ -24,9 +24,9 @@ class AudioNotifier:
         self.backend_preference = list(backend_preference or DEFAULT_BACKENDS)
         self.sounds: dict[str, str] = sounds or {}
 
-    def notify(self, event: NotificationEvent) -> None:
+    def notify(self, event: NotificationEvent) -> bool:
         if not self.enabled:
-            return
+            return False
 
         sound_path = self.sounds.get(event.event_type.value, "")
         if not sound_path:
@@ -34,16 +34,17 @@ class AudioNotifier:
 
         if not sound_path:
             self._try_bell()
-            return
+            return True
 
         for backend in self.backend_preference:
             if backend == "pygame" and self._try_pygame(sound_path):
-                return
+                return True
             if backend == "simpleaudio" and self._try_simpleaudio(sound_path):
-                return
+                return True
             if backend == "bell":
                 self._try_bell()
-                return
+                return True
+        return False
 
     def _try_pygame(self, path: str) -> bool:
         try:
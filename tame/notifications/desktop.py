@@ -29,17 +29,20 @@ class DesktopNotifier:
         self.urgency = urgency
         self.icon_path = icon_path
         self.timeout_ms = timeout_ms
+        self._available: bool | None = None
 
     def is_available(self) -> bool:
-        return shutil.which("notify-send") is not None
+        """Whether notify-send is on PATH; looked up once, then cached."""
+        if self._available is None:
+            self._available = shutil.which("notify-send") is not None
+            if not self._available:
+                log.warning("notify-send not found; desktop notifications unavailable")
+        return self._available
 
-    def notify(self, event: NotificationEvent) -> None:
-        if not self.enabled:
-            return
-
-        if not self.is_available():
-            log.warning("notify-send not found; desktop notifications unavailable")
-            return
+    def notify(self, event: NotificationEvent) -> bool:
+        """Show *event*; blocks until notify-send exits, so call off the UI."""
+        if not self.enabled or not self.is_available():
+            return False
 
         urgency = self.PRIORITY_URGENCY.get(event.priority, self.urgency)
 
@@ -58,10 +61,13 @@ class DesktopNotifier:
         cmd.extend([title, event.message])
 
         try:
-            subprocess.Popen(  # noqa: S603
+            proc = subprocess.Popen(  # noqa: S603
                 cmd,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
-        except OSError:
-            log.warning("Failed to launch notify-send", exc_info=True)
+            # Reaped here rather than left as a zombie
+            return proc.wait(timeout=10) == 0
+        except (OSError, subprocess.TimeoutExpired):
+            log.warning("Failed to run notify-send", exc_info=True)
+            return False
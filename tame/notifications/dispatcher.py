@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from .models import Delivery, NotificationEvent, Priority
+from .outbox import Outbox
+
+log = logging.getLogger(__name__)
+
+# Delivers one event.  True is sent; False (or raising) means it should be
+# retried; a Delivery can also say there was nothing to send, or that the
+# endpoint rejected it for good
+SendFn = Callable[[NotificationEvent], bool | Delivery]
+# Delivers several coalesced events in one call, with the same contract
+BatchSendFn = Callable[[list[NotificationEvent]], bool | Delivery]
+
+
+class _Channel:
+    """One channel's queue, its worker threads and its counters."""
+
+    def __init__(
+        self,
+        name: str,
+        send: SendFn,
+        queue_size: int,
+        concurrency: int,
+        max_retries: int,
+        backoff_seconds: float,
+        max_backoff_seconds: float,
+        send_batch: BatchSendFn | None,
+        batch_window: float,
+        batch_max: int,
+        durable: bool,
+        max_replays: int,
+    ) -> None:
+        self.name = name
+        self.send = send
+        self.send_batch = send_batch
+        # With no window (or batch sender) every event goes out on its own
+        self.batch_window = max(0.0, batch_window) if send_batch else 0.0
+        self.batch_max = max(1, batch_max) if self.batch_window else 1
+        # When the oldest event still queued arrived (time.monotonic())
+        self.first_queued = 0.0
+        # Failed sends go to the outbox and are replayed by one thread
+        self.durable = durable
+        self.replaying = False
+        # Attempts at one outbox record before it is dropped (0 = no limit)
+        self.max_replays = max(0, max_replays)
+        # Held from taking a batch until it is known whether it goes to the
+        # outbox, so workers append in the order they dequeued
+        self.order_lock = threading.Lock()
+        # deque(maxlen) drops the oldest event when a new one arrives
+        self.queue: deque[NotificationEvent] = deque(maxlen=max(1, queue_size))
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff = max(0.0, backoff_seconds)
+        self.max_backoff = max(self.backoff, max_backoff_seconds)
+        self.workers: list[threading.Thread] = []
+        self.busy = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry number *attempt* (1-based)."""
+        return min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+
+
+class NotificationDispatcher:
+    """Delivers notifications to slow channels off the UI thread.
+
+    Each channel (desktop, audio, Slack, webhook) has its own bounded queue
+    and up to ``concurrency`` worker threads, so a webhook stuck on a
+    timeout doesn't hold up desktop notifications.  :meth:`submit` never
+    blocks: when a channel's queue is full its oldest event is dropped.
+    Failed sends are retried with exponential backoff, and a stuck channel
+    only ever ties up its own workers.
+
+    A channel added with ``send_batch`` coalesces: events wait up to
+    ``batch_window`` seconds, or until ``batch_max`` are queued, and then go
+    out together in one call.  A CRITICAL event ends the wait at once and
+    takes whatever is queued along with it.
+
+    With an :class:`Outbox`, events a ``durable`` channel fails to deliver
+    (or still has queued at close) are written to disk instead of being
+    dropped, and a replay thread resends them in order, backing off while
+    the endpoint stays down.  New events queue up behind that backlog.  A
+    send the endpoint rejects outright (:attr:`Delivery.REJECTED`) is never
+    retried or kept, and a record still failing after ``max_replays``
+    attempts is dropped, so one bad record can't hold up the rest.
+    """
+
+    def __init__(self, queue_size: int = 100, outbox: Outbox | None = None) -> None:
+        self._queue_size = queue_size
+        self._outbox = outbox
+        self._channels: dict[str, _Channel] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        # flush() calls waiting; batch windows are cut short meanwhile
+        self._flushing = 0
+
+    def add_channel(
+        self,
+        name: str,
+        send: SendFn,
+        *,
+        concurrency: int = 1,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+        send_batch: BatchSendFn | None = None,
+        batch_window: float = 0.0,
+        batch_max: int = 50,
+        durable: bool = False,
+        max_replays: int = 100,
+    ) -> None:
+        channel = _Channel(
+            name,
+            send,
+            self._queue_size,
+            concurrency,
+            max_retries,
+            backoff_seconds,
+            max_backoff_seconds,
+            send_batch,
+            batch_window,
+            batch_max,
+            durable and self._outbox is not None,
+            max_replays,
+        )
+        self._channels[name] = channel
+        # Pick up what a previous run left undelivered
+        with self._cond:
+            self._start_replay(channel)
+
+    def submit(self, name: str, event: NotificationEvent) -> None:
+        """Queue *event* for channel *name*; returns immediately."""
+        channel = self._channels[name]
+        with self._cond:
+            if self._closed:
+                return
+            if len(channel.queue) == channel.queue.maxlen:
+                channel.dropped += 1
+                if channel.dropped == 1 or channel.dropped % 100 == 0:
+                    log.warning(
+                        "Notification queue for %s full, dropped %d oldest events",
+                        name,
+                        channel.dropped,
+                    )
+            if not channel.queue:
+                channel.first_queued = time.monotonic()
+            channel.queue.append(event)
+            # Workers start on first use and stay for the app's lifetime
+            idle = len(channel.workers) - channel.busy
+            if len(channel.workers) < channel.concurrency and len(channel.queue) > idle:
+                worker = threading.Thread(
+                    target=self._work,
+                    args=(channel,),
+                    name=f"notify-{name}-{len(channel.workers)}",
+                    daemon=True,
+                )
+                channel.workers.append(worker)
+                worker.start()
+            self._cond.notify_all()
+
+    def stats(self, name: str) -> dict[str, int]:
+        channel = self._channels[name]
+        with self._cond:
+            return {
+                "queued": len(channel.queue),
+                "delivered": channel.delivered,
+                "failed": channel.failed,
+                "dropped": channel.dropped,
+            }
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queue is empty and no send is in flight.
+
+        Events held back for a batch are sent straight away.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while any(c.queue or c.busy for c in self._channels.values()):
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flushing -= 1
+        return True
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Give queued events up to *timeout* seconds, then stop the workers.
+
+        Events still queued after that are discarded, or kept in the outbox
+        for durable channels; workers are daemon threads, so one blocked in
+        a send doesn't hold up exit.
+        """
+        self.flush(timeout)
+        leftover: list[tuple[_Channel, list[NotificationEvent]]] = []
+        with self._cond:
+            self._closed = True
+            for channel in self._channels.values():
+                if channel.durable and channel.queue:
+                    leftover.append((channel, list(channel.queue)))
+                channel.queue.clear()
+            self._cond.notify_all()
+        for channel, events in leftover:
+            # Records the size a worker would have sent, so a replay never
+            # batches a channel that doesn't (batch_max is 1 without a window)
+            for start in range(0, len(events), channel.batch_max):
+                self._defer(channel, events[start : start + channel.batch_max])
+
+    def _work(self, channel: _Channel) -> None:
+        while True:
+            sent = deferred = False
+            with channel.order_lock:
+                with self._cond:
+                    while not self._closed:
+                        if not channel.queue:
+                            self._cond.wait()
+                            continue
+                        wait = self._batch_wait(channel)
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    if self._closed:
+                        return
+                    count = min(len(channel.queue), channel.batch_max)
+                    batch = [channel.queue.popleft() for _ in range(count)]
+                    channel.busy += 1
+                # Sending ahead of an outbox backlog would reorder events
+                backlogged = channel.durable and self._backlogged(channel)
+                if backlogged:
+                    deferred = self._defer(channel, batch)
+            try:
+                if not backlogged:
+                    outcome = self._deliver(channel, batch)
+                    sent = outcome in (Delivery.SENT, Delivery.SKIPPED)
+                    if outcome is Delivery.RETRY and channel.durable:
+                        deferred = self._defer(channel, batch)
+            finally:
+                with self._cond:
+                    channel.busy -= 1
+                    if sent:
+                        channel.delivered += len(batch)
+                    elif not deferred:
+                        channel.failed += len(batch)
+                    self._cond.notify_all()
+
+    def _backlogged(self, channel: _Channel) -> bool:
+        return self._outbox is not None and self._outbox.pending(channel.name) > 0
+
+    def _defer(self, channel: _Channel, batch: list[NotificationEvent]) -> bool:
+        """Write *batch* to the outbox and make sure it gets replayed."""
+        if self._outbox is None or not self._outbox.append(channel.name, batch):
+            return False
+        with self._cond:
+            self._start_replay(channel)
+        return True
+
+    def _start_replay(self, channel: _Channel) -> None:
+        # Called with self._cond held
+        if (
+            not channel.durable
+            or channel.replaying
+            or self._closed
+            or not self._backlogged(channel)
+        ):
+            return
+        channel.replaying = True
+        threading.Thread(
+            target=self._replay,
+            args=(channel,),
+            name=f"notify-{channel.name}-replay",
+            daemon=True,
+        ).start()
+
+    def _replay(self, channel: _Channel) -> None:
+        """Resend the outbox backlog oldest first until it is empty."""
+        assert self._outbox is not None
+        attempt = 0
+        while True:
+            with self._cond:
+                if self._closed or not self._backlogged(channel):
+                    channel.replaying = False
+                    return
+            batch = None
+            try:
+                batch = self._outbox.peek(channel.name)
+                if batch is None:
+                    continue
+                outcome = self._send(channel, batch) if batch else Delivery.SKIPPED
+            except Exception:
+                log.debug("%s outbox replay raised", channel.name, exc_info=True)
+                outcome = Delivery.RETRY
+            if outcome is Delivery.RETRY:
+                attempt += 1
+                if batch is not None and 0 < channel.max_replays <= attempt:
+                    log.warning(
+                        "Dropping %d %s events from the outbox after %d attempts",
+                        len(batch),
+                        channel.name,
+                        attempt,
+                    )
+                    outcome = Delivery.REJECTED
+            elif outcome is Delivery.REJECTED and batch:
+                log.warning(
+                    "%s rejected %d events from the outbox, dropping them",
+                    channel.name,
+                    len(batch),
+                )
+            if outcome is not Delivery.RETRY and batch is not None:
+                try:
+                    self._outbox.pop(channel.name)
+                except Exception:
+                    # Backs off below and tries the record again
+                    log.debug("%s outbox pop raised", channel.name, exc_info=True)
+                else:
+                    attempt = 0
+                    with self._cond:
+                        if outcome is Delivery.REJECTED:
+                            channel.failed += len(batch)
+                        else:
+                            channel.delivered += len(batch)
+                        self._cond.notify_all()
+                    continue
+            if attempt == 1:
+                log.info(
+                    "%s unreachable, keeping notifications in outbox", channel.name
+                )
+            # Never spin, even with backoff_seconds = 0
+            delay = max(0.05, channel.delay(attempt))
+            with self._cond:
+                deadline = time.monotonic() + delay
+                while not self._closed and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+
+    def _batch_wait(self, channel: _Channel) -> float:
+        """Seconds the queued events should still wait for company."""
+        if (
+            channel.batch_window <= 0
+            or self._flushing
+            or len(channel.queue) >= channel.batch_max
+            or any(e.priority is Priority.CRITICAL for e in channel.queue)
+        ):
+            return 0.0
+        return channel.first_queued + channel.batch_window - time.monotonic()
+
+    def _deliver(self, channel: _Channel, batch: list[NotificationEvent]) -> Delivery:
+        attempt = 0
+        while True:
+            try:
+                outcome = self._send(channel, batch)
+            except Exception:
+                log.debug("%s notification raised", channel.name, exc_info=True)
+                outcome = Delivery.RETRY
+            if outcome is Delivery.REJECTED:
+                log.warning(
+                    "%s rejected notification for %s, not retrying",
+                    channel.name,
+                    _describe(batch),
+                )
+            if outcome is not Delivery.RETRY:
+                return outcome
+            attempt += 1
+            if attempt > channel.max_retries:
+                log.warning(
+                    "Giving up on %s notification for %s after %d attempts",
+                    channel.name,
+                    _describe(batch),
+                    attempt,
+                )
+                return Delivery.RETRY
+            with self._cond:
+                # Woken early by close(); other notify_all()s just re-check
+                deadline = time.monotonic() + channel.delay(attempt)
+                while not self._closed and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                if self._closed:
+                    return Delivery.RETRY
+
+    @staticmethod
+    def _send(channel: _Channel, batch: list[NotificationEvent]) -> Delivery:
+        if len(batch) > 1 and channel.batch_window > 0:
+            assert channel.send_batch is not None
+            return _outcome(channel.send_batch(batch))
+        if len(batch) == 1:
+            return _outcome(channel.send(batch[0]))
+        # An outbox record from before batching was turned off: the events go
+        # out one at a time, and a retry resends the whole record
+        outcomes = []
+        for event in batch:
+            outcome = _outcome(channel.send(event))
+            if outcome is Delivery.RETRY:
+                return outcome
+            outcomes.append(outcome)
+        if all(outcome is Delivery.REJECTED for outcome in outcomes):
+            return Delivery.REJECTED
+        return Delivery.SENT
+
+
+def _outcome(result: bool | Delivery) -> Delivery:
+    if isinstance(result, Delivery):
+        return result
+    return Delivery.SENT if result else Delivery.RETRY
+
+
+def _describe(batch: list[NotificationEvent]) -> str:
+    return batch[0].session_name if len(batch) == 1 else f"{len(batch)} events"
@@ -1,22 +1,21 @@
 from __future__ import annotations
 
 import logging
+import os
 from datetime import datetime, time
 from typing import Any, Callable
 
 from .audio import AudioNotifier
 from .desktop import DesktopNotifier
+from .dispatcher import NotificationDispatcher
 from .history import NotificationHistory
+from .http_pool import HTTPConnectionPool
 from .models import EVENT_PRIORITY, EventType, NotificationEvent, Priority
+from .outbox import Outbox
 from .slack import SlackNotifier
+from .throttle import NotificationThrottle
 from .webhook import WebhookNotifier
 
-# Seconds before the same (session, event_type) can fire again.
-_DEFAULT_COOLDOWN: dict[EventType, float] = {
-    EventType.ERROR: 60.0,
-    EventType.SESSION_IDLE: 120.0,
-}
-
 log = logging.getLogger(__name__)
 
 DEFAULT_ROUTING: dict[str, dict[str, bool]] = {
@@ -66,18 +65,30 @@ class NotificationEngine:
         )
 
         history_cfg = config.get("history", {})
+        history_path = str(history_cfg.get("path", ""))
         self._history = NotificationHistory(
-            max_size=history_cfg.get("max_size", 500),
+            max_size=int(history_cfg.get("max_size", 500)),
+            path=os.path.expanduser(history_path) if history_path else None,
+            retention_days=float(history_cfg.get("retention_days", 0)),
         )
 
         self._enabled: bool = config.get("enabled", True)
 
+        # One keep-alive pool for Slack and the webhook, so a burst of
+        # events reuses connections rather than handshaking for each
+        http_cfg = config.get("http", {})
+        self._http_pool = HTTPConnectionPool(
+            max_concurrent=int(http_cfg.get("max_concurrent", 4)),
+            idle_seconds=float(http_cfg.get("idle_seconds", 30.0)),
+        )
+
         slack_cfg = config.get("slack", {})
         self._slack = SlackNotifier(
             enabled=slack_cfg.get("enabled", False),
             webhook_url=slack_cfg.get("webhook_url", ""),
             verbosity=int(slack_cfg.get("verbosity", 10)),
             sessions=slack_cfg.get("sessions"),
+            pool=self._http_pool,
         )
 
         webhook_cfg = config.get("webhook", {})
@@ -86,6 +97,55 @@ class NotificationEngine:
             url=webhook_cfg.get("url", ""),
             headers=webhook_cfg.get("headers"),
             timeout=float(webhook_cfg.get("timeout", 5.0)),
+            pool=self._http_pool,
+        )
+
+        # Desktop, audio, Slack and webhook deliveries can block (fork,
+        # sound playback, HTTP timeouts), so they run on dispatcher workers
+        dispatch_cfg = config.get("dispatch", {})
+        # Slack and webhook events that can't be delivered wait on disk
+        outbox_cfg = config.get("outbox", {})
+        outbox_path = str(outbox_cfg.get("path", ""))
+        self._outbox: Outbox | None = None
+        if outbox_cfg.get("enabled", True) and outbox_path:
+            self._outbox = Outbox(
+                os.path.expanduser(outbox_path),
+                max_bytes=int(float(outbox_cfg.get("max_mb", 10)) * 1024 * 1024),
+            )
+        self._dispatcher = NotificationDispatcher(
+            queue_size=int(dispatch_cfg.get("queue_size", 100)),
+            outbox=self._outbox,
+        )
+        retries = int(dispatch_cfg.get("max_retries", 3))
+        backoff = float(dispatch_cfg.get("backoff_seconds", 1.0))
+        max_replays = int(dispatch_cfg.get("max_replay_attempts", 100))
+        # Retrying a desktop popup or a sound later would only confuse
+        self._dispatcher.add_channel("desktop", self._desktop.notify, max_retries=0)
+        self._dispatcher.add_channel("audio", self._audio.notify, max_retries=0)
+        self._dispatcher.add_channel(
+            "slack",
+            self._slack.send,
+            concurrency=int(slack_cfg.get("concurrency", 2)),
+            max_retries=retries,
+            backoff_seconds=backoff,
+            send_batch=self._slack.send_batch,
+            batch_window=float(slack_cfg.get("digest_seconds", 5.0)),
+            batch_max=int(slack_cfg.get("digest_max_events", 50)),
+            durable=self._slack.enabled,
+            max_replays=max_replays,
+        )
+        self._dispatcher.add_channel(
+            "webhook",
+            self._webhook.send,
+            concurrency=int(webhook_cfg.get("concurrency", 2)),
+            max_retries=retries,
+            backoff_seconds=backoff,
+            send_batch=self._webhook.send_batch,
+            # Off by default: batches change the body to NDJSON
+            batch_window=float(webhook_cfg.get("digest_seconds", 0.0)),
+            batch_max=int(webhook_cfg.get("digest_max_events", 50)),
+            durable=self._webhook.enabled,
+            max_replays=max_replays,
         )
 
         self._routing: dict[str, dict[str, bool]] = config.get(
@@ -100,8 +160,8 @@ class NotificationEngine:
         self.on_toast: Callable[[NotificationEvent], Any] | None = None
         self.on_sidebar_flash: Callable[[NotificationEvent], Any] | None = None
 
-        # Per-(session, event_type) cooldown to avoid notification spam.
-        self._last_fired: dict[tuple[str, EventType], float] = {}
+        # Cooldowns, cross-session dedup and per-channel rate limits
+        self._throttle = NotificationThrottle(config.get("throttle", {}))
 
     def dispatch(
         self,
@@ -130,41 +190,36 @@ class NotificationEngine:
             log.debug("DND active — suppressing notification channels")
             return event
 
-        # Per-(session, event_type) cooldown to suppress repeated noise.
-        cooldown = _DEFAULT_COOLDOWN.get(event_type, 0.0)
-        if cooldown > 0:
-            key = (session_id, event_type)
-            now = datetime.now().timestamp()
-            last = self._last_fired.get(key, 0.0)
-            if now - last < cooldown:
-                log.debug(
-                    "Suppressed %s for session %s (cooldown %.0fs)",
-                    event_type.value,
-                    session_id,
-                    cooldown,
-                )
-                return event
-            self._last_fired[key] = now
+        # Per-(session, event_type) cooldown and same-text dedup
+        if not self._throttle.allow(event):
+            return event
 
         routes = self._routing.get(event_type.value, {})
+        take = self._throttle.take
 
-        if routes.get("desktop", False):
-            self._desktop.notify(event)
+        if routes.get("desktop", False) and self._desktop.enabled and take("desktop"):
+            self._dispatcher.submit("desktop", event)
 
-        if routes.get("audio", False):
-            self._audio.notify(event)
+        if routes.get("audio", False) and self._audio.enabled and take("audio"):
+            self._dispatcher.submit("audio", event)
 
-        if routes.get("toast", False) and self.on_toast is not None:
+        if routes.get("toast", False) and self.on_toast is not None and take("toast"):
             self.on_toast(event)
 
-        if routes.get("sidebar_flash", False) and self.on_sidebar_flash is not None:
+        if (
+            routes.get("sidebar_flash", False)
+            and self.on_sidebar_flash is not None
+            and take("sidebar_flash")
+        ):
             self.on_sidebar_flash(event)
 
         # Slack has its own event/session filtering (not tied to routing table)
-        self._slack.notify(event)
+        if self._slack.accepts(event) and take("slack"):
+            self._dispatcher.submit("slack", event)
 
         # Webhook dispatch (independent of routing table)
-        self._webhook.notify(event)
+        if self._webhook.enabled and take("webhook"):
+            self._dispatcher.submit("webhook", event)
 
         return event
 
@@ -188,6 +243,18 @@ class NotificationEngine:
     def get_history(self) -> NotificationHistory:
         return self._history
 
+    def get_dispatcher(self) -> NotificationDispatcher:
+        return self._dispatcher
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Let queued deliveries finish for up to *timeout* seconds.
+
+        Also writes out queued history events.
+        """
+        self._dispatcher.close(timeout)
+        self._http_pool.close()
+        self._history.close()
+
 
 def _parse_time(value: str | None) -> time | None:
     if not value:
@@ -1,32 +1,331 @@
 from __future__ import annotations
 
-from collections import deque
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
 
-from .models import EventType, NotificationEvent
+from .models import EventType, NotificationEvent, Priority
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    session_name TEXT NOT NULL,
+    message TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    matched_text TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_session ON events (session_id, id);
+CREATE INDEX IF NOT EXISTS events_type ON events (event_type, id);
+"""
+
+# Queued events that wake the writer before its next tick
+_BATCH = 500
+
+# Longest a read waits for the writer before querying what's committed
+_READ_WAIT = 5.0
+
+_COLUMNS = (
+    "id, ts, event_type, session_id, session_name, message, priority, matched_text"
+)
+
+# Rows as read back: (id, ts, event_type, session_id, ...)
+_Row = tuple[int, float, str, str, str, str, str, str]
+
+
+def _to_event(row: _Row) -> NotificationEvent:
+    _id, ts, event_type, session_id, session_name, message, priority, matched = row
+    return NotificationEvent(
+        event_type=EventType(event_type),
+        session_id=session_id,
+        session_name=session_name,
+        message=message,
+        priority=Priority(priority),
+        timestamp=datetime.fromtimestamp(ts),
+        matched_text=matched,
+    )
 
 
 class NotificationHistory:
-    def __init__(self, max_size: int = 500) -> None:
-        self._events: deque[NotificationEvent] = deque(maxlen=max_size)
+    """Notification log kept in SQLite, newest *max_size* events at most.
+
+    With a *path* the database is a WAL-mode file that survives restarts;
+    without one it lives in memory.  :meth:`add` only queues the event, so
+    it's safe to call from the UI loop: a writer thread inserts queued
+    events in one transaction every *flush_seconds*, and a read waits for
+    it to write out whatever was queued before the read.  Session, type
+    and timestamp are indexed, and :meth:`page` walks results newest first
+    by id, so queries stay fast however much history there is.  Events
+    older than *retention_days* (0 = forever) are deleted as new ones are
+    written.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 500,
+        path: str | Path | None = None,
+        retention_days: float = 0,
+        flush_seconds: float = 1.0,
+    ) -> None:
+        self.max_size = max(1, max_size)
+        self._path = Path(path) if path else None
+        self._retention = max(0.0, retention_days) * 86400
+        self._flush_seconds = flush_seconds
+        # Guards the queue only; never held while SQLite is working
+        self._lock = threading.Lock()
+        self._pending: list[NotificationEvent] = []
+        # Events ever queued / ever written out (or dropped), to let reads
+        # wait for exactly the events queued before them
+        self._queued = 0
+        self._written = 0
+        self._caught_up = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._writer: threading.Thread | None = None
+        self._closed = False
+        # Guards the connection and _count; taken before _lock when both are
+        self._db_lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._count = 0
 
     def add(self, event: NotificationEvent) -> None:
-        self._events.append(event)
+        with self._lock:
+            if self._closed:
+                log.debug("History closed, not recording %s", event.event_type.value)
+                return
+            self._pending.append(event)
+            self._queued += 1
+            if len(self._pending) >= _BATCH:
+                self._wake.set()
+            start = self._writer is None
+            if start:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="notify-history", daemon=True
+                )
+        if start and self._writer is not None:
+            self._writer.start()
 
     def get_recent(self, n: int = 50) -> list[NotificationEvent]:
-        items = list(self._events)
-        return items[-n:]
+        events = self._query(
+            f"SELECT {_COLUMNS} FROM events ORDER BY id DESC LIMIT ?", (n,)
+        )
+        return events[::-1]
 
     def get_all(self) -> list[NotificationEvent]:
-        return list(self._events)
+        return self._query(f"SELECT {_COLUMNS} FROM events ORDER BY id")
 
     def get_by_session(self, session_id: str) -> list[NotificationEvent]:
-        return [e for e in self._events if e.session_id == session_id]
+        return self._query(
+            f"SELECT {_COLUMNS} FROM events WHERE session_id = ? ORDER BY id",
+            (session_id,),
+        )
 
     def get_by_type(self, event_type: EventType) -> list[NotificationEvent]:
-        return [e for e in self._events if e.event_type == event_type]
+        return self._query(
+            f"SELECT {_COLUMNS} FROM events WHERE event_type = ? ORDER BY id",
+            (event_type.value,),
+        )
+
+    def page(
+        self,
+        limit: int = 100,
+        before: int | None = None,
+        session_id: str | None = None,
+        event_type: EventType | None = None,
+    ) -> list[tuple[int, NotificationEvent]]:
+        """Up to *limit* ``(id, event)`` pairs, newest first.
+
+        Pass the last id of one page as *before* to get the next.
+        """
+        where, params = self._filters(session_id, event_type)
+        if before is not None:
+            where.append("id < ?")
+            params.append(before)
+        sql = f"SELECT {_COLUMNS} FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        rows = self._execute(sql, params)
+        return [(row[0], _to_event(row)) for row in rows]
+
+    def count(
+        self, session_id: str | None = None, event_type: EventType | None = None
+    ) -> int:
+        where, params = self._filters(session_id, event_type)
+        if where:
+            sql = "SELECT COUNT(*) FROM events WHERE " + " AND ".join(where)
+            return int(self._execute(sql, params)[0][0])
+        self._wait_for_writer()
+        with self._db_lock:
+            self._connect()
+            return self._count
 
     def clear(self) -> None:
-        self._events.clear()
+        with self._db_lock:
+            with self._lock:
+                self._written += len(self._pending)
+                self._pending.clear()
+                self._caught_up.notify_all()
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM events")
+            self._count = 0
+
+    def close(self) -> None:
+        """Write out queued events and close the database.
+
+        Events added after this are dropped.
+        """
+        with self._lock:
+            self._closed = True
+            writer = self._writer
+        self._wake.set()
+        if writer is not None and writer is not threading.current_thread():
+            writer.join()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     def __len__(self) -> int:
-        return len(self._events)
+        return self.count()
+
+    # -- internals --
+
+    @staticmethod
+    def _filters(
+        session_id: str | None, event_type: EventType | None
+    ) -> tuple[list[str], list[object]]:
+        where: list[str] = []
+        params: list[object] = []
+        if session_id is not None:
+            where.append("session_id = ?")
+            params.append(session_id)
+        if event_type is not None:
+            where.append("event_type = ?")
+            params.append(event_type.value)
+        return where, params
+
+    def _query(self, sql: str, params: tuple = ()) -> list[NotificationEvent]:
+        return [_to_event(row) for row in self._execute(sql, params)]
+
+    def _execute(self, sql: str, params) -> list[_Row]:
+        self._wait_for_writer()
+        with self._db_lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def _wait_for_writer(self) -> None:
+        """Block until events queued so far are written, or _READ_WAIT passes.
+
+        Returns at once when nothing is queued, the usual case for a read.
+        """
+        with self._lock:
+            target = self._queued
+            if self._written >= target:
+                return
+            self._wake.set()
+            if not self._caught_up.wait_for(
+                lambda: self._written >= target, timeout=_READ_WAIT
+            ):
+                log.debug("History writer is behind, reading what's committed")
+
+    def _connect(self) -> sqlite3.Connection:
+        """The open connection; called with _db_lock held."""
+        if self._conn is None:
+            # Opened on first use so startup never waits on the disk
+            conn = None
+            if self._path is not None:
+                try:
+                    self._path.parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(str(self._path), check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.executescript(_SCHEMA)
+                except (OSError, sqlite3.Error):
+                    log.warning(
+                        "Could not open %s, keeping history in memory",
+                        self._path,
+                        exc_info=True,
+                    )
+                    conn = None
+            if conn is None:
+                conn = sqlite3.connect(":memory:", check_same_thread=False)
+                conn.executescript(_SCHEMA)
+            self._count = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            self._conn = conn
+            with conn:
+                self._prune(conn)
+        return self._conn
+
+    def _flush(self) -> None:
+        """Write out the queue; runs on the writer thread."""
+        with self._db_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if batch:
+                self._insert(batch)
+        with self._lock:
+            self._written += len(batch)
+            self._caught_up.notify_all()
+
+    def _insert(self, batch: list[NotificationEvent]) -> None:
+        """Insert *batch* and prune; called with _db_lock held."""
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO events (ts, event_type, session_id, session_name,"
+                    " message, priority, matched_text) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            e.timestamp.timestamp(),
+                            e.event_type.value,
+                            e.session_id,
+                            e.session_name,
+                            e.message,
+                            e.priority.value,
+                            e.matched_text,
+                        )
+                        for e in batch
+                    ],
+                )
+                self._count += len(batch)
+                self._prune(conn)
+        except sqlite3.Error:
+            log.warning("Could not write %d history events", len(batch), exc_info=True)
+            if self._conn is not None:
+                row = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()
+                self._count = row[0]
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        if self._retention:
+            cutoff = time.time() - self._retention
+            cur = conn.execute("DELETE FROM events WHERE ts < ?", (cutoff,))
+            self._count -= max(0, cur.rowcount)
+        excess = self._count - self.max_size
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM events WHERE id IN"
+                " (SELECT id FROM events ORDER BY id LIMIT ?)",
+                (excess,),
+            )
+            self._count = self.max_size
+
+    def _write_loop(self) -> None:
+        while True:
+            self._wake.wait(self._flush_seconds)
+            self._wake.clear()
+            # Checked before writing: add() refuses events once closed, so
+            # this last pass gets everything
+            closing = self._closed
+            self._flush()
+            if closing:
+                return
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import http.client
+import logging
+import threading
+import time
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+
+from .models import Delivery
+
+log = logging.getLogger(__name__)
+
+# What a keep-alive connection the server has since closed fails with
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+@dataclass(frozen=True)
+class _Endpoint:
+    scheme: str
+    host: str
+    port: int
+    # (host, port) of the proxy to go through, if any
+    proxy: tuple[str, int] | None = None
+
+
+@dataclass
+class HTTPResponse:
+    status: int
+    body: bytes
+
+    @property
+    def delivery(self) -> Delivery:
+        """2xx is sent; 408, 429 and 5xx are worth retrying, other 4xx aren't."""
+        if 200 <= self.status < 300:
+            return Delivery.SENT
+        if 400 <= self.status < 500 and self.status not in (408, 429):
+            return Delivery.REJECTED
+        return Delivery.RETRY
+
+
+class HTTPConnectionPool:
+    """Keep-alive HTTP(S) connections shared by the Slack and webhook channels.
+
+    Each request borrows an idle connection to the same scheme/host/port
+    (opening one if there is none), so a burst of notifications costs one
+    TCP and TLS handshake instead of one per event.  Connections idle for
+    more than *idle_seconds* are closed instead of reused, and at most
+    *max_concurrent* requests are in flight at once across all hosts.
+    ``http_proxy``/``https_proxy`` are honoured as ``urllib`` did.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        idle_seconds: float = 30.0,
+        max_idle_per_host: int = 4,
+    ) -> None:
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._idle_seconds = idle_seconds
+        self._max_idle_per_host = max(1, max_idle_per_host)
+        self._lock = threading.Lock()
+        # Most recently used last, with the time each was returned
+        self._idle: dict[_Endpoint, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def post(
+        self,
+        url: str,
+        body: bytes,
+        headers: dict[str, str] | None = None,
+        timeout: float = 10.0,
+    ) -> HTTPResponse:
+        """POST *body* to *url*; raises ``OSError`` or ``HTTPException``.
+
+        A reused connection the server has quietly closed is retried once
+        on a fresh one.
+        """
+        endpoint, target = self._resolve(url)
+        with self._slots:
+            conn, reused = self._checkout(endpoint, timeout)
+            try:
+                return self._send(endpoint, conn, target, body, headers, timeout)
+            except _STALE_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+            conn = self._connect(endpoint, timeout)
+            try:
+                return self._send(endpoint, conn, target, body, headers, timeout)
+            except BaseException:
+                conn.close()
+                raise
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(conns) for conns in self._idle.values())
+
+    def _send(
+        self,
+        endpoint: _Endpoint,
+        conn: http.client.HTTPConnection,
+        target: str,
+        body: bytes,
+        headers: dict[str, str] | None,
+        timeout: float,
+    ) -> HTTPResponse:
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.request("POST", target, body=body, headers=headers or {})
+        resp = conn.getresponse()
+        # The body must be drained before the connection can carry another
+        data = resp.read()
+        with self._lock:
+            self.requests_sent += 1
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(endpoint, conn)
+        return HTTPResponse(resp.status, data)
+
+    @staticmethod
+    def _resolve(url: str) -> tuple[_Endpoint, str]:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL {url!r}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        proxy = None
+        proxy_url = urllib.request.getproxies().get(parts.scheme)
+        if proxy_url and not urllib.request.proxy_bypass(parts.hostname):
+            proxy_parts = urllib.parse.urlsplit(proxy_url)
+            if proxy_parts.hostname:
+                proxy = (proxy_parts.hostname, proxy_parts.port or 80)
+                if parts.scheme == "http":
+                    # Plain HTTP proxies take the absolute URL
+                    target = urllib.parse.urlunsplit(parts._replace(fragment=""))
+        return _Endpoint(parts.scheme, parts.hostname, port, proxy), target
+
+    def _checkout(
+        self, endpoint: _Endpoint, timeout: float
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        found = None
+        with self._lock:
+            conns = self._idle.pop(endpoint, [])
+            live = [(c, t) for c, t in conns if now - t <= self._idle_seconds]
+            expired = [c for c, t in conns if now - t > self._idle_seconds]
+            if live:
+                found = live.pop()[0]
+            if live:
+                self._idle[endpoint] = live
+        for conn in expired:
+            conn.close()
+        if found is not None:
+            return found, True
+        return self._connect(endpoint, timeout), False
+
+    def _checkin(self, endpoint: _Endpoint, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            conns = self._idle.setdefault(endpoint, [])
+            conns.append((conn, time.monotonic()))
+            surplus = conns[: -self._max_idle_per_host]
+            del conns[: -self._max_idle_per_host]
+        for old, _ in surplus:
+            old.close()
+
+    def _connect(
+        self, endpoint: _Endpoint, timeout: float
+    ) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        host, port = endpoint.proxy or (endpoint.host, endpoint.port)
+        conn: http.client.HTTPConnection
+        if endpoint.scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+            if endpoint.proxy is not None:
+                conn.set_tunnel(endpoint.host, endpoint.port)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        log.debug("Opening connection to %s://%s:%d", endpoint.scheme, host, port)
+        return conn
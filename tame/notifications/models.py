@@ -12,6 +12,18 @@ class EventType(Enum):
     SESSION_IDLE = "session_idle"
 
 
+class Delivery(Enum):
+    """How a send went, so the dispatcher knows whether to try again."""
+
+    SENT = "sent"
+    # Nothing left to send once the channel's own filters ran
+    SKIPPED = "skipped"
+    # Worth another attempt: timeouts, connection errors, 5xx, 408, 429
+    RETRY = "retry"
+    # Retrying can't help: other 4xx, a payload that can't be encoded
+    REJECTED = "rejected"
+
+
 class Priority(Enum):
     LOW = "low"
     MEDIUM = "medium"
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .models import EventType, NotificationEvent, Priority
+
+log = logging.getLogger(__name__)
+
+# Delivered bytes at the head of a log before it is worth rewriting
+_COMPACT_BYTES = 64 * 1024
+_COPY_CHUNK = 64 * 1024
+
+
+def _encode(events: list[NotificationEvent]) -> bytes:
+    record = [
+        {
+            "event_type": e.event_type.value,
+            "session_id": e.session_id,
+            "session_name": e.session_name,
+            "message": e.message,
+            "priority": e.priority.value,
+            "timestamp": e.timestamp.isoformat(),
+            "matched_text": e.matched_text,
+        }
+        for e in events
+    ]
+    return json.dumps(record).encode("utf-8") + b"\n"
+
+
+def _decode(line: bytes) -> list[NotificationEvent]:
+    record: list[dict[str, Any]] = json.loads(line)
+    return [
+        NotificationEvent(
+            event_type=EventType(d["event_type"]),
+            session_id=d["session_id"],
+            session_name=d["session_name"],
+            message=d["message"],
+            priority=Priority(d["priority"]),
+            timestamp=datetime.fromisoformat(d["timestamp"]),
+            matched_text=d.get("matched_text", ""),
+        )
+        for d in record
+    ]
+
+
+class _Log:
+    """One channel's outbox file and the cursor into it."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.cursor_path = path.with_suffix(".offset")
+        self.lock = threading.Lock()
+        self.offset = 0
+        self.size = 0
+        self.records = 0
+        try:
+            self._load()
+        except OSError:
+            log.warning("Could not read outbox %s", path, exc_info=True)
+
+    def _load(self) -> None:
+        try:
+            self.size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        try:
+            self.offset = int(self.cursor_path.read_text().strip() or 0)
+        except (OSError, ValueError):
+            self.offset = 0
+        if not 0 <= self.offset <= self.size:
+            self.offset = 0
+        with open(self.path, "r+b") as f:
+            # A crash mid-append leaves a partial last line; drop it so the
+            # next record doesn't run into it
+            end = self.size
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    f.seek(0)
+                    end = 0
+                    for line in f:
+                        if line.endswith(b"\n"):
+                            end += len(line)
+                    f.truncate(end)
+                    self.size = end
+            # Counted a line at a time, however large the backlog
+            f.seek(self.offset)
+            self.records = sum(1 for _ in f)
+
+    def save_cursor(self) -> None:
+        tmp = self.cursor_path.with_suffix(".offset.tmp")
+        tmp.write_text(str(self.offset))
+        os.replace(tmp, self.cursor_path)
+
+
+class Outbox:
+    """Append-only, on-disk backlog of undelivered notifications.
+
+    Each channel gets ``<directory>/<channel>.outbox``: one JSON line per
+    record (a single event or a coalesced batch), appended with an fsync,
+    plus a ``.offset`` file holding the byte offset of the oldest record
+    not yet delivered.  Only that offset, the file size and a record count
+    are kept in memory, so a backlog of any size costs the same RAM.
+    Delivered records are compacted away once they make up most of the file.
+
+    Delivery is at-least-once: a crash between sending a record and saving
+    the cursor sends it again on the next start.
+    """
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int = 10 * 1024 * 1024
+    ) -> None:
+        self._dir = Path(directory)
+        self._max_bytes = max_bytes
+        self._logs: dict[str, _Log] = {}
+        self._lock = threading.Lock()
+
+    def append(self, channel: str, events: list[NotificationEvent]) -> bool:
+        """Persist *events* as one record; False if the outbox is full."""
+        data = _encode(events)
+        entry = self._log(channel)
+        with entry.lock:
+            if entry.size - entry.offset + len(data) > self._max_bytes:
+                log.warning(
+                    "Outbox for %s is full (%d bytes), dropping %d events",
+                    channel,
+                    self._max_bytes,
+                    len(events),
+                )
+                return False
+            try:
+                self._dir.mkdir(parents=True, exist_ok=True)
+                with open(entry.path, "ab") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                log.warning("Could not write outbox %s", entry.path, exc_info=True)
+                return False
+            entry.size += len(data)
+            entry.records += 1
+        return True
+
+    def pending(self, channel: str) -> int:
+        """Records waiting for *channel*."""
+        entry = self._log(channel)
+        with entry.lock:
+            return entry.records
+
+    def peek(self, channel: str) -> list[NotificationEvent] | None:
+        """The oldest undelivered record, or None when there is none.
+
+        Records that can't be decoded are skipped.
+        """
+        entry = self._log(channel)
+        with entry.lock:
+            while entry.records:
+                with open(entry.path, "rb") as f:
+                    f.seek(entry.offset)
+                    line = f.readline()
+                try:
+                    return _decode(line)
+                except (ValueError, KeyError, TypeError):
+                    log.warning("Skipping corrupt record in %s", entry.path)
+                    self._advance(entry, len(line))
+        return None
+
+    def pop(self, channel: str) -> None:
+        """Mark the oldest record delivered."""
+        entry = self._log(channel)
+        with entry.lock:
+            if not entry.records:
+                return
+            with open(entry.path, "rb") as f:
+                f.seek(entry.offset)
+                length = len(f.readline())
+            self._advance(entry, length)
+
+    def _advance(self, entry: _Log, length: int) -> None:
+        entry.offset += length
+        entry.records -= 1
+        if entry.offset >= entry.size:
+            # Everything delivered: start the file over
+            with open(entry.path, "wb"):
+                pass
+            entry.offset = entry.size = 0
+        elif entry.offset >= _COMPACT_BYTES and entry.offset * 2 >= entry.size:
+            self._compact(entry)
+        entry.save_cursor()
+
+    @staticmethod
+    def _compact(entry: _Log) -> None:
+        """Rewrite the file without its delivered head, a chunk at a time."""
+        tmp = entry.path.with_suffix(".outbox.tmp")
+        old_offset = entry.offset
+        try:
+            with open(entry.path, "rb") as src, open(tmp, "wb") as dst:
+                src.seek(old_offset)
+                while chunk := src.read(_COPY_CHUNK):
+                    dst.write(chunk)
+                dst.flush()
+                os.fsync(dst.fileno())
+            # Cursor first: a crash in between re-sends, never skips
+            entry.offset = 0
+            entry.save_cursor()
+            os.replace(tmp, entry.path)
+        except OSError:
+            log.warning("Could not compact outbox %s", entry.path, exc_info=True)
+            entry.offset = old_offset
+            return
+        entry.size -= old_offset
+
+    def _log(self, channel: str) -> _Log:
+        with self._lock:
+            entry = self._logs.get(channel)
+            if entry is None:
+                entry = _Log(self._dir / f"{channel}.outbox")
+                self._logs[channel] = entry
+            return entry
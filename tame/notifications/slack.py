@@ -2,11 +2,10 @@ from __future__ import annotations
 
 import json
 import logging
-import urllib.request
-from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from .models import EVENT_VERBOSITY, EventType, NotificationEvent
+from .http_pool import HTTPConnectionPool
+from .models import EVENT_VERBOSITY, Delivery, EventType, NotificationEvent
 
 log = logging.getLogger(__name__)
 
@@ -25,6 +24,9 @@ _EMOJI: dict[EventType, str] = {
     EventType.SESSION_IDLE: ":zzz:",
 }
 
+# Lines listed per event type in a digest before "... and N more"
+_DIGEST_LINES = 10
+
 
 class SlackNotifier:
     """Send notifications to Slack via Incoming Webhook.
@@ -35,6 +37,8 @@ class SlackNotifier:
         verbosity: int — numeric level (0=off, 10=errors/input, 50=+completed, 100=all)
         sessions: list[str] — session name patterns to forward
             (empty = all sessions, glob-like matching)
+        digest_seconds / digest_max_events: coalescing window, applied by
+            the engine's dispatcher (see :meth:`notify_batch`)
     """
 
     def __init__(
@@ -43,27 +47,57 @@ class SlackNotifier:
         webhook_url: str = "",
         verbosity: int = 10,
         sessions: list[str] | None = None,
+        pool: HTTPConnectionPool | None = None,
     ) -> None:
         self._enabled = enabled and bool(webhook_url)
         self._webhook_url = webhook_url
         self._verbosity = verbosity
         # Which session names to send for (empty = all)
         self._allowed_sessions: set[str] = set(sessions) if sessions else set()
-        self._pool = ThreadPoolExecutor(max_workers=2)
+        self._pool = pool or HTTPConnectionPool()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
 
-    def notify(self, event: NotificationEvent) -> None:
+    def accepts(self, event: NotificationEvent) -> bool:
+        """Whether *event* passes the enabled, verbosity and session filters."""
         if not self._enabled:
-            return
+            return False
         # Verbosity filter
         event_level = EVENT_VERBOSITY.get(event.event_type, 100)
         if event_level > self._verbosity:
-            return
+            return False
         # Session name filter
-        if self._allowed_sessions and event.session_name not in self._allowed_sessions:
-            return
+        return (
+            not self._allowed_sessions or event.session_name in self._allowed_sessions
+        )
+
+    def notify(self, event: NotificationEvent) -> bool:
+        """Post *event* if it passes the filters; blocks, so call off the UI.
+
+        Returns True once Slack has accepted it.
+        """
+        return self.send(event) is Delivery.SENT
+
+    def notify_batch(self, events: list[NotificationEvent]) -> bool:
+        """Post the accepted *events* as one digest message."""
+        return self.send_batch(events) is Delivery.SENT
+
+    def send(self, event: NotificationEvent) -> Delivery:
+        """:meth:`notify`, saying whether a failure is worth retrying."""
+        if not self.accepts(event):
+            return Delivery.SKIPPED
+        return self._post(self._build_payload(event))
 
-        payload = self._build_payload(event)
-        self._pool.submit(self._post, payload)
+    def send_batch(self, events: list[NotificationEvent]) -> Delivery:
+        """:meth:`notify_batch`; SKIPPED when the filters leave nothing."""
+        events = [e for e in events if self.accepts(e)]
+        if not events:
+            return Delivery.SKIPPED
+        if len(events) == 1:
+            return self._post(self._build_payload(events[0]))
+        return self._post(self._build_digest(events))
 
     def _build_payload(self, event: NotificationEvent) -> dict[str, Any]:
         emoji = _EMOJI.get(event.event_type, ":bell:")
@@ -95,17 +129,46 @@ class SlackNotifier:
             ]
         }
 
-    def _post(self, payload: dict[str, Any]) -> None:
+    def _build_digest(self, events: list[NotificationEvent]) -> dict[str, Any]:
+        by_type: dict[EventType, list[NotificationEvent]] = {}
+        for event in events:
+            by_type.setdefault(event.event_type, []).append(event)
+        sessions = {e.session_id for e in events}
+        summary = f"TAME: {len(events)} events from {len(sessions)} sessions"
+        attachments = []
+        for event_type, group in by_type.items():
+            lines = [f"*{e.session_name}*: {e.message}" for e in group[:_DIGEST_LINES]]
+            if len(group) > _DIGEST_LINES:
+                lines.append(f"... and {len(group) - _DIGEST_LINES} more")
+            emoji = _EMOJI.get(event_type, ":bell:")
+            attachments.append(
+                {
+                    "fallback": f"TAME: {len(group)} x {event_type.value}",
+                    "color": _COLORS.get(event_type, "#439FE0"),
+                    "title": f"{emoji} TAME [{event_type.value}] x{len(group)}",
+                    "text": "\n".join(lines),
+                    "footer": "TAME Notification digest",
+                    "ts": int(group[-1].timestamp.timestamp()),
+                }
+            )
+        return {"text": summary, "attachments": attachments}
+
+    def _post(self, payload: dict[str, Any]) -> Delivery:
         try:
             data = json.dumps(payload).encode("utf-8")
-            req = urllib.request.Request(
+        except (TypeError, ValueError):
+            log.warning("Could not encode Slack payload", exc_info=True)
+            return Delivery.REJECTED
+        try:
+            resp = self._pool.post(
                 self._webhook_url,
-                data=data,
-                headers={"Content-Type": "application/json"},
-                method="POST",
+                data,
+                {"Content-Type": "application/json"},
+                timeout=10,
             )
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                if resp.status != 200:
-                    log.warning("Slack webhook returned %d", resp.status)
         except Exception:
             log.debug("Slack notification failed", exc_info=True)
+            return Delivery.RETRY
+        if resp.delivery is not Delivery.SENT:
+            log.warning("Slack webhook returned %d", resp.status)
+        return resp.delivery
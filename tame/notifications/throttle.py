@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from .models import EventType, NotificationEvent
+
+log = logging.getLogger(__name__)
+
+DEFAULT_COOLDOWNS: dict[EventType, float] = {
+    EventType.ERROR: 60.0,
+    EventType.SESSION_IDLE: 120.0,
+}
+
+# Digits are masked before hashing, so "retry in 23s" and "retry in 24s"
+# from two agents count as the same text
+_DIGITS = re.compile(r"\d+")
+_SPACE = re.compile(r"\s+")
+
+
+def text_fingerprint(text: str) -> str:
+    """Short hash of *text* with digits masked and whitespace collapsed."""
+    normalized = _SPACE.sub(" ", _DIGITS.sub("#", text)).strip().lower()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class TokenBucket:
+    """Allows *burst* events at once, refilled at *per_minute* tokens a minute."""
+
+    def __init__(self, per_minute: float, burst: int) -> None:
+        self.rate = max(0.0, per_minute) / 60.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._stamp: float | None = None
+
+    def take(self, now: float) -> bool:
+        if self._stamp is not None:
+            elapsed = max(0.0, now - self._stamp)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._stamp = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class ExpiringKeys:
+    """Last-seen times for keys, forgotten after *ttl* seconds.
+
+    Entries are kept oldest first, so expiry only looks at the front; past
+    *max_keys* the oldest are dropped early.  Memory stays bounded however
+    many sessions or distinct messages come through.
+    """
+
+    def __init__(self, ttl: float, max_keys: int = 4096) -> None:
+        self.ttl = ttl
+        self.max_keys = max(1, max_keys)
+        self._seen: OrderedDict[Hashable, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def hit(self, key: Hashable, now: float, window: float | None = None) -> bool:
+        """True if *key* was recorded within *window* (default ttl) seconds.
+
+        Otherwise records it at *now* and returns False.
+        """
+        if self.seen(key, now, window):
+            return True
+        self.record(key, now)
+        return False
+
+    def seen(self, key: Hashable, now: float, window: float | None = None) -> bool:
+        """True if *key* was recorded within *window* (default ttl) seconds."""
+        self._expire(now)
+        last = self._seen.get(key)
+        limit = self.ttl if window is None else window
+        return last is not None and now - last < limit
+
+    def record(self, key: Hashable, now: float) -> None:
+        self._expire(now)
+        self._seen[key] = now
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_keys:
+            self._seen.popitem(last=False)
+
+    def _expire(self, now: float) -> None:
+        while self._seen:
+            key, last = next(iter(self._seen.items()))
+            if now - last < self.ttl:
+                break
+            del self._seen[key]
+
+
+class NotificationThrottle:
+    """Decides which notifications are noise.
+
+    * ``cooldowns``: seconds before the same session can fire the same
+      event type again (``{"error": 60, "session_idle": 120}``).
+    * ``dedup_seconds``: an event whose matched text hashes the same as one
+      from any session in that window is dropped.
+    * ``rate_limits``: a token bucket per channel
+      (``{"slack": {"per_minute": 20, "burst": 10}}``); channels not listed
+      are unlimited.
+    """
+
+    def __init__(self, config: dict[str, Any] | None = None) -> None:
+        config = config or {}
+        self._cooldowns: dict[EventType, float] = dict(DEFAULT_COOLDOWNS)
+        cooldown_cfg = config.get("cooldowns", {})
+        if isinstance(cooldown_cfg, dict):
+            for name, seconds in cooldown_cfg.items():
+                try:
+                    self._cooldowns[EventType(name)] = max(0.0, float(seconds))
+                except (ValueError, TypeError):
+                    log.warning("Ignoring cooldown for unknown event %r", name)
+        self._dedup_seconds = max(0.0, float(config.get("dedup_seconds", 60.0)))
+        max_keys = int(config.get("max_keys", 4096))
+        ttl = max([self._dedup_seconds, *self._cooldowns.values()])
+        self._keys = ExpiringKeys(ttl, max_keys)
+        self._buckets: dict[str, TokenBucket] = {}
+        rate_cfg = config.get("rate_limits", {})
+        if isinstance(rate_cfg, dict):
+            for channel, limit in rate_cfg.items():
+                if not isinstance(limit, dict):
+                    continue
+                per_minute = float(limit.get("per_minute", 0))
+                if per_minute > 0:
+                    self._buckets[channel] = TokenBucket(
+                        per_minute, int(limit.get("burst", 1))
+                    )
+
+    def allow(self, event: NotificationEvent, now: float | None = None) -> bool:
+        """Whether *event* gets past its cooldown and the dedup window."""
+        now = time.monotonic() if now is None else now
+        cooldown = self._cooldowns.get(event.event_type, 0.0)
+        cooldown_key = ("cooldown", event.session_id, event.event_type)
+        if cooldown > 0 and self._keys.seen(cooldown_key, now, cooldown):
+            log.debug(
+                "Suppressed %s for session %s (cooldown %.0fs)",
+                event.event_type.value,
+                event.session_id,
+                cooldown,
+            )
+            return False
+        text_key = None
+        if self._dedup_seconds > 0 and event.matched_text:
+            text_key = ("text", event.event_type, text_fingerprint(event.matched_text))
+            if self._keys.seen(text_key, now, self._dedup_seconds):
+                log.debug(
+                    "Suppressed %s for session %s (same text as a recent event)",
+                    event.event_type.value,
+                    event.session_id,
+                )
+                return False
+        # Windows only start for events that actually go out, so a
+        # suppressed event never mutes the next, different one
+        if cooldown > 0:
+            self._keys.record(cooldown_key, now)
+        if text_key is not None:
+            self._keys.record(text_key, now)
+        return True
+
+    def take(self, channel: str, now: float | None = None) -> bool:
+        """Spend a token from *channel*'s bucket; False when it's empty."""
+        bucket = self._buckets.get(channel)
+        if bucket is None:
+            return True
+        return bucket.take(time.monotonic() if now is None else now)
+
+    def key_count(self) -> int:
+        return len(self._keys)
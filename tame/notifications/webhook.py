@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import json
 import logging
-import urllib.request
 from typing import Any
 
-from .models import NotificationEvent
+from .http_pool import HTTPConnectionPool
+from .models import Delivery, NotificationEvent
 
 log = logging.getLogger(__name__)
 
 
 class WebhookNotifier:
-    """Send notification events to a generic webhook URL as JSON POST."""
+    """Send notification events to a generic webhook URL as JSON POST.
+
+    Coalesced batches (:meth:`notify_batch`) go out as one NDJSON body,
+    one event object per line.
+    """
 
     def __init__(
         self,
@@ -19,44 +23,73 @@ class WebhookNotifier:
         url: str = "",
         headers: dict[str, str] | None = None,
         timeout: float = 5.0,
+        pool: HTTPConnectionPool | None = None,
     ) -> None:
         self._enabled = enabled
         self._url = url
         self._headers = headers or {}
         self._timeout = timeout
+        self._pool = pool or HTTPConnectionPool()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled and bool(self._url)
 
     def notify(self, event: NotificationEvent) -> bool:
         """Send a notification event to the webhook.
 
-        Returns True if the request was sent successfully.
+        Returns True if the request was sent successfully.  Blocks for up to
+        the timeout, so the engine calls it from a dispatcher worker.
         """
-        if not self._enabled or not self._url:
-            return False
-
-        payload: dict[str, Any] = {
-            "event_type": event.event_type.value,
-            "session_id": event.session_id,
-            "session_name": event.session_name,
-            "message": event.message,
-            "priority": event.priority.value,
-            "matched_text": event.matched_text,
-        }
+        return self.send(event) is Delivery.SENT
+
+    def notify_batch(self, events: list[NotificationEvent]) -> bool:
+        """Send *events* in one request as newline-delimited JSON."""
+        return self.send_batch(events) is Delivery.SENT
+
+    def send(self, event: NotificationEvent) -> Delivery:
+        """:meth:`notify`, saying whether a failure is worth retrying."""
+        if not self.enabled:
+            return Delivery.SKIPPED
+        try:
+            data = json.dumps(_payload(event)).encode("utf-8")
+        except (TypeError, ValueError):
+            log.warning("Could not encode webhook payload", exc_info=True)
+            return Delivery.REJECTED
+        return self._post(data, "application/json", event.event_type.value)
 
+    def send_batch(self, events: list[NotificationEvent]) -> Delivery:
+        """:meth:`notify_batch`, saying whether a failure is worth retrying."""
+        if not self.enabled or not events:
+            return Delivery.SKIPPED
         try:
-            data = json.dumps(payload).encode("utf-8")
-            headers = {
-                "Content-Type": "application/json",
-                **self._headers,
-            }
-            req = urllib.request.Request(
-                self._url,
-                data=data,
-                headers=headers,
-                method="POST",
-            )
-            urllib.request.urlopen(req, timeout=self._timeout)
-            log.debug("Webhook sent to %s for %s", self._url, event.event_type.value)
-            return True
+            lines = [json.dumps(_payload(e)) + "\n" for e in events]
+        except (TypeError, ValueError):
+            log.warning("Could not encode webhook payload", exc_info=True)
+            return Delivery.REJECTED
+        data = "".join(lines).encode("utf-8")
+        return self._post(data, "application/x-ndjson", f"{len(events)} events")
+
+    def _post(self, data: bytes, content_type: str, what: str) -> Delivery:
+        try:
+            headers = {"Content-Type": content_type, **self._headers}
+            resp = self._pool.post(self._url, data, headers, timeout=self._timeout)
         except Exception:
             log.warning("Failed to send webhook to %s", self._url, exc_info=True)
-            return False
+            return Delivery.RETRY
+        if resp.delivery is Delivery.SENT:
+            log.debug("Webhook sent to %s for %s", self._url, what)
+        else:
+            log.warning("Webhook %s returned %d", self._url, resp.status)
+        return resp.delivery
+
+
+def _payload(event: NotificationEvent) -> dict[str, Any]:
+    return {
+        "event_type": event.event_type.value,
+        "session_id": event.session_id,
+        "session_name": event.session_name,
+        "message": event.message,
+        "priority": event.priority.value,
+        "matched_text": event.matched_text,
+    }
@@ -1,21 +1,37 @@
 from __future__ import annotations
 
-from .state import AttentionState, ProcessState, SessionState
+from .state import AttentionState, OutputKind, ProcessState, SessionState
 from .output_buffer import OutputBuffer
 from .pattern_matcher import PatternMatch, PatternMatcher
 from .pty_process import PTYProcess
 from .session import Session, UsageInfo
 from .manager import SessionManager
+from .resource_class import ResourceClass
+from .resource_monitor import (
+    ProcSampler,
+    ResourceMonitor,
+    ResourceUsage,
+    create_resource_monitor,
+)
+from .tmux_control import TmuxCommandError, TmuxControlClient
 
 __all__ = [
     "AttentionState",
+    "OutputKind",
     "ProcessState",
     "SessionState",
     "OutputBuffer",
     "PatternMatch",
     "PatternMatcher",
+    "ProcSampler",
     "PTYProcess",
+    "ResourceClass",
+    "ResourceMonitor",
+    "ResourceUsage",
     "Session",
     "SessionManager",
+    "TmuxCommandError",
+    "TmuxControlClient",
     "UsageInfo",
+    "create_resource_monitor",
 ]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass, field
+
+from .session import Session
+from .state import ProcessState
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class PressureSample:
+    """System-wide pressure signals for one governor tick."""
+
+    load_per_cpu: float
+    # PSI "some avg10" for memory, in percent; None without /proc/pressure
+    memory_pressure: float | None = None
+
+
+def read_pressure(proc_root: str = "/proc") -> PressureSample:
+    """1-minute load average per CPU and memory PSI, where available."""
+    try:
+        load = os.getloadavg()[0]
+    except OSError:
+        load = 0.0
+    sample = PressureSample(load_per_cpu=load / (os.cpu_count() or 1))
+    try:
+        with open(f"{proc_root}/pressure/memory") as f:
+            for line in f:
+                if line.startswith("some "):
+                    fields = dict(
+                        part.split("=", 1) for part in line.split()[1:] if "=" in part
+                    )
+                    sample.memory_pressure = float(fields["avg10"])
+                    break
+    except (OSError, KeyError, ValueError):
+        pass  # kernel without PSI, or it's disabled
+    return sample
+
+
+@dataclass
+class GovernorDecision:
+    pause: list[str] = field(default_factory=list)
+    resume: list[str] = field(default_factory=list)
+    reason: str = ""
+
+
+class LoadGovernor:
+    """Decides when to stop and restart low-priority sessions under load.
+
+    Pressure starts when load per CPU or memory PSI crosses its ``high``
+    threshold and ends only once both are back under ``low``; resuming
+    additionally waits ``resume_delay_seconds`` after that.  While pressured
+    one low-priority session is stopped per tick, the busiest first; once
+    clear, one is resumed per tick, so the load comes back gradually.  Only
+    sessions the governor stopped itself are ever resumed.
+    """
+
+    def __init__(self, config: Mapping[str, object] | None = None) -> None:
+        cfg = dict(config or {})
+        self.enabled = bool(cfg.get("enabled", False))
+        self.low_priority_groups: frozenset[str] = frozenset(
+            str(g) for g in _as_list(cfg.get("low_priority_groups", ["batch"]))
+        )
+        self.load_high = _number(cfg, "load_per_cpu_high", 1.5)
+        self.load_low = _number(cfg, "load_per_cpu_low", 1.0)
+        self.memory_high = _number(cfg, "memory_pressure_high", 20.0)
+        self.memory_low = _number(cfg, "memory_pressure_low", 5.0)
+        self.min_session_cpu = _number(cfg, "min_session_cpu", 5.0)
+        self.resume_delay = _number(cfg, "resume_delay_seconds", 30.0)
+        self.pressured = False
+        self._cleared_at: float | None = None
+
+    def is_low_priority(self, session: Session) -> bool:
+        """Sessions in a low-priority group, or tagged ``priority = "low"``."""
+        return (
+            session.group in self.low_priority_groups
+            or session.metadata.get("priority") == "low"
+        )
+
+    def tick(
+        self,
+        sample: PressureSample,
+        sessions: Iterable[Session],
+        cpu: Mapping[str, float],
+        throttled: Collection[str],
+        now: float,
+    ) -> GovernorDecision:
+        """What to stop or resume, given this tick's signals.
+
+        *throttled* are the sessions the governor stopped earlier and that
+        are still stopped.
+        """
+        decision = GovernorDecision()
+        if not self.enabled:
+            # Switched off with sessions still stopped: let them all go
+            decision.resume = list(throttled)
+            return decision
+        self._update_pressure(sample, now)
+        if self.pressured:
+            candidates = [
+                s
+                for s in sessions
+                if s.process_state is ProcessState.RUNNING
+                and s.id not in throttled
+                and self.is_low_priority(s)
+                and cpu.get(s.id, 0.0) >= self.min_session_cpu
+            ]
+            if candidates:
+                busiest = max(candidates, key=lambda s: cpu.get(s.id, 0.0))
+                decision.pause.append(busiest.id)
+                decision.reason = self._describe(sample)
+        elif (
+            throttled
+            and self._cleared_at is not None
+            and now - self._cleared_at >= self.resume_delay
+        ):
+            decision.resume.append(next(iter(throttled)))
+        return decision
+
+    def _update_pressure(self, sample: PressureSample, now: float) -> None:
+        memory = sample.memory_pressure
+        if not self.pressured:
+            if sample.load_per_cpu > self.load_high or (
+                memory is not None and memory > self.memory_high
+            ):
+                self.pressured = True
+                self._cleared_at = None
+                log.info("Governor: under pressure (%s)", self._describe(sample))
+        elif sample.load_per_cpu < self.load_low and (
+            memory is None or memory < self.memory_low
+        ):
+            self.pressured = False
+            self._cleared_at = now
+            log.info("Governor: pressure cleared (%s)", self._describe(sample))
+
+    @staticmethod
+    def _describe(sample: PressureSample) -> str:
+        text = f"load {sample.load_per_cpu:.2f}/cpu"
+        if sample.memory_pressure is not None:
+            text += f", memory pressure {sample.memory_pressure:.1f}%"
+        return text
+
+
+def _number(cfg: Mapping[str, object], key: str, default: float) -> float:
+    value = cfg.get(key, default)
+    return float(value) if isinstance(value, (int, float)) else default
+
+
+def _as_list(value: object) -> list[object]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, Iterable):
+        return list(value)
+    return []
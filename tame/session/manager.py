@@ -5,7 +5,12 @@ import codecs
 import logging
 import os
 import re
+import signal
+import time
 import uuid
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Callable
 
@@ -14,9 +19,12 @@ from tame.config.defaults import get_default_patterns_flat, get_profile_patterns
 from .output_buffer import OutputBuffer
 from .pattern_matcher import PatternMatcher, PatternMatch
 from .pty_process import PTYProcess
+from .resource_class import ResourceClass
+from .resource_monitor import process_tree_pids
 from .session import Session
 from .state import (
     AttentionState,
+    OutputKind,
     PRIORITY_ATTENTION_STATES,
     PRIORITY_PROCESS_STATES,
     ProcessState,
@@ -48,15 +56,65 @@ _USAGE_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
     ),
 ]
 
+# Process states that hold one of the max_concurrent_sessions slots
+_SLOT_STATES: frozenset[ProcessState] = frozenset(
+    {ProcessState.STARTING, ProcessState.RUNNING}
+)
+
+
+@dataclass
+class _SpawnRequest:
+    """Everything needed to start a queued session once a slot frees up."""
+
+    shell: str
+    working_dir: str
+    command: list[str] | None
+    rows: int
+    cols: int
+    resource_class: ResourceClass | None = None
+    # Keystrokes typed while queued, written once the process starts
+    input: list[str] = field(default_factory=list)
+
+
 StatusChangeCallback = Callable[[str, SessionState, SessionState, str], None]
-OutputCallback = Callable[[str, str], None]  # session_id, text
+OutputCallback = Callable[[str, str, OutputKind], None]  # session_id, text, kind
 
 ANSI_ESCAPE_RE = re.compile(
     r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~]|\][^\x1B\x07]*(?:\x07|\x1B\\))"
 )
+REDRAW_CONTROL_RE = re.compile(r"\x1b\[[0-9;?]*(?:[ABCDHfJK])|\x1bc|\x0c|\r(?!\n)")
+# The alternatives of REDRAW_CONTROL_RE searched one at a time: each has a
+# literal prefix re can scan for, which the alternation defeats
+_CURSOR_CSI_RE = re.compile(r"\x1b\[[0-9;?]*[ABCDHfJK]")
+_BARE_CR_RE = re.compile(r"\r(?!\n)")
+
+
+def classify_output(text: str) -> OutputKind:
+    """Tell redraw chunks (cursor movement, clears, bare CR) from plain output.
+
+    Equivalent to ``REDRAW_CONTROL_RE.search(text)``, in a fraction of the time
+    on SGR-colored output.
+    """
+    if (
+        "\x0c" in text
+        or "\x1bc" in text
+        or _BARE_CR_RE.search(text) is not None
+        or ("\x1b[" in text and _CURSOR_CSI_RE.search(text) is not None)
+    ):
+        return OutputKind.REDRAW
+    return OutputKind.STREAM
 
 
 class SessionManager:
+    # Time per event-loop iteration spent on deferred background output
+    _BACKGROUND_SLICE_SECONDS: float = 0.004
+    # Past this much deferred output, slices ignore the budget until under it
+    _BACKGROUND_BACKLOG_MAX: int = 8 * 1024 * 1024
+    # Consecutive deferred reads of a session are handled together, up to this
+    _BACKGROUND_BATCH_BYTES: int = 65536
+    # Slot releases averaged for queued sessions' estimated start times
+    _ETA_WINDOW: int = 10
+
     def __init__(
         self,
         on_status_change: StatusChangeCallback | None = None,
@@ -65,11 +123,33 @@ class SessionManager:
         idle_threshold_seconds: float = 300.0,
         idle_prompt_timeout: float = 3.0,
         state_debounce_ms: float = 500.0,
+        max_concurrent_sessions: int = 0,
+        resource_classes: Mapping[str, ResourceClass] | None = None,
     ) -> None:
         self._sessions: dict[str, Session] = {}
+        self._resource_classes: dict[str, ResourceClass] = dict(resource_classes or {})
+        # Admission control: with a limit set, sessions created while that
+        # many are running wait here (in start order) as PENDING
+        self._max_concurrent: int = max(0, max_concurrent_sessions)
+        self._pending: dict[str, _SpawnRequest] = {}
+        self._hold_admissions: bool = False
+        # Sessions stopped by the load governor, with the pids it stopped.
+        # They keep their admission slot: throttling isn't making room.
+        self._throttled: dict[str, list[int]] = {}
+        # When running sessions last gave up their slot, for start estimates
+        self._slot_releases: deque[float] = deque(maxlen=self._ETA_WINDOW)
         self._scan_partials: dict[str, str] = {}
         self._on_status_change = on_status_change
         self._on_output = on_output
+        # Session whose output is on screen; only its chunks are classified,
+        # everything else is reported as OutputKind.BACKGROUND
+        self._focused_session_id: str | None = None
+        # Priority lane: with a loop attached, only the focused session's
+        # output is handled as it is read.  Other sessions' raw reads queue
+        # here and are decoded/scanned in budgeted slices between loop turns.
+        self._deferred: dict[str, deque[bytes]] = {}
+        self._deferred_bytes: int = 0
+        self._drain_handle: asyncio.TimerHandle | None = None
         base = get_default_patterns_flat()
         if patterns:
             base.update({cat: list(rxs) for cat, rxs in patterns.items()})
@@ -100,14 +180,32 @@ class SessionManager:
         rows: int = 24,
         cols: int = 80,
         profile: str = "",
+        queue_if_full: bool = True,
+        resource_class: str = "",
     ) -> Session:
+        """Create a session, starting its process unless admission is full.
+
+        With ``max_concurrent_sessions`` reached the session is returned
+        PENDING and started when a running session exits or pauses.  Pass
+        *queue_if_full* False for processes that already exist elsewhere
+        (re-attaching to tmux); they count against the limit but never wait.
+        The named *resource_class* is applied to the process as it starts.
+        """
         shell = shell or os.environ.get("SHELL", "/bin/bash")
         session_id = uuid.uuid4().hex
-
-        pty_proc = PTYProcess()
-        pty_proc.start(
-            shell=shell, cwd=working_dir, command=command, rows=rows, cols=cols
+        if resource_class and resource_class not in self._resource_classes:
+            log.warning("Unknown resource class %r, ignoring", resource_class)
+            resource_class = ""
+        request = _SpawnRequest(
+            shell,
+            working_dir,
+            command,
+            rows,
+            cols,
+            self._resource_classes.get(resource_class),
         )
+        queued = queue_if_full and (bool(self._pending) or not self._has_free_slot())
+        pty_proc = None if queued else self._spawn(request)
 
         # Merge base patterns with profile-specific patterns
         session_patterns = dict(self._patterns)
@@ -122,39 +220,71 @@ class SessionManager:
             id=session_id,
             name=name,
             working_dir=working_dir,
-            process_state=ProcessState.RUNNING,
+            process_state=ProcessState.PENDING if queued else ProcessState.RUNNING,
             attention_state=AttentionState.NONE,
             created_at=now,
             last_activity=now,
             output_buffer=OutputBuffer(),
             pattern_matcher=PatternMatcher(session_patterns),
-            pid=pty_proc.pid,
+            pid=pty_proc.pid if pty_proc else None,
             pty_process=pty_proc,
             profile=profile,
+            resource_class=resource_class,
         )
         self._sessions[session_id] = session
+        if queued:
+            self._pending[session_id] = request
+            log.info(
+                "Session %s queued at position %d (limit %d)",
+                name,
+                len(self._pending),
+                self._max_concurrent,
+            )
+            return session
+
         self._reset_idle_timer(session_id)
+        self._attach(session)
+        return session
 
-        if self._loop:
+    @staticmethod
+    def _spawn(request: _SpawnRequest) -> PTYProcess:
+        pty_proc = PTYProcess()
+        pty_proc.start(
+            shell=request.shell,
+            cwd=request.working_dir,
+            command=request.command,
+            rows=request.rows,
+            cols=request.cols,
+            resource_class=request.resource_class,
+        )
+        return pty_proc
 
-            def _on_output(data: bytes, sid: str = session_id) -> None:
-                self._on_session_output(sid, data)
+    def _attach(self, session: Session) -> None:
+        if self._loop is None or session.pty_process is None:
+            return
 
-            pty_proc.attach_to_loop(self._loop, _on_output)
+        def _on_output(data: bytes, sid: str = session.id) -> None:
+            self._on_session_output(sid, data)
 
-        return session
+        session.pty_process.attach_to_loop(self._loop, _on_output)
 
     def delete_session(self, session_id: str) -> None:
         session = self._get(session_id)
         if session.pty_process:
             session.pty_process.close()
+        self._pending.pop(session_id, None)
+        was_throttled = self._throttled.pop(session_id, None) is not None
         self._scan_partials.pop(session_id, None)
         self._last_scanned_partial.pop(session_id, None)
         self._cancel_weak_prompt_timer(session_id)
         self._cancel_idle_timer(session_id)
         self._debounce_until.pop(session_id, None)
         self._utf8_decoders.pop(session_id, None)
+        for data in self._deferred.pop(session_id, ()):
+            self._deferred_bytes -= len(data)
         del self._sessions[session_id]
+        if session.process_state in _SLOT_STATES or was_throttled:
+            self._release_slot()
 
     def get_session(self, session_id: str) -> Session:
         return self._get(session_id)
@@ -172,6 +302,46 @@ class SessionManager:
         session = self._get(session_id)
         session.group = group
 
+    @property
+    def resource_classes(self) -> list[ResourceClass]:
+        return list(self._resource_classes.values())
+
+    def set_resource_class(
+        self, session_id: str, name: str, root_pid: int | None = None
+    ) -> list[str]:
+        """Move a session's running processes into resource class *name*.
+
+        Applies to every process in the tree under *root_pid* (default: the
+        session's own pid).  Returns the settings some process refused,
+        typically ``nice`` since lowering it needs ``CAP_SYS_NICE``.
+        """
+        session = self._get(session_id)
+        try:
+            resource_class = self._resource_classes[name]
+        except KeyError:
+            raise KeyError(f"No resource class {name!r}") from None
+        session.resource_class = name
+        request = self._pending.get(session_id)
+        if request is not None:
+            request.resource_class = resource_class
+            return []
+        root = root_pid if root_pid is not None else session.pid
+        if root is None:
+            return []
+        failed: list[str] = []
+        for pid in process_tree_pids(root):
+            for setting in resource_class.apply(pid):
+                if setting not in failed:
+                    failed.append(setting)
+        if failed:
+            log.warning(
+                "Resource class %s only partly applied to session %s: %s",
+                name,
+                session.name,
+                ", ".join(failed),
+            )
+        return failed
+
     def list_groups(self) -> list[str]:
         """Return sorted list of unique non-empty group names."""
         groups = {s.group for s in self._sessions.values() if s.group}
@@ -201,11 +371,16 @@ class SessionManager:
             self._set_process_state(session, ProcessState.RUNNING)
 
     def pause_all(self) -> None:
-        for sid in list(self._sessions):
-            try:
-                self.pause_session(sid)
-            except (KeyError, RuntimeError):
-                pass
+        # Slots freed by pausing everything shouldn't start queued sessions
+        self._hold_admissions = True
+        try:
+            for sid in list(self._sessions):
+                try:
+                    self.pause_session(sid)
+                except (KeyError, RuntimeError):
+                    pass
+        finally:
+            self._hold_admissions = False
 
     def resume_all(self) -> None:
         for sid in list(self._sessions):
@@ -215,6 +390,16 @@ class SessionManager:
                 pass
 
     def stop_all(self) -> None:
+        self._hold_admissions = True
+        try:
+            self._stop_all()
+        finally:
+            self._hold_admissions = False
+
+    def _stop_all(self) -> None:
+        for session_id in list(self._pending):
+            del self._pending[session_id]
+            self._set_process_state(self._sessions[session_id], ProcessState.EXITED)
         for session in list(self._sessions.values()):
             if session.pty_process and session.pty_process.is_alive:
                 session.pty_process.terminate()
@@ -231,6 +416,10 @@ class SessionManager:
 
     def send_input(self, session_id: str, text: str) -> None:
         session = self._get(session_id)
+        request = self._pending.get(session_id)
+        if request is not None:
+            request.input.append(text)
+            return
         if session.pty_process is None:
             raise RuntimeError(f"Session {session_id} has no PTY process")
         session.pty_process.write(text)
@@ -246,11 +435,185 @@ class SessionManager:
 
     def resize_session(self, session_id: str, rows: int, cols: int) -> None:
         session = self._get(session_id)
+        request = self._pending.get(session_id)
+        if request is not None:
+            request.rows, request.cols = rows, cols
+            return
         if session.pty_process is None:
             raise RuntimeError(f"Session {session_id} has no PTY process")
         session.pty_process.resize(rows, cols)
 
+    # ------------------------------------------------------------------
+    # Admission control
+    # ------------------------------------------------------------------
+
+    @property
+    def max_concurrent_sessions(self) -> int:
+        return self._max_concurrent
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def pending_queue(self) -> list[tuple[str, float | None]]:
+        """Queued session ids in start order with estimated seconds to start.
+
+        The estimate assumes slots keep freeing at the average interval of
+        the last few releases; it is ``None`` until two have been seen.
+        """
+        releases = self._slot_releases
+        if len(releases) < 2:
+            return [(session_id, None) for session_id in self._pending]
+        interval = (releases[-1] - releases[0]) / (len(releases) - 1)
+        since_last = time.monotonic() - releases[-1]
+        return [
+            (session_id, max(0.0, interval * position - since_last))
+            for position, session_id in enumerate(self._pending, 1)
+        ]
+
+    def _has_free_slot(self) -> bool:
+        if self._max_concurrent <= 0:
+            return True
+        running = sum(
+            1
+            for s in self._sessions.values()
+            if s.process_state in _SLOT_STATES or s.id in self._throttled
+        )
+        return running < self._max_concurrent
+
+    # ------------------------------------------------------------------
+    # Load governor
+    # ------------------------------------------------------------------
+
+    @property
+    def throttled_session_ids(self) -> list[str]:
+        """Sessions stopped by :meth:`throttle_session`, oldest first."""
+        return list(self._throttled)
+
+    def throttle_session(self, session_id: str, root_pid: int | None = None) -> bool:
+        """SIGSTOP a running session's whole process tree to shed load.
+
+        *root_pid* overrides the tree's root, for sessions whose work runs
+        outside their PTY child (a tmux pane).  Signalling every pid rather
+        than the PTY's process group also stops shell jobs, which job
+        control puts in groups of their own.  Returns False when the
+        session can't be stopped right now.
+        """
+        session = self._get(session_id)
+        if (
+            session.process_state is not ProcessState.RUNNING
+            or session.pty_process is None
+            or not session.pty_process.is_alive
+            or self._is_debounced(session_id)
+        ):
+            return False
+        root = root_pid if root_pid is not None else session.pid
+        pids = process_tree_pids(root) if root is not None else []
+        _signal_pids(pids, signal.SIGSTOP)
+        self._throttled[session_id] = pids
+        self.pause_session(session_id)
+        return True
+
+    def unthrottle_session(self, session_id: str) -> bool:
+        """Resume a session stopped by :meth:`throttle_session`."""
+        session = self._sessions.get(session_id)
+        if session is None or session_id not in self._throttled:
+            return False
+        if self._is_debounced(session_id):
+            return False
+        self.resume_session(session_id)
+        return True
+
+    def _release_slot(self) -> None:
+        self._slot_releases.append(time.monotonic())
+        if not self._hold_admissions:
+            self._admit_pending()
+
+    def _admit_pending(self) -> None:
+        """Start queued sessions, oldest first, while slots are free."""
+        while self._pending and self._has_free_slot():
+            session_id = next(iter(self._pending))
+            request = self._pending.pop(session_id)
+            session = self._sessions[session_id]
+            if session.process_state is not ProcessState.PENDING:
+                continue  # cancelled while queued
+            try:
+                pty_proc = self._spawn(request)
+            except OSError:
+                log.exception("Failed to start queued session %s", session.name)
+                self._set_attention_state(session, AttentionState.ERROR_SEEN)
+                self._set_process_state(session, ProcessState.EXITED)
+                continue
+            session.pty_process = pty_proc
+            session.pid = pty_proc.pid
+            # The process is running now: a debounced update would leave the
+            # session showing PENDING with no later transition to fix it
+            self._set_process_state(session, ProcessState.RUNNING, debounce=False)
+            self._reset_idle_timer(session_id)
+            self._attach(session)
+            for text in request.input:
+                pty_proc.write(text)
+            log.info("Started queued session %s", session.name)
+
+    @property
+    def focused_session_id(self) -> str | None:
+        return self._focused_session_id
+
+    @focused_session_id.setter
+    def focused_session_id(self, session_id: str | None) -> None:
+        self._focused_session_id = session_id
+        if session_id is None:
+            return
+        # Catch the newly focused session up before its next read
+        for data in self._deferred.pop(session_id, ()):
+            self._deferred_bytes -= len(data)
+            self._handle_output_bytes(session_id, data)
+
     def _on_session_output(self, session_id: str, data: bytes) -> None:
+        if self._loop is not None and session_id != self._focused_session_id:
+            self._deferred.setdefault(session_id, deque()).append(data)
+            self._deferred_bytes += len(data)
+            if self._drain_handle is None:
+                # call_later rather than call_soon: the drain then runs after
+                # the next poll's reader callbacks, not ahead of them
+                self._drain_handle = self._loop.call_later(0, self._drain_deferred)
+            return
+        self._handle_output_bytes(session_id, data)
+
+    def _drain_deferred(self) -> None:
+        """Handle deferred background output for one time slice, round-robin."""
+        self._drain_handle = None
+        deadline = time.monotonic() + self._BACKGROUND_SLICE_SECONDS
+        while self._deferred:
+            session_id = next(iter(self._deferred))
+            queue = self._deferred.pop(session_id)
+            data = queue.popleft()
+            # Merge following reads (never the empty EOF read) so per-chunk
+            # overhead stays low however finely the reader split them
+            if data and queue and queue[0]:
+                parts = [data]
+                size = len(data)
+                while (
+                    queue
+                    and queue[0]
+                    and size + len(queue[0]) <= self._BACKGROUND_BATCH_BYTES
+                ):
+                    size += len(queue[0])
+                    parts.append(queue.popleft())
+                data = b"".join(parts)
+            if queue:
+                self._deferred[session_id] = queue  # back of the line
+            self._deferred_bytes -= len(data)
+            self._handle_output_bytes(session_id, data)
+            if (
+                time.monotonic() >= deadline
+                and self._deferred_bytes <= self._BACKGROUND_BACKLOG_MAX
+            ):
+                break
+        if self._deferred and self._loop is not None:
+            self._drain_handle = self._loop.call_later(0, self._drain_deferred)
+
+    def _handle_output_bytes(self, session_id: str, data: bytes) -> None:
         session = self._sessions.get(session_id)
         if session is None:
             return
@@ -299,7 +662,12 @@ class SessionManager:
         self._cancel_weak_prompt_timer(session_id)
 
         if self._on_output:
-            self._on_output(session_id, text)
+            kind = (
+                classify_output(text)
+                if session_id == self.focused_session_id
+                else OutputKind.BACKGROUND
+            )
+            self._on_output(session_id, text, kind)
 
         # Run pattern matcher on each complete line, preserving split lines
         # across PTY read boundaries.
@@ -484,13 +852,9 @@ class SessionManager:
 
     def attach_to_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         self._loop = loop
-        for session_id, session in self._sessions.items():
+        for session in self._sessions.values():
             if session.pty_process and session.pty_process.is_alive:
-
-                def _on_output(data: bytes, sid: str = session_id) -> None:
-                    self._on_session_output(sid, data)
-
-                session.pty_process.attach_to_loop(loop, _on_output)
+                self._attach(session)
 
     # ------------------------------------------------------------------
     # Idle detection (#6) — per-session timers
@@ -541,9 +905,16 @@ class SessionManager:
             if session.pty_process:
                 session.pty_process.close()
         self._sessions.clear()
+        self._pending.clear()
+        self._throttled.clear()
         self._scan_partials.clear()
         self._last_scanned_partial.clear()
         self._utf8_decoders.clear()
+        self._deferred.clear()
+        self._deferred_bytes = 0
+        if self._drain_handle is not None:
+            self._drain_handle.cancel()
+            self._drain_handle = None
 
     # ------------------------------------------------------------------
     # Helpers
@@ -574,7 +945,12 @@ class SessionManager:
             )
 
     def _set_process_state(
-        self, session: Session, new_ps: ProcessState, matched_text: str = ""
+        self,
+        session: Session,
+        new_ps: ProcessState,
+        matched_text: str = "",
+        *,
+        debounce: bool = True,
     ) -> None:
         if not is_valid_process_transition(session.process_state, new_ps):
             log.warning(
@@ -585,15 +961,27 @@ class SessionManager:
             )
             return
         # Debounce non-priority transitions
-        if new_ps not in PRIORITY_PROCESS_STATES and self._is_debounced(session.id):
+        if (
+            debounce
+            and new_ps not in PRIORITY_PROCESS_STATES
+            and self._is_debounced(session.id)
+        ):
             return
         old_status = session.status
-        session.process_state = new_ps
+        old_ps, session.process_state = session.process_state, new_ps
         new_status = session.status
         if old_status is not new_status:
             self._stamp_debounce(session.id)
             if self._on_status_change:
                 self._on_status_change(session.id, old_status, new_status, matched_text)
+        if session.id in self._throttled:
+            if new_ps is not ProcessState.PAUSED:
+                # Resumed (by the governor or by hand) or exited while stopped
+                _signal_pids(self._throttled.pop(session.id), signal.SIGCONT)
+                if new_ps is ProcessState.EXITED:
+                    self._release_slot()
+        elif old_ps in _SLOT_STATES and new_ps not in _SLOT_STATES:
+            self._release_slot()
 
     def _set_attention_state(
         self, session: Session, new_as: AttentionState, matched_text: str = ""
@@ -616,3 +1004,11 @@ class SessionManager:
             self._stamp_debounce(session.id)
             if self._on_status_change:
                 self._on_status_change(session.id, old_status, new_status, matched_text)
+
+
+def _signal_pids(pids: list[int], sig: int) -> None:
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass  # exited since, or pid reused by someone else's process
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections import deque
+from itertools import islice
 from typing import Iterator
 
 
@@ -16,6 +17,20 @@ class OutputBuffer:
         assert self._lines.maxlen is not None
         return self._lines.maxlen
 
+    @property
+    def first_line_number(self) -> int:
+        """Absolute number of the oldest retained line.
+
+        Lines are numbered from the first one ever received, so numbers stay
+        stable as old lines are evicted.
+        """
+        return self.total_lines_received - len(self._lines)
+
+    @property
+    def partial(self) -> str:
+        """Text received after the last newline."""
+        return self._partial
+
     def append_data(self, text: str) -> None:
         self.total_bytes_received += len(text)
 
@@ -33,6 +48,21 @@ class OutputBuffer:
     def get_lines(self) -> list[str]:
         return list(self._lines)
 
+    def line(self, number: int) -> str | None:
+        """Return the retained line with absolute *number*, or None."""
+        index = number - self.first_line_number
+        if 0 <= index < len(self._lines):
+            return self._lines[index]
+        return None
+
+    def iter_lines(self, start: int, end: int) -> Iterator[str]:
+        """Yield retained lines with absolute numbers in ``[start, end)``."""
+        first = self.first_line_number
+        lo = max(start - first, 0)
+        hi = min(end - first, len(self._lines))
+        if lo < hi:
+            yield from islice(self._lines, lo, hi)
+
     def get_all_text(self) -> str:
         pieces = list(self._lines)
         if pieces or self._partial:
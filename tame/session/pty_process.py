@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import errno
 import fcntl
+import logging
 import os
 import pty
 import signal
@@ -11,6 +12,10 @@ import subprocess
 import termios
 from typing import Callable
 
+from .resource_class import ResourceClass
+
+log = logging.getLogger("tame.pty")
+
 
 class PTYProcess:
     def __init__(self) -> None:
@@ -19,6 +24,7 @@ class PTYProcess:
         self._process: subprocess.Popen[bytes] | None = None
         self._on_data: Callable[[bytes], None] | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._winsize: tuple[int, int] | None = None  # (rows, cols)
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -32,6 +38,7 @@ class PTYProcess:
         command: list[str] | None = None,
         rows: int = 24,
         cols: int = 80,
+        resource_class: ResourceClass | None = None,
     ) -> None:
         master_fd, slave_fd = pty.openpty()
         self._master_fd = master_fd
@@ -40,6 +47,7 @@ class PTYProcess:
         # Set PTY size BEFORE spawning child so it inherits correct dimensions.
         winsize = struct.pack("HHHH", rows, cols, 0, 0)
         fcntl.ioctl(master_fd, termios.TIOCSWINSZ, winsize)
+        self._winsize = (rows, cols)
 
         spawn_env = os.environ.copy()
         if env:
@@ -57,6 +65,20 @@ class PTYProcess:
             env=spawn_env,
             start_new_session=True,
         )
+        if resource_class is not None:
+            # Applied from here rather than a preexec_fn: running Python in
+            # the forked child isn't safe while other threads hold locks.
+            # Popen returns once the child has exec'd, so anything it forks
+            # before this line keeps TAME's own settings; the app re-applies
+            # the class to the whole tree on its next resource poll.
+            failed = resource_class.apply(self._process.pid)
+            if failed:
+                log.warning(
+                    "Resource class %s only partly applied to pid %d: %s",
+                    resource_class.name,
+                    self._process.pid,
+                    ", ".join(failed),
+                )
 
         # Slave fd is now owned by the child — close our copy.
         os.close(slave_fd)
@@ -89,11 +111,7 @@ class PTYProcess:
                     self._on_data(b"")
                 return
             # Any other OSError (e.g. EBADF after close) — log and treat as EOF.
-            import logging
-
-            logging.getLogger("tame.pty").warning(
-                "Unexpected OSError on PTY read (errno=%s): %s", exc.errno, exc
-            )
+            log.warning("Unexpected OSError on PTY read (errno=%s): %s", exc.errno, exc)
             self._detach_reader()
             if self._on_data:
                 self._on_data(b"")
@@ -120,8 +138,12 @@ class PTYProcess:
         os.write(self._master_fd, data.encode())
 
     def resize(self, rows: int, cols: int) -> None:
+        """Set the window size; a no-op (no SIGWINCH) if it is unchanged."""
         if self._master_fd is None:
             raise RuntimeError("PTYProcess not started")
+        if self._winsize == (rows, cols):
+            return
+        self._winsize = (rows, cols)
         winsize = struct.pack("HHHH", rows, cols, 0, 0)
         fcntl.ioctl(self._master_fd, termios.TIOCSWINSZ, winsize)
         if self._process and self.is_alive:
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import ctypes
+import logging
+import os
+import platform
+import resource
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+log = logging.getLogger(__name__)
+
+IO_CLASSES: dict[str, int] = {"realtime": 1, "best-effort": 2, "idle": 3}
+
+# ioprio_set(2) has no libc wrapper; syscall numbers by architecture
+_IOPRIO_SET_SYSCALL: dict[str, int] = {
+    "x86_64": 251,
+    "aarch64": 30,
+    "riscv64": 30,
+    "i386": 289,
+    "i686": 289,
+    "armv7l": 314,
+    "ppc64le": 273,
+    "s390x": 282,
+}
+_IOPRIO_SET = _IOPRIO_SET_SYSCALL.get(platform.machine())
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+
+try:
+    _libc: ctypes.CDLL | None = ctypes.CDLL(None, use_errno=True)
+except OSError:
+    _libc = None
+
+
+def _ioprio_set(tid: int, io_class: int, level: int) -> None:
+    if _libc is None or _IOPRIO_SET is None:
+        raise OSError(f"ioprio_set is not available on {platform.machine()}")
+    value = (io_class << _IOPRIO_CLASS_SHIFT) | level
+    if _libc.syscall(_IOPRIO_SET, _IOPRIO_WHO_PROCESS, tid, value) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+
+def _threads(pid: int) -> list[int]:
+    """Thread ids of *pid*: nice and I/O priority are per thread on Linux."""
+    try:
+        return [int(tid) for tid in os.listdir(f"/proc/{pid}/task")]
+    except OSError:
+        return [pid]
+
+
+@dataclass(frozen=True)
+class ResourceClass:
+    """Scheduling priority and limits for a session's processes.
+
+    ``max_memory_mb`` (``RLIMIT_AS``) and ``max_processes`` (``RLIMIT_NPROC``)
+    of 0 leave the limit as it is, so a tighter ulimit the session inherited
+    is kept.  Only soft limits are set, so a session can be moved to a
+    roomier class later; ``RLIMIT_NPROC`` counts every process of the user,
+    not just the session's.
+    """
+
+    name: str
+    nice: int = 0
+    io_class: str = "best-effort"
+    io_level: int = 4
+    max_memory_mb: int = 0
+    max_processes: int = 0
+
+    def describe(self) -> str:
+        parts = [f"nice {self.nice}", f"io {self.io_class}"]
+        if self.io_class != "idle":
+            parts[-1] += f"/{self.io_level}"
+        if self.max_memory_mb:
+            parts.append(f"mem {self.max_memory_mb}MB")
+        if self.max_processes:
+            parts.append(f"nproc {self.max_processes}")
+        return ", ".join(parts)
+
+    def apply(self, pid: int) -> list[str]:
+        """Apply to process *pid* (0 for the calling process).
+
+        Returns the settings that couldn't be applied, e.g. lowering nice
+        without ``CAP_SYS_NICE``; never raises.
+        """
+        failed: list[str] = []
+        tids = [0] if pid == 0 else _threads(pid)
+        for tid in tids:
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, self.nice)
+            except OSError:
+                if "nice" not in failed:
+                    failed.append("nice")
+            try:
+                _ioprio_set(tid, IO_CLASSES[self.io_class], self.io_level)
+            except OSError:
+                if "io" not in failed:
+                    failed.append("io")
+        for limit, value, label in (
+            (resource.RLIMIT_AS, self.max_memory_mb * 1024 * 1024, "memory"),
+            (resource.RLIMIT_NPROC, self.max_processes, "nproc"),
+        ):
+            if value <= 0:
+                continue
+            try:
+                _, hard = resource.prlimit(pid, limit)
+                if hard == resource.RLIM_INFINITY:
+                    soft = value
+                else:
+                    soft = min(value, hard)
+                resource.prlimit(pid, limit, (soft, hard))
+            except (OSError, ValueError):
+                failed.append(label)
+        return failed
+
+
+def parse_resource_classes(config: Mapping[str, object]) -> dict[str, ResourceClass]:
+    """``[sessions.resource_classes.<name>]`` tables, by name."""
+    classes: dict[str, ResourceClass] = {}
+    for name, table in config.items():
+        if not isinstance(table, Mapping):
+            log.warning("Resource class %r is not a table, ignoring", name)
+            continue
+        io_class = str(table.get("io_class", "best-effort"))
+        if io_class not in IO_CLASSES:
+            log.warning(
+                "Resource class %r has unknown io_class %r, using best-effort",
+                name,
+                io_class,
+            )
+            io_class = "best-effort"
+        classes[str(name)] = ResourceClass(
+            name=str(name),
+            nice=max(-20, min(19, _int(table, "nice", 0))),
+            io_class=io_class,
+            io_level=max(0, min(7, _int(table, "io_level", 4))),
+            max_memory_mb=max(0, _int(table, "max_memory_mb", 0)),
+            max_processes=max(0, _int(table, "max_processes", 0)),
+        )
+    return classes
+
+
+def _int(table: Mapping[str, object], key: str, default: int) -> int:
+    value = table.get(key, default)
+    return int(value) if isinstance(value, (int, float)) else default
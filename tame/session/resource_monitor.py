@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import time
+from array import array
+from collections.abc import Collection
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TextIO
+
+import psutil
+
+from tame.utils.timeseries import RingSeries
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class ResourceUsage:
+    """Resource usage summed over one session's process tree."""
+
+    cpu_percent: float = 0.0
+    rss_bytes: int = 0
+    num_fds: int = 0
+    read_bytes: int = 0
+    write_bytes: int = 0
+    # Read+write rate since the previous sample (0 on the first one)
+    io_bytes_per_sec: float = 0.0
+    num_processes: int = 0
+
+
+class ResourceHistory:
+    """The last *capacity* resource samples of one session.
+
+    Each series is a fixed ``RingSeries``, so a session's history takes the
+    same memory after an hour as after a minute.
+    """
+
+    __slots__ = ("_last_output", "cpu", "output_rate", "rss", "timestamps")
+
+    def __init__(self, capacity: int) -> None:
+        self.timestamps = RingSeries(capacity)
+        self.cpu = RingSeries(capacity)
+        self.rss = RingSeries(capacity)
+        # Output bytes per second, from the buffer's running byte count
+        self.output_rate = RingSeries(capacity)
+        self._last_output: tuple[float, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def record(self, timestamp: float, usage: ResourceUsage, output_bytes: int) -> None:
+        """Append one sample; *output_bytes* is the session's running total."""
+        rate = 0.0
+        if self._last_output is not None:
+            last_time, last_bytes = self._last_output
+            if timestamp > last_time:
+                # The buffer's count restarts when it's cleared
+                rate = max(0, output_bytes - last_bytes) / (timestamp - last_time)
+        self._last_output = (timestamp, output_bytes)
+        self.timestamps.append(timestamp)
+        self.cpu.append(usage.cpu_percent)
+        self.rss.append(usage.rss_bytes)
+        self.output_rate.append(rate)
+
+    def write_csv(self, f: TextIO) -> int:
+        """Write the samples as CSV, oldest first; returns the row count."""
+        writer = csv.writer(f)
+        writer.writerow(
+            ["timestamp", "cpu_percent", "rss_bytes", "output_bytes_per_sec"]
+        )
+        rows = 0
+        for ts, cpu, rss, rate in zip(
+            self.timestamps, self.cpu, self.rss, self.output_rate
+        ):
+            writer.writerow(
+                [
+                    datetime.fromtimestamp(ts).isoformat(timespec="seconds"),
+                    f"{cpu:.1f}",
+                    int(rss),
+                    f"{rate:.0f}",
+                ]
+            )
+            rows += 1
+        return rows
+
+
+class ResourceMonitor:
+    """Samples CPU, RSS, fds and I/O over each session's process tree.
+
+    ``psutil.Process`` handles are kept between polls: ``cpu_percent`` is
+    measured against the previous call on the same handle, so a fresh handle
+    per poll would always report 0.  Handles for processes that exited (or
+    whose pid was reused) are evicted on the next sample.
+    """
+
+    def __init__(self) -> None:
+        self._handles: dict[int, psutil.Process] = {}
+        # session id -> (read+write bytes, monotonic time) at the last sample
+        self._io_totals: dict[str, tuple[int, float]] = {}
+        # Cost of the last sample, for logging
+        self.last_poll_seconds: float = 0.0
+        self.last_poll_processes: int = 0
+
+    def sample(
+        self, roots: dict[str, int], detail: Collection[str] | None = None
+    ) -> dict[str, ResourceUsage]:
+        """Usage per session id, given each session's root pid.
+
+        *detail* is accepted for compatibility with :class:`ProcSampler`;
+        fds and I/O come out of the same ``oneshot`` here, so every session
+        gets them.
+        """
+        del detail
+        start = time.perf_counter()
+        live: dict[int, psutil.Process] = {}
+        usage: dict[str, ResourceUsage] = {}
+        for session_id, pid in roots.items():
+            root = self._handle(pid, live)
+            if root is None:
+                continue
+            try:
+                children = root.children(recursive=True)
+            except psutil.Error:
+                continue
+            total = ResourceUsage()
+            for proc in (root, *children):
+                handle = self._handle(proc.pid, live, proc)
+                if handle is not None:
+                    self._add_process(handle, total)
+            usage[session_id] = total
+        self._update_io_rates(usage)
+        self._handles = live
+        self._record_cost(start, len(usage), len(live))
+        return usage
+
+    def _update_io_rates(self, usage: dict[str, ResourceUsage]) -> None:
+        now = time.monotonic()
+        io_totals = {}
+        for session_id, total in usage.items():
+            io = total.read_bytes + total.write_bytes
+            previous = self._io_totals.get(session_id)
+            if previous is not None and now > previous[1]:
+                # Exited children take their counters with them; don't go negative
+                total.io_bytes_per_sec = max(0, io - previous[0]) / (now - previous[1])
+            io_totals[session_id] = (io, now)
+        self._io_totals = io_totals
+
+    def _record_cost(self, start: float, sessions: int, processes: int) -> None:
+        self.last_poll_seconds = time.perf_counter() - start
+        self.last_poll_processes = processes
+        log.debug(
+            "Resource poll: %d sessions, %d processes in %.1f ms",
+            sessions,
+            processes,
+            self.last_poll_seconds * 1000,
+        )
+
+    def _handle(
+        self,
+        pid: int,
+        live: dict[int, psutil.Process],
+        fresh: psutil.Process | None = None,
+    ) -> psutil.Process | None:
+        """Cached handle for *pid*, replaced if the pid now names another process."""
+        handle = live.get(pid)
+        if handle is not None:
+            return handle
+        cached = self._handles.get(pid)
+        try:
+            # Process equality compares pid and creation time
+            candidate = fresh if fresh is not None else psutil.Process(pid)
+            if cached is not None and cached == candidate:
+                handle = cached
+            else:
+                handle = candidate
+        except psutil.Error:
+            return None
+        live[pid] = handle
+        return handle
+
+    @staticmethod
+    def _add_process(proc: psutil.Process, total: ResourceUsage) -> None:
+        try:
+            with proc.oneshot():
+                total.cpu_percent += proc.cpu_percent(interval=None)
+                total.rss_bytes += proc.memory_info().rss
+                try:
+                    total.num_fds += proc.num_fds()
+                except (AttributeError, psutil.AccessDenied):
+                    pass  # not on this platform / not ours to inspect
+                try:
+                    io = proc.io_counters()
+                    total.read_bytes += io.read_bytes
+                    total.write_bytes += io.write_bytes
+                except (AttributeError, psutil.AccessDenied):
+                    pass
+        except psutil.Error:
+            return
+        total.num_processes += 1
+
+
+def process_tree_pids(root: int) -> list[int]:
+    """*root* and all its descendants, parents before children."""
+    try:
+        proc = psutil.Process(root)
+        return [root, *(child.pid for child in proc.children(recursive=True))]
+    except psutil.Error:
+        return []
+
+
+# Offsets into the fields after the ")" closing comm in /proc/<pid>/stat
+_STAT_PPID = 1
+_STAT_UTIME = 11
+_STAT_STIME = 12
+_STAT_STARTTIME = 19
+_STAT_RSS = 21
+
+
+def _read_proc(path: str) -> bytes | None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, 4096)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+class ProcSampler(ResourceMonitor):
+    """Linux sampler reading ``/proc`` directly, one pass per poll.
+
+    ``psutil.Process.children`` scans every ``/proc/<pid>/stat`` on the
+    machine for each call, and each handle costs several more reads.  Here
+    each stat file is read once per tick: that one pass yields the
+    parent->child map for every session's tree as well as CPU ticks and RSS,
+    and the CPU deltas against the previous tick are summed over flat arrays.
+    Open fds and I/O need two more reads per process, so they are only
+    collected for the sessions named in *detail*.  Falls back to psutil when
+    ``/proc`` is unavailable.
+    """
+
+    def __init__(self, proc_root: str = "/proc") -> None:
+        super().__init__()
+        self._proc_root = proc_root
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        # (pid, starttime) -> cumulative utime+stime ticks at the last tick
+        self._prev_ticks: dict[tuple[int, int], int] = {}
+        self._prev_time: float | None = None
+
+    @staticmethod
+    def available(proc_root: str = "/proc") -> bool:
+        return os.path.exists(os.path.join(proc_root, "self", "stat"))
+
+    def sample(
+        self, roots: dict[str, int], detail: Collection[str] | None = None
+    ) -> dict[str, ResourceUsage]:
+        """Usage per session id; fds and I/O only for sessions in *detail*.
+
+        With *detail* left as ``None`` every session gets them.
+        """
+        if not self.available(self._proc_root):
+            return super().sample(roots)
+        start = time.perf_counter()
+        now = time.monotonic()
+        stats = self._scan()
+        children: dict[int, list[int]] = {}
+        for pid, fields in stats.items():
+            children.setdefault(int(fields[_STAT_PPID]), []).append(pid)
+
+        # Flatten every session's tree into parallel arrays
+        pids = array("q")
+        ticks = array("q")
+        prev = array("q")
+        rss_pages = array("q")
+        spans: list[tuple[str, int, int]] = []
+        prev_ticks = self._prev_ticks
+        new_ticks: dict[tuple[int, int], int] = {}
+        for session_id, root in roots.items():
+            if root not in stats:
+                continue
+            begin = len(pids)
+            stack = [root]
+            while stack:
+                pid = stack.pop()
+                fields = stats[pid]
+                key = (pid, int(fields[_STAT_STARTTIME]))
+                cpu = int(fields[_STAT_UTIME]) + int(fields[_STAT_STIME])
+                pids.append(pid)
+                ticks.append(cpu)
+                # A pid missing last tick (or reused since) has no baseline
+                prev.append(prev_ticks.get(key, cpu))
+                rss_pages.append(int(fields[_STAT_RSS]))
+                new_ticks[key] = cpu
+                stack.extend(children.get(pid, ()))
+            spans.append((session_id, begin, len(pids)))
+
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        scale = 100.0 / (self._clock_ticks * elapsed) if elapsed > 0 else 0.0
+        deltas = array("q", [t - p for t, p in zip(ticks, prev)])
+
+        usage: dict[str, ResourceUsage] = {}
+        for session_id, begin, end in spans:
+            total = ResourceUsage(
+                cpu_percent=sum(deltas[begin:end]) * scale,
+                rss_bytes=sum(rss_pages[begin:end]) * self._page_size,
+                num_processes=end - begin,
+            )
+            if detail is None or session_id in detail:
+                for pid in pids[begin:end]:
+                    self._add_detail(pid, total)
+            usage[session_id] = total
+
+        self._prev_ticks = new_ticks
+        self._prev_time = now
+        self._update_io_rates(
+            {sid: u for sid, u in usage.items() if detail is None or sid in detail}
+        )
+        self._record_cost(start, len(usage), len(pids))
+        return usage
+
+    def _scan(self) -> dict[int, list[bytes]]:
+        """Fields after comm from every ``/proc/<pid>/stat``, by pid."""
+        stats: dict[int, list[bytes]] = {}
+        root = self._proc_root
+        try:
+            entries = os.listdir(root)
+        except OSError:
+            return stats
+        for name in entries:
+            if not name.isdigit():
+                continue
+            data = _read_proc(f"{root}/{name}/stat")
+            if data is None:
+                continue  # exited between listdir and open
+            # comm may itself contain spaces and parentheses
+            fields = data[data.rfind(b")") + 2 :].split()
+            if len(fields) > _STAT_RSS:
+                stats[int(name)] = fields
+        return stats
+
+    def _add_detail(self, pid: int, total: ResourceUsage) -> None:
+        base = f"{self._proc_root}/{pid}"
+        try:
+            total.num_fds += len(os.listdir(f"{base}/fd"))
+        except OSError:
+            pass  # not ours to inspect, or gone
+        data = _read_proc(f"{base}/io")
+        if data is None:
+            return
+        for line in data.splitlines():
+            key, _, value = line.partition(b":")
+            if key == b"read_bytes":
+                total.read_bytes += int(value)
+            elif key == b"write_bytes":
+                total.write_bytes += int(value)
+
+
+def create_resource_monitor() -> ResourceMonitor:
+    """The ``/proc`` sampler where available, the psutil monitor otherwise."""
+    if ProcSampler.available():
+        return ProcSampler()
+    return ResourceMonitor()
@@ -41,6 +41,8 @@ class Session:
     usage: UsageInfo = field(default_factory=UsageInfo)
     profile: str = ""
     group: str = ""
+    # Name of the resource class (nice/ionice/rlimits) it runs under
+    resource_class: str = ""
 
     @property
     def status(self) -> SessionState:
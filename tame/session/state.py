@@ -9,6 +9,7 @@ log = logging.getLogger(__name__)
 class ProcessState(Enum):
     """Lifecycle state of the underlying process."""
 
+    PENDING = "pending"  # Queued by admission control; not spawned yet
     STARTING = "starting"
     RUNNING = "running"
     PAUSED = "paused"
@@ -28,6 +29,7 @@ class SessionState(Enum):
     """Combined display state derived from ProcessState + AttentionState."""
 
     CREATED = "created"
+    PENDING = "pending"  # Waiting for a free concurrency slot
     STARTING = "starting"
     ACTIVE = "active"
     IDLE = "idle"
@@ -37,8 +39,17 @@ class SessionState(Enum):
     ERROR = "error"  # Exited with non-zero or error pattern
 
 
+class OutputKind(Enum):
+    """How a chunk of PTY output should be scheduled for display."""
+
+    BACKGROUND = "background"  # Not the focused session; not scanned
+    STREAM = "stream"  # Plain output; fine to batch
+    REDRAW = "redraw"  # Cursor movement / clear / CR redraw; latency-sensitive
+
+
 # Valid state transitions for ProcessState
 VALID_PROCESS_TRANSITIONS: dict[ProcessState, frozenset[ProcessState]] = {
+    ProcessState.PENDING: frozenset({ProcessState.RUNNING, ProcessState.EXITED}),
     ProcessState.STARTING: frozenset({ProcessState.RUNNING, ProcessState.EXITED}),
     ProcessState.RUNNING: frozenset({ProcessState.PAUSED, ProcessState.EXITED}),
     ProcessState.PAUSED: frozenset({ProcessState.RUNNING, ProcessState.EXITED}),
@@ -85,6 +96,8 @@ def compute_session_state(
     process: ProcessState, attention: AttentionState
 ) -> SessionState:
     """Derive the display SessionState from ProcessState + AttentionState."""
+    if process is ProcessState.PENDING:
+        return SessionState.PENDING
     if process is ProcessState.STARTING:
         return SessionState.STARTING
     if process is ProcessState.PAUSED:
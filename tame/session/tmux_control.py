@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import errno
+import fcntl
+import logging
+import os
+import re
+import subprocess
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+# Guard lines framing a command's output: %begin/%end/%error TIME NUMBER FLAGS.
+# FLAGS is 1 for commands this client sent, 0 for the attach command itself.
+_GUARD_RE = re.compile(r"%(begin|end|error) (\d+) (\d+) (\d+)$")
+# Characters that need quoting in a tmux command argument
+_UNSAFE_ARG_RE = re.compile(r"[^\w@%+=:,./-]")
+
+
+class TmuxCommandError(RuntimeError):
+    """A command sent over the control connection returned %error."""
+
+
+def _quote(arg: str) -> str:
+    if arg and not _UNSAFE_ARG_RE.search(arg):
+        return arg
+    return "'" + arg.replace("'", "'\\''") + "'"
+
+
+class TmuxControlClient:
+    """Persistent ``tmux -C`` client that answers commands over one pipe.
+
+    The client attaches to a private session (destroyed once it detaches), so
+    captures and listings cost a line written to the pipe instead of a
+    fork+exec of ``tmux`` per request.  Replies are matched to commands in
+    the order they were sent.
+    """
+
+    def __init__(self, session_name: str) -> None:
+        self._session_name = session_name
+        self._process: subprocess.Popen[bytes] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: deque[asyncio.Future[list[str]]] = deque()
+        # Resolved once the attach command itself has run; commands sent
+        # earlier could be handled before the private session exists
+        self._attached: asyncio.Future[None] | None = None
+        self._partial = b""
+        # Output of the block being read: (command number, ours, lines)
+        self._block: tuple[str, bool, list[str]] | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Spawn the control client and wait until it accepts commands."""
+        self._spawn(asyncio.get_running_loop())
+        assert self._attached is not None
+        await asyncio.wait_for(self._attached, timeout=5.0)
+        await self.command(
+            "set-option", "-t", self._session_name, "destroy-unattached", "on"
+        )
+
+    def _spawn(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Inherits $TMUX, so it reaches the same server as the sessions' own
+        # `tmux new-session` clients
+        self._process = subprocess.Popen(
+            ["tmux", "-C", "new-session", "-A", "-s", self._session_name, "cat"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        assert self._process.stdout is not None
+        fd = self._process.stdout.fileno()
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        self._loop = loop
+        self._attached = loop.create_future()
+        loop.add_reader(fd, self._on_readable)
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def close(self) -> None:
+        """Detach the client; tmux then destroys its private session."""
+        process = self._process
+        if process is None:
+            return
+        self._detach_reader()
+        self._process = None
+        try:
+            assert process.stdin is not None
+            process.stdin.close()
+            process.wait(timeout=1.0)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+        self._fail_pending("tmux control client closed")
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    async def command(self, *args: str) -> list[str]:
+        """Run a tmux command and return its output lines."""
+        process = self._process
+        if process is None or process.stdin is None or self._loop is None:
+            raise TmuxCommandError("tmux control client not running")
+        future: asyncio.Future[list[str]] = self._loop.create_future()
+        try:
+            process.stdin.write(" ".join(map(_quote, args)).encode() + b"\n")
+            process.stdin.flush()
+        except OSError as exc:
+            raise TmuxCommandError(f"tmux control client gone: {exc}") from exc
+        self._pending.append(future)
+        return await future
+
+    async def capture_pane(self, target: str, escapes: bool = False) -> str:
+        """Visible content of *target*'s pane, with SGR sequences if *escapes*."""
+        args = ["capture-pane", "-p", "-t", target]
+        if escapes:
+            args.insert(2, "-e")
+        return "\n".join(await self.command(*args)) + "\n"
+
+    async def list_sessions(self) -> list[str]:
+        return await self.command("list-sessions", "-F", "#{session_name}")
+
+    async def pane_pids(self) -> dict[str, int]:
+        """Pid of the first pane's process in every session, by session name."""
+        pids: dict[str, int] = {}
+        for line in await self.command(
+            "list-panes", "-a", "-F", "#{session_name} #{pane_pid}"
+        ):
+            name, _, pid = line.rpartition(" ")
+            if name and pid.isdigit():
+                pids.setdefault(name, int(pid))
+        return pids
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+
+    def _on_readable(self) -> None:
+        process = self._process
+        assert process is not None and process.stdout is not None
+        try:
+            data = os.read(process.stdout.fileno(), 65536)
+        except OSError as exc:
+            if exc.errno == errno.EAGAIN:
+                return
+            data = b""
+        if not data:
+            log.warning("tmux control client exited")
+            self._detach_reader()
+            self._process = None
+            self._fail_pending("tmux control client exited")
+            return
+        self.feed(data)
+
+    def feed(self, data: bytes) -> None:
+        """Parse control-mode output, resolving commands as replies complete."""
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        for raw in lines:
+            self._handle_line(raw.decode("utf-8", errors="replace"))
+
+    def _handle_line(self, line: str) -> None:
+        block = self._block
+        if block is not None:
+            guard = _GUARD_RE.match(line)
+            if guard is None or guard.group(1) == "begin" or guard.group(3) != block[0]:
+                block[2].append(line)
+                return
+            self._block = None
+            _number, ours, output = block
+            if not ours:
+                self._resolve_attached(guard.group(1) == "error", output)
+                return
+            if not self._pending:
+                return
+            future = self._pending.popleft()
+            if future.done():
+                return
+            if guard.group(1) == "error":
+                future.set_exception(TmuxCommandError("\n".join(output)))
+            else:
+                future.set_result(output)
+            return
+        if line.startswith("%begin"):
+            guard = _GUARD_RE.match(line)
+            if guard is not None:
+                self._block = (guard.group(3), guard.group(4) == "1", [])
+        elif line == "%exit" or line.startswith("%exit "):
+            self._fail_pending("tmux control client exited")
+        # Other notifications (%output, %session-changed, ...) are not used:
+        # each session's output already streams through its own PTY.
+
+    def _resolve_attached(self, error: bool, output: list[str]) -> None:
+        attached = self._attached
+        if attached is None or attached.done():
+            return
+        if error:
+            attached.set_exception(TmuxCommandError("\n".join(output)))
+        else:
+            attached.set_result(None)
+
+    def _fail_pending(self, reason: str) -> None:
+        self._resolve_attached(True, [reason])
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(TmuxCommandError(reason))
+
+    def _detach_reader(self) -> None:
+        process = self._process
+        if self._loop is None or process is None or process.stdout is None:
+            return
+        try:
+            self._loop.remove_reader(process.stdout.fileno())
+        except (OSError, ValueError):
+            pass
@@ -64,6 +64,14 @@ class ViewerResized(Message):
         self.cols = cols
 
 
+class ViewerFastForward(Message):
+    """Viewer entered or left firehose mode (output is being fast-forwarded)."""
+
+    def __init__(self, active: bool) -> None:
+        super().__init__()
+        self.active = active
+
+
 class GroupToggled(Message):
     """A group's collapsed state was toggled in the sidebar."""
 
@@ -7,8 +7,11 @@ from .easter_egg import EasterEgg
 from .group_dialog import GroupDialog
 from .header_bar import HeaderBar
 from .history_picker import HistoryPicker
+from .jump_dialog import JumpDialog
 from .name_dialog import NameDialog
 from .notification_panel import NotificationPanel
+from .resource_class_picker import ResourceClassPicker
+from .resource_graphs import ResourceGraphs
 from .search_dialog import SearchDialog
 from .session_list_item import SessionListItem
 from .session_search_bar import SessionSearchBar
@@ -25,8 +28,11 @@ __all__ = [
     "GroupDialog",
     "HeaderBar",
     "HistoryPicker",
+    "JumpDialog",
     "NameDialog",
     "NotificationPanel",
+    "ResourceClassPicker",
+    "ResourceGraphs",
     "SearchDialog",
     "SessionListItem",
     "SessionSearchBar",
@@ -13,6 +13,7 @@ COMMAND_ENTRIES: list[tuple[str, str, str]] = [
     ("f", "session_search", "Search in Session"),
     ("g", "global_search", "Global Search"),
     ("h", "show_history", "Input History"),
+    ("j", "jump_to_line", "Jump to Line"),
     ("l", "notification_history", "Notification Log"),
     ("m", "rename_session", "Rename Session"),
     ("n", "next_session", "Next Session"),
@@ -24,6 +25,9 @@ COMMAND_ENTRIES: list[tuple[str, str, str]] = [
     ("r", "resume_all", "Resume All"),
     ("z", "pause_all", "Pause All"),
     ("u", "check_usage", "Check Usage"),
+    ("k", "echo_latency", "Echo Latency"),
+    ("o", "resource_graphs", "Resource Graphs"),
+    ("b", "resource_class", "Resource Class"),
     ("x", "clear_notifications", "Clear Notifications"),
     ("w", "set_group", "Set Group"),
     ("v", "show_diff", "Git Diff"),
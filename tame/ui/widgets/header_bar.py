@@ -23,6 +23,7 @@ class HeaderBar(Static):
         super().__init__("TAME", id="header-bar")
         self._session_info: str = ""
         self._system_stats: str = ""
+        self._terminal_mem: str = ""
         self._usage_info: str = ""
         self._refresh_content()
 
@@ -60,9 +61,18 @@ class HeaderBar(Static):
         self._usage_info = ""
         self._refresh_content()
 
-    def update_system_stats(self, cpu_percent: float, memory_used: str) -> None:
+    def update_system_stats(
+        self, cpu_percent: float, memory_used: str, detail: str = ""
+    ) -> None:
         """Update the system resource display."""
         self._system_stats = f"CPU:{cpu_percent:.0f}% {memory_used}"
+        if detail:
+            self._system_stats += f" {detail}"
+        self._refresh_content()
+
+    def update_terminal_memory(self, memory_used: str) -> None:
+        """Update the viewer's terminal-emulator memory for this session."""
+        self._terminal_mem = f"Term:{memory_used}" if memory_used else ""
         self._refresh_content()
 
     def _refresh_content(self) -> None:
@@ -73,4 +83,6 @@ class HeaderBar(Static):
             parts.append(self._usage_info)
         if self._system_stats:
             parts.append(self._system_stats)
+        if self._terminal_mem:
+            parts.append(self._terminal_mem)
         self.update(" | ".join(parts))
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Input, Label
+
+
+class JumpDialog(ModalScreen[int | None]):
+    """Modal dialog asking for a scrollback line number to jump to."""
+
+    DEFAULT_CSS = """
+    JumpDialog {
+        align: center middle;
+    }
+
+    JumpDialog #dialog-box {
+        width: 50;
+        height: auto;
+        padding: 1 2;
+        background: $surface;
+        border: thick $primary;
+    }
+
+    JumpDialog #line-input {
+        margin-top: 1;
+    }
+
+    JumpDialog #hint-label {
+        margin-top: 1;
+        color: $text-muted;
+    }
+    """
+
+    def __init__(self, current_line: int, total_lines: int) -> None:
+        super().__init__()
+        self._current_line = current_line
+        self._total_lines = total_lines
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="dialog-box"):
+            yield Label(f"Jump to line (1-{self._total_lines}):")
+            yield Input(
+                value=str(self._current_line),
+                id="line-input",
+                type="integer",
+            )
+            yield Label("Enter to jump, Escape to cancel", id="hint-label")
+
+    def on_mount(self) -> None:
+        self.query_one("#line-input", Input).focus()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        event.stop()
+        try:
+            line = int(event.value.strip())
+        except ValueError:
+            self.dismiss(None)
+            return
+        self.dismiss(line)
+
+    def key_escape(self) -> None:
+        self.dismiss(None)
@@ -1,20 +1,22 @@
 from __future__ import annotations
 
+from typing import ClassVar
+
+from rich.segment import Segment
+from textual import events
 from textual.app import ComposeResult
-from textual.containers import Vertical, VerticalScroll
+from textual.containers import Vertical
+from textual.geometry import Size
 from textual.screen import ModalScreen
-from textual.widgets import Label, Static
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Label
 
 from tame.notifications.history import NotificationHistory
-from tame.notifications.models import NotificationEvent, Priority
-
+from tame.notifications.models import EventType, NotificationEvent, Priority
 
-_PRIORITY_STYLE: dict[Priority, str] = {
-    Priority.CRITICAL: "bold red",
-    Priority.HIGH: "yellow",
-    Priority.MEDIUM: "green",
-    Priority.LOW: "dim",
-}
+# Rows fetched from the history store at a time
+_PAGE_SIZE = 100
 
 _PRIORITY_ICON: dict[Priority, str] = {
     Priority.CRITICAL: "!!",
@@ -23,54 +25,169 @@ _PRIORITY_ICON: dict[Priority, str] = {
     Priority.LOW: "-",
 }
 
+# What "t" steps through; None shows every type
+_TYPE_CYCLE: list[EventType | None] = [None, *EventType]
 
-class NotificationRow(Static):
-    """A single notification event row."""
 
-    DEFAULT_CSS = """
-    NotificationRow {
-        width: 100%;
-        height: auto;
-        padding: 0 1;
+class NotificationList(ScrollView, can_focus=False):
+    """Virtualized notification log: one widget, rows rendered on demand.
+
+    Rows come from :meth:`NotificationHistory.page` a page at a time, newest
+    first; the next page is fetched when scrolling gets near the end of
+    what's loaded.  Only rows in view are rendered, so opening the list
+    costs one page and a count however long the history is.  Session and
+    type filters are applied by the store's indexes.
+    """
+
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        "notification-list--critical",
+        "notification-list--high",
+        "notification-list--medium",
+        "notification-list--low",
+        "notification-list--highlighted",
     }
 
-    NotificationRow:hover {
-        background: $surface-darken-2;
+    DEFAULT_CSS = """
+    NotificationList {
+        height: 1fr;
+        scrollbar-size-vertical: 1;
     }
 
-    NotificationRow.priority-critical {
+    NotificationList > .notification-list--critical {
         color: #ef4444;
     }
 
-    NotificationRow.priority-high {
+    NotificationList > .notification-list--high {
         color: #f59e0b;
     }
 
-    NotificationRow.priority-medium {
+    NotificationList > .notification-list--medium {
         color: #22c55e;
     }
 
-    NotificationRow.priority-low {
+    NotificationList > .notification-list--low {
         color: $text-muted;
     }
+
+    NotificationList > .notification-list--highlighted {
+        background: $accent;
+    }
     """
 
-    def __init__(self, event: NotificationEvent) -> None:
-        super().__init__()
-        self._event = event
+    def __init__(
+        self,
+        history: NotificationHistory,
+        *,
+        page_size: int = _PAGE_SIZE,
+        id: str | None = None,
+    ) -> None:
+        super().__init__(id=id)
+        self._history = history
+        self._page_size = max(1, page_size)
+        # (store id, event) per loaded row, newest first
+        self._rows: list[tuple[int, NotificationEvent]] = []
+        self._exhausted = False
+        self._loading = False
+        self._total = 0
+        self._highlighted = 0
+        self.session_filter: str | None = None
+        self.type_filter: EventType | None = None
 
-    def on_mount(self) -> None:
-        ev = self._event
-        ts = ev.timestamp.strftime("%H:%M:%S")
-        icon = _PRIORITY_ICON.get(ev.priority, "-")
-        msg = ev.message[:120] + "..." if len(ev.message) > 120 else ev.message
-        self.update(f"[{ts}] [{icon}] [{ev.session_name}] {msg}")
-        self.add_class(f"priority-{ev.priority.value}")
-
-    def on_click(self) -> None:
+    @property
+    def total(self) -> int:
+        """Events matching the current filters, loaded or not."""
+        return self._total
+
+    @property
+    def loaded(self) -> int:
+        return len(self._rows)
+
+    @property
+    def highlighted_event(self) -> NotificationEvent | None:
+        if 0 <= self._highlighted < len(self._rows):
+            return self._rows[self._highlighted][1]
+        return None
+
+    def reload(self) -> None:
+        """Drop loaded rows and fetch the first page for the current filters."""
+        self._rows = []
+        self._exhausted = False
+        self._highlighted = 0
+        self._total = self._history.count(self.session_filter, self.type_filter)
+        self._load_page()
+        self.scroll_to(y=0, animate=False)
+
+    def set_filters(self, session_id: str | None, event_type: EventType | None) -> None:
+        self.session_filter = session_id
+        self.type_filter = event_type
+        self.reload()
+
+    def move(self, delta: int) -> None:
+        """Move the highlight by *delta* rows, loading more when needed."""
+        target = max(0, self._highlighted + delta)
+        while target >= len(self._rows) and not self._exhausted:
+            self._load_page()
+        if not self._rows:
+            return
+        self._highlighted = min(target, len(self._rows) - 1)
+        top = self.scroll_offset.y
+        height = self.scrollable_content_region.height
+        if self._highlighted < top:
+            self.scroll_to(y=self._highlighted, animate=False)
+        elif height and self._highlighted >= top + height:
+            self.scroll_to(y=self._highlighted - height + 1, animate=False)
+        self.refresh()
+
+    def _load_page(self) -> None:
+        self._loading = False
+        if self._exhausted:
+            return
+        before = self._rows[-1][0] if self._rows else None
+        page = self._history.page(
+            self._page_size,
+            before=before,
+            session_id=self.session_filter,
+            event_type=self.type_filter,
+        )
+        self._rows.extend(page)
+        self._exhausted = len(page) < self._page_size
+        self.virtual_size = Size(0, len(self._rows))
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        width = self.scrollable_content_region.width
+        index = y + self.scroll_offset.y
+        base = self.rich_style
+        # Fetch the next page before the reader gets to the end of this one
+        if (
+            not self._exhausted
+            and not self._loading
+            and index >= len(self._rows) - self._page_size // 2
+        ):
+            self._loading = True
+            self.call_later(self._load_page)
+        if index >= len(self._rows):
+            return Strip.blank(width, base)
+        event = self._rows[index][1]
+        style = base + self.get_component_rich_style(
+            f"notification-list--{event.priority.value}"
+        )
+        if index == self._highlighted:
+            style += self.get_component_rich_style("notification-list--highlighted")
+        ts = event.timestamp.strftime("%m-%d %H:%M:%S")
+        icon = _PRIORITY_ICON.get(event.priority, "-")
+        msg = event.message[:120] + "..." if len(event.message) > 120 else event.message
+        text = f" [{ts}] [{icon}] [{event.session_name}] {msg}"
+        return Strip([Segment(text, style)]).crop_extend(0, width, style)
+
+    def on_click(self, event: events.Click) -> None:
+        index = event.y + self.scroll_offset.y
+        if not 0 <= index < len(self._rows):
+            return
+        event.stop()
         screen = self.screen
         if isinstance(screen, NotificationPanel):
-            screen.dismiss(self._event.session_id)
+            screen.dismiss(self._rows[index][1].session_id)
 
 
 class NotificationPanel(ModalScreen[str | None]):
@@ -93,8 +210,8 @@ class NotificationPanel(ModalScreen[str | None]):
         height: 2;
     }
 
-    NotificationPanel #notif-scroll {
-        height: 1fr;
+    NotificationPanel #notif-empty {
+        color: $text-muted;
     }
 
     NotificationPanel #notif-footer {
@@ -108,35 +225,79 @@ class NotificationPanel(ModalScreen[str | None]):
         self._history = history
 
     def compose(self) -> ComposeResult:
-        events_list = self._history.get_all()
         with Vertical(id="notif-box"):
+            yield Label("Notification History", id="notif-header")
+            yield Label("No notifications yet.", id="notif-empty")
+            yield NotificationList(self._history, id="notif-list")
             yield Label(
-                f"Notification History ({len(events_list)} events)  [Esc to close, C to clear]",
-                id="notif-header",
-            )
-            with VerticalScroll(id="notif-scroll"):
-                if not events_list:
-                    yield Label("No notifications yet.", id="notif-empty")
-                else:
-                    for ev in reversed(events_list):
-                        yield NotificationRow(ev)
-            yield Label(
-                "Click session name to switch  |  C = Clear  |  Esc = Close",
+                "Up/Down select | Enter/click switch | S session | T type | "
+                "A all | C clear | Esc close",
                 id="notif-footer",
             )
 
-    def key_escape(self) -> None:
-        self.dismiss(None)
+    def on_mount(self) -> None:
+        self._list.reload()
+        self._update_header()
 
-    def key_q(self) -> None:
-        self.dismiss(None)
+    @property
+    def _list(self) -> NotificationList:
+        return self.query_one(NotificationList)
 
-    def key_c(self) -> None:
-        self._history.clear()
-        scroll = self.query_one("#notif-scroll", VerticalScroll)
-        for child in list(scroll.children):
-            child.remove()
-        scroll.mount(Label("No notifications yet.", id="notif-empty"))
+    def _update_header(self) -> None:
+        notif_list = self._list
+        filters = []
+        if notif_list.session_filter is not None:
+            event = notif_list.highlighted_event
+            name = event.session_name if event else notif_list.session_filter
+            filters.append(f"session {name}")
+        if notif_list.type_filter is not None:
+            filters.append(notif_list.type_filter.value)
+        shown = f", {' + '.join(filters)}" if filters else ""
         self.query_one("#notif-header", Label).update(
-            "Notification History (0 events)  [Esc to close, C to clear]"
+            f"Notification History ({notif_list.total} events{shown})"
         )
+        self.query_one("#notif-empty", Label).display = notif_list.total == 0
+
+    def on_key(self, event: events.Key) -> None:
+        event.stop()
+        notif_list = self._list
+        key = event.key
+        if key in ("escape", "q"):
+            self.dismiss(None)
+        elif key == "up":
+            notif_list.move(-1)
+        elif key == "down":
+            notif_list.move(1)
+        elif key == "pageup":
+            notif_list.move(-max(1, notif_list.scrollable_content_region.height))
+        elif key == "pagedown":
+            notif_list.move(max(1, notif_list.scrollable_content_region.height))
+        elif key == "home":
+            notif_list.move(-notif_list.loaded)
+        elif key in ("enter", "return"):
+            highlighted = notif_list.highlighted_event
+            if highlighted is not None:
+                self.dismiss(highlighted.session_id)
+        elif key == "s":
+            # Narrow to the highlighted event's session, or back out of it
+            highlighted = notif_list.highlighted_event
+            if notif_list.session_filter is not None:
+                session_id = None
+            elif highlighted is not None:
+                session_id = highlighted.session_id
+            else:
+                return
+            notif_list.set_filters(session_id, notif_list.type_filter)
+            self._update_header()
+        elif key == "t":
+            index = _TYPE_CYCLE.index(notif_list.type_filter)
+            next_type = _TYPE_CYCLE[(index + 1) % len(_TYPE_CYCLE)]
+            notif_list.set_filters(notif_list.session_filter, next_type)
+            self._update_header()
+        elif key == "a":
+            notif_list.set_filters(None, None)
+            self._update_header()
+        elif key == "c":
+            self._history.clear()
+            notif_list.reload()
+            self._update_header()
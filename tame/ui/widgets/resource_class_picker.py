@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from textual import events
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.css.query import NoMatches
+from textual.screen import ModalScreen
+from textual.widgets import Label
+
+from tame.session.resource_class import ResourceClass
+
+
+class ResourceClassPicker(ModalScreen[str | None]):
+    """Modal list of the configured resource classes.
+
+    Dismisses with the chosen class name, or ``None`` on Escape.
+    """
+
+    DEFAULT_CSS = """
+    ResourceClassPicker {
+        align: center middle;
+    }
+
+    ResourceClassPicker #rc-box {
+        width: 64;
+        height: auto;
+        padding: 1 2;
+        background: $surface;
+        border: thick $primary;
+    }
+
+    ResourceClassPicker .rc-title {
+        text-align: center;
+        text-style: bold;
+        margin-bottom: 1;
+    }
+
+    ResourceClassPicker .rc-row {
+        margin: 0;
+    }
+
+    ResourceClassPicker .rc-row-selected {
+        margin: 0;
+        background: $primary;
+        color: $text;
+    }
+
+    ResourceClassPicker .rc-footer {
+        margin-top: 1;
+        text-align: center;
+        color: $text-muted;
+    }
+    """
+
+    def __init__(self, classes: list[ResourceClass], current: str = "") -> None:
+        super().__init__()
+        self._choices = classes
+        names = [rc.name for rc in classes]
+        self._selected = names.index(current) if current in names else 0
+        self._current = current
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="rc-box"):
+            yield Label("[bold]Resource Class[/bold]", classes="rc-title")
+            if not self._choices:
+                yield Label("No resource classes configured", classes="rc-row")
+            for i, rc in enumerate(self._choices):
+                marker = "*" if rc.name == self._current else " "
+                cls = "rc-row-selected" if i == self._selected else "rc-row"
+                yield Label(
+                    f"{marker} {rc.name:<12} {rc.describe()}",
+                    classes=cls,
+                    id=f"rc-{i}",
+                    markup=False,
+                )
+            yield Label(
+                "Up/Down select | Enter apply | ESC cancel", classes="rc-footer"
+            )
+
+    def _update_highlight(self) -> None:
+        for i in range(len(self._choices)):
+            try:
+                lbl = self.query_one(f"#rc-{i}", Label)
+            except NoMatches:
+                continue
+            lbl.set_classes("rc-row-selected" if i == self._selected else "rc-row")
+
+    def on_key(self, event: events.Key) -> None:
+        event.stop()
+        if event.key == "escape":
+            self.dismiss(None)
+            return
+        if not self._choices:
+            return
+        if event.key == "up":
+            self._selected = max(0, self._selected - 1)
+            self._update_highlight()
+        elif event.key == "down":
+            self._selected = min(len(self._choices) - 1, self._selected + 1)
+            self._update_highlight()
+        elif event.key in ("enter", "return"):
+            self.dismiss(self._choices[self._selected].name)
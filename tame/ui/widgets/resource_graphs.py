@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Label, Static
+
+from tame.session.resource_monitor import ResourceHistory
+from tame.utils.timeseries import RingSeries, format_bytes, sparkline
+
+_LABEL_WIDTH = 12
+
+
+class ResourceGraphs(ModalScreen[str | None]):
+    """Sparklines of one session's CPU, memory and output-rate history.
+
+    Redraws from the live history every second.  Dismisses with
+    ``"export"`` when E is pressed so the app can write the CSV.
+    """
+
+    DEFAULT_CSS = """
+    ResourceGraphs {
+        align: center middle;
+    }
+
+    ResourceGraphs #graphs-box {
+        width: 90%;
+        height: auto;
+        padding: 1 2;
+        background: $surface;
+        border: thick $primary;
+    }
+
+    ResourceGraphs #graphs-header {
+        text-style: bold;
+        margin-bottom: 1;
+    }
+
+    ResourceGraphs .graph {
+        height: 2;
+    }
+    """
+
+    def __init__(self, session_name: str, history: ResourceHistory) -> None:
+        super().__init__()
+        self._session_name = session_name
+        self._history = history
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="graphs-box"):
+            yield Label(
+                f"Resources: {self._session_name}  [E to export CSV, Esc to close]",
+                id="graphs-header",
+            )
+            yield Static(id="graph-cpu", classes="graph")
+            yield Static(id="graph-rss", classes="graph")
+            yield Static(id="graph-output", classes="graph")
+
+    def on_mount(self) -> None:
+        self.call_after_refresh(self._refresh_graphs)
+        self.set_interval(1.0, self._refresh_graphs)
+
+    def _refresh_graphs(self) -> None:
+        box = self.query_one("#graphs-box")
+        width = max(8, box.content_size.width - _LABEL_WIDTH)
+        history = self._history
+        self._draw("#graph-cpu", "CPU", history.cpu, width, lambda v: f"{v:.0f}%", 100)
+        self._draw("#graph-rss", "Memory", history.rss, width, format_bytes)
+        self._draw(
+            "#graph-output",
+            "Output",
+            history.output_rate,
+            width,
+            lambda v: f"{format_bytes(v)}/s",
+            1024,
+        )
+
+    def _draw(
+        self,
+        selector: str,
+        title: str,
+        series: RingSeries,
+        width: int,
+        fmt: Callable[[float], str],
+        high: float | None = None,
+    ) -> None:
+        values = series.last(width)
+        text = Text()
+        text.append(f"{title:<{_LABEL_WIDTH}}", style="bold")
+        if not values:
+            text.append("no samples yet", style="dim")
+        else:
+            text.append(sparkline(values, 0 if high else None, high), style="cyan")
+            text.append(
+                f"\n{'':<{_LABEL_WIDTH}}now {fmt(values[-1])}  "
+                f"min {fmt(min(values))}  max {fmt(max(values))}",
+                style="dim",
+            )
+        self.query_one(selector, Static).update(text)
+
+    def key_e(self) -> None:
+        self.dismiss("export")
+
+    def key_escape(self) -> None:
+        self.dismiss(None)
+
+    def key_q(self) -> None:
+        self.dismiss(None)
@@ -24,13 +24,19 @@ class SearchResult(Static):
     """
 
     def __init__(
-        self, session_id: str, session_name: str, line: str, line_num: int
+        self,
+        session_id: str,
+        session_name: str,
+        line: str,
+        line_num: int,
+        lines_from_end: int = 0,
     ) -> None:
         super().__init__()
         self.session_id = session_id
         self._session_name = session_name
         self._line = line
         self._line_num = line_num
+        self._lines_from_end = lines_from_end
 
     def on_mount(self) -> None:
         # Truncate long lines for display
@@ -40,10 +46,10 @@ class SearchResult(Static):
         )
 
     def on_click(self) -> None:
-        # Dismiss with the session_id to switch to it
+        # Dismiss with the hit so the viewer can open at the matching line
         screen = self.screen
         if isinstance(screen, SearchDialog):
-            screen.dismiss(self.session_id)
+            screen.dismiss((self.session_id, self._lines_from_end, self._line))
 
 
 # ANSI escape stripper
@@ -52,7 +58,11 @@ _ANSI_RE = re.compile(
 )
 
 
-class SearchDialog(ModalScreen[str | None]):
+# (session_id, lines_from_end, line_text) or None on cancel
+SearchDialogResult = tuple[str, int, str] | None
+
+
+class SearchDialog(ModalScreen[SearchDialogResult]):
     """Global search across all session output buffers."""
 
     DEFAULT_CSS = """
@@ -120,10 +130,17 @@ class SearchDialog(ModalScreen[str | None]):
         query_lower = query.lower()
         for session_id, session_name, output_text in self._sessions:
             clean = _ANSI_RE.sub("", output_text)
-            for i, line in enumerate(clean.split("\n"), 1):
+            lines = clean.split("\n")
+            for i, line in enumerate(lines, 1):
                 if query_lower in line.lower():
                     results.append(
-                        SearchResult(session_id, session_name, line.strip(), i)
+                        SearchResult(
+                            session_id,
+                            session_name,
+                            line.strip(),
+                            i,
+                            lines_from_end=len(lines) - i,
+                        )
                     )
         return results
 
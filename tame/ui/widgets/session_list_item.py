@@ -1,15 +1,13 @@
 from __future__ import annotations
 
 from rich.text import Text
-from textual import events
-from textual.widgets import Static
 
 from tame.session.session import Session
 from tame.session.state import SessionState
-from tame.ui.events import SessionSelected
 
 STATUS_ICONS: dict[SessionState, str] = {
     SessionState.CREATED: "\u25cb",
+    SessionState.PENDING: "\u25cc",
     SessionState.STARTING: "\u25cb",
     SessionState.ACTIVE: "\u25cf",
     SessionState.IDLE: "\u25cb",
@@ -26,6 +24,7 @@ STATUS_STYLE: dict[SessionState, str] = {
     SessionState.ERROR: "red bold",
     SessionState.DONE: "dim",
     SessionState.PAUSED: "yellow",
+    SessionState.PENDING: "dim",
 }
 
 ATTENTION_BADGE: dict[SessionState, tuple[str, str]] = {
@@ -34,78 +33,127 @@ ATTENTION_BADGE: dict[SessionState, tuple[str, str]] = {
 }
 
 
-class SessionListItem(Static):
-    """A single session entry in the sidebar list."""
+def _format_wait(seconds: float) -> str:
+    if seconds < 60:
+        return "<1m"
+    minutes = round(seconds / 60)
+    if minutes < 60:
+        return f"~{minutes}m"
+    return f"~{minutes // 60}h{minutes % 60:02d}m"
 
-    DEFAULT_CSS = """
-    SessionListItem.session-item {
-        height: 1;
-        min-height: 1;
-        padding: 0 1;
-        content-align: left middle;
-        color: $text;
-    }
 
-    SessionListItem:hover {
-        background: $boost;
-    }
+class SessionListItem:
+    """Model of one session row in the sidebar list.
 
-    SessionListItem.highlighted {
-        background: $accent;
-        color: $text;
-        border-left: wide $secondary;
-    }
+    Rows are plain objects rather than widgets: ``SessionList`` keeps one per
+    session and renders only the rows that are scrolled into view.
     """
 
+    __slots__ = (
+        "_name_lower",
+        "_queue_str",
+        "_resource_str",
+        "_session_name",
+        "_sparkline",
+        "_status",
+        "_terminal_mem_str",
+        "group",
+        "session_id",
+    )
+
     def __init__(
         self,
         session_id: str,
         name: str = "",
         status: SessionState = SessionState.CREATED,
+        group: str = "",
     ) -> None:
-        super().__init__(classes="session-item")
         self.session_id = session_id
+        self.group = group
         self._session_name = name
+        self._name_lower = name.lower()
         self._status = status
+        self._queue_str = ""
         self._resource_str = ""
+        self._sparkline = ""
+        self._terminal_mem_str = ""
+
+    @property
+    def name(self) -> str:
+        return self._session_name
 
-    def render(self) -> Text:
-        """Render session row text directly each paint for reliability."""
+    def matches(self, query: str) -> bool:
+        """Whether the row passes the (already lower-cased) search *query*."""
+        return query in self._name_lower
+
+    def render(self, name_style: str = "bold") -> Text:
+        """Row text: status icon, name, status label, badge and resources."""
         icon = STATUS_ICONS.get(self._status, "?")
         label = self._status.value.upper()
         style = STATUS_STYLE.get(self._status, "")
-        name_style = self._name_style()
         line = Text()
         line.append(f"{icon} ", style=style)
         line.append(self._session_name, style=name_style)
         line.append(f"  {label}", style=style)
+        if self._queue_str:
+            line.append(f" {self._queue_str}", style=style)
         badge = ATTENTION_BADGE.get(self._status)
         if badge:
             line.append(badge[0], style=badge[1])
+        if self._sparkline:
+            line.append(f"  {self._sparkline}", style="cyan")
         if self._resource_str:
-            line.append(f"  {self._resource_str}", style="dim")
+            sep = " " if self._sparkline else "  "
+            line.append(f"{sep}{self._resource_str}", style="dim")
+        if self._terminal_mem_str:
+            line.append(f"  term {self._terminal_mem_str}", style="dim")
         return line
 
-    def update_resources(self, cpu: float, mem_str: str) -> None:
-        """Update the resource usage display for this session."""
-        self._resource_str = f"{cpu:.0f}% {mem_str}"
-        self.refresh()
-
-    def _name_style(self) -> str:
-        """Use explicit high-contrast session-name color for readability."""
-        try:
-            if self.app.dark:  # type: ignore[attr-defined]
-                return "bold #f5f5f5"
-            return "bold #1f1f1f"
-        except Exception:
-            return "bold"
-
-    def update_from_session(self, session: Session) -> None:
-        """Refresh display from a Session object."""
+    def update_resources(self, cpu: float, mem_str: str) -> bool:
+        """Update the resource usage display; True if the row changed."""
+        resource_str = f"{cpu:.0f}% {mem_str}"
+        if resource_str == self._resource_str:
+            return False
+        self._resource_str = resource_str
+        return True
+
+    def update_queue(self, position: int | None, eta: float | None = None) -> bool:
+        """Show the admission queue position and estimated wait, if queued."""
+        if position is None:
+            queue_str = ""
+        elif eta is None:
+            queue_str = f"#{position}"
+        else:
+            queue_str = f"#{position} {_format_wait(eta)}"
+        if queue_str == self._queue_str:
+            return False
+        self._queue_str = queue_str
+        return True
+
+    def update_sparkline(self, sparkline: str) -> bool:
+        """Show recent CPU history next to the latest sample."""
+        if sparkline == self._sparkline:
+            return False
+        self._sparkline = sparkline
+        return True
+
+    def update_terminal_memory(self, mem_str: str) -> bool:
+        """Show the viewer's cached terminal footprint ("" when not cached)."""
+        if mem_str == self._terminal_mem_str:
+            return False
+        self._terminal_mem_str = mem_str
+        return True
+
+    def update_from_session(self, session: Session) -> bool:
+        """Refresh from a Session object; True if the row changed."""
+        if (
+            session.name == self._session_name
+            and session.status is self._status
+            and session.group == self.group
+        ):
+            return False
         self._session_name = session.name
+        self._name_lower = session.name.lower()
         self._status = session.status
-        self.refresh()
-
-    def on_click(self, event: events.Click) -> None:
-        event.stop()
-        self.post_message(SessionSelected(self.session_id))
+        self.group = session.group
+        return True
@@ -1,53 +1,366 @@
 from __future__ import annotations
 
-from textual.containers import Vertical, VerticalScroll
-from textual.widgets import Button, Input, Label, Static
+from collections.abc import Iterable
+from typing import ClassVar
+
+from rich.segment import Segment
+from textual import events
+from textual.containers import Vertical
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Button, Input, Label
 
 from tame.session.session import Session
-from tame.ui.events import GroupToggled
+from tame.ui.events import GroupToggled, SessionSelected
 from tame.ui.widgets.session_list_item import SessionListItem
 
+# How long a flashed row stays marked
+_FLASH_SECONDS = 2.0
+
+
+class SessionList(ScrollView, can_focus=False):
+    """Virtualized session list: one widget, rows rendered from a model.
+
+    Each session is a ``SessionListItem`` model and each group a header row;
+    only the rows scrolled into view are rendered, so the cost of a repaint,
+    a status change or a resource poll doesn't grow with the session count.
+    The row list is rebuilt (O(sessions)) only when membership, grouping,
+    collapse state or the search query changes.
+    """
 
-class GroupHeader(Static):
-    """Clickable group header that toggles collapse."""
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        "session-list--group",
+        "session-list--hover",
+        "session-list--highlighted",
+        "session-list--marker",
+        "session-list--flash",
+    }
 
     DEFAULT_CSS = """
-    GroupHeader {
-        width: 100%;
-        height: 1;
-        padding: 0 1;
+    SessionList {
+        height: 1fr;
+        scrollbar-size-vertical: 1;
+    }
+
+    SessionList > .session-list--group {
         background: $surface-darken-1;
         color: $text;
     }
 
-    GroupHeader:hover {
-        background: $surface-darken-2;
+    SessionList > .session-list--hover {
+        background: $boost;
+    }
+
+    SessionList > .session-list--highlighted {
+        background: $accent;
+        color: $text;
+    }
+
+    SessionList > .session-list--marker {
+        color: $secondary;
+    }
+
+    SessionList > .session-list--flash {
+        background: $warning 40%;
     }
     """
 
-    def __init__(self, group_name: str) -> None:
-        super().__init__()
-        self._group_name = group_name
-        self._collapsed = False
+    def __init__(self, *, id: str | None = None) -> None:
+        super().__init__(id=id)
+        self._items: dict[str, SessionListItem] = {}
+        self._collapsed_groups: set[str] = set()
+        self._query = ""
+        # Session ids matching _query, in list order; None when not filtering.
+        # A longer query that contains the previous one only re-checks these.
+        self._matches: list[str] | None = None
+        # (is_group_header, session id or group name) per visible row
+        self._rows: list[tuple[bool, str]] = []
+        self._row_of: dict[str, int] = {}
+        self._rows_dirty = False
+        self._highlighted: str | None = None
+        self._hover_row: int | None = None
+        self._flashing: set[str] = set()
 
-    def on_mount(self) -> None:
-        self._render_label()
+    # ------------------------------------------------------------------
+    # Model
+    # ------------------------------------------------------------------
 
-    def _render_label(self) -> None:
-        arrow = "▶" if self._collapsed else "▼"
-        self.update(f"{arrow} {self._group_name}")
+    def item(self, session_id: str) -> SessionListItem | None:
+        return self._items.get(session_id)
 
-    @property
-    def collapsed(self) -> bool:
-        return self._collapsed
+    def add_item(self, item: SessionListItem) -> None:
+        self._items[item.session_id] = item
+        if self._matches is not None and item.matches(self._query):
+            self._matches.append(item.session_id)
+        self._invalidate_rows()
+
+    def remove_item(self, session_id: str) -> None:
+        if self._items.pop(session_id, None) is None:
+            return
+        if self._matches is not None and session_id in self._matches:
+            self._matches.remove(session_id)
+        self._flashing.discard(session_id)
+        if self._highlighted == session_id:
+            self._highlighted = None
+        self._invalidate_rows()
+
+    def update_item(self, session: Session) -> None:
+        item = self._items.get(session.id)
+        if item is None:
+            return
+        old_name, old_group = item.name, item.group
+        if not item.update_from_session(session):
+            return
+        if item.group != old_group:
+            self._invalidate_rows()
+        elif item.name != old_name and self._matches is not None:
+            self._refilter()
+        else:
+            self._refresh_rows((session.id,))
+
+    def update_resources(self, results: list[tuple[str, float, str]]) -> None:
+        changed = []
+        for session_id, cpu, mem_str in results:
+            item = self._items.get(session_id)
+            if item is not None and item.update_resources(cpu, mem_str):
+                changed.append(session_id)
+        self._refresh_rows(changed)
+
+    def update_terminal_memory(self, usage: dict[str, str]) -> None:
+        """Set each row's terminal footprint from *usage* ("" if absent)."""
+        changed = [
+            session_id
+            for session_id, item in self._items.items()
+            if item.update_terminal_memory(usage.get(session_id, ""))
+        ]
+        self._refresh_rows(changed)
+
+    def update_queue(self, queue: dict[str, tuple[int, float | None]]) -> None:
+        """Set queued rows' (position, estimated wait); clear the others."""
+        changed = [
+            session_id
+            for session_id, item in self._items.items()
+            if item.update_queue(*queue.get(session_id, (None, None)))
+        ]
+        self._refresh_rows(changed)
+
+    def update_sparklines(self, sparklines: dict[str, str]) -> None:
+        """Set each row's CPU sparkline from *sparklines* ("" if absent)."""
+        changed = [
+            session_id
+            for session_id, item in self._items.items()
+            if item.update_sparkline(sparklines.get(session_id, ""))
+        ]
+        self._refresh_rows(changed)
+
+    def set_query(self, query: str) -> bool:
+        """Filter rows by name; returns whether any session matches."""
+        query = query.strip().lower()
+        if query == self._query:
+            return self._matches is None or bool(self._matches)
+        previous, self._query = self._query, query
+        if not query:
+            self._matches = None
+        elif self._matches is not None and previous in query:
+            # Narrowing: only the previous matches can still match
+            self._matches = [
+                sid for sid in self._matches if self._items[sid].matches(query)
+            ]
+        else:
+            self._refilter()
+            return bool(self._matches)
+        self._invalidate_rows()
+        return self._matches is None or bool(self._matches)
+
+    def _refilter(self) -> None:
+        query = self._query
+        self._matches = [
+            sid for sid, item in self._items.items() if item.matches(query)
+        ]
+        self._invalidate_rows()
+
+    def toggle_group(self, group: str) -> None:
+        collapsed = group not in self._collapsed_groups
+        if collapsed:
+            self._collapsed_groups.add(group)
+        else:
+            self._collapsed_groups.discard(group)
+        self._invalidate_rows()
+        self.post_message(GroupToggled(group, collapsed))
+
+    def is_collapsed(self, group: str) -> bool:
+        return group in self._collapsed_groups
+
+    def highlight(self, session_id: str) -> None:
+        previous, self._highlighted = self._highlighted, session_id
+        self._refresh_rows([sid for sid in (previous, session_id) if sid])
+        self._ensure_rows()
+        index = self._row_of.get(session_id)
+        if index is None:
+            return
+        top = self.scroll_offset.y
+        height = self.scrollable_content_region.height
+        if index < top:
+            self.scroll_to(y=index, animate=False)
+        elif height and index >= top + height:
+            self.scroll_to(y=index - height + 1, animate=False)
+
+    def flash(self, session_id: str) -> None:
+        if session_id not in self._items:
+            return
+        self._flashing.add(session_id)
+        self._refresh_rows((session_id,))
+        self.set_timer(_FLASH_SECONDS, lambda: self._unflash(session_id))
+
+    def _unflash(self, session_id: str) -> None:
+        if session_id in self._flashing:
+            self._flashing.discard(session_id)
+            self._refresh_rows((session_id,))
 
-    def toggle(self) -> None:
-        self._collapsed = not self._collapsed
-        self._render_label()
-        self.post_message(GroupToggled(self._group_name, self._collapsed))
+    def clear_flash(self) -> None:
+        flashing, self._flashing = self._flashing, set()
+        self._refresh_rows(flashing)
 
-    def on_click(self) -> None:
-        self.toggle()
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+
+    def visible_session_ids(self) -> list[str]:
+        """Session ids with a row in the list (filtered, not collapsed)."""
+        self._ensure_rows()
+        return [key for is_group, key in self._rows if not is_group]
+
+    def row_of(self, session_id: str) -> int | None:
+        self._ensure_rows()
+        return self._row_of.get(session_id)
+
+    def _invalidate_rows(self) -> None:
+        if not self._rows_dirty:
+            self._rows_dirty = True
+            if self.is_attached:
+                self.call_later(self._ensure_rows)
+        self.refresh()
+
+    def _ensure_rows(self) -> None:
+        if not self._rows_dirty:
+            return
+        self._rows_dirty = False
+        rows: list[tuple[bool, str]] = []
+        if self._matches is not None:
+            rows = [(False, sid) for sid in self._matches]
+        else:
+            # Members are listed under their group's header, which sits where
+            # the group's first session would be
+            members: dict[str, list[str]] = {}
+            for sid, item in self._items.items():
+                if item.group:
+                    members.setdefault(item.group, []).append(sid)
+            for sid, item in self._items.items():
+                group = item.group
+                if not group:
+                    rows.append((False, sid))
+                elif group in members:
+                    rows.append((True, group))
+                    if group not in self._collapsed_groups:
+                        rows.extend((False, member) for member in members[group])
+                    del members[group]
+        self._rows = rows
+        self._row_of = {
+            key: i for i, (is_group, key) in enumerate(rows) if not is_group
+        }
+        self._hover_row = None
+        self.virtual_size = Size(0, len(rows))
+        self.refresh()
+
+    def _refresh_rows(self, session_ids: Iterable[str]) -> None:
+        """Repaint the given sessions' rows if any is scrolled into view."""
+        if self._rows_dirty:
+            return  # a full repaint is already pending
+        top = self.scroll_offset.y
+        bottom = top + self.scrollable_content_region.height
+        for sid in session_ids:
+            index = self._row_of.get(sid)
+            if index is not None and top <= index < bottom:
+                self.refresh()
+                return
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _name_style(self) -> str:
+        """Use explicit high-contrast session-name color for readability."""
+        try:
+            if self.app.dark:  # type: ignore[attr-defined]
+                return "bold #f5f5f5"
+            return "bold #1f1f1f"
+        except Exception:
+            return "bold"
+
+    def render_line(self, y: int) -> Strip:
+        width = self.scrollable_content_region.width
+        index = y + self.scroll_offset.y
+        base = self.rich_style
+        if index >= len(self._rows):
+            return Strip.blank(width, base)
+        is_group, key = self._rows[index]
+        if is_group:
+            arrow = "▶" if key in self._collapsed_groups else "▼"
+            style = base + self.get_component_rich_style("session-list--group")
+            segments = [Segment(f" {arrow} {key}", style)]
+        else:
+            style = base
+            marker = " "
+            marker_style = style
+            if key == self._highlighted:
+                style += self.get_component_rich_style("session-list--highlighted")
+                marker = "▌"
+                marker_style = style + self.get_component_rich_style(
+                    "session-list--marker", partial=True
+                )
+            elif key in self._flashing:
+                style += self.get_component_rich_style("session-list--flash")
+            elif index == self._hover_row:
+                style += self.get_component_rich_style("session-list--hover")
+            text = self._items[key].render(self._name_style())
+            segments = [Segment(marker, marker_style)]
+            segments.extend(
+                Segment(seg.text, style + seg.style if seg.style else style)
+                for seg in text.render(self.app.console)
+            )
+        return Strip(segments).crop_extend(0, width, style)
+
+    # ------------------------------------------------------------------
+    # Mouse
+    # ------------------------------------------------------------------
+
+    def _row_at(self, event: events.MouseEvent) -> int | None:
+        self._ensure_rows()
+        index = event.y + self.scroll_offset.y
+        return index if 0 <= index < len(self._rows) else None
+
+    def on_click(self, event: events.Click) -> None:
+        index = self._row_at(event)
+        if index is None:
+            return
+        event.stop()
+        is_group, key = self._rows[index]
+        if is_group:
+            self.toggle_group(key)
+        else:
+            self.post_message(SessionSelected(key))
+
+    def on_mouse_move(self, event: events.MouseMove) -> None:
+        index = self._row_at(event)
+        if index != self._hover_row:
+            self._hover_row = index
+            self.refresh()
+
+    def on_leave(self, event: events.Leave) -> None:
+        if self._hover_row is not None:
+            self._hover_row = None
+            self.refresh()
 
 
 class SessionSidebar(Vertical):
@@ -65,10 +378,6 @@ class SessionSidebar(Vertical):
         margin: 1;
     }
 
-    SessionSidebar #session-scroll {
-        height: 1fr;
-    }
-
     SessionSidebar #no-results {
         display: none;
         width: 100%;
@@ -83,106 +392,67 @@ class SessionSidebar(Vertical):
     }
     """
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._collapsed_groups: set[str] = set()
-
     def compose(self):
         yield Input(placeholder="Search sessions...", id="session-search")
-        with VerticalScroll(id="session-scroll"):
-            yield Label("No matching sessions", id="no-results")
+        yield Label("No matching sessions", id="no-results")
+        yield SessionList(id="session-list")
         yield Button("+ New Session", id="new-session-btn", variant="primary")
 
+    @property
+    def session_list(self) -> SessionList:
+        return self.query_one(SessionList)
+
     def add_session(self, session: Session) -> None:
-        """Add a new SessionListItem to the list."""
-        item = SessionListItem(
-            session_id=session.id,
-            name=session.name,
-            status=session.status,
+        """Add a row for *session* to the list."""
+        self.session_list.add_item(
+            SessionListItem(
+                session_id=session.id,
+                name=session.name,
+                status=session.status,
+                group=session.group,
+            )
         )
-        item.id = f"session-item-{session.id}"
-        if session.group:
-            item.add_class(f"group-{session.group}")
-            if session.group in self._collapsed_groups:
-                item.display = False
-        scroll = self.query_one("#session-scroll", VerticalScroll)
-        # If session has a group, ensure group header exists
-        if session.group:
-            self._ensure_group_header(session.group)
-        scroll.mount(item)
-
-    def _ensure_group_header(self, group: str) -> None:
-        """Create a group header if one doesn't exist yet."""
-        header_id = f"group-header-{group}"
-        try:
-            self.query_one(f"#{header_id}")
-        except Exception:
-            header = GroupHeader(group)
-            header.id = header_id
-            scroll = self.query_one("#session-scroll", VerticalScroll)
-            # Find the first session in this group to insert the header before it
-            first_in_group = None
-            for item in scroll.query(SessionListItem):
-                if item.has_class(f"group-{group}"):
-                    first_in_group = item
-                    break
-            if first_in_group is not None:
-                scroll.mount(header, before=first_in_group)
-            else:
-                scroll.mount(header)
 
     def remove_session(self, session_id: str) -> None:
-        """Remove a session item by its session_id."""
-        try:
-            item = self.query_one(f"#session-item-{session_id}", SessionListItem)
-            item.remove()
-        except Exception:
-            pass
+        """Remove a session row by its session_id."""
+        self.session_list.remove_item(session_id)
 
     def update_session(self, session: Session) -> None:
-        """Update an existing session item."""
-        try:
-            item = self.query_one(f"#session-item-{session.id}", SessionListItem)
-            item.update_from_session(session)
-        except Exception:
-            pass
+        """Update an existing session row."""
+        self.session_list.update_item(session)
+
+    def update_resources(self, results: list[tuple[str, float, str]]) -> None:
+        """Apply (session_id, cpu %, memory) samples to the rows."""
+        self.session_list.update_resources(results)
+
+    def update_terminal_memory(self, usage: dict[str, str]) -> None:
+        """Apply each session's cached-terminal footprint to the rows."""
+        self.session_list.update_terminal_memory(usage)
+
+    def update_queue(self, queue: dict[str, tuple[int, float | None]]) -> None:
+        """Apply admission-queue positions and estimated waits to the rows."""
+        self.session_list.update_queue(queue)
+
+    def update_sparklines(self, sparklines: dict[str, str]) -> None:
+        """Apply each session's recent-CPU sparkline to the rows."""
+        self.session_list.update_sparklines(sparklines)
 
     def highlight_session(self, session_id: str) -> None:
         """Visually highlight the given session and un-highlight others."""
-        for item in self.query(SessionListItem):
-            if item.session_id == session_id:
-                item.add_class("highlighted")
-            else:
-                item.remove_class("highlighted")
+        self.session_list.highlight(session_id)
+
+    def flash_session(self, session_id: str) -> None:
+        """Briefly mark a session that needs attention."""
+        self.session_list.flash(session_id)
 
     def clear_all_flash(self) -> None:
-        """Remove the flash class from all session items."""
-        for item in self.query(SessionListItem):
-            item.remove_class("flash")
-
-    def on_group_toggled(self, event: GroupToggled) -> None:
-        """Show/hide session items when a group is toggled."""
-        if event.collapsed:
-            self._collapsed_groups.add(event.group)
-        else:
-            self._collapsed_groups.discard(event.group)
-        for item in self.query(SessionListItem):
-            if item.has_class(f"group-{event.group}"):
-                item.display = not event.collapsed
+        """Remove the flash mark from all session rows."""
+        self.session_list.clear_flash()
 
     def on_input_changed(self, event: Input.Changed) -> None:
-        """Filter session list items by the search query."""
+        """Filter session rows by the search query."""
         if event.input.id != "session-search":
             return
-        query = event.value.strip().lower()
-        any_visible = False
-        for item in self.query(SessionListItem):
-            visible = query == "" or query in item._session_name.lower()
-            item.display = visible
-            if visible:
-                any_visible = True
-        # Also filter group headers
-        for header in self.query(GroupHeader):
-            header.display = query == ""
+        any_visible = self.session_list.set_query(event.value)
         no_results = self.query_one("#no-results", Label)
-        no_results.display = not any_visible and query != ""
+        no_results.display = not any_visible
@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import logging
 import re
-from collections import defaultdict
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict, deque
 from functools import lru_cache
+from typing import cast
 
 from rich.style import Style
 from rich.text import Text
@@ -12,19 +17,26 @@ from textual.timer import Timer
 from textual.widget import Widget
 
 from tame import __version__
+from tame.session.manager import ANSI_ESCAPE_RE
 from tame.session.output_buffer import OutputBuffer
-from tame.ui.events import ViewerResized
+from tame.ui.events import ViewerFastForward, ViewerResized
 
 log = logging.getLogger("tame.viewer")
 
 try:
     import pyte
-    from pyte.screens import StaticDefaultDict
+    from pyte import charsets as pyte_charsets
+    from pyte import modes as pyte_modes
+    from pyte.screens import Char, Margins, StaticDefaultDict
+    from wcwidth import wcswidth
 
     _PYTE_IMPORT_ERROR: Exception | None = None
 except Exception as exc:  # pragma: no cover - fallback for environments missing pyte
     pyte = None  # type: ignore[assignment]
+    Char = None  # type: ignore[assignment,misc]
+    Margins = None  # type: ignore[assignment,misc]
     StaticDefaultDict = None  # type: ignore[assignment,misc]
+    wcswidth = None  # type: ignore[assignment]
     _PYTE_IMPORT_ERROR = exc
 
 
@@ -58,6 +70,25 @@ _FALLBACK_FULL_CLEAR_RE = re.compile(
     r"\x0c|\x1bc|\x1b\[(?:2|3)J|\x1b\[(?:H|1;1H|1;H|;1H|;H)\x1b\[(?:0)?J"
 )
 
+# Front-end tokenizer for _TerminalState.feed().  The printable class is the
+# complement of what pyte's Stream treats as special (NUL, BEL..SI, ESC, DEL
+# and the C1 CSI/OSC introducers), so runs split exactly where pyte's would.
+_VT_TOKEN_RE = re.compile(
+    r"([^\x00\x07-\x0f\x1b\x7f\x9b\x9d]+)"  # printable run
+    r"|([\x07-\x0f])"  # C0 control
+    r"|\x1b\[(\??)([0-9;]*)([@-~])"  # CSI without intermediates
+)
+_ASCII_SPLIT_RE = re.compile(r"([\x20-\x7e]+)|[^\x20-\x7e]+")
+_ASCII_PRINTABLE = "".join(map(chr, range(0x20, 0x7F)))
+# State a fast-forward carries over from the output it skips: private modes
+# (alt screen, cursor visibility, autowrap) and SGR attributes
+_PRIVATE_MODE_RE = re.compile(r"\x1b\[\?[0-9;]*[hl]")
+_SGR_RE = re.compile(r"\x1b\[[0-9;:]*m")
+_SCROLL_REGION_RE = re.compile(r"\x1b\[[0-9;]*r")
+_ALT_SCREEN_RE = re.compile(r"\x1b\[\?(?:[0-9;]*;)?(?:47|1047|1049)(?:;[0-9;]*)?h")
+# C0 controls other than TAB and CR, which take no columns in a raw line
+_WIDTHLESS_CONTROL_RE = re.compile(r"[\x00-\x08\x0a-\x0c\x0e-\x1f\x7f]")
+
 
 def _normalize_color(name: str) -> str:
     """Prepend '#' to bare hex color strings so Rich can parse them."""
@@ -66,6 +97,202 @@ def _normalize_color(name: str) -> str:
     return name
 
 
+def _display_width(line: str) -> int:
+    """Columns a raw output line occupies once escapes are interpreted.
+
+    Carriage returns overwrite from column 0, so the widest segment wins.
+    """
+    if "\x1b" in line:
+        line = ANSI_ESCAPE_RE.sub("", line)
+    text = _WIDTHLESS_CONTROL_RE.sub("", line)
+    width = 0
+    for segment in text.split("\r"):
+        segment = segment.expandtabs()
+        if segment.isascii():
+            columns = len(segment)
+        else:
+            columns = wcswidth(segment)
+            if columns < 0:
+                columns = len(segment)
+        width = max(width, columns)
+    return width
+
+
+class _IndexedHistory:
+    """Fixed-capacity ring buffer with O(1) random access.
+
+    Stands in for the ``deque`` pyte keeps in ``history.top``.  Indexing a
+    deque walks its blocks, so reading a viewport out of the middle of a
+    10k-line history meant copying the whole thing every repaint.
+    """
+
+    __slots__ = ("_items", "_len", "_start", "appended", "maxlen")
+
+    def __init__(self, maxlen: int) -> None:
+        self.maxlen = max(0, maxlen)
+        self._items: list = [None] * self.maxlen
+        self._start = 0
+        self._len = 0
+        # Monotonic count of rows ever appended (lets callers detect scrolling
+        # even once the ring is full and ``len()`` stops changing).
+        self.appended = 0
+
+    def append(self, item):
+        """Append *item*, returning the row it evicted (or None)."""
+        if self.maxlen == 0:
+            return None
+        self.appended += 1
+        if self._len < self.maxlen:
+            self._items[(self._start + self._len) % self.maxlen] = item
+            self._len += 1
+            return None
+        evicted = self._items[self._start]
+        self._items[self._start] = item
+        self._start = (self._start + 1) % self.maxlen
+        return evicted
+
+    def extend(self, items) -> None:
+        for item in items:
+            self.append(item)
+
+    def pop(self):
+        if self._len == 0:
+            raise IndexError("pop from an empty history")
+        self._len -= 1
+        idx = (self._start + self._len) % self.maxlen
+        item = self._items[idx]
+        self._items[idx] = None
+        return item
+
+    def popleft(self):
+        if self._len == 0:
+            raise IndexError("pop from an empty history")
+        item = self._items[self._start]
+        self._items[self._start] = None
+        self._start = (self._start + 1) % self.maxlen
+        self._len -= 1
+        return item
+
+    def clear(self) -> None:
+        self._items = [None] * self.maxlen
+        self._start = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("history index out of range")
+        return self._items[(self._start + index) % self.maxlen]
+
+    def __iter__(self):
+        for i in range(self._len):
+            yield self._items[(self._start + i) % self.maxlen]
+
+
+# Approximate footprint of one pyte ``Char`` namedtuple on 64-bit CPython;
+# used to estimate the cost of the live (uncompacted) screen rows.
+_CHAR_NBYTES = 112
+
+
+class _AttrTable:
+    """Interns cell attributes so packed rows store one small id per cell.
+
+    A key is a pyte ``Char`` without its ``data`` field.  Id 0 is always the
+    screen's default attributes.
+    """
+
+    __slots__ = ("_ids", "keys", "styles")
+
+    def __init__(self, default_char) -> None:
+        self._ids: dict[tuple, int] = {}
+        self.keys: list[tuple] = []
+        # Rich styles per id, filled lazily by the renderer
+        self.styles: dict[int, Style] = {}
+        self.intern(tuple(default_char)[1:])
+
+    def intern(self, key: tuple) -> int:
+        attr_id = self._ids.get(key)
+        if attr_id is None:
+            attr_id = len(self.keys)
+            self._ids[key] = attr_id
+            self.keys.append(key)
+        return attr_id
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class _CompactRow:
+    """A scrollback row packed into arrays instead of a dict of ``Char``.
+
+    ``codes`` holds one codepoint per cell (0 for the placeholder pyte leaves
+    after a wide character), ``attrs`` the interned attribute id per cell, or
+    None when every cell uses the defaults.  ``extras`` maps the rare cells
+    holding more than one codepoint (combining marks) to their text.
+    Trailing default blanks are not stored.
+    """
+
+    __slots__ = ("attrs", "codes", "extras", "line")
+
+    def __init__(
+        self,
+        codes: array,
+        attrs: array | None = None,
+        extras: dict[int, str] | None = None,
+    ) -> None:
+        self.codes = codes
+        self.attrs = attrs
+        self.extras = extras
+        # OutputBuffer line the row (approximately) came from
+        self.line = -1
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        size = sys.getsizeof(self) + sys.getsizeof(self.codes)
+        if self.attrs is not None:
+            size += sys.getsizeof(self.attrs)
+        if self.extras:
+            size += sys.getsizeof(self.extras)
+        return size
+
+    def plain(self, width: int) -> str:
+        """First *width* stored cells, one character per cell."""
+        codes = self.codes[:width]
+        if codes.typecode == "B":
+            text = codes.tobytes().decode("latin-1")
+        else:
+            text = "".join(map(chr, codes))
+        return text.replace("\x00", " ")
+
+    def cells(self, width: int) -> list[str]:
+        """Per-cell text for the first *width* stored cells."""
+        cells = list(self.plain(width))
+        if self.extras:
+            for x, data in self.extras.items():
+                if x < len(cells):
+                    cells[x] = data
+        return cells
+
+    def text(self, width: int) -> str:
+        """Row text clipped or blank-padded to *width* cells."""
+        stored = min(width, len(self.codes))
+        if self.extras:
+            text = "".join(self.cells(stored))
+        else:
+            text = self.plain(stored)
+        return text + " " * (width - stored)
+
+
 class TAMEScreen(pyte.HistoryScreen):
     """HistoryScreen subclass with alternate screen buffer support.
 
@@ -85,6 +312,235 @@ class TAMEScreen(pyte.HistoryScreen):
         None  # pyte's buffer (defaultdict of StaticDefaultDict)
     )
     _saved_cursor: tuple | None = None  # (x, y, attrs, hidden)
+    _saved_row_lines: list[int] | None = None
+    # Absolute OutputBuffer line being drawn, advanced by whoever feeds the
+    # screen.  Lines before history_floor were cleared from scrollback
+    # (ED 3 / RIS).
+    line_number: int = 0
+    history_floor: int = 0
+    # line_number each screen row was last entered or drawn on (-1 when
+    # unknown); packed rows carry their row's stamp into history.  A wrapped
+    # or ESC D scrolled row keeps the line it belongs to.
+    row_lines: list[int]
+    # Set when older scrollback is derived from the OutputBuffer
+    derived_scrollback: bool = False
+
+    # HistoryScreen wraps every event handler looked up on the instance in
+    # before/after_event hooks, even from inside pyte's own methods.  They
+    # serve pyte's paging (replaced by the viewer) and keep cursor.hidden in
+    # step with DECTCEM, which _sync_cursor_visibility() does instead.
+    __getattribute__ = object.__getattribute__
+
+    def __init__(
+        self, columns: int, lines: int, history: int = 100, ratio: float = 0.5
+    ) -> None:
+        super().__init__(columns, lines, history=history, ratio=ratio)
+        # Rows scrolled off the top are packed into _CompactRow; rows pushed
+        # off the bottom by reverse_index() were only ever needed for pyte's
+        # own paging, which TAME doesn't use, so they are dropped.
+        self.history = self.history._replace(
+            top=_IndexedHistory(history),  # type: ignore[arg-type]
+            bottom=deque(maxlen=0),
+        )
+        self.attr_table = _AttrTable(self.default_char)
+        self.history_nbytes = 0
+        self._ascii_cells: dict[Char, dict[str, Char]] = {}
+        self._char_attr_ids: dict[Char, int] = {}
+
+    def index(self) -> None:
+        """Move the cursor down, packing the row that scrolls off into history.
+
+        Same as ``Screen.index`` otherwise.
+        """
+        top, bottom = self.margins or Margins(0, self.lines - 1)
+        row_lines = self.row_lines
+        if self.cursor.y != bottom:
+            self.cursor_down()
+            row_lines[self.cursor.y] = self.line_number
+            return
+        buffer = self.buffer
+        history: _IndexedHistory = self.history.top  # type: ignore[assignment]
+        packed = self._pack_row(buffer[top])
+        line = row_lines[top]
+        if line < 0:
+            # Never entered or drawn on: err late, so the seam with derived
+            # scrollback can repeat a line but never skip one
+            line = next((n for n in row_lines[top + 1 : bottom + 1] if n >= 0), -1)
+            if line < 0:
+                line = self.line_number
+        packed.line = line
+        evicted = history.append(packed)
+        self.history_nbytes += packed.nbytes
+        if evicted is not None:
+            self.history_nbytes -= evicted.nbytes
+            if self.derived_scrollback:
+                # Drop what's left of a wrapped line whose first rows were
+                # just evicted; derived scrollback then renders that line
+                # whole.  The last row stays so history[0].line still marks
+                # the seam.
+                while len(history) > 1 and history[0].line == evicted.line:
+                    self.history_nbytes -= history.popleft().nbytes
+        self.dirty.update(range(self.lines))
+        for y in range(top, bottom):
+            buffer[y] = buffer[y + 1]
+        buffer.pop(bottom, None)
+        del row_lines[top]
+        row_lines.insert(bottom, self.line_number)
+
+    def reverse_index(self) -> None:
+        top, bottom = self.margins or Margins(0, self.lines - 1)
+        if self.cursor.y == top:
+            self._shift_row_lines(top, bottom, 1)
+        super().reverse_index()
+
+    def insert_lines(self, count=None) -> None:
+        top, bottom = self.margins or Margins(0, self.lines - 1)
+        if top <= self.cursor.y <= bottom:
+            self._shift_row_lines(self.cursor.y, bottom, count or 1)
+        super().insert_lines(count)
+
+    def delete_lines(self, count=None) -> None:
+        top, bottom = self.margins or Margins(0, self.lines - 1)
+        if top <= self.cursor.y <= bottom:
+            self._shift_row_lines(self.cursor.y, bottom, -(count or 1))
+        super().delete_lines(count)
+
+    def erase_in_display(self, how: int = 0, *args, **kwargs) -> None:
+        super().erase_in_display(how, *args, **kwargs)
+        y = self.cursor.y
+        blank = {0: range(y + 1, self.lines), 1: range(y)}.get(how, range(self.lines))
+        for row in blank:
+            self.row_lines[row] = -1
+
+    def reset(self) -> None:
+        super().reset()
+        self.reset_row_lines()
+
+    def reset_row_lines(self) -> None:
+        """Forget every row's stamp; the cursor row is on ``line_number``."""
+        self.row_lines = [-1] * self.lines
+        self.row_lines[self.cursor.y] = self.line_number
+
+    def _shift_row_lines(self, top: int, bottom: int, count: int) -> None:
+        """Move the stamps of rows *top*..*bottom* down by *count* (up if < 0)."""
+        span = bottom + 1 - top
+        rows = self.row_lines[top : bottom + 1]
+        if count > 0:
+            rows = [-1] * min(count, span) + rows[: max(0, span - count)]
+        else:
+            rows = rows[-count:] + [-1] * min(-count, span)
+        self.row_lines[top : bottom + 1] = rows
+
+    def draw(self, data: str) -> None:
+        """Write *data* at the cursor.
+
+        Printable ASCII runs (the bulk of agent output) are written a line
+        segment at a time from shared per-attribute ``Char`` tables; other
+        text goes through pyte's per-character path.
+        """
+        self.row_lines[self.cursor.y] = self.line_number
+        if (
+            self.charset
+            or self.g0_charset is not pyte_charsets.LAT1_MAP
+            or pyte_modes.IRM in self.mode
+            or pyte_modes.DECAWM not in self.mode
+        ):
+            super().draw(data)
+            return
+        for match in _ASCII_SPLIT_RE.finditer(data):
+            if match.group(1) is None:
+                super().draw(match.group())
+            else:
+                self._draw_ascii(match.group())
+
+    def _draw_ascii(self, text: str) -> None:
+        cursor = self.cursor
+        columns = self.columns
+        cells = self._ascii_cells.get(cursor.attrs)
+        if cells is None:
+            if len(self._ascii_cells) >= 256:
+                self._ascii_cells.clear()
+            cells = {ch: cursor.attrs._replace(data=ch) for ch in _ASCII_PRINTABLE}
+            self._ascii_cells[cursor.attrs] = cells
+        offset = 0
+        length = len(text)
+        while offset < length:
+            if cursor.x >= columns:
+                self.dirty.add(cursor.y)
+                self.carriage_return()
+                self.linefeed()
+            take = min(length - offset, columns - cursor.x)
+            x = cursor.x
+            self.buffer[cursor.y].update(
+                zip(
+                    range(x, x + take),
+                    map(cells.__getitem__, text[offset : offset + take]),
+                )
+            )
+            cursor.x = x + take
+            offset += take
+        self.dirty.add(cursor.y)
+
+    def prev_page(self) -> None:
+        """Disabled: the viewer pages through history itself."""
+
+    def next_page(self) -> None:
+        """Disabled: the viewer pages through history itself."""
+
+    def _reset_history(self) -> None:
+        super()._reset_history()
+        self.history_nbytes = 0
+        self.history_floor = self.line_number
+
+    def _pack_row(self, row) -> _CompactRow:
+        """Pack a pyte row (dict of ``Char``) into a :class:`_CompactRow`."""
+        default = self.default_char
+        width = min(self.columns, max(row, default=-1) + 1)
+        chars = [row.get(x) or default for x in range(width)]
+        end = width
+        while end and chars[end - 1] == default:
+            end -= 1
+        del chars[end:]
+
+        datas = [char.data for char in chars]
+        text = "".join(datas)
+        extras: dict[int, str] | None = None
+        if len(text) == end and "" not in datas:
+            codes = list(map(ord, text))
+        else:
+            # Wide-character placeholders ("") or combining sequences
+            codes = []
+            for x, data in enumerate(datas):
+                if len(data) == 1:
+                    codes.append(ord(data))
+                elif not data:
+                    codes.append(0)
+                else:
+                    codes.append(ord(data[0]))
+                    if extras is None:
+                        extras = {}
+                    extras[x] = data
+
+        # Cells are mostly shared Char instances, so look ids up per Char
+        # and only intern the misses.
+        char_ids = self._char_attr_ids
+        found = list(map(char_ids.get, chars))
+        if None in found:
+            if len(char_ids) > 0x10000:
+                char_ids.clear()
+            intern = self.attr_table.intern
+            for x, attr_id in enumerate(found):
+                if attr_id is None:
+                    char = chars[x]
+                    found[x] = char_ids[char] = intern(char[1:])
+        attrs = cast("list[int]", found)
+
+        top_code = max(codes, default=0)
+        typecode = "B" if top_code < 0x100 else "H" if top_code < 0x10000 else "I"
+        packed_attrs = None
+        if any(attrs):
+            packed_attrs = array("H" if max(attrs) < 0x10000 else "I", attrs)
+        return _CompactRow(array(typecode, codes), packed_attrs, extras)
 
     def set_mode(self, *modes, **kwargs):
         private = kwargs.get("private", False)
@@ -104,6 +560,7 @@ class TAMEScreen(pyte.HistoryScreen):
         remaining = [m for m in modes if m not in handled]
         if remaining:
             super().set_mode(*remaining, **kwargs)
+        self._sync_cursor_visibility()
 
     def reset_mode(self, *modes, **kwargs):
         private = kwargs.get("private", False)
@@ -123,9 +580,17 @@ class TAMEScreen(pyte.HistoryScreen):
         remaining = [m for m in modes if m not in handled]
         if remaining:
             super().reset_mode(*remaining, **kwargs)
+        self._sync_cursor_visibility()
+
+    def restore_cursor(self) -> None:
+        super().restore_cursor()
+        self._sync_cursor_visibility()
 
     # ------------------------------------------------------------------
 
+    def _sync_cursor_visibility(self) -> None:
+        self.cursor.hidden = pyte_modes.DECTCEM not in self.mode
+
     def _save_cursor(self) -> None:
         cursor = self.cursor
         self._saved_cursor = (
@@ -147,12 +612,17 @@ class TAMEScreen(pyte.HistoryScreen):
     def resize(self, lines=None, columns=None):
         old_columns = self.columns
         super().resize(lines=lines, columns=columns)
+        # Shrinking already dropped the top stamps through delete_lines()
+        self.row_lines = self._fit_row_lines(self.row_lines)
         if self._alt_active and self._saved_buffer is not None:
             if self.columns < old_columns:
                 for line in self._saved_buffer.values():  # type: ignore[union-attr]
                     for x in range(self.columns, old_columns):
                         line.pop(x, None)
 
+    def _fit_row_lines(self, row_lines: list[int]) -> list[int]:
+        return (row_lines + [-1] * self.lines)[: self.lines]
+
     def _enter_alt_screen(self, *, save_cursor: bool) -> None:
         if self._alt_active:
             return
@@ -170,6 +640,8 @@ class TAMEScreen(pyte.HistoryScreen):
         # O(1) reference swap — keeps full StaticDefaultDict semantics
         self._saved_buffer = self.buffer
         self.buffer = defaultdict(lambda: StaticDefaultDict(self.default_char))
+        self._saved_row_lines = self.row_lines
+        self.row_lines = [-1] * self.lines
 
         self.cursor.x = 0
         self.cursor.y = 0
@@ -189,6 +661,9 @@ class TAMEScreen(pyte.HistoryScreen):
         # O(1) reference restore
         self.buffer = self._saved_buffer  # type: ignore[assignment]
         self._saved_buffer = None
+        # The saved stamps missed any resize made on the alternate screen
+        self.row_lines = self._fit_row_lines(self._saved_row_lines or [])
+        self._saved_row_lines = None
 
         if restore_cursor:
             self._restore_cursor()
@@ -196,22 +671,368 @@ class TAMEScreen(pyte.HistoryScreen):
         self.dirty.update(range(self.lines))
 
 
+class _DerivedScrollback:
+    """Scrollback rows re-rendered on demand from an OutputBuffer's raw lines.
+
+    Covers the lines older than the emulator's own (bounded) history, so a
+    cached session keeps one copy of its old output instead of two.  Row
+    counts come from each line's display width; only lines that are viewed
+    get rendered, and those sit in a small LRU cache.
+    """
+
+    _MAX_CACHED_LINES: int = 256
+
+    __slots__ = (
+        "_buffer",
+        "_cache",
+        "_columns",
+        "_cum",
+        "_scratch",
+        "_screen",
+        "_stream",
+        "_widths",
+        "_widths_start",
+    )
+
+    def __init__(self, output_buffer: OutputBuffer, screen: TAMEScreen) -> None:
+        self._buffer = output_buffer
+        self._screen = screen
+        # Display width per raw line from _widths_start on, and the running
+        # row total at the start of each of those lines (one extra entry).
+        self._widths = array("I")
+        self._cum = array("Q", [0])
+        self._widths_start = output_buffer.first_line_number
+        self._columns = screen.columns
+        self._cache: OrderedDict[int, list[_CompactRow]] = OrderedDict()
+        self._scratch: TAMEScreen | None = None
+        self._stream: pyte.Stream | None = None
+
+    @property
+    def nbytes(self) -> int:
+        size = sys.getsizeof(self._widths) + sys.getsizeof(self._cum)
+        for rows in self._cache.values():
+            size += sum(row.nbytes for row in rows)
+        return size
+
+    def row_count(self, start: int, end: int) -> int:
+        """Rows the raw lines ``[start, end)`` wrap to at the screen width."""
+        self._sync(start, end)
+        base = self._widths_start
+        return self._cum[end - base] - self._cum[start - base]
+
+    def row(self, start: int, index: int) -> _CompactRow:
+        """Row *index* counted from raw line *start* (after ``row_count``)."""
+        base = self._widths_start
+        target = self._cum[start - base] + index
+        offset = bisect_right(self._cum, target) - 1
+        rows = self._rows_for_line(base + offset, self._widths[offset])
+        return rows[target - self._cum[offset]]
+
+    def row_of_line(self, start: int, line: int) -> int:
+        """First row of raw *line*, counted from raw line *start*."""
+        base = self._widths_start
+        return self._cum[line - base] - self._cum[start - base]
+
+    def _rows_for(self, width: int) -> int:
+        return max(1, -(-width // self._columns))
+
+    def _sync(self, start: int, end: int) -> None:
+        base = self._widths_start
+        widths = self._widths
+        if not base <= start <= base + len(widths):
+            # Buffer cleared or jumped ahead; start over
+            self._widths = widths = array("I")
+            self._cum = array("Q", [0])
+            self._widths_start = base = start
+            self._cache.clear()
+        elif start - base > max(1024, len(widths) // 2):
+            # Drop lines evicted from the buffer, amortised
+            drop = start - base
+            del widths[:drop]
+            first = self._cum[drop]
+            self._cum = array("Q", (total - first for total in self._cum[drop:]))
+            self._widths_start = base = start
+
+        columns = self._screen.columns
+        if columns != self._columns:
+            self._columns = columns
+            self._cache.clear()
+            cum = array("Q", [0])
+            for width in widths:
+                cum.append(cum[-1] + self._rows_for(width))
+            self._cum = cum
+
+        have = base + len(widths)
+        if end > have:
+            cum = self._cum
+            for line in self._buffer.iter_lines(have, end):
+                width = _display_width(line)
+                widths.append(width)
+                cum.append(cum[-1] + self._rows_for(width))
+
+    def _rows_for_line(self, number: int, width: int) -> list[_CompactRow]:
+        rows = self._cache.get(number)
+        if rows is not None:
+            self._cache.move_to_end(number)
+            return rows
+        rows = self._render(self._buffer.line(number) or "", self._rows_for(width))
+        self._cache[number] = rows
+        if len(self._cache) > self._MAX_CACHED_LINES:
+            self._cache.popitem(last=False)
+        return rows
+
+    def _render(self, text: str, count: int) -> list[_CompactRow]:
+        """Run one raw line through a 1-row scratch screen and pack the rows."""
+        scratch = self._scratch
+        if (
+            scratch is None
+            or scratch.columns != self._columns
+            or scratch.history.top.maxlen < count  # type: ignore[operator]
+        ):
+            scratch = TAMEScreen(columns=self._columns, lines=1, history=max(count, 16))
+            # Share attribute ids with the screen the rows are drawn for
+            scratch.attr_table = self._screen.attr_table
+            scratch._char_attr_ids = self._screen._char_attr_ids
+            self._scratch = scratch
+            self._stream = pyte.Stream(scratch)
+        else:
+            scratch.reset()
+        assert self._stream is not None
+        self._stream.feed(text)
+        history: _IndexedHistory = scratch.history.top  # type: ignore[assignment]
+        rows: list[_CompactRow] = list(history)
+        rows.append(scratch._pack_row(scratch.buffer[0]))
+        if len(rows) < count:
+            rows.extend(_CompactRow(array("B")) for _ in range(count - len(rows)))
+        return rows[:count]
+
+
 class _TerminalState:
-    """Cached pyte terminal state for a single session."""
+    """Cached pyte terminal state for a single session.
 
-    __slots__ = ("session_id", "screen", "stream")
+    With an *output_buffer*, scrollback older than the emulator's own
+    *history* rows is derived from the buffer's raw lines on demand.
+    """
+
+    __slots__ = (
+        "_basic",
+        "_csi",
+        "_draw",
+        "derived",
+        "origin",
+        "output_buffer",
+        "screen",
+        "session_id",
+        "stream",
+    )
 
-    def __init__(self, session_id: str, rows: int, cols: int) -> None:
+    def __init__(
+        self,
+        session_id: str,
+        rows: int,
+        cols: int,
+        output_buffer: OutputBuffer | None = None,
+        history: int = 10000,
+    ) -> None:
         self.session_id = session_id
-        self.screen = TAMEScreen(columns=cols, lines=rows, history=10000)
+        self.screen = TAMEScreen(columns=cols, lines=rows, history=history)
         self.stream = pyte.Stream(self.screen)
+        self.output_buffer = output_buffer
+        self.derived: _DerivedScrollback | None = None
+        # First OutputBuffer line the emulator has seen; earlier lines are
+        # derived scrollback
+        self.origin = 0
+        if output_buffer is not None:
+            self.origin = output_buffer.first_line_number
+            self.screen.line_number = output_buffer.first_line_number
+            self.screen.history_floor = output_buffer.first_line_number
+            self.screen.reset_row_lines()
+            self.screen.derived_scrollback = True
+            self.derived = _DerivedScrollback(output_buffer, self.screen)
+        screen = self.screen
+        self._draw = screen.draw
+        # SO/SI are ignored in UTF-8 mode, as pyte does
+        self._basic = {
+            char: getattr(screen, name)
+            for char, name in pyte.Stream.basic.items()
+            if char not in "\x0e\x0f"
+        }
+        self._csi = {
+            final: getattr(screen, name) for final, name in pyte.Stream.csi.items()
+        }
+
+    def replay(self) -> None:
+        """Feed the output buffer, as on first visit to a session.
+
+        Only the lines the emulator itself keeps (screen plus history) are
+        emulated; older ones are derived scrollback either way.
+        """
+        assert self.output_buffer is not None
+        text = self.output_buffer.get_all_text()
+        if text and not self.output_buffer.partial:
+            # get_all_text() drops the newline ending the last complete line
+            text += "\n"
+        if text:
+            history: _IndexedHistory = self.screen.history.top  # type: ignore[assignment]
+            self.fast_forward(text, self.screen.lines + history.maxlen)
 
     def feed(self, text: str) -> None:
-        self.stream.feed(text)
+        """Feed *text* to the screen.
+
+        One regex splits the chunk into printable runs, C0 controls and plain
+        CSI sequences, which are dispatched directly.  Anything else (OSC,
+        charset designations, sequences split across chunks) is handed to
+        pyte's parser one character at a time until it is back in its ground
+        state, so the end result matches ``Stream.feed``.
+        """
+        stream = self.stream
+        send = stream._send_to_parser
+        match = _VT_TOKEN_RE.match
+        draw = self._draw
+        basic = self._basic
+        csi = self._csi
+        in_sequence = not stream._taking_plain_text
+        offset = 0
+        length = len(text)
+        screen = self.screen
+        while offset < length:
+            token = None if in_sequence else match(text, offset)
+            if token is None:
+                char = text[offset]
+                if char == "\n":
+                    screen.line_number += 1
+                in_sequence = not send(char)
+                offset += 1
+                continue
+            offset = token.end()
+            run, control, private, params, final = token.groups()
+            if run is not None:
+                draw(run)
+            elif control is not None:
+                if control == "\n":
+                    screen.line_number += 1
+                handler = basic.get(control)
+                if handler is not None:
+                    handler()
+            else:
+                handler = csi.get(final)
+                if handler is None or (private and final not in "hl"):
+                    # Unknown or unusual; let pyte decide what it means
+                    for char in token.group():
+                        send(char)
+                    continue
+                args = [min(int(param or 0), 9999) for param in params.split(";")]
+                if private:
+                    handler(*args, private=True)
+                else:
+                    handler(*args)
+        stream._taking_plain_text = not in_sequence
+
+    def fast_forward(self, text: str, keep_lines: int) -> None:
+        """Feed *text*, emulating only its last *keep_lines* lines.
+
+        The skipped lines are left to the derived scrollback, and the private
+        modes and SGR attributes they set are replayed so the tail renders as
+        it would have.  Falls back to ``feed()`` where skipping could change
+        the final frame: without an output buffer, on or switching to the
+        alternate screen or with a scroll region (full-screen apps redraw
+        incrementally) or inside an escape sequence.
+        """
+        screen = self.screen
+        if (
+            self.derived is None
+            or screen._alt_active
+            or screen.margins is not None
+            or not self.stream._taking_plain_text
+            or _SCROLL_REGION_RE.search(text)
+        ):
+            self.feed(text)
+            return
+        cut = len(text)
+        for _ in range(keep_lines):
+            cut = text.rfind("\n", 0, cut)
+            if cut < 0:
+                self.feed(text)
+                return
+        skipped = text[: cut + 1]
+        if _ALT_SCREEN_RE.search(skipped):
+            # A full-screen app started in the skipped part draws its frame
+            # there, and the alternate screen has no scrollback to derive
+            self.feed(text)
+            return
+        reset = max(skipped.rfind("\x1b[0m"), skipped.rfind("\x1b[m"), 0)
+        state = _PRIVATE_MODE_RE.findall(skipped) + _SGR_RE.findall(skipped, reset)
+
+        history: _IndexedHistory = screen.history.top  # type: ignore[assignment]
+        history.clear()
+        screen.history_nbytes = 0
+        screen.erase_in_display(2)
+        screen.cursor_position()
+        screen.line_number += skipped.count("\n")
+        self.origin = screen.line_number
+        screen.reset_row_lines()
+        self.feed("".join(state) + text[cut + 1 :])
 
     def resize(self, rows: int, cols: int) -> None:
         self.screen.resize(lines=rows, columns=cols)
 
+    def _derived_range(self) -> tuple[int, int]:
+        """Raw lines ``[start, end)`` older than the emulator's history."""
+        assert self.output_buffer is not None
+        screen = self.screen
+        history: _IndexedHistory = screen.history.top  # type: ignore[assignment]
+        start = max(self.output_buffer.first_line_number, screen.history_floor)
+        if history.appended <= len(history) or not history:
+            # Emulator history holds everything since it started
+            end = self.origin
+        else:
+            end = history[0].line
+        end = min(end, self.output_buffer.total_lines_received)
+        return start, max(start, end)
+
+    def scrollback_length(self) -> int:
+        """Rows of scrollback above the live screen."""
+        length = len(self.screen.history.top)
+        if self.derived is not None:
+            length += self.derived.row_count(*self._derived_range())
+        return length
+
+    def scrollback_row(self, index: int) -> _CompactRow:
+        """Scrollback row *index*, oldest first."""
+        if self.derived is not None:
+            start, end = self._derived_range()
+            derived = self.derived.row_count(start, end)
+            if index < derived:
+                return self.derived.row(start, index)
+            index -= derived
+        return self.screen.history.top[index]  # type: ignore[return-value]
+
+    def scrollback_row_of_output_line(self, line: int) -> int | None:
+        """Scrollback row where absolute OutputBuffer *line* starts.
+
+        Only known exactly for lines in the derived part of the scrollback.
+        """
+        if self.derived is None:
+            return None
+        start, end = self._derived_range()
+        if not start <= line < end:
+            return None
+        self.derived.row_count(start, end)
+        return self.derived.row_of_line(start, line)
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the live screen(s) and packed history."""
+        screen = self.screen
+        buffers = [screen.buffer]
+        if screen._saved_buffer is not None:
+            buffers.append(screen._saved_buffer)  # type: ignore[arg-type]
+        live = 0
+        for buffer in buffers:
+            for row in buffer.values():
+                live += sys.getsizeof(row) + len(row) * _CHAR_NBYTES
+        derived = self.derived.nbytes if self.derived is not None else 0
+        return live + screen.history_nbytes + derived
+
 
 class SessionViewer(Widget):
     """PTY-backed terminal viewport for the currently active session."""
@@ -229,10 +1050,28 @@ class SessionViewer(Widget):
 
     # Target ≤60 UI updates/sec per session
     _RENDER_INTERVAL: float = 1.0 / 60
+    # Quiet period before a resize reaches the emulator and the PTY
+    _RESIZE_DEBOUNCE: float = 0.1
+    # Firehose mode: while the active session outputs more than this many
+    # characters/sec (measured over _FIREHOSE_WINDOW), output is queued and
+    # each frame emulates only the lines it can show
+    _FIREHOSE_CHARS_PER_SEC: int = 250_000
+    _FIREHOSE_WINDOW: float = 0.25
+    _FIREHOSE_RENDER_INTERVAL: float = 0.1
+    # Lines emulated per fast-forwarded frame beyond the screen height
+    _FIREHOSE_EXTRA_LINES: int = 100
     _FALLBACK_MAX_CHARS: int = 500_000
 
     # Maximum cached terminal states (LRU eviction for memory)
     _MAX_CACHED_TERMINALS: int = 5
+    # Rows of scrollback each cached emulator keeps itself; older rows are
+    # re-rendered from the session's OutputBuffer when scrolled to.
+    _EMULATOR_HISTORY_ROWS: int = 1000
+
+    # Rows moved per mouse-wheel notch (Shift+wheel moves a page)
+    _WHEEL_LINES: int = 3
+    # How far (in pages) reveal_output_line() looks around its estimate
+    _SEARCH_WINDOW_PAGES: int = 4
 
     def __init__(self) -> None:
         super().__init__(id="session-viewer")
@@ -252,6 +1091,11 @@ class SessionViewer(Widget):
         self._auto_scroll: bool = True
         self._dirty: bool = False
         self._refresh_timer: Timer | None = None
+        self._resize_timer: Timer | None = None
+        self._firehose: bool = False
+        self._firehose_pending: list[str] = []
+        self._rate_window_start: float = time.monotonic()
+        self._rate_window_chars: int = 0
         # In-session search state
         self._search_matches: list[
             tuple[int, int, int]
@@ -268,9 +1112,25 @@ class SessionViewer(Widget):
             self._schedule_refresh()
             return
 
+        self._rate_window_chars += len(text)
+        self._update_firehose()
+        if self._firehose:
+            self._firehose_pending.append(text)
+            self._schedule_refresh()
+            return
+
+        history: _IndexedHistory = self._active_terminal.screen.history.top  # type: ignore[assignment]
+        appended_before = history.appended
         self._active_terminal.feed(text)
         if self._auto_scroll:
             self._scroll_offset = 0
+        elif self._scroll_offset > 0:
+            # Keep the scrolled-back view pinned while new rows push into
+            # history underneath it.
+            self._scroll_offset = min(
+                self._scroll_offset + history.appended - appended_before,
+                self.history_length,
+            )
         self._schedule_refresh()
 
     def _schedule_refresh(self) -> None:
@@ -278,18 +1138,79 @@ class SessionViewer(Widget):
         if self._dirty:
             return  # Already scheduled
         self._dirty = True
+        interval = (
+            self._FIREHOSE_RENDER_INTERVAL if self._firehose else self._RENDER_INTERVAL
+        )
         self._refresh_timer = self.set_timer(
-            self._RENDER_INTERVAL, self._flush_refresh, name="viewer_refresh"
+            interval, self._flush_refresh, name="viewer_refresh"
         )
 
     def _flush_refresh(self) -> None:
         """Flush a pending refresh."""
         self._dirty = False
         self._refresh_timer = None
+        if self._firehose:
+            self._fast_forward_pending()
+            self._update_firehose()
+            if self._firehose:
+                # Keep ticking so the mode ends once output slows down
+                self._schedule_refresh()
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Firehose mode
+    # ------------------------------------------------------------------
+
+    def _update_firehose(self) -> None:
+        """Enter or leave firehose mode based on the active session's rate."""
+        now = time.monotonic()
+        elapsed = now - self._rate_window_start
+        budget = self._FIREHOSE_CHARS_PER_SEC * self._FIREHOSE_WINDOW
+        if elapsed < self._FIREHOSE_WINDOW:
+            if not self._firehose and self._rate_window_chars >= budget:
+                self._set_firehose(True)
+            return
+        rate = self._rate_window_chars / elapsed
+        self._rate_window_start = now
+        self._rate_window_chars = 0
+        self._set_firehose(rate >= self._FIREHOSE_CHARS_PER_SEC)
+
+    def _set_firehose(self, active: bool) -> None:
+        if active == self._firehose:
+            return
+        if not active:
+            self._fast_forward_pending()
+        self._firehose = active
+        self.post_message(ViewerFastForward(active))
         self.refresh()
 
+    def _leave_firehose(self) -> None:
+        """Catch up on queued output before the active terminal changes."""
+        self._set_firehose(False)
+        self._rate_window_start = time.monotonic()
+        self._rate_window_chars = 0
+
+    def _fast_forward_pending(self) -> None:
+        """Feed queued firehose output, skipping lines no frame will show."""
+        pending = self._firehose_pending
+        terminal = self._active_terminal
+        if not pending or terminal is None:
+            pending.clear()
+            return
+        text = "".join(pending)
+        pending.clear()
+        pinned = not self._auto_scroll and self._scroll_offset > 0
+        before = self.history_length if pinned else 0
+        terminal.fast_forward(text, terminal.screen.lines + self._FIREHOSE_EXTRA_LINES)
+        if self._auto_scroll:
+            self._scroll_offset = 0
+        elif pinned:
+            length = self.history_length
+            self._scroll_offset = min(self._scroll_offset + length - before, length)
+
     def load_session(self, session_id: str, output_buffer: OutputBuffer) -> None:
         """Switch to a session, replaying its buffer only on first visit."""
+        self._leave_firehose()
         self._has_session = True
         self._scroll_offset = 0
         self._auto_scroll = True
@@ -303,8 +1224,10 @@ class SessionViewer(Widget):
             return
 
         if session_id in self._terminals:
-            # Already cached — instant swap
+            # Already cached — instant swap, catching up on any resize that
+            # happened while it was in the background
             self._active_terminal = self._terminals[session_id]
+            self._fit_terminal(self._active_terminal)
             self._touch_lru(session_id)
             self.refresh()
             return
@@ -312,16 +1235,23 @@ class SessionViewer(Widget):
         # First visit — create terminal state and replay buffer
         rows = max(1, self.size.height or self._rows)
         cols = max(1, self.size.width or self._cols)
-        terminal = _TerminalState(session_id, rows, cols)
-        full_text = output_buffer.get_all_text()
-        if full_text:
-            terminal.feed(full_text)
+        terminal = _TerminalState(
+            session_id, rows, cols, output_buffer, history=self._EMULATOR_HISTORY_ROWS
+        )
+        terminal.replay()
         self._terminals[session_id] = terminal
         self._active_terminal = terminal
         self._touch_lru(session_id)
         self._evict_lru()
         self.refresh()
 
+    def terminal_memory(self) -> dict[str, int]:
+        """Approximate bytes held by each cached terminal, keyed by session."""
+        return {
+            session_id: terminal.memory_bytes()
+            for session_id, terminal in self._terminals.items()
+        }
+
     def _touch_lru(self, session_id: str) -> None:
         """Move session_id to the end of the LRU list (most recently used)."""
         if session_id in self._terminal_lru:
@@ -347,6 +1277,7 @@ class SessionViewer(Widget):
         Kept for backward compatibility with tests and callers that don't
         track session IDs.
         """
+        self._leave_firehose()
         self._has_session = True
         full_text = output_buffer.get_all_text()
         if pyte is None:
@@ -356,15 +1287,21 @@ class SessionViewer(Widget):
 
         rows = max(1, self.size.height or self._rows)
         cols = max(1, self.size.width or self._cols)
-        terminal = _TerminalState("__legacy__", rows, cols)
-        if full_text:
-            terminal.feed(full_text)
+        terminal = _TerminalState(
+            "__legacy__",
+            rows,
+            cols,
+            output_buffer,
+            history=self._EMULATOR_HISTORY_ROWS,
+        )
+        terminal.replay()
         self._terminals["__legacy__"] = terminal
         self._active_terminal = terminal
         self.refresh()
 
     def show_snapshot(self, text: str) -> None:
         """Render a full-screen ANSI snapshot, replacing prior viewport state."""
+        self._leave_firehose()
         self._has_session = True
         self._scroll_offset = 0
         self._auto_scroll = True
@@ -380,6 +1317,18 @@ class SessionViewer(Widget):
         if terminal is not None:
             terminal.feed(text)
 
+    def reload_session(self, session_id: str, output_buffer: OutputBuffer) -> None:
+        """Rebuild *session_id*'s terminal from its buffer, even if active.
+
+        Used when output meant for the viewer was dropped before reaching it.
+        """
+        terminal = self._terminals.pop(session_id, None)
+        if terminal is None:
+            return
+        if self._active_terminal is terminal:
+            self._active_terminal = None
+            self.load_session(session_id, output_buffer)
+
     def invalidate_session(self, session_id: str) -> None:
         """Drop cached terminal state for a background session.
 
@@ -396,41 +1345,176 @@ class SessionViewer(Widget):
         """Discard cached terminal state for a deleted session."""
         terminal = self._terminals.pop(session_id, None)
         if self._active_terminal is terminal and terminal is not None:
+            self._leave_firehose()
             self._active_terminal = None
             self._has_session = bool(self._terminals)
             self.refresh()
 
     def on_resize(self, event: events.Resize) -> None:
-        rows = max(1, event.size.height)
-        cols = max(1, event.size.width)
-        self._rows = rows
-        self._cols = cols
+        """Repaint at the new size now; resize the emulator and PTY once the
+        size settles.
 
-        for terminal in self._terminals.values():
-            terminal.resize(rows, cols)
+        Dragging a window edge fires many Resize events; each PTY resize
+        sends SIGWINCH and makes agent TUIs redraw everything.  Only the
+        active terminal is resized; background ones catch up in
+        ``load_session()`` (and their PTYs when the app activates them).
+        """
+        self._rows = max(1, event.size.height)
+        self._cols = max(1, event.size.width)
+        if self._resize_timer is not None:
+            self._resize_timer.stop()
+        self._resize_timer = self.set_timer(
+            self._RESIZE_DEBOUNCE, self._apply_resize, name="viewer_resize"
+        )
+        self.refresh()
 
-        self.post_message(ViewerResized(rows, cols))
+    def _apply_resize(self) -> None:
+        self._resize_timer = None
+        if self._active_terminal is not None:
+            self._fit_terminal(self._active_terminal)
+        self.post_message(ViewerResized(self._rows, self._cols))
         self.refresh()
 
+    def _fit_terminal(self, terminal: _TerminalState) -> None:
+        screen = terminal.screen
+        if (screen.lines, screen.columns) != (self._rows, self._cols):
+            terminal.resize(self._rows, self._cols)
+
     def on_mouse_scroll_up(self, event: events.MouseScrollUp) -> None:
-        """Scroll up through history."""
-        history_len = (
-            len(self._active_terminal.screen.history.top)
-            if self._active_terminal
-            else 0
-        )
-        if history_len > 0:
-            self._scroll_offset = min(self._scroll_offset + 3, history_len)
-            self._auto_scroll = False
-            self.refresh()
+        """Scroll up through history (a full page with Shift held)."""
+        if event.shift:
+            self.scroll_page(up=True)
+        else:
+            self.scroll_lines(self._WHEEL_LINES)
 
     def on_mouse_scroll_down(self, event: events.MouseScrollDown) -> None:
-        """Scroll down toward live output."""
-        self._scroll_offset = max(0, self._scroll_offset - 3)
-        if self._scroll_offset == 0:
-            self._auto_scroll = True
+        """Scroll down toward live output (a full page with Shift held)."""
+        if event.shift:
+            self.scroll_page(up=False)
+        else:
+            self.scroll_lines(-self._WHEEL_LINES)
+
+    # ------------------------------------------------------------------
+    # Scrollback navigation
+    # ------------------------------------------------------------------
+
+    @property
+    def history_length(self) -> int:
+        """Number of scrollback rows above the live screen."""
+        if self._active_terminal is None:
+            return 0
+        return self._active_terminal.scrollback_length()
+
+    @property
+    def first_visible_line(self) -> int:
+        """Absolute scrollback line shown in the top row of the viewport.
+
+        Line 0 is the oldest history row; ``history_length`` is the first row
+        of the live screen.
+        """
+        return self.history_length - self._scroll_offset
+
+    def scroll_lines(self, delta: int) -> None:
+        """Scroll by *delta* rows; positive moves back into history."""
+        self._set_scroll_offset(self._scroll_offset + delta)
+
+    def scroll_page(self, up: bool = True) -> None:
+        """Scroll one viewport height, keeping one row of overlap."""
+        page = max(1, self._rows - 1)
+        self.scroll_lines(page if up else -page)
+
+    def scroll_to_top(self) -> None:
+        """Jump to the oldest row of scrollback."""
+        self._set_scroll_offset(self.history_length)
+
+    def scroll_to_bottom(self) -> None:
+        """Return to live output and resume auto-scroll."""
+        self._set_scroll_offset(0)
+
+    def jump_to_line(self, line: int) -> None:
+        """Scroll so absolute scrollback *line* is in view (upper third)."""
+        first = line - self._rows // 3
+        self._set_scroll_offset(self.history_length - first)
+
+    def reveal_output_line(self, lines_from_end: int, text: str = "") -> bool:
+        """Jump to an OutputBuffer line identified by its distance from the end.
+
+        Raw output lines map one-to-one onto rendered rows unless the line
+        wrapped or the program moved the cursor, so the estimate is refined
+        by looking for *text* in nearby rows.  Returns True if the line was
+        found (or no text was given), False if only the estimate was used.
+        """
+        terminal = self._active_terminal
+        if terminal is None:
+            return False
+        cursor_line = self.history_length + terminal.screen.cursor.y
+        estimate = max(0, cursor_line - lines_from_end)
+        if terminal.output_buffer is not None:
+            # Exact for lines old enough to be derived from the raw buffer
+            row = terminal.scrollback_row_of_output_line(
+                terminal.output_buffer.total_lines_received - lines_from_end
+            )
+            if row is not None:
+                estimate = row
+        found = True
+        if text:
+            match = self._find_line_near(text, estimate)
+            found = match is not None
+            if match is not None:
+                estimate = match
+        self.jump_to_line(estimate)
+        return found
+
+    def _set_scroll_offset(self, offset: int) -> None:
+        offset = max(0, min(offset, self.history_length))
+        if offset == self._scroll_offset and self._auto_scroll == (offset == 0):
+            return
+        self._scroll_offset = offset
+        self._auto_scroll = offset == 0
         self.refresh()
 
+    def _row_at_line(self, line: int):
+        """Return the row for absolute scrollback *line* (or None).
+
+        History rows are :class:`_CompactRow`; live screen rows are pyte dicts.
+        """
+        assert self._active_terminal is not None
+        screen = self._active_terminal.screen
+        history_length = self.history_length
+        if line < history_length:
+            return self._active_terminal.scrollback_row(line)
+        y = line - history_length
+        if 0 <= y < screen.lines:
+            return screen.buffer.get(y, {})
+        return None
+
+    def _row_text(self, row) -> str:
+        if isinstance(row, _CompactRow):
+            return row.text(self._cols)
+        chars = []
+        for x in range(self._cols):
+            char = row.get(x)
+            chars.append(" " if char is None else (char.data or " "))
+        return "".join(chars)
+
+    def _find_line_near(self, text: str, near: int) -> int | None:
+        """Find the row containing *text* closest to absolute line *near*."""
+        needle = text.strip().lower()[:80]
+        if not needle or self._active_terminal is None:
+            return None
+        total = self.history_length + self._active_terminal.screen.lines
+        window = max(self._rows, 1) * self._SEARCH_WINDOW_PAGES
+        for distance in range(window + 1):
+            for line in (near - distance, near + distance):
+                if not 0 <= line < total:
+                    continue
+                row = self._row_at_line(line)
+                if row is None:
+                    continue
+                if needle in self._row_text(row).lower():
+                    return line
+        return None
+
     def render(self) -> Text:
         if not self._has_session:
             return self._render_welcome()
@@ -600,39 +1684,22 @@ class SessionViewer(Widget):
         output = Text()
 
         if self._scroll_offset > 0:
-            # Render from scrollback history
-            history_lines = list(screen.history.top)
-            total_history = len(history_lines)
-
-            # Calculate which lines to show
+            # Render from scrollback history — indexed access, O(rows)
+            terminal = self._active_terminal
+            total_history = self.history_length
             start = max(0, total_history - self._scroll_offset)
 
-            # Mix history lines and screen lines
-            visible_lines: list[dict] = []
-            for i in range(start, min(start + rows, total_history)):
-                visible_lines.append(history_lines[i])
-
-            remaining = rows - len(visible_lines)
-            if remaining > 0:
-                for y in range(min(remaining, rows)):
-                    visible_lines.append(screen.buffer.get(y, {}))
-
-            for y_idx, row in enumerate(visible_lines[:rows]):
-                run_chars: list[str] = []
-                run_style: Style | None = None
-                for x in range(cols):
-                    char = row.get(x)
-                    symbol = " " if char is None else (char.data or " ")
-                    style = self._char_style(char)
-                    if style == run_style:
-                        run_chars.append(symbol)
-                    else:
-                        if run_chars:
-                            output.append("".join(run_chars), style=run_style)
-                        run_chars = [symbol]
-                        run_style = style
-                if run_chars:
-                    output.append("".join(run_chars), style=run_style)
+            # History rows first, then the top of the live screen
+            for y_idx in range(rows):
+                line = start + y_idx
+                if line < total_history:
+                    self._append_compact_row(
+                        output, terminal.scrollback_row(line), screen.attr_table, cols
+                    )
+                else:
+                    self._append_buffer_row(
+                        output, screen.buffer.get(line - total_history, {}), cols
+                    )
                 if y_idx < rows - 1:
                     output.append("\n")
         else:
@@ -653,9 +1720,9 @@ class SessionViewer(Widget):
                         highlight_cells[(my, mx)] = is_current
 
             for y in range(rows):
-                row = buffer.get(y, {})
-                run_chars = []
-                run_style = None
+                row: dict = buffer.get(y, {})
+                run_chars: list[str] = []
+                run_style: Style | None = None
                 for x in range(cols):
                     char = row.get(x)
                     symbol = " " if char is None else (char.data or " ")
@@ -690,6 +1757,64 @@ class SessionViewer(Widget):
 
         return output
 
+    def _append_buffer_row(self, output: Text, row, cols: int) -> None:
+        """Append a live pyte row (dict of ``Char``) as styled runs."""
+        run_chars: list[str] = []
+        run_style: Style | None = None
+        for x in range(cols):
+            char = row.get(x)
+            symbol = " " if char is None else (char.data or " ")
+            style = self._char_style(char)
+            if style == run_style:
+                run_chars.append(symbol)
+            else:
+                if run_chars:
+                    output.append("".join(run_chars), style=run_style)
+                run_chars = [symbol]
+                run_style = style
+        if run_chars:
+            output.append("".join(run_chars), style=run_style)
+
+    def _append_compact_row(
+        self, output: Text, row: _CompactRow, table: _AttrTable, cols: int
+    ) -> None:
+        """Append a packed history row, one span per run of equal attributes."""
+        stored = min(len(row), cols)
+        cells: str | list[str] = row.cells(stored) if row.extras else row.plain(stored)
+        attrs = row.attrs
+        if attrs is None:
+            if stored:
+                output.append("".join(cells), style=self._attr_style(table, 0))
+        else:
+            run_start = 0
+            for x in range(1, stored + 1):
+                if x == stored or attrs[x] != attrs[run_start]:
+                    output.append(
+                        "".join(cells[run_start:x]),
+                        style=self._attr_style(table, attrs[run_start]),
+                    )
+                    run_start = x
+        if stored < cols:
+            output.append(" " * (cols - stored), style=Style())
+
+    def _attr_style(self, table: _AttrTable, attr_id: int) -> Style:
+        style = table.styles.get(attr_id)
+        if style is None:
+            fg, bg, bold, italics, underscore, strikethrough, reverse = table.keys[
+                attr_id
+            ][:7]
+            style = self._style_from_attrs(
+                str(fg),
+                str(bg),
+                bool(bold),
+                bool(italics),
+                bool(underscore),
+                bool(strikethrough),
+                bool(reverse),
+            )
+            table.styles[attr_id] = style
+        return style
+
     @staticmethod
     @lru_cache(maxsize=1024)
     def _style_from_attrs(
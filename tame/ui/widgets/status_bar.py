@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from textual.widgets import Static
 
+from tame.utils.timeseries import format_bytes
+
 
 class StatusBar(Static):
     """Bottom status bar showing aggregate session stats and key hints."""
@@ -23,14 +25,32 @@ class StatusBar(Static):
         self._active: int = 0
         self._waiting: int = 0
         self._errors: int = 0
+        self._pending: int = 0
+        self._fast_forward: bool = False
+        self._output_dropped: int = 0
         self._refresh_display()
 
-    def update_stats(self, total: int, active: int, waiting: int, errors: int) -> None:
+    def update_stats(
+        self, total: int, active: int, waiting: int, errors: int, pending: int = 0
+    ) -> None:
         """Update the stats display."""
         self._total = total
         self._active = active
         self._waiting = waiting
         self._errors = errors
+        self._pending = pending
+        self._refresh_display()
+
+    def set_fast_forward(self, active: bool) -> None:
+        """Show or hide the firehose-mode badge."""
+        self._fast_forward = active
+        self._refresh_display()
+
+    def set_output_dropped(self, nbytes: int) -> None:
+        """Show how much of the active session's output skipped the viewer."""
+        if nbytes == self._output_dropped:
+            return
+        self._output_dropped = nbytes
         self._refresh_display()
 
     def _refresh_display(self) -> None:
@@ -39,8 +59,13 @@ class StatusBar(Static):
             f"Sessions: {self._total} | Active: {self._active} | "
             f"Waiting: {self._waiting} | Errors: {self._errors}"
         )
+        if self._pending:
+            stats += f" | Queued: {self._pending}"
+        if self._output_dropped:
+            stats += f" | UI skipped: {format_bytes(self._output_dropped)}"
         keys = (
             "F2 New | F3/F4 \u2190\u2192 | F6 Sidebar | F7/F8 \u25b6/\u23f8"
             " | F9 Rename | C-SPC Cmd | F12 Quit"
         )
-        self.update(f"{stats}  {keys}")
+        badge = "\u23e9 fast-forwarding | " if self._fast_forward else ""
+        self.update(f"{badge}{stats}  {keys}")
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import bisect
+
+# Bucket upper bounds in milliseconds, roughly 1-2-5 per decade
+_BOUNDS_MS: tuple[float, ...] = (
+    1,
+    2,
+    5,
+    10,
+    16,
+    25,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies; recording is O(log buckets).
+
+    Percentiles are reported as the upper bound of the bucket they fall in,
+    which is precise enough to tell "within a frame" from "visibly laggy".
+    """
+
+    def __init__(self, bounds_ms: tuple[float, ...] = _BOUNDS_MS) -> None:
+        self._bounds = bounds_ms
+        # One extra bucket for everything above the last bound
+        self._counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        self._counts[bisect.bisect_left(self._bounds, ms)] += 1
+        self.count += 1
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound (ms) of the bucket holding the *pct*-th percentile."""
+        if self.count == 0:
+            return 0.0
+        rank = pct / 100.0 * self.count
+        seen = 0
+        for bound, n in zip(self._bounds, self._counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """(upper bound ms, count) pairs; the last bound is ``inf``."""
+        return list(zip((*self._bounds, float("inf")), self._counts))
+
+    def summary(self) -> str:
+        if self.count == 0:
+            return "no samples"
+        return (
+            f"n={self.count} p50≤{self.percentile(50):.1f}ms "
+            f"p90≤{self.percentile(90):.1f}ms p99≤{self.percentile(99):.1f}ms "
+            f"max={self.max_ms:.1f}ms"
+        )
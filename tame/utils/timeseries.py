@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+
+_SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+
+class RingSeries:
+    """Fixed-capacity series of floats in a preallocated ``array('d')``.
+
+    Appending overwrites the oldest sample once full, so memory is
+    ``8 * capacity`` bytes however long the session runs.
+    """
+
+    __slots__ = ("_count", "_start", "_values")
+
+    def __init__(self, capacity: int) -> None:
+        self._values = array("d", bytes(8 * max(1, capacity)))
+        self._start = 0
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._values)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float) -> None:
+        capacity = len(self._values)
+        if self._count < capacity:
+            self._values[(self._start + self._count) % capacity] = value
+            self._count += 1
+        else:
+            self._values[self._start] = value
+            self._start = (self._start + 1) % capacity
+
+    def __iter__(self) -> Iterator[float]:
+        """Samples oldest first."""
+        end = self._start + self._count
+        capacity = len(self._values)
+        if end <= capacity:
+            yield from self._values[self._start : end]
+        else:
+            yield from self._values[self._start :]
+            yield from self._values[: end - capacity]
+
+    def last(self, n: int) -> list[float]:
+        """The newest *n* samples, oldest first."""
+        values = list(self)
+        return values[-n:] if n > 0 else []
+
+
+def format_bytes(nbytes: float) -> str:
+    """Compact human-readable size for the sidebar, header bar and graphs."""
+    if nbytes >= 1024**3:
+        return f"{nbytes / 1024**3:.1f}GB"
+    if nbytes >= 1024**2:
+        return f"{nbytes / 1024**2:.1f}MB"
+    return f"{nbytes / 1024:.0f}KB"
+
+
+def sparkline(
+    values: list[float], low: float | None = None, high: float | None = None
+) -> str:
+    """One block character per value, scaled between *low* and *high*.
+
+    The bounds default to the values' own min and max, so a slow climb
+    (a leak) still fills the height; pass fixed bounds for percentages.
+    """
+    if not values:
+        return ""
+    lo = min(values) if low is None else low
+    hi = max(values) if high is None else max(high, max(values))
+    span = hi - lo
+    if span <= 0:
+        return _SPARK_BLOCKS[0] * len(values)
+    top = len(_SPARK_BLOCKS) - 1
+    return "".join(
+        _SPARK_BLOCKS[max(0, min(top, round((v - lo) / span * top)))] for v in values
+    )
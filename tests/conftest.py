@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+@dataclass
+class RecordedRequest:
+    path: str
+    headers: dict[str, str]
+    body: bytes
+
+
+@dataclass
+class HTTPStandIn:
+    """Local HTTP/1.1 server standing in for Slack or a webhook endpoint."""
+
+    url: str
+    requests: list[RecordedRequest] = field(default_factory=list)
+    connections: int = 0
+    status: int = 200
+    # Picks the status per request instead, when set
+    respond: Callable[[RecordedRequest], int] | None = None
+    # Close the connection after each response instead of keeping it alive
+    close_after_response: bool = False
+    # Drop connections idle for this long, like a real server would
+    keepalive_timeout: float | None = None
+
+
+@pytest.fixture
+def http_standin() -> Iterator[HTTPStandIn]:
+    lock = threading.Lock()
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            self.timeout = standin.keepalive_timeout
+            super().setup()
+            with lock:
+                standin.connections += 1
+
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            request = RecordedRequest(self.path, dict(self.headers), body)
+            with lock:
+                standin.requests.append(request)
+            respond = standin.respond
+            self.send_response(respond(request) if respond else standin.status)
+            self.send_header("Content-Length", "2")
+            if standin.close_after_response:
+                self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *_args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    standin = HTTPStandIn(url=f"http://127.0.0.1:{server.server_address[1]}")
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield standin
+    server.shutdown()
+    server.server_close()
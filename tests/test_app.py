@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import datetime, timezone
 
 import pytest
@@ -9,19 +11,24 @@ from textual import events
 from textual.widgets import Input
 
 from tame.app import TAMEApp
+from tame.session.governor import LoadGovernor, PressureSample
+from tame.session.manager import _SpawnRequest
 from tame.session.output_buffer import OutputBuffer
 from tame.session.pattern_matcher import PatternMatcher
+from tame.session.resource_monitor import ResourceUsage
 from tame.session.session import Session
-from tame.session.state import AttentionState, ProcessState
+from tame.session.state import AttentionState, OutputKind, ProcessState
+from tame.session.tmux_control import TmuxCommandError
 from tame.ui.widgets import (
     CommandPalette,
     HeaderBar,
+    ResourceGraphs,
     SessionSidebar,
     SessionViewer,
     StatusBar,
     ToastOverlay,
 )
-from tame.ui.widgets.session_list_item import SessionListItem
+from tame.ui.widgets.session_sidebar import SessionList
 
 
 class _DummyTimer:
@@ -37,6 +44,9 @@ class _DummyViewer:
         self.appended: list[str] = []
         self.snapshots: list[str] = []
         self.invalidated: list[str] = []
+        self.reloaded: list[str] = []
+        # Also stands in for the status bar
+        self.output_dropped = 0
 
     def append_output(self, text: str) -> None:
         self.appended.append(text)
@@ -47,6 +57,12 @@ class _DummyViewer:
     def invalidate_session(self, session_id: str) -> None:
         self.invalidated.append(session_id)
 
+    def reload_session(self, session_id: str, _output_buffer: OutputBuffer) -> None:
+        self.reloaded.append(session_id)
+
+    def set_output_dropped(self, nbytes: int) -> None:
+        self.output_dropped = nbytes
+
 
 @pytest.fixture
 def app(tmp_path, monkeypatch) -> TAMEApp:
@@ -120,6 +136,17 @@ async def test_status_bar_initial_text(app: TAMEApp) -> None:
         assert "Sessions: 0" in text
 
 
+@pytest.mark.asyncio
+async def test_status_bar_shows_dropped_output(app: TAMEApp) -> None:
+    async with app.run_test():
+        bar = app.query_one(StatusBar)
+        assert "UI skipped" not in str(bar.render())
+        bar.set_output_dropped(3 * 1024 * 1024)
+        assert "UI skipped: 3.0MB" in str(bar.render())
+        bar.set_output_dropped(0)
+        assert "UI skipped" not in str(bar.render())
+
+
 @pytest.mark.asyncio
 async def test_header_bar_initial_text(app: TAMEApp) -> None:
     """Header bar should show just 'TAME' on launch with no session selected."""
@@ -134,8 +161,8 @@ async def test_new_session_creates_sidebar_item(app: TAMEApp) -> None:
     """Pressing F2 + Enter should create a session and add it to the sidebar."""
     async with app.run_test() as pilot:
         await _create_session_via_dialog(pilot)
-        items = app.query(SessionListItem)
-        assert len(items) == 1
+        rows = app.query_one(SessionSidebar).session_list.visible_session_ids()
+        assert len(rows) == 1
         bar = app.query_one(StatusBar)
         text = str(bar.render())
         assert "Sessions: 1" in text
@@ -253,7 +280,10 @@ async def test_click_sidebar_item_switches_session(app: TAMEApp) -> None:
         first_id = sessions[0].id
         second_id = sessions[1].id
         assert app._active_session_id == second_id
-        clicked = await pilot.click(f"#session-item-{first_id}")
+        session_list = app.query_one(SessionSidebar).session_list
+        row = session_list.row_of(first_id)
+        assert row is not None
+        clicked = await pilot.click(SessionList, offset=(2, row))
         assert clicked is True
         await pilot.pause()
         assert app._active_session_id == first_id
@@ -286,8 +316,8 @@ async def test_name_dialog_escape_cancels(app: TAMEApp) -> None:
         await pilot.pause()
         await pilot.press("escape")
         await pilot.pause()
-        items = app.query(SessionListItem)
-        assert len(items) == 0
+        rows = app.query_one(SessionSidebar).session_list.visible_session_ids()
+        assert rows == []
 
 
 @pytest.mark.asyncio
@@ -465,9 +495,207 @@ def test_non_redraw_chunk_still_batches(tmp_path, monkeypatch) -> None:
     assert app._output_flush_timer is not None
 
 
-def test_flush_pending_output_uses_tmux_snapshot_for_active(
+def test_pending_output_total_is_tracked_incrementally(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    app = TAMEApp()
+    app._active_session_id = "s1"
+    app._app_focused = True
+    monkeypatch.setattr(app, "set_timer", lambda *_args, **_kwargs: _DummyTimer())
+    flushed = {"count": 0}
+
+    def _fake_flush() -> None:
+        flushed["count"] += 1
+
+    monkeypatch.setattr(app, "_flush_pending_output", _fake_flush)
+
+    # The session layer's classification is trusted, not recomputed
+    app._handle_pty_output("s1", "x" * 100, OutputKind.STREAM)
+    app._handle_pty_output("s1", "\x1b[1A" + "y" * 100, OutputKind.STREAM)
+    assert flushed["count"] == 0
+    assert app._output_pending_total == 204
+    app._handle_pty_output("s1", "z", OutputKind.REDRAW)
+    assert flushed["count"] == 1
+
+    app._drop_pending_output("s1")
+    assert app._output_pending_total == 0
+
+
+def test_echo_latency_recorded_when_active_output_is_flushed(
     tmp_path, monkeypatch
 ) -> None:
+    app = _make_snapshot_app(tmp_path, monkeypatch, ["echo"])
+    app._tmux_snapshot_render = False
+    viewer = _DummyViewer()
+    monkeypatch.setattr(app, "query_one", lambda _selector, *_args, **_kwargs: viewer)
+    app._echo_sent_at = time.monotonic() - 0.003
+
+    app._flush_pending_output()
+
+    assert viewer.appended == ["echo"]
+    assert app._echo_latency.count == 1
+    assert 3.0 <= app._echo_latency.max_ms < 1000
+    assert app._echo_sent_at is None
+
+
+async def test_resource_history_sparklines_and_csv_export(
+    app: TAMEApp, tmp_path
+) -> None:
+    async with app.run_test() as pilot:
+        app._create_session("graphs")
+        await pilot.pause()
+        session = app._session_manager.get_session("test-session-1")
+        for cpu in (0.0, 50.0, 100.0):
+            session.output_buffer.append_data("x" * 100)
+            app._record_resource_history(
+                {session.id: ResourceUsage(cpu_percent=cpu, rss_bytes=1024**2)}
+            )
+        history = app._resource_history[session.id]
+        assert list(history.cpu) == [0.0, 50.0, 100.0]
+        item = app.query_one(SessionSidebar).session_list.item(session.id)
+        assert "▁▅█" in item.render().plain
+
+        app.action_resource_graphs()
+        await pilot.pause()
+        assert isinstance(app.screen, ResourceGraphs)
+        await pilot.press("e")
+        await pilot.pause()
+        assert not isinstance(app.screen, ResourceGraphs)
+        exports = list((tmp_path / ".local/share/tame/exports").iterdir())
+        assert len(exports) == 1
+        assert exports[0].name.startswith("graphs_")
+        assert exports[0].name.endswith(".resources.csv")
+        assert len(exports[0].read_text().splitlines()) == 4
+
+        # Deleted sessions' histories are dropped on the next poll
+        app._session_manager._sessions.clear()
+        app._record_resource_history({})
+        assert app._resource_history == {}
+
+
+async def test_queued_sessions_show_position_in_sidebar_and_status_bar(
+    app: TAMEApp,
+) -> None:
+    async with app.run_test() as pilot:
+        app._create_session("running")
+        app._create_session("queued")
+        await pilot.pause()
+        session = app._session_manager.get_session("test-session-2")
+        session.process_state = ProcessState.PENDING
+        app._session_manager._pending[session.id] = _SpawnRequest(
+            "/bin/sh", "/tmp", None, 24, 80
+        )
+        app._pending_status_updates.add(session.id)
+        app._flush_status_updates()
+        item = app.query_one(SessionSidebar).session_list.item(session.id)
+        assert item.render().plain.endswith("PENDING #1")
+        assert "Queued: 1" in str(app.query_one(StatusBar).render())
+
+        # Admitted: the queue marker goes away
+        del app._session_manager._pending[session.id]
+        session.process_state = ProcessState.RUNNING
+        app._pending_status_updates.add(session.id)
+        app._flush_status_updates()
+        assert "#1" not in item.render().plain
+        assert not app._queue_shown
+
+
+class _FakeTmuxControl:
+    def __init__(
+        self,
+        text: str | None = "snapshot text",
+        sessions: list[str] | None = None,
+        delay: float = 0.0,
+    ) -> None:
+        self.text = text
+        self.sessions = sessions
+        self.delay = delay
+        self.captures: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.is_running = True
+
+    async def capture_pane(self, target: str, escapes: bool = False) -> str:
+        self.captures.append(target)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        if self.text is None:
+            raise TmuxCommandError("can't find pane")
+        return self.text
+
+    def close(self) -> None:
+        self.is_running = False
+
+    async def list_sessions(self) -> list[str]:
+        if self.sessions is None:
+            raise TmuxCommandError("server exited unexpectedly")
+        return self.sessions
+
+    async def pane_pids(self) -> dict[str, int]:
+        return {"tame-a": 4242}
+
+
+async def test_resource_roots_use_tmux_pane_pids(app: TAMEApp) -> None:
+    plain = app._session_manager.create_session("plain", "/tmp")
+    tmux = app._session_manager.create_session("tmux", "/tmp")
+    tmux.metadata["tmux_session_name"] = "tame-a"
+    app._tmux_control = _FakeTmuxControl()  # type: ignore[assignment]
+    # The tmux client pid is only the attached client; its shell is the pane
+    assert await app._resource_roots() == {plain.id: 999, tmux.id: 4242}
+
+
+async def test_governor_throttles_pane_tree(app: TAMEApp, monkeypatch) -> None:
+    batch = app._session_manager.create_session("batch", "/tmp")
+    batch.group = "batch"
+    app._session_manager.create_session("dev", "/tmp")
+    app._governor = LoadGovernor({"enabled": True})
+    monkeypatch.setattr(app, "_update_status_bar", lambda: None)
+    monkeypatch.setattr(
+        "tame.app.read_pressure", lambda: PressureSample(load_per_cpu=4.0)
+    )
+    stopped: list[tuple[str, int | None]] = []
+    monkeypatch.setattr(
+        app._session_manager,
+        "throttle_session",
+        lambda sid, root=None: stopped.append((sid, root)) or True,
+    )
+    usage = {
+        sid: ResourceUsage(cpu_percent=80.0) for sid in app._session_manager._sessions
+    }
+    async with app.run_test():
+        app._run_governor({batch.id: 4242}, usage)
+    assert stopped == [(batch.id, 4242)]
+
+
+async def test_resource_class_applied_to_process_trees(
+    app: TAMEApp, monkeypatch
+) -> None:
+    tmux = app._session_manager.create_session("tmux", "/tmp")
+    tmux.metadata["tmux_session_name"] = "tame-a"
+    tmux.resource_class = "batch"
+    plain = app._session_manager.create_session("plain", "/tmp")
+    plain.resource_class = "batch"
+    applied: list[tuple[str, str, int | None]] = []
+    monkeypatch.setattr(
+        app._session_manager,
+        "set_resource_class",
+        lambda sid, name, root=None: applied.append((sid, name, root)) or [],
+    )
+    app._apply_tree_resource_classes({tmux.id: 4242, plain.id: 999})
+    app._apply_tree_resource_classes({tmux.id: 4242, plain.id: 999})
+    # Applied once per tree (catching what the PTY child forked before it
+    # got the class); again only when the pane is replaced
+    app._apply_tree_resource_classes({tmux.id: 5151, plain.id: 999})
+    assert applied == [
+        (tmux.id, "batch", 4242),
+        (plain.id, "batch", 999),
+        (tmux.id, "batch", 5151),
+    ]
+
+
+def _make_snapshot_app(tmp_path, monkeypatch, chunks: list[str]) -> TAMEApp:
     monkeypatch.setenv("HOME", str(tmp_path))
     monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
     app = TAMEApp()
@@ -491,31 +719,115 @@ def test_flush_pending_output_uses_tmux_snapshot_for_active(
     session.metadata["tmux_session_name"] = "tame-s1"
     app._session_manager._sessions[session.id] = session
     app._active_session_id = session.id
-    app._output_pending = {session.id: ["ignored stream output"]}
+    app._output_pending = {session.id: chunks}
+    return app
 
+
+async def test_flush_pending_output_uses_tmux_snapshot_for_active(
+    tmp_path, monkeypatch
+) -> None:
+    app = _make_snapshot_app(tmp_path, monkeypatch, ["ignored stream output"])
+    app._tmux_control = _FakeTmuxControl()
     viewer = _DummyViewer()
     monkeypatch.setattr(app, "query_one", lambda _selector, *_args, **_kwargs: viewer)
-    monkeypatch.setattr(app, "_capture_tmux_pane_render", lambda _name: "snapshot text")
 
     app._flush_pending_output()
+    await app._snapshot_task
 
     assert viewer.snapshots == ["snapshot text"]
     assert viewer.appended == []
 
 
-def test_flush_pending_output_falls_back_when_snapshot_capture_fails(
+async def test_tmux_snapshots_are_coalesced(tmp_path, monkeypatch) -> None:
+    app = _make_snapshot_app(tmp_path, monkeypatch, [])
+    control = _FakeTmuxControl()
+    app._tmux_control = control
+    viewer = _DummyViewer()
+    monkeypatch.setattr(app, "query_one", lambda _selector, *_args, **_kwargs: viewer)
+
+    app._output_pending = {"s1": ["first"]}
+    app._flush_pending_output()
+    await asyncio.sleep(0)  # first capture is now in flight
+    for i in range(10):
+        app._output_pending = {"s1": [f"chunk {i}"]}
+        app._flush_pending_output()
+    await app._snapshot_task
+
+    # One capture in flight plus a single follow-up for everything after it
+    assert control.captures == ["tame-s1", "tame-s1"]
+    assert viewer.appended == []
+
+
+async def test_flush_pending_output_falls_back_without_control_client(
     tmp_path, monkeypatch
 ) -> None:
-    monkeypatch.setenv("HOME", str(tmp_path))
-    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
-    app = TAMEApp()
-    app._tmux_snapshot_render = True
-    app._tmux_available = True
+    app = _make_snapshot_app(tmp_path, monkeypatch, ["stream output"])
+    # The control client was tried and couldn't start
+    app._tmux_control_start = asyncio.get_running_loop().create_future()
+    app._tmux_control_start.set_result(None)
+    viewer = _DummyViewer()
+    monkeypatch.setattr(app, "query_one", lambda _selector, *_args, **_kwargs: viewer)
+
+    app._flush_pending_output()
+
+    assert viewer.snapshots == []
+    assert viewer.appended == ["stream output"]
+
+
+async def test_failed_snapshot_rebuilds_viewer_from_buffer(
+    tmp_path, monkeypatch
+) -> None:
+    app = _make_snapshot_app(tmp_path, monkeypatch, ["stream output"])
+    app._tmux_control = _FakeTmuxControl(text=None)
+    viewer = _DummyViewer()
+    loaded: list[str] = []
+    viewer.load_session = lambda session_id, _buffer: loaded.append(session_id)
+    monkeypatch.setattr(app, "query_one", lambda _selector, *_args, **_kwargs: viewer)
 
+    app._flush_pending_output()
+    await app._snapshot_task
+
+    assert viewer.snapshots == []
+    assert viewer.invalidated == ["s1"]
+    assert loaded == ["s1"]
+
+
+async def test_restore_captures_panes_concurrently(app: TAMEApp, monkeypatch) -> None:
+    names = [f"tame-agent{i:02d}" for i in range(30)]
+    control = _FakeTmuxControl(text="$ ready\n", delay=0.1)
+    scanned: list[str] = []
+    async with app.run_test() as pilot:
+        app._start_in_tmux = True
+        app._tmux_available = True
+        app._restore_tmux_sessions_on_startup = True
+        app._tmux_control = control
+        app._tmux_control_start = asyncio.ensure_future(asyncio.sleep(0))
+        monkeypatch.setattr(app, "_list_existing_tmux_sessions", lambda: names)
+        monkeypatch.setattr(
+            app._session_manager,
+            "scan_pane_content",
+            lambda session_id, _text: scanned.append(session_id),
+        )
+
+        started = time.monotonic()
+        await app._restore_tmux_sessions_async()
+        elapsed = time.monotonic() - started
+        await pilot.pause()
+
+        # 30 captures of 100 ms each, 8 at a time
+        assert elapsed < 1.0
+        assert sorted(control.captures) == names
+        assert control.max_in_flight == app._RESTORE_CAPTURE_CONCURRENCY
+        assert len(scanned) == 30
+        assert len(app._session_manager.list_sessions()) == 30
+
+
+async def test_health_check_diffs_one_listing(tmp_path, monkeypatch) -> None:
+    app = _make_snapshot_app(tmp_path, monkeypatch, [])
     now = datetime.now(timezone.utc)
-    session = Session(
-        id="s1",
-        name="s1",
+    gone = Session(
+        id="s2",
+        name="s2",
         working_dir=".",
         process_state=ProcessState.RUNNING,
         attention_state=AttentionState.NONE,
@@ -526,19 +838,66 @@ def test_flush_pending_output_falls_back_when_snapshot_capture_fails(
         pid=None,
         pty_process=None,
     )
-    session.metadata["tmux_session_name"] = "tame-s1"
-    app._session_manager._sessions[session.id] = session
-    app._active_session_id = session.id
-    app._output_pending = {session.id: ["stream output"]}
+    gone.metadata["tmux_session_name"] = "tame-s2"
+    app._session_manager._sessions[gone.id] = gone
+    exited: list[str] = []
+    monkeypatch.setattr(app._session_manager, "mark_session_exited", exited.append)
+
+    app._tmux_control = _FakeTmuxControl(sessions=["tame-s1", "other"])
+    await app._check_tmux_health()
+    assert exited == ["s2"]
 
+    # If tmux can't be asked at all, nothing is marked
+    exited.clear()
+    app._tmux_control = _FakeTmuxControl(sessions=None)
+    monkeypatch.setattr(app, "_list_tmux_session_names", lambda: None)
+    await app._check_tmux_health()
+    assert exited == []
+
+
+def test_blurred_output_queue_is_bounded(tmp_path, monkeypatch) -> None:
+    app = _make_snapshot_app(tmp_path, monkeypatch, [])
+    app._tmux_snapshot_render = False
+    app._app_focused = False
     viewer = _DummyViewer()
     monkeypatch.setattr(app, "query_one", lambda _selector, *_args, **_kwargs: viewer)
-    monkeypatch.setattr(app, "_capture_tmux_pane_render", lambda _name: None)
 
-    app._flush_pending_output()
+    chunk = "y" * 65536
+    for _ in range(40):
+        app._handle_pty_output("s1", chunk)
+        app._handle_pty_output("background", chunk)
 
-    assert viewer.snapshots == []
-    assert viewer.appended == ["stream output"]
+    # Background output isn't queued at all; the active queue stays bounded
+    assert "background" not in app._output_pending
+    assert app._output_pending_chars["s1"] <= app._PENDING_MAX_CHARS
+    # Whole chunks are dropped and counted in bytes
+    dropped = app._output_dropped_bytes["s1"]
+    assert dropped > 0
+    assert dropped % len(chunk) == 0
+    assert "background" not in app._output_dropped_bytes
+
+    app.on_app_focus(events.AppFocus())
+
+    assert viewer.reloaded == ["s1"]
+    assert viewer.output_dropped == dropped
+    assert viewer.appended == []
+    assert viewer.invalidated == ["background"]
+    assert app._output_pending == {}
+
+
+def test_active_output_within_bound_is_fed(tmp_path, monkeypatch) -> None:
+    app = _make_snapshot_app(tmp_path, monkeypatch, [])
+    app._tmux_snapshot_render = False
+    app._app_focused = False
+    viewer = _DummyViewer()
+    monkeypatch.setattr(app, "query_one", lambda _selector, *_args, **_kwargs: viewer)
+
+    app._handle_pty_output("s1", "one ")
+    app._handle_pty_output("s1", "two")
+    app.on_app_focus(events.AppFocus())
+
+    assert viewer.appended == ["one two"]
+    assert viewer.reloaded == []
 
 
 def test_sanitize_tmux_snapshot_ansi_strips_background_and_reverse() -> None:
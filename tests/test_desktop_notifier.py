@@ -29,6 +29,13 @@ class TestDesktopNotifier:
         with patch("shutil.which", return_value=None):
             assert notifier.is_available() is False
 
+    def test_is_available_looked_up_once(self) -> None:
+        notifier = DesktopNotifier()
+        with patch("shutil.which", return_value=None) as mock_which:
+            assert notifier.is_available() is False
+            assert notifier.notify(_make_event()) is False
+        mock_which.assert_called_once()
+
     def test_notify_calls_subprocess(self) -> None:
         notifier = DesktopNotifier(timeout_ms=3000)
         event = _make_event()
@@ -37,7 +44,8 @@ class TestDesktopNotifier:
             patch.object(notifier, "is_available", return_value=True),
             patch("tame.notifications.desktop.subprocess.Popen") as mock_popen,
         ):
-            notifier.notify(event)
+            mock_popen.return_value.wait.return_value = 0
+            assert notifier.notify(event) is True
 
         mock_popen.assert_called_once()
         cmd = mock_popen.call_args[0][0]
@@ -0,0 +1,153 @@
+"""Tests for firehose (fast-forward) mode of the session viewer."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pyte")
+
+from tame.session.output_buffer import OutputBuffer
+from tame.ui.events import ViewerFastForward
+from tame.ui.widgets import session_viewer
+from tame.ui.widgets.session_viewer import SessionViewer, _TerminalState
+
+
+def _terminal(buffer: OutputBuffer, rows: int = 10, cols: int = 40) -> _TerminalState:
+    terminal = _TerminalState("s1", rows, cols, buffer, history=20)
+    terminal.replay()
+    return terminal
+
+
+def _scrollback(terminal: _TerminalState) -> list[str]:
+    return [
+        terminal.scrollback_row(i).plain(terminal.screen.columns).rstrip()
+        for i in range(terminal.scrollback_length())
+    ]
+
+
+class TestFastForward:
+    def test_matches_full_feed(self) -> None:
+        buffer = OutputBuffer()
+        buffer.append_data("start\r\n")
+        full = _terminal(buffer)
+        fast = _terminal(buffer)
+        text = "".join(f"line {i}\r\n" for i in range(5000)) + "tail"
+        buffer.append_data(text)
+        full.feed(text)
+        fast.fast_forward(text, keep_lines=30)
+
+        assert fast.screen.display == full.screen.display
+        assert fast.screen.cursor.x == full.screen.cursor.x
+        assert fast.screen.line_number == full.screen.line_number
+        assert len(fast.screen.history.top) < 30
+        assert _scrollback(fast) == _scrollback(full)
+
+    def test_skipped_attributes_carry_over(self) -> None:
+        buffer = OutputBuffer()
+        terminal = _terminal(buffer)
+        text = "\x1b[0m\x1b[1m\x1b[31m" + "x\r\n" * 500 + "red"
+        buffer.append_data(text)
+        terminal.fast_forward(text, keep_lines=5)
+        char = terminal.screen.buffer[terminal.screen.cursor.y][0]
+        assert char.data == "r"
+        assert char.fg == "red"
+        assert char.bold
+
+    @pytest.mark.parametrize("prefix", ["\x1b[?1049h", ""])
+    def test_full_screen_apps_are_fed_in_full(self, prefix: str) -> None:
+        buffer = OutputBuffer()
+        terminal = _terminal(buffer)
+        terminal.feed(prefix)
+        # A title outside the scroll region is painted once, before the part
+        # a fast-forward would skip
+        text = "\x1b[1;1Htitle\x1b[3;10r\x1b[3;1H" + "line\r\n" * 200
+        terminal.fast_forward(text, keep_lines=5)
+        assert terminal.screen.display[0].startswith("title")
+
+    @pytest.mark.parametrize("mode", ["1049", "1047", "47", "1;1049"])
+    def test_alt_screen_enter_in_skipped_text_is_fed_in_full(self, mode: str) -> None:
+        buffer = OutputBuffer()
+        full = _terminal(buffer)
+        fast = _terminal(buffer)
+        # The app paints its header once, then streams far past keep_lines
+        text = f"\x1b[?{mode}h\x1b[Hheader\r\n" + "row\r\n" * 200 + "end"
+        full.feed(text)
+        fast.fast_forward(text, keep_lines=5)
+        assert fast.screen._alt_active
+        assert fast.screen.display == full.screen.display
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def viewer(monkeypatch) -> tuple[SessionViewer, OutputBuffer, list, _Clock]:
+    clock = _Clock()
+    monkeypatch.setattr(session_viewer.time, "monotonic", clock)
+    viewer = SessionViewer()
+    viewer._rows = 10
+    viewer._cols = 40
+    posted: list = []
+    monkeypatch.setattr(viewer, "post_message", posted.append)
+    monkeypatch.setattr(viewer, "refresh", lambda *a, **k: None)
+    monkeypatch.setattr(viewer, "_schedule_refresh", lambda: None)
+    buffer = OutputBuffer()
+    viewer.load_session("s1", buffer)
+    return viewer, buffer, posted, clock
+
+
+def _stream(viewer: SessionViewer, buffer: OutputBuffer, text: str) -> None:
+    buffer.append_data(text)
+    viewer.append_output(text)
+
+
+def test_burst_enters_and_quiet_leaves_firehose(viewer) -> None:
+    viewer, buffer, posted, clock = viewer
+    chunk = "".join(f"row {i:06d} " + "." * 25 + "\r\n" for i in range(8000))
+    _stream(viewer, buffer, chunk)
+    assert viewer._firehose
+    assert [m.active for m in posted] == [True]
+    assert isinstance(posted[0], ViewerFastForward)
+
+    # Queued output is fast-forwarded on the next frame
+    _stream(viewer, buffer, chunk)
+    viewer._flush_refresh()
+    assert not viewer._firehose_pending
+    screen = viewer._active_terminal.screen
+    assert screen.line_number == buffer.total_lines_received
+    assert screen.display[-2].startswith("row 007999")
+
+    # The window holding the burst keeps the mode on; a quiet one ends it
+    clock.now += 0.3
+    viewer._flush_refresh()
+    assert viewer._firehose
+    clock.now += 0.3
+    viewer._flush_refresh()
+    assert not viewer._firehose
+    assert [m.active for m in posted] == [True, False]
+
+
+def test_trickle_never_enters_firehose(viewer) -> None:
+    viewer, buffer, posted, clock = viewer
+    for i in range(200):
+        clock.now += 0.01
+        _stream(viewer, buffer, f"line {i}\r\n")
+    assert not viewer._firehose
+    assert posted == []
+
+
+def test_switching_sessions_flushes_queue(viewer) -> None:
+    viewer, buffer, posted, _ = viewer
+    chunk = "x" * 300_000 + "\r\nlast\r\n"
+    _stream(viewer, buffer, chunk)
+    _stream(viewer, buffer, "queued\r\n")
+    terminal = viewer._active_terminal
+    viewer.load_session("s2", OutputBuffer())
+    assert not viewer._firehose
+    assert "queued" in "".join(terminal.screen.display)
+    assert [m.active for m in posted] == [True, False]
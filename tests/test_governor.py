@@ -0,0 +1,133 @@
+"""Tests for the load governor."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from tame.session.governor import LoadGovernor, PressureSample, read_pressure
+from tame.session.output_buffer import OutputBuffer
+from tame.session.pattern_matcher import PatternMatcher
+from tame.session.session import Session
+from tame.session.state import AttentionState, ProcessState
+
+_CALM = PressureSample(load_per_cpu=0.5, memory_pressure=0.0)
+_LOADED = PressureSample(load_per_cpu=2.0, memory_pressure=0.0)
+# Between the thresholds: neither starts nor ends pressure
+_MIDDLE = PressureSample(load_per_cpu=1.2, memory_pressure=0.0)
+
+
+def _session(session_id: str, group: str = "batch", **metadata: str) -> Session:
+    now = datetime.now(UTC)
+    return Session(
+        id=session_id,
+        name=session_id,
+        working_dir=".",
+        process_state=ProcessState.RUNNING,
+        attention_state=AttentionState.NONE,
+        created_at=now,
+        last_activity=now,
+        output_buffer=OutputBuffer(),
+        pattern_matcher=PatternMatcher({}),
+        group=group,
+        metadata=dict(metadata),
+    )
+
+
+def _governor(**overrides: object) -> LoadGovernor:
+    return LoadGovernor({"enabled": True, "resume_delay_seconds": 10, **overrides})
+
+
+def test_pauses_busiest_low_priority_session_first() -> None:
+    governor = _governor()
+    sessions = [
+        _session("quiet"),
+        _session("busy"),
+        _session("interactive", group="dev"),
+        _session("tagged", group="dev", priority="low"),
+    ]
+    cpu = {"quiet": 10.0, "busy": 90.0, "interactive": 200.0, "tagged": 50.0}
+    decision = governor.tick(_LOADED, sessions, cpu, [], now=0)
+    assert decision.pause == ["busy"]
+    assert "load 2.00/cpu" in decision.reason
+    decision = governor.tick(_LOADED, sessions, cpu, ["busy"], now=5)
+    assert decision.pause == ["tagged"]
+
+
+def test_idle_sessions_are_left_alone() -> None:
+    governor = _governor(min_session_cpu=5)
+    decision = governor.tick(_LOADED, [_session("s")], {"s": 1.0}, [], now=0)
+    assert decision.pause == []
+
+
+def test_hysteresis_between_thresholds() -> None:
+    governor = _governor()
+    sessions = [_session("s")]
+    cpu = {"s": 50.0}
+    assert governor.tick(_MIDDLE, sessions, cpu, [], now=0).pause == []
+    assert governor.tick(_LOADED, sessions, cpu, [], now=1).pause == ["s"]
+    # Still pressured until load drops under the low threshold
+    assert governor.pressured
+    governor.tick(_MIDDLE, sessions, cpu, ["s"], now=2)
+    assert governor.pressured
+
+
+def test_memory_pressure_alone_triggers() -> None:
+    governor = _governor()
+    sample = PressureSample(load_per_cpu=0.1, memory_pressure=35.0)
+    decision = governor.tick(sample, [_session("s")], {"s": 50.0}, [], now=0)
+    assert decision.pause == ["s"]
+    assert "memory pressure 35.0%" in decision.reason
+
+
+def test_resumes_one_at_a_time_after_delay() -> None:
+    governor = _governor()
+    sessions = [_session("a"), _session("b")]
+    cpu = {"a": 50.0, "b": 50.0}
+    governor.tick(_LOADED, sessions, cpu, [], now=0)
+    assert governor.tick(_CALM, sessions, cpu, ["a", "b"], now=100).resume == []
+    assert governor.tick(_CALM, sessions, cpu, ["a", "b"], now=105).resume == []
+    assert governor.tick(_CALM, sessions, cpu, ["a", "b"], now=110).resume == ["a"]
+    assert governor.tick(_CALM, sessions, cpu, ["b"], now=115).resume == ["b"]
+
+
+def test_renewed_pressure_restarts_resume_delay() -> None:
+    governor = _governor()
+    sessions = [_session("a")]
+    governor.tick(_LOADED, sessions, {}, [], now=0)
+    governor.tick(_CALM, sessions, {}, ["a"], now=1)
+    governor.tick(_LOADED, sessions, {}, ["a"], now=5)
+    governor.tick(_CALM, sessions, {}, ["a"], now=8)
+    assert governor.tick(_CALM, sessions, {}, ["a"], now=12).resume == []
+    assert governor.tick(_CALM, sessions, {}, ["a"], now=18).resume == ["a"]
+
+
+def test_disabled_governor_releases_everything() -> None:
+    governor = LoadGovernor({"enabled": False})
+    decision = governor.tick(_LOADED, [_session("a")], {"a": 99.0}, ["b", "c"], now=0)
+    assert decision.pause == []
+    assert decision.resume == ["b", "c"]
+
+
+def test_config_values_are_read() -> None:
+    governor = LoadGovernor(
+        {"low_priority_groups": "training", "load_per_cpu_high": 3, "bogus": 1}
+    )
+    assert not governor.enabled
+    assert governor.low_priority_groups == frozenset({"training"})
+    assert governor.load_high == 3.0
+    assert governor.resume_delay == 30.0
+
+
+def test_read_pressure_parses_psi(tmp_path) -> None:
+    (tmp_path / "pressure").mkdir()
+    (tmp_path / "pressure" / "memory").write_text(
+        "some avg10=12.50 avg60=3.00 avg300=1.00 total=12345\n"
+        "full avg10=4.00 avg60=1.00 avg300=0.50 total=6789\n"
+    )
+    sample = read_pressure(str(tmp_path))
+    assert sample.memory_pressure == 12.5
+    assert sample.load_per_cpu >= 0
+
+
+def test_read_pressure_without_psi(tmp_path) -> None:
+    assert read_pressure(str(tmp_path)).memory_pressure is None
@@ -0,0 +1,97 @@
+"""Tests for the keep-alive HTTP pool behind the Slack and webhook channels."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from tame.notifications.engine import NotificationEngine
+from tame.notifications.http_pool import HTTPConnectionPool
+from tame.notifications.models import EventType
+
+
+def test_sequential_posts_share_one_connection(http_standin) -> None:
+    pool = HTTPConnectionPool()
+    for i in range(5):
+        resp = pool.post(f"{http_standin.url}/hook", f"{i}".encode())
+        assert resp.status == 200 and resp.body == b"ok"
+    assert http_standin.connections == 1
+    assert pool.connections_opened == 1
+    assert [r.body for r in http_standin.requests] == [b"0", b"1", b"2", b"3", b"4"]
+    pool.close()
+
+
+def test_idle_connections_expire(http_standin) -> None:
+    pool = HTTPConnectionPool(idle_seconds=0.05)
+    pool.post(http_standin.url, b"a")
+    time.sleep(0.1)
+    pool.post(http_standin.url, b"b")
+    assert pool.connections_opened == 2
+    assert pool.idle_count() == 1
+    pool.close()
+    assert pool.idle_count() == 0
+
+
+def test_connection_closed_by_server_is_replaced(http_standin) -> None:
+    http_standin.keepalive_timeout = 0.05
+    pool = HTTPConnectionPool()
+    pool.post(http_standin.url, b"a")
+    time.sleep(0.3)  # the server has dropped the idle connection
+    assert pool.post(http_standin.url, b"b").status == 200
+    assert [r.body for r in http_standin.requests] == [b"a", b"b"]
+    pool.close()
+
+
+def test_connection_close_response_is_not_reused(http_standin) -> None:
+    http_standin.close_after_response = True
+    pool = HTTPConnectionPool()
+    pool.post(http_standin.url, b"a")
+    pool.post(http_standin.url, b"b")
+    assert pool.connections_opened == 2
+    assert pool.idle_count() == 0
+
+
+def test_concurrent_requests_are_capped(http_standin) -> None:
+    pool = HTTPConnectionPool(max_concurrent=2)
+    threads = [
+        threading.Thread(target=pool.post, args=(http_standin.url, b"x"))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(http_standin.requests) == 10
+    assert pool.connections_opened <= 2
+    pool.close()
+
+
+def test_http_proxy_gets_absolute_url(monkeypatch) -> None:
+    monkeypatch.setenv("http_proxy", "http://proxy.local:3128")
+    monkeypatch.delenv("no_proxy", raising=False)
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    endpoint, target = HTTPConnectionPool._resolve("http://hooks.example/a?b=1")
+    assert endpoint.proxy == ("proxy.local", 3128)
+    assert target == "http://hooks.example/a?b=1"
+
+
+def test_notification_burst_reuses_connections(http_standin) -> None:
+    engine = NotificationEngine(
+        {
+            "desktop": {"enabled": False},
+            "audio": {"enabled": False},
+            "slack": {
+                "enabled": True,
+                "webhook_url": f"{http_standin.url}/slack",
+                "digest_seconds": 0,
+            },
+            "webhook": {"enabled": True, "url": f"{http_standin.url}/hook"},
+        }
+    )
+    for i in range(50):
+        engine.dispatch(EventType.ERROR, f"s{i}", f"agent-{i}", "rate limited")
+    assert engine.get_dispatcher().flush(timeout=10)
+    assert len(http_standin.requests) == 100
+    # Two workers per channel, so at most four connections for 100 posts
+    assert http_standin.connections <= 4
+    engine.close()
@@ -30,6 +30,7 @@ def _make_app(tmp_path) -> TAMEApp:
     config_file.write_text(
         "[sessions]\nstart_in_tmux = false\nrestore_tmux_sessions_on_startup = false\n"
         "[notifications]\nenabled = true\n"
+        '[notifications.history]\npath = ""\n'
     )
     return TAMEApp(config_path=str(config_file))
 
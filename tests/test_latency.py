@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from tame.utils.latency import LatencyHistogram
+
+
+def test_empty_histogram() -> None:
+    hist = LatencyHistogram()
+    assert hist.count == 0
+    assert hist.percentile(50) == 0.0
+    assert hist.summary() == "no samples"
+
+
+def test_percentiles_report_bucket_bounds() -> None:
+    hist = LatencyHistogram()
+    for _ in range(90):
+        hist.record(0.0015)  # 1.5 ms -> the 2 ms bucket
+    for _ in range(10):
+        hist.record(0.030)  # 30 ms -> the 50 ms bucket
+    assert hist.count == 100
+    assert hist.percentile(50) == 2
+    assert hist.percentile(90) == 2
+    # Clamped to the largest sample seen
+    assert hist.percentile(99) == 30.0
+    assert hist.summary().startswith("n=100 p50≤2.0ms")
+
+
+def test_overflow_bucket() -> None:
+    hist = LatencyHistogram(bounds_ms=(1, 10))
+    hist.record(5.0)
+    assert hist.buckets() == [(1, 0), (10, 0), (float("inf"), 1)]
+    assert hist.percentile(50) == 5000.0
@@ -0,0 +1,248 @@
+"""Tests for the background notification dispatcher."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+
+from tame.notifications.dispatcher import NotificationDispatcher
+from tame.notifications.engine import NotificationEngine
+from tame.notifications.models import EventType, NotificationEvent, Priority
+
+
+def _event(n: int = 0) -> NotificationEvent:
+    return NotificationEvent(
+        event_type=EventType.ERROR,
+        session_id=f"s{n}",
+        session_name=f"agent-{n}",
+        message=f"msg-{n}",
+        priority=Priority.CRITICAL,
+    )
+
+
+def test_delivers_off_the_calling_thread() -> None:
+    threads: list[str] = []
+    dispatcher = NotificationDispatcher()
+    dispatcher.add_channel(
+        "desktop", lambda _e: threads.append(threading.current_thread().name) or True
+    )
+    dispatcher.submit("desktop", _event())
+    assert dispatcher.flush(timeout=5)
+    assert threads == ["notify-desktop-0"]
+    assert dispatcher.stats("desktop")["delivered"] == 1
+
+
+def test_full_queue_drops_oldest() -> None:
+    release = threading.Event()
+    delivered: list[str] = []
+
+    def _send(event: NotificationEvent) -> bool:
+        release.wait(5)
+        delivered.append(event.session_id)
+        return True
+
+    dispatcher = NotificationDispatcher(queue_size=3)
+    dispatcher.add_channel("webhook", _send)
+    dispatcher.submit("webhook", _event(0))
+    # Let the worker take s0 so the queue holds only what follows
+    deadline = time.monotonic() + 5
+    while dispatcher.stats("webhook")["queued"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    start = time.monotonic()
+    for n in range(1, 7):
+        dispatcher.submit("webhook", _event(n))
+    assert time.monotonic() - start < 0.5  # submit never waits on the send
+    release.set()
+    assert dispatcher.flush(timeout=5)
+    assert delivered == ["s0", "s4", "s5", "s6"]
+    assert dispatcher.stats("webhook")["dropped"] == 3
+
+
+def test_retries_with_backoff_then_gives_up() -> None:
+    attempts: list[float] = []
+
+    def _send(_event: NotificationEvent) -> bool:
+        attempts.append(time.monotonic())
+        if len(attempts) == 2:
+            raise OSError("connection reset")
+        return False
+
+    dispatcher = NotificationDispatcher()
+    dispatcher.add_channel("slack", _send, max_retries=3, backoff_seconds=0.05)
+    dispatcher.submit("slack", _event())
+    assert dispatcher.flush(timeout=5)
+    assert len(attempts) == 4
+    gaps = [b - a for a, b in itertools.pairwise(attempts)]
+    assert gaps[0] >= 0.05 and gaps[1] >= 0.1 and gaps[2] >= 0.2
+    assert dispatcher.stats("slack") == {
+        "queued": 0,
+        "delivered": 0,
+        "failed": 1,
+        "dropped": 0,
+    }
+
+
+def test_retry_succeeds() -> None:
+    results = iter([False, True])
+    dispatcher = NotificationDispatcher()
+    dispatcher.add_channel("slack", lambda _e: next(results), backoff_seconds=0.01)
+    dispatcher.submit("slack", _event())
+    assert dispatcher.flush(timeout=5)
+    assert dispatcher.stats("slack")["delivered"] == 1
+
+
+def test_concurrency_limit_per_channel() -> None:
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def _send(_event: NotificationEvent) -> bool:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return True
+
+    dispatcher = NotificationDispatcher()
+    dispatcher.add_channel("webhook", _send, concurrency=2)
+    for n in range(8):
+        dispatcher.submit("webhook", _event(n))
+    assert dispatcher.flush(timeout=5)
+    assert peak == 2
+    assert dispatcher.stats("webhook")["delivered"] == 8
+
+
+def test_close_interrupts_backoff() -> None:
+    dispatcher = NotificationDispatcher()
+    dispatcher.add_channel("slack", lambda _e: False, backoff_seconds=30)
+    dispatcher.submit("slack", _event())
+    start = time.monotonic()
+    dispatcher.close(timeout=0.1)
+    assert dispatcher.flush(timeout=5)
+    assert time.monotonic() - start < 5
+    dispatcher.submit("slack", _event())
+    assert dispatcher.stats("slack")["queued"] == 0
+
+
+def test_engine_dispatch_does_not_wait_for_webhook(monkeypatch) -> None:
+    engine = NotificationEngine(
+        {
+            "desktop": {"enabled": False},
+            "audio": {"enabled": False},
+            "webhook": {"enabled": True, "url": "http://127.0.0.1:9/hook"},
+        }
+    )
+    release = threading.Event()
+    sent: list[NotificationEvent] = []
+
+    def _slow_notify(event: NotificationEvent) -> bool:
+        release.wait(5)
+        sent.append(event)
+        return True
+
+    monkeypatch.setattr(
+        engine.get_dispatcher()._channels["webhook"], "send", _slow_notify
+    )
+    start = time.monotonic()
+    event = engine.dispatch(EventType.ERROR, "s1", "agent-1", "boom")
+    assert time.monotonic() - start < 0.5
+    release.set()
+    assert engine.get_dispatcher().flush(timeout=5)
+    assert sent == [event]
+    engine.close()
+
+
+def _batching(window: float, batch_max: int = 50):
+    batches: list[list[str]] = []
+
+    def _send_batch(events: list[NotificationEvent]) -> bool:
+        batches.append([e.session_id for e in events])
+        return True
+
+    dispatcher = NotificationDispatcher()
+    dispatcher.add_channel(
+        "slack",
+        lambda e: _send_batch([e]),
+        send_batch=_send_batch,
+        batch_window=window,
+        batch_max=batch_max,
+    )
+    return dispatcher, batches
+
+
+def _low(n: int) -> NotificationEvent:
+    event = _event(n)
+    event.priority = Priority.HIGH
+    return event
+
+
+def test_batch_window_coalesces_events() -> None:
+    dispatcher, batches = _batching(window=0.2)
+    for n in range(5):
+        dispatcher.submit("slack", _low(n))
+    time.sleep(0.1)
+    assert batches == []
+    deadline = time.monotonic() + 5
+    while not batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches == [["s0", "s1", "s2", "s3", "s4"]]
+    assert dispatcher.stats("slack")["delivered"] == 5
+
+
+def test_batch_max_sends_without_waiting() -> None:
+    dispatcher, batches = _batching(window=30, batch_max=3)
+    for n in range(7):
+        dispatcher.submit("slack", _low(n))
+    deadline = time.monotonic() + 5
+    while len(batches) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches == [["s0", "s1", "s2"], ["s3", "s4", "s5"]]
+    # The straggler waits out the window, or a flush
+    assert dispatcher.flush(timeout=5)
+    assert batches[-1] == ["s6"]
+
+
+def test_critical_event_flushes_batch() -> None:
+    dispatcher, batches = _batching(window=30)
+    dispatcher.submit("slack", _low(0))
+    dispatcher.submit("slack", _low(1))
+    start = time.monotonic()
+    dispatcher.submit("slack", _event(2))
+    while not batches and time.monotonic() - start < 5:
+        time.sleep(0.01)
+    assert time.monotonic() - start < 1
+    assert batches == [["s0", "s1", "s2"]]
+
+
+def test_notification_storm_is_coalesced(http_standin) -> None:
+    engine = NotificationEngine(
+        {
+            "desktop": {"enabled": False},
+            "audio": {"enabled": False},
+            "slack": {
+                "enabled": True,
+                "webhook_url": f"{http_standin.url}/slack",
+                "digest_seconds": 30,
+            },
+            "webhook": {
+                "enabled": True,
+                "url": f"{http_standin.url}/hook",
+                "digest_seconds": 30,
+            },
+        }
+    )
+    for i in range(20):
+        engine.dispatch(EventType.INPUT_NEEDED, f"s{i}", f"agent-{i}", "rate limited")
+    assert engine.get_dispatcher().flush(timeout=10)
+    paths = sorted(r.path for r in http_standin.requests)
+    assert paths == ["/hook", "/slack"]
+    slack = next(r for r in http_standin.requests if r.path == "/slack")
+    digest = json.loads(slack.body)
+    assert digest["text"] == "TAME: 20 events from 20 sessions"
+    assert "x20" in digest["attachments"][0]["title"]
+    engine.close()
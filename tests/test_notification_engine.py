@@ -140,7 +140,7 @@ class TestDispatch:
         assert engine._dnd_enabled is True
         assert engine._dnd_start is not None
         assert engine._dnd_end is not None
-        assert engine._history._events.maxlen == 100
+        assert engine._history.max_size == 100
 
     def test_history_filter_by_session(self) -> None:
         engine = _make_engine()
@@ -0,0 +1,153 @@
+"""Tests for the SQLite-backed notification history store."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from tame.notifications.history import NotificationHistory
+from tame.notifications.models import EventType, NotificationEvent, Priority
+
+_TYPES = list(EventType)
+
+
+def _event(
+    n: int,
+    session_id: str | None = None,
+    event_type: EventType | None = None,
+    timestamp: datetime | None = None,
+) -> NotificationEvent:
+    return NotificationEvent(
+        event_type=event_type or _TYPES[n % len(_TYPES)],
+        session_id=session_id or f"s{n % 10}",
+        session_name=f"agent-{n % 10}",
+        message=f"msg-{n}",
+        priority=Priority.MEDIUM,
+        timestamp=timestamp or datetime.now(),
+        matched_text=f"text-{n}",
+    )
+
+
+def test_events_survive_restart(tmp_path) -> None:
+    path = tmp_path / "notifications.db"
+    history = NotificationHistory(path=path)
+    for n in range(3):
+        history.add(_event(n))
+    history.close()
+
+    reopened = NotificationHistory(path=path)
+    assert len(reopened) == 3
+    first = reopened.get_all()[0]
+    assert (first.message, first.matched_text) == ("msg-0", "text-0")
+    assert first.event_type is EventType.INPUT_NEEDED
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    reopened.close()
+
+
+def test_writer_thread_batches_inserts(tmp_path) -> None:
+    path = tmp_path / "notifications.db"
+    history = NotificationHistory(path=path, flush_seconds=0.05)
+    for n in range(20):
+        history.add(_event(n))
+    # add() only queues; the writer thread commits them together
+    deadline = time.monotonic() + 5
+    rows = 0
+    while rows < 20 and time.monotonic() < deadline:
+        time.sleep(0.02)
+        if path.exists():
+            with sqlite3.connect(path) as conn:
+                rows = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    assert rows == 20
+    history.close()
+
+
+def test_add_and_reads_never_write_on_the_calling_thread(monkeypatch) -> None:
+    history = NotificationHistory(flush_seconds=0.01)
+    writing = threading.Event()
+    release = threading.Event()
+    writers: list[str] = []
+    real_insert = history._insert
+
+    def slow_insert(batch: list[NotificationEvent]) -> None:
+        writers.append(threading.current_thread().name)
+        writing.set()
+        release.wait(5)
+        real_insert(batch)
+
+    monkeypatch.setattr(history, "_insert", slow_insert)
+    history.add(_event(0))
+    assert writing.wait(5)
+    # The writer is mid-insert; queueing another event doesn't wait for it
+    t0 = time.perf_counter()
+    history.add(_event(1))
+    assert time.perf_counter() - t0 < 0.1
+    release.set()
+    assert [e.message for e in history.get_all()] == ["msg-0", "msg-1"]
+    assert set(writers) == {"notify-history"}
+    history.close()
+
+
+def test_events_added_after_close_are_dropped(tmp_path) -> None:
+    history = NotificationHistory(path=tmp_path / "n.db")
+    history.add(_event(0))
+    history.close()
+    history.add(_event(1))
+    assert history._pending == []
+    assert [e.message for e in history.get_all()] == ["msg-0"]
+    history.close()
+
+
+def test_page_walks_newest_first_with_filters() -> None:
+    history = NotificationHistory(max_size=1000)
+    for n in range(50):
+        history.add(_event(n))
+    first = history.page(limit=4, session_id="s3")
+    assert [e.message for _, e in first] == ["msg-43", "msg-33", "msg-23", "msg-13"]
+    rest = history.page(limit=4, before=first[-1][0], session_id="s3")
+    assert [e.message for _, e in rest] == ["msg-3"]
+    errors = history.page(limit=100, event_type=EventType.ERROR)
+    assert all(e.event_type is EventType.ERROR for _, e in errors)
+    assert len(errors) == history.count(event_type=EventType.ERROR) == 13
+    assert history.count(session_id="s3", event_type=EventType.SESSION_IDLE) == 3
+
+
+def test_retention_drops_old_events(tmp_path) -> None:
+    history = NotificationHistory(path=tmp_path / "n.db", retention_days=30)
+    history.add(_event(0, timestamp=datetime.now() - timedelta(days=40)))
+    history.add(_event(1))
+    assert [e.message for e in history.get_all()] == ["msg-1"]
+    assert len(history) == 1
+    history.close()
+
+
+def test_max_size_keeps_newest() -> None:
+    history = NotificationHistory(max_size=5)
+    for n in range(12):
+        history.add(_event(n))
+    assert len(history) == 5
+    assert [e.message for e in history.get_recent(2)] == ["msg-10", "msg-11"]
+
+
+def test_year_of_events_queries_fast(tmp_path) -> None:
+    history = NotificationHistory(max_size=500_000, path=tmp_path / "n.db")
+    start = datetime.now() - timedelta(days=365)
+    for n in range(100_000):
+        history.add(
+            _event(
+                n, session_id=f"s{n % 200}", timestamp=start + timedelta(minutes=5 * n)
+            )
+        )
+    assert len(history) == 100_000
+
+    t0 = time.perf_counter()
+    page = history.page(limit=100, session_id="s7")
+    older = history.page(limit=100, before=page[-1][0], event_type=EventType.ERROR)
+    count = history.count(session_id="s7")
+    elapsed = time.perf_counter() - t0
+    assert len(page) == len(older) == 100
+    assert count == 500
+    assert elapsed < 0.05
+    history.close()
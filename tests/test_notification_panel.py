@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import time
 from datetime import datetime
 
+from textual.app import App
+
 from tame.notifications.history import NotificationHistory
 from tame.notifications.models import EventType, NotificationEvent, Priority
+from tame.ui.widgets.notification_panel import NotificationList, NotificationPanel
 
 
 # ---------------------------------------------------------------------------
@@ -113,3 +117,112 @@ class TestPriorityMapping:
     def test_low_events(self):
         ev = _make_event(event_type=EventType.SESSION_IDLE, priority=Priority.LOW)
         assert ev.priority == Priority.LOW
+
+
+# ---------------------------------------------------------------------------
+# Tests: virtualized panel
+# ---------------------------------------------------------------------------
+
+
+class _PanelApp(App):
+    def __init__(self, history: NotificationHistory) -> None:
+        super().__init__()
+        self.history = history
+        self.result: list[str | None] = []
+
+    def on_mount(self) -> None:
+        self.push_screen(NotificationPanel(self.history), callback=self.result.append)
+
+
+def _big_history(n: int) -> NotificationHistory:
+    history = NotificationHistory(max_size=n)
+    types = list(EventType)
+    for i in range(n):
+        history.add(
+            _make_event(
+                event_type=types[i % len(types)],
+                session_id=f"s{i % 7}",
+                session_name=f"agent-{i % 7}",
+                message=f"msg-{i}",
+            )
+        )
+    return history
+
+
+def _header(app: App) -> str:
+    return str(app.screen.query_one("#notif-header").render())
+
+
+class TestNotificationPanel:
+    async def test_opens_with_one_page(self):
+        history = _big_history(20_000)
+        len(history)  # write the queued events before timing
+        app = _PanelApp(history)
+        start = time.perf_counter()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            elapsed = time.perf_counter() - start
+            notif_list = app.screen.query_one(NotificationList)
+            assert notif_list.loaded == 100
+            assert notif_list.total == 20_000
+            assert notif_list.highlighted_event.message == "msg-19999"
+            assert "20000 events" in _header(app)
+        assert elapsed < 2
+
+    async def test_scrolling_loads_next_page(self):
+        app = _PanelApp(_big_history(1_000))
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            notif_list = app.screen.query_one(NotificationList)
+            notif_list.scroll_to(y=80, animate=False)
+            await pilot.pause()
+            await pilot.pause()
+            assert notif_list.loaded == 200
+            notif_list.move(240)
+            await pilot.press("pagedown", "down")
+            assert notif_list.loaded >= 300
+            messages = [e.message for _, e in notif_list._rows]
+            assert messages[:3] == ["msg-999", "msg-998", "msg-997"]
+            assert len(set(messages)) == len(messages)
+
+    async def test_filters_use_the_store(self):
+        app = _PanelApp(_big_history(1_000))
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            notif_list = app.screen.query_one(NotificationList)
+            await pilot.press("t", "t")
+            assert notif_list.type_filter is EventType.ERROR
+            assert notif_list.total == 250
+            await pilot.press("s")
+            session = notif_list.session_filter
+            assert session is not None
+            rows = [e for _, e in notif_list._rows]
+            assert rows and all(
+                e.event_type is EventType.ERROR and e.session_id == session
+                for e in rows
+            )
+            assert "error" in _header(app)
+            await pilot.press("a")
+            assert notif_list.total == 1_000
+
+    async def test_enter_switches_to_session(self):
+        history = NotificationHistory()
+        history.add(_make_event(session_id="s1", message="old"))
+        history.add(_make_event(session_id="s2", message="new"))
+        app = _PanelApp(history)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await pilot.press("down", "enter")
+            await pilot.pause()
+        assert app.result == ["s1"]
+
+    async def test_clear_empties_panel(self):
+        history = _big_history(10)
+        app = _PanelApp(history)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await pilot.press("c")
+            notif_list = app.screen.query_one(NotificationList)
+            assert notif_list.total == 0
+            assert len(history) == 0
+            assert app.screen.query_one("#notif-empty").display
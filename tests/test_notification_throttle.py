@@ -0,0 +1,134 @@
+"""Tests for notification cooldowns, dedup and rate limits."""
+
+from __future__ import annotations
+
+import copy
+from unittest.mock import MagicMock
+
+from tame.config.defaults import DEFAULT_CONFIG
+from tame.notifications.engine import NotificationEngine
+from tame.notifications.models import EventType, NotificationEvent, Priority
+from tame.notifications.throttle import (
+    ExpiringKeys,
+    NotificationThrottle,
+    TokenBucket,
+    text_fingerprint,
+)
+
+
+def _event(
+    session: str = "s1",
+    event_type: EventType = EventType.ERROR,
+    matched_text: str = "",
+) -> NotificationEvent:
+    return NotificationEvent(
+        event_type=event_type,
+        session_id=session,
+        session_name=f"agent-{session}",
+        message="boom",
+        priority=Priority.CRITICAL,
+        matched_text=matched_text,
+    )
+
+
+def test_token_bucket_bursts_then_refills() -> None:
+    bucket = TokenBucket(per_minute=60, burst=3)
+    assert [bucket.take(0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.take(0.5) is False
+    assert bucket.take(1.0) is True
+
+
+def test_expiring_keys_stay_bounded() -> None:
+    keys = ExpiringKeys(ttl=60, max_keys=100)
+    for n in range(10_000):
+        keys.hit(n, now=0.0)
+    assert len(keys) == 100
+    assert keys.hit(9_999, now=1.0) is True
+    keys.hit("new", now=61.0)
+    assert len(keys) == 1
+
+
+def test_cooldowns_come_from_config() -> None:
+    throttle = NotificationThrottle(
+        {"cooldowns": {"error": 0, "completed": 30, "bogus": 5}}
+    )
+    assert throttle.allow(_event(), now=0) is True
+    assert throttle.allow(_event(), now=1) is True
+    done = _event(event_type=EventType.COMPLETED)
+    assert throttle.allow(done, now=0) is True
+    assert throttle.allow(done, now=10) is False
+    assert throttle.allow(done, now=31) is True
+    # Unchanged defaults still apply
+    idle = _event(event_type=EventType.SESSION_IDLE)
+    assert throttle.allow(idle, now=0) is True
+    assert throttle.allow(idle, now=100) is False
+
+
+def test_same_text_is_deduplicated_across_sessions() -> None:
+    throttle = NotificationThrottle({"dedup_seconds": 60})
+    assert throttle.allow(_event("s1", matched_text="429: retry in 23s"), now=0)
+    assert not throttle.allow(_event("s2", matched_text="429:  retry in 24s"), now=5)
+    assert throttle.allow(_event("s3", matched_text="out of memory"), now=5)
+    assert throttle.allow(_event("s4", matched_text="429: retry in 9s"), now=61)
+
+
+def test_deduplicated_event_does_not_start_cooldown() -> None:
+    throttle = NotificationThrottle({"dedup_seconds": 60})
+    assert throttle.allow(_event("s1", matched_text="HTTP 429"), now=0)
+    # s2's first error is a duplicate of s1's and never notifies...
+    assert not throttle.allow(_event("s2", matched_text="HTTP 429"), now=1)
+    # ...so a different error from s2 isn't held back by a cooldown
+    assert throttle.allow(_event("s2", matched_text="disk full"), now=2)
+    assert not throttle.allow(_event("s2", matched_text="segfault"), now=3)
+
+
+def test_fingerprint_masks_digits() -> None:
+    assert text_fingerprint("Error 500 at 12:01") == text_fingerprint(
+        "error 502 at 9:59"
+    )
+    assert text_fingerprint("Error") != text_fingerprint("Warning")
+
+
+def test_rate_limited_channels() -> None:
+    throttle = NotificationThrottle({"rate_limits": {"slack": {"per_minute": 6}}})
+    assert throttle.take("slack", now=0) is True
+    assert throttle.take("slack", now=1) is False
+    assert throttle.take("slack", now=10) is True
+    assert all(throttle.take("toast", now=0) for _ in range(50))
+
+
+def _default_engine() -> NotificationEngine:
+    config = copy.deepcopy(DEFAULT_CONFIG["notifications"])
+    config["outbox"]["enabled"] = False
+    config["history"]["path"] = ""
+    engine = NotificationEngine(config)
+    engine.set_dnd(False)
+    return engine
+
+
+def test_identical_error_burst_notifies_once(monkeypatch) -> None:
+    engine = _default_engine()
+    submitted: list[str] = []
+    monkeypatch.setattr(
+        engine.get_dispatcher(), "submit", lambda name, _e: submitted.append(name)
+    )
+    toast = MagicMock()
+    engine.on_toast = toast
+    for n in range(200):
+        engine.dispatch(
+            EventType.ERROR, f"s{n}", f"agent-{n}", "rate limited", "HTTP 429"
+        )
+    assert toast.call_count == 1
+    assert submitted.count("desktop") == 1
+    assert len(engine.get_history()) == 200
+
+
+def test_distinct_error_burst_is_rate_limited(monkeypatch) -> None:
+    engine = _default_engine()
+    submitted: list[str] = []
+    monkeypatch.setattr(
+        engine.get_dispatcher(), "submit", lambda name, _e: submitted.append(name)
+    )
+    for n in range(200):
+        engine.dispatch(EventType.ERROR, f"s{n}", f"agent-{n}", f"failure {n}")
+    assert submitted.count("desktop") == 3
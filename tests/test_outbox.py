@@ -0,0 +1,241 @@
+"""Tests for the on-disk notification outbox."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from tame.notifications import outbox as outbox_mod
+from tame.notifications.dispatcher import NotificationDispatcher
+from tame.notifications.engine import NotificationEngine
+from tame.notifications.models import EventType, NotificationEvent, Priority
+from tame.notifications.outbox import Outbox
+
+
+def _event(n: int) -> NotificationEvent:
+    return NotificationEvent(
+        event_type=EventType.INPUT_NEEDED,
+        session_id=f"s{n}",
+        session_name=f"agent-{n}",
+        message=f"msg-{n}",
+        priority=Priority.HIGH,
+        matched_text="[y/n]",
+    )
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_records_come_back_in_order(tmp_path) -> None:
+    box = Outbox(tmp_path)
+    box.append("slack", [_event(0)])
+    box.append("slack", [_event(1), _event(2)])
+    assert box.pending("slack") == 2
+    first = box.peek("slack")
+    assert [e.session_id for e in first] == ["s0"]
+    assert first[0].event_type is EventType.INPUT_NEEDED
+    assert first[0].matched_text == "[y/n]"
+    box.pop("slack")
+    assert [e.session_id for e in box.peek("slack")] == ["s1", "s2"]
+    box.pop("slack")
+    assert box.peek("slack") is None
+    # Fully delivered logs are emptied rather than left to grow
+    assert (tmp_path / "slack.outbox").stat().st_size == 0
+
+
+def test_backlog_survives_restart(tmp_path) -> None:
+    box = Outbox(tmp_path)
+    for n in range(3):
+        box.append("webhook", [_event(n)])
+    box.pop("webhook")
+    reopened = Outbox(tmp_path)
+    assert reopened.pending("webhook") == 2
+    assert reopened.peek("webhook")[0].session_id == "s1"
+
+
+def test_partial_record_is_dropped_on_restart(tmp_path) -> None:
+    box = Outbox(tmp_path)
+    box.append("webhook", [_event(0)])
+    with open(tmp_path / "webhook.outbox", "ab") as f:
+        f.write(b'[{"event_type": "err')
+    reopened = Outbox(tmp_path)
+    assert reopened.pending("webhook") == 1
+    reopened.append("webhook", [_event(1)])
+    reopened.pop("webhook")
+    assert reopened.peek("webhook")[0].session_id == "s1"
+
+
+def test_corrupt_record_is_skipped(tmp_path) -> None:
+    (tmp_path / "webhook.outbox").write_bytes(b"not json\n")
+    box = Outbox(tmp_path)
+    box.append("webhook", [_event(1)])
+    assert box.peek("webhook")[0].session_id == "s1"
+    assert box.pending("webhook") == 1
+
+
+def test_delivered_head_is_compacted(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(outbox_mod, "_COMPACT_BYTES", 1024)
+    box = Outbox(tmp_path)
+    for n in range(100):
+        box.append("slack", [_event(n)])
+    path = tmp_path / "slack.outbox"
+    full = path.stat().st_size
+    for _ in range(60):
+        box.pop("slack")
+    assert path.stat().st_size < full / 2
+    assert box.pending("slack") == 40
+    assert box.peek("slack")[0].session_id == "s60"
+    assert Outbox(tmp_path).peek("slack")[0].session_id == "s60"
+
+
+def test_full_outbox_refuses_records(tmp_path) -> None:
+    box = Outbox(tmp_path, max_bytes=600)
+    results = [box.append("slack", [_event(n)]) for n in range(5)]
+    assert results[0] and not results[-1]
+    assert box.pending("slack") == results.count(True)
+
+
+def _engine(url: str, outbox_dir) -> NotificationEngine:
+    return NotificationEngine(
+        {
+            "desktop": {"enabled": False},
+            "audio": {"enabled": False},
+            # One worker, so live sends are in order too
+            "webhook": {"enabled": True, "url": url, "concurrency": 1},
+            "dispatch": {"max_retries": 0, "backoff_seconds": 0.05},
+            "outbox": {"path": str(outbox_dir)},
+        }
+    )
+
+
+def test_failed_posts_are_replayed_in_order(http_standin, tmp_path) -> None:
+    http_standin.status = 503
+    engine = _engine(f"{http_standin.url}/hook", tmp_path)
+    for n in range(5):
+        engine.dispatch(EventType.INPUT_NEEDED, f"s{n}", f"agent-{n}", "waiting")
+    assert engine.get_dispatcher().flush(timeout=5)
+    assert _wait_for(lambda: len(http_standin.requests) >= 2)
+    http_standin.status = 200
+    assert _wait_for(lambda: _delivered(engine) == 5)
+    assert Outbox(tmp_path).pending("webhook") == 0
+    delivered = [json.loads(r.body)["session_id"] for r in http_standin.requests]
+    # Failed attempts repeat the head; what got through is in order
+    assert list(dict.fromkeys(delivered)) == [f"s{n}" for n in range(5)]
+    engine.close()
+
+
+def test_backlog_is_sent_after_restart(http_standin, tmp_path) -> None:
+    engine = _engine("http://127.0.0.1:9/hook", tmp_path)
+    engine.dispatch(EventType.ERROR, "s1", "agent-1", "boom")
+    assert engine.get_dispatcher().flush(timeout=5)
+    engine.close()
+    assert Outbox(tmp_path).pending("webhook") == 1
+
+    restarted = _engine(f"{http_standin.url}/hook", tmp_path)
+    assert _wait_for(lambda: len(http_standin.requests) == 1)
+    assert json.loads(http_standin.requests[0].body)["message"] == "boom"
+    assert _wait_for(lambda: Outbox(tmp_path).pending("webhook") == 0)
+    restarted.close()
+
+
+def test_rejected_head_record_does_not_block_backlog(http_standin, tmp_path) -> None:
+    box = Outbox(tmp_path)
+    for n in range(3):
+        box.append("webhook", [_event(n)])
+    http_standin.respond = lambda r: 400 if b'"s0"' in r.body else 200
+    engine = _engine(f"{http_standin.url}/hook", tmp_path)
+    assert _wait_for(lambda: _delivered(engine) == 2)
+    assert Outbox(tmp_path).pending("webhook") == 0
+    sent = [json.loads(r.body)["session_id"] for r in http_standin.requests]
+    # The rejected record was tried once, not retried
+    assert sent == ["s0", "s1", "s2"]
+    assert engine.get_dispatcher().stats("webhook")["failed"] == 1
+
+    # A live event the endpoint rejects isn't retried or kept either
+    http_standin.respond = None
+    http_standin.status = 403
+    engine.dispatch(EventType.ERROR, "s9", "agent-9", "boom")
+    assert engine.get_dispatcher().flush(timeout=5)
+    assert len(http_standin.requests) == 4
+    assert Outbox(tmp_path).pending("webhook") == 0
+    engine.close()
+
+
+def test_events_queued_at_close_are_replayed_one_post_each(
+    http_standin, tmp_path
+) -> None:
+    release = threading.Event()
+    http_standin.respond = lambda _r: 200 if release.wait(5) else 500
+    engine = _engine(f"{http_standin.url}/hook", tmp_path)
+    for n in range(5):
+        engine.dispatch(EventType.INPUT_NEEDED, f"s{n}", f"agent-{n}", "waiting")
+    # s0 holds the only worker; the rest are still queued at close
+    assert _wait_for(lambda: len(http_standin.requests) == 1)
+    engine.close(timeout=0.1)
+    release.set()
+    assert Outbox(tmp_path).pending("webhook") == 4
+
+    http_standin.respond = None
+    restarted = _engine(f"{http_standin.url}/hook", tmp_path)
+    assert _wait_for(lambda: Outbox(tmp_path).pending("webhook") == 0)
+    # digest_seconds is 0: one JSON object per POST, never NDJSON
+    replayed = [json.loads(r.body)["session_id"] for r in http_standin.requests[1:]]
+    assert replayed == ["s1", "s2", "s3", "s4"]
+    restarted.close()
+
+
+def test_replay_gives_up_on_a_record_after_max_attempts(tmp_path) -> None:
+    box = Outbox(tmp_path)
+    for n in range(2):
+        box.append("webhook", [_event(n)])
+    attempts: list[str] = []
+
+    def _send(event: NotificationEvent) -> bool:
+        attempts.append(event.session_id)
+        return event.session_id != "s0"
+
+    dispatcher = NotificationDispatcher(outbox=box)
+    dispatcher.add_channel(
+        "webhook", _send, backoff_seconds=0, durable=True, max_replays=3
+    )
+    assert _wait_for(lambda: box.pending("webhook") == 0)
+    assert attempts == ["s0", "s0", "s0", "s1"]
+    assert dispatcher.stats("webhook") == {
+        "queued": 0,
+        "delivered": 1,
+        "failed": 1,
+        "dropped": 0,
+    }
+    dispatcher.close()
+
+
+def test_events_filtered_out_since_count_as_delivered(http_standin, tmp_path) -> None:
+    box = Outbox(tmp_path)
+    idle = _event(0)
+    idle.event_type = EventType.SESSION_IDLE
+    box.append("slack", [idle])
+    box.append("slack", [_event(1)])
+    # Verbosity 10 (the default) no longer forwards idle events
+    engine = NotificationEngine(
+        {
+            "desktop": {"enabled": False},
+            "audio": {"enabled": False},
+            "slack": {"enabled": True, "webhook_url": f"{http_standin.url}/slack"},
+            "outbox": {"path": str(tmp_path)},
+        }
+    )
+    assert _wait_for(lambda: Outbox(tmp_path).pending("slack") == 0)
+    assert len(http_standin.requests) == 1
+    assert engine.get_dispatcher().stats("slack")["delivered"] == 2
+    engine.close()
+
+
+def _delivered(engine: NotificationEngine) -> int:
+    return engine.get_dispatcher().stats("webhook")["delivered"]
@@ -61,3 +61,16 @@ def test_clear() -> None:
     assert buf.get_all_text() == ""
     assert buf.total_lines_received == 0
     assert buf.total_bytes_received == 0
+
+
+def test_absolute_line_numbers_survive_eviction() -> None:
+    buf = OutputBuffer(maxlen=3)
+    buf.append_data("a\nb\nc\nd\ne\nf")
+    assert buf.first_line_number == 2
+    assert buf.line(2) == "c"
+    assert buf.line(4) == "e"
+    assert buf.line(1) is None
+    assert buf.line(5) is None
+    assert list(buf.iter_lines(0, 4)) == ["c", "d"]
+    assert list(buf.iter_lines(3, 10)) == ["d", "e"]
+    assert buf.partial == "f"
@@ -0,0 +1,81 @@
+"""Tests for per-session resource classes."""
+
+from __future__ import annotations
+
+import subprocess
+
+import psutil
+import pytest
+
+from tame.session.pty_process import PTYProcess
+from tame.session.resource_class import ResourceClass, parse_resource_classes
+
+_BATCH = ResourceClass(
+    "batch", nice=10, io_class="idle", max_memory_mb=512, max_processes=4000
+)
+
+
+@pytest.fixture
+def sleeper():
+    proc = subprocess.Popen(["sleep", "60"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def test_parse_clamps_and_validates() -> None:
+    classes = parse_resource_classes(
+        {
+            "batch": {"nice": 40, "io_class": "bogus", "io_level": 9},
+            "training": {"io_class": "idle", "max_memory_mb": -1},
+            "broken": "nice=5",
+        }
+    )
+    assert sorted(classes) == ["batch", "training"]
+    assert classes["batch"] == ResourceClass(
+        "batch", nice=19, io_class="best-effort", io_level=7
+    )
+    assert classes["training"].max_memory_mb == 0
+
+
+def test_describe() -> None:
+    assert _BATCH.describe() == "nice 10, io idle, mem 512MB, nproc 4000"
+    assert ResourceClass("i").describe() == "nice 0, io best-effort/4"
+
+
+def test_apply_to_running_process(sleeper) -> None:
+    assert _BATCH.apply(sleeper.pid) == []
+    proc = psutil.Process(sleeper.pid)
+    assert proc.nice() == 10
+    assert proc.ionice().ioclass == psutil.IOPRIO_CLASS_IDLE
+    assert proc.rlimit(psutil.RLIMIT_AS)[0] == 512 * 1024 * 1024
+    assert proc.rlimit(psutil.RLIMIT_NPROC)[0] == 4000
+
+
+def test_zero_limit_keeps_inherited_limit(sleeper) -> None:
+    proc = psutil.Process(sleeper.pid)
+    _, hard = proc.rlimit(psutil.RLIMIT_AS)
+    proc.rlimit(psutil.RLIMIT_AS, (256 * 1024 * 1024, hard))
+    assert ResourceClass("roomy", nice=10).apply(sleeper.pid) == []
+    assert proc.rlimit(psutil.RLIMIT_AS) == (256 * 1024 * 1024, hard)
+
+
+def test_apply_reports_refused_settings(monkeypatch, sleeper) -> None:
+    def _refuse(*_args):
+        raise PermissionError("not allowed")
+
+    monkeypatch.setattr("tame.session.resource_class.os.setpriority", _refuse)
+    assert _BATCH.apply(sleeper.pid) == ["nice"]
+
+
+def test_pty_process_starts_in_class() -> None:
+    pty_proc = PTYProcess()
+    pty_proc.start(command=["sleep", "60"], resource_class=_BATCH)
+    try:
+        assert pty_proc.pid is not None
+        # Applied by the parent as soon as Popen returns
+        proc = psutil.Process(pty_proc.pid)
+        assert proc.nice() == 10
+        assert proc.rlimit(psutil.RLIMIT_AS)[0] == 512 * 1024 * 1024
+    finally:
+        pty_proc.close()
@@ -0,0 +1,198 @@
+"""Tests for the process-tree resource monitor."""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from tame.session.resource_monitor import (
+    ProcSampler,
+    ResourceHistory,
+    ResourceMonitor,
+    ResourceUsage,
+)
+
+# Parent that spins for a while and keeps one sleeping child (auto-reaped)
+_TREE_SCRIPT = """
+import signal, subprocess, sys, time
+signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+print(child.pid, flush=True)
+end = time.monotonic() + 60
+while time.monotonic() < end:
+    pass
+"""
+
+
+@pytest.fixture
+def process_tree():
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _TREE_SCRIPT], stdout=subprocess.PIPE, text=True
+    )
+    child_pid = int(proc.stdout.readline())
+    yield proc, child_pid
+    for pid in (child_pid, proc.pid):
+        try:
+            psutil.Process(pid).kill()
+        except psutil.Error:
+            pass
+    proc.wait()
+
+
+def test_sums_whole_tree(process_tree) -> None:
+    proc, _ = process_tree
+    monitor = ResourceMonitor()
+    usage = monitor.sample({"s1": proc.pid})["s1"]
+    assert usage.num_processes == 2
+    expected_rss = sum(
+        p.memory_info().rss
+        for p in (psutil.Process(proc.pid), *psutil.Process(proc.pid).children())
+    )
+    # Both processes counted; allow for the busy parent's RSS moving slightly
+    assert usage.rss_bytes > expected_rss / 2
+    assert usage.num_fds >= 6
+    assert monitor.last_poll_processes == 2
+    assert monitor.last_poll_seconds > 0
+
+
+def test_cpu_is_measured_across_polls(process_tree) -> None:
+    proc, _ = process_tree
+    monitor = ResourceMonitor()
+    # The first call on a fresh handle has no baseline
+    assert monitor.sample({"s1": proc.pid})["s1"].cpu_percent == 0.0
+    handle = monitor._handles[proc.pid]
+    time.sleep(0.3)
+    usage = monitor.sample({"s1": proc.pid})["s1"]
+    assert monitor._handles[proc.pid] is handle
+    assert usage.cpu_percent > 10
+
+
+def test_dead_processes_are_evicted(process_tree) -> None:
+    proc, child_pid = process_tree
+    monitor = ResourceMonitor()
+    monitor.sample({"s1": proc.pid})
+    assert child_pid in monitor._handles
+    psutil.Process(child_pid).kill()
+    deadline = time.monotonic() + 5
+    while psutil.pid_exists(child_pid) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    usage = monitor.sample({"s1": proc.pid})["s1"]
+    assert usage.num_processes == 1
+    assert set(monitor._handles) == {proc.pid}
+
+
+def test_missing_root_is_skipped() -> None:
+    monitor = ResourceMonitor()
+    usage = monitor.sample({"s1": os.getpid(), "gone": 2**22 + 12345})
+    assert set(usage) == {"s1"}
+
+
+# ---------------------------------------------------------------------------
+# /proc sampler
+# ---------------------------------------------------------------------------
+
+
+def _write_stat(root, pid: int, ppid: int, ticks: int, rss_pages: int, comm="sh"):
+    fields = ["S", str(ppid)] + ["0"] * 9 + [str(ticks), "0"] + ["0"] * 6
+    fields += ["1000", "0", str(rss_pages)] + ["0"] * 20
+    proc = root / str(pid)
+    proc.mkdir(exist_ok=True)
+    (proc / "stat").write_text(f"{pid} ({comm}) " + " ".join(fields))
+
+
+def _fake_proc(tmp_path):
+    root = tmp_path / "proc"
+    (root / "self").mkdir(parents=True)
+    (root / "self" / "stat").write_text("")
+    return root
+
+
+def test_proc_sampler_builds_trees_in_one_pass(tmp_path) -> None:
+    root = _fake_proc(tmp_path)
+    _write_stat(root, 10, 1, ticks=100, rss_pages=10)
+    _write_stat(root, 11, 10, ticks=50, rss_pages=5, comm="a (weird) name")
+    _write_stat(root, 12, 11, ticks=0, rss_pages=1)
+    _write_stat(root, 20, 1, ticks=7, rss_pages=2)
+    sampler = ProcSampler(str(root))
+    usage = sampler.sample({"a": 10, "b": 20, "gone": 30}, detail=())
+    assert set(usage) == {"a", "b"}
+    assert usage["a"].num_processes == 3
+    assert usage["a"].rss_bytes == 16 * sampler._page_size
+    assert usage["a"].cpu_percent == 0.0
+    assert sampler.last_poll_processes == 4
+
+
+def test_proc_sampler_cpu_deltas(tmp_path) -> None:
+    root = _fake_proc(tmp_path)
+    _write_stat(root, 10, 1, ticks=100, rss_pages=10)
+    _write_stat(root, 11, 10, ticks=50, rss_pages=5)
+    sampler = ProcSampler(str(root))
+    sampler.sample({"a": 10})
+    sampler._prev_time -= 1.0  # one second of wall time
+    _write_stat(root, 10, 1, ticks=100 + sampler._clock_ticks // 2, rss_pages=10)
+    # pid 11 was replaced by an unrelated process: no baseline, no spike
+    _write_stat(root, 11, 10, ticks=9999, rss_pages=5)
+    stat = (root / "11" / "stat").read_text().replace(" 1000 ", " 2000 ")
+    (root / "11" / "stat").write_text(stat)
+    usage = sampler.sample({"a": 10})
+    assert usage["a"].cpu_percent == pytest.approx(50, rel=0.05)
+
+
+def test_proc_sampler_matches_psutil(process_tree) -> None:
+    proc, child_pid = process_tree
+    sampler = ProcSampler()
+    usage = sampler.sample({"s1": proc.pid})["s1"]
+    assert usage.num_processes == 2
+    assert usage.num_fds >= 6
+    time.sleep(0.3)
+    usage = sampler.sample({"s1": proc.pid}, detail=())["s1"]
+    assert usage.cpu_percent > 10
+    assert usage.num_fds == 0
+    expected = sum(
+        p.memory_info().rss
+        for p in (psutil.Process(proc.pid), psutil.Process(child_pid))
+    )
+    assert usage.rss_bytes == pytest.approx(expected, rel=0.5)
+
+
+def test_proc_sampler_falls_back_to_psutil(tmp_path) -> None:
+    sampler = ProcSampler(str(tmp_path / "missing"))
+    usage = sampler.sample({"s1": os.getpid()})
+    assert usage["s1"].num_processes >= 1
+    assert os.getpid() in sampler._handles
+
+
+# ---------------------------------------------------------------------------
+# History
+# ---------------------------------------------------------------------------
+
+
+def test_history_records_output_rate_and_wraps() -> None:
+    history = ResourceHistory(3)
+    history.record(1000.0, ResourceUsage(cpu_percent=10, rss_bytes=100), 0)
+    history.record(1005.0, ResourceUsage(cpu_percent=20, rss_bytes=200), 5000)
+    # Buffer cleared: the count restarts, which isn't negative output
+    history.record(1010.0, ResourceUsage(cpu_percent=30, rss_bytes=300), 10)
+    history.record(1015.0, ResourceUsage(cpu_percent=40, rss_bytes=400), 510)
+    assert len(history) == 3
+    assert list(history.cpu) == [20, 30, 40]
+    assert list(history.output_rate) == [1000, 0, 100]
+
+
+def test_history_csv_export() -> None:
+    history = ResourceHistory(10)
+    history.record(1000.0, ResourceUsage(cpu_percent=12.34, rss_bytes=2048), 0)
+    history.record(1005.0, ResourceUsage(), 500)
+    out = io.StringIO()
+    assert history.write_csv(out) == 2
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ["timestamp", "cpu_percent", "rss_bytes", "output_bytes_per_sec"]
+    assert rows[1][1:] == ["12.3", "2048", "0"]
+    assert rows[2][1:] == ["0.0", "0", "100"]
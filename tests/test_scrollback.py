@@ -0,0 +1,318 @@
+"""Tests for indexed scrollback history and viewer navigation."""
+
+from __future__ import annotations
+
+import pytest
+
+pyte = pytest.importorskip("pyte")
+
+from tame.session.output_buffer import OutputBuffer
+from tame.ui.widgets.session_viewer import (
+    SessionViewer,
+    TAMEScreen,
+    _CompactRow,
+    _display_width,
+    _IndexedHistory,
+    _TerminalState,
+)
+
+
+def _make_viewer(line_count: int, rows: int = 10, cols: int = 40) -> SessionViewer:
+    viewer = SessionViewer()
+    viewer._rows = rows
+    viewer._cols = cols
+    viewer._has_session = True
+    terminal = _TerminalState("s1", rows, cols)
+    terminal.feed("".join(f"line {i}\r\n" for i in range(line_count)))
+    viewer._terminals["s1"] = terminal
+    viewer._active_terminal = terminal
+    return viewer
+
+
+def _load_viewer(
+    lines: list[str], rows: int = 10, cols: int = 40, emulator_rows: int = 20
+) -> tuple[SessionViewer, OutputBuffer]:
+    buffer = OutputBuffer()
+    buffer.append_data("".join(f"{line}\r\n" for line in lines))
+    viewer = SessionViewer()
+    viewer._rows = rows
+    viewer._cols = cols
+    viewer._EMULATOR_HISTORY_ROWS = emulator_rows
+    viewer.load_session("s1", buffer)
+    return viewer, buffer
+
+
+def _scrollback_text(viewer: SessionViewer) -> list[str]:
+    return [
+        viewer._row_text(viewer._row_at_line(i)).rstrip()
+        for i in range(viewer.history_length)
+    ]
+
+
+def _visible_lines(viewer: SessionViewer) -> list[str]:
+    return [line.rstrip() for line in str(viewer.render()).split("\n")]
+
+
+# ---------------------------------------------------------------------------
+# _IndexedHistory
+# ---------------------------------------------------------------------------
+
+
+class TestIndexedHistory:
+    def test_append_and_index(self) -> None:
+        ring = _IndexedHistory(5)
+        for i in range(3):
+            ring.append(i)
+        assert len(ring) == 3
+        assert [ring[i] for i in range(3)] == [0, 1, 2]
+        assert ring[-1] == 2
+
+    def test_wraps_and_evicts_oldest(self) -> None:
+        ring = _IndexedHistory(3)
+        ring.extend(range(7))
+        assert list(ring) == [4, 5, 6]
+        assert ring[0] == 4
+        assert ring.appended == 7
+
+    def test_pop_and_clear(self) -> None:
+        ring = _IndexedHistory(3)
+        ring.extend(range(5))
+        assert ring.pop() == 4
+        assert list(ring) == [2, 3]
+        ring.clear()
+        assert not ring
+        with pytest.raises(IndexError):
+            ring.pop()
+
+    def test_out_of_range(self) -> None:
+        ring = _IndexedHistory(3)
+        ring.append("a")
+        with pytest.raises(IndexError):
+            ring[1]
+
+    def test_zero_capacity_is_noop(self) -> None:
+        ring = _IndexedHistory(0)
+        ring.append("a")
+        assert len(ring) == 0
+
+    def test_screen_uses_indexed_history(self) -> None:
+        screen = TAMEScreen(columns=20, lines=3, history=50)
+        stream = pyte.Stream(screen)
+        stream.feed("".join(f"row{i}\r\n" for i in range(10)))
+        history = screen.history.top
+        assert isinstance(history, _IndexedHistory)
+        assert isinstance(history[0], _CompactRow)
+        assert history[0].text(6) == "row0  "
+
+
+# ---------------------------------------------------------------------------
+# Compact history rows
+# ---------------------------------------------------------------------------
+
+
+def _feed_screen(text: str, columns: int = 20, lines: int = 3) -> TAMEScreen:
+    screen = TAMEScreen(columns=columns, lines=lines, history=50)
+    pyte.Stream(screen).feed(text)
+    return screen
+
+
+class TestCompactRows:
+    def test_plain_row_has_no_attrs_and_trims_blanks(self) -> None:
+        screen = _feed_screen("hello\r\n" * 5)
+        row = screen.history.top[0]
+        assert row.attrs is None
+        assert len(row) == 5
+        assert row.codes.typecode == "B"
+
+    def test_attributes_are_interned(self) -> None:
+        screen = _feed_screen("\x1b[31mred\x1b[0m plain\r\n" * 5)
+        row = screen.history.top[0]
+        assert row.text(9) == "red plain"
+        assert list(row.attrs[:4]) == [1, 1, 1, 0]
+        # Every row reuses the same interned id
+        assert len(screen.attr_table) == 2
+        assert screen.history.top[1].attrs[0] == 1
+
+    def test_wide_and_combining_characters(self) -> None:
+        # x + combining acute has no precomposed form, so it stays two codepoints
+        screen = _feed_screen("中x\u0301y\r\n" * 5)
+        row = screen.history.top[0]
+        assert row.codes.typecode == "H"
+        assert row.cells(4) == ["中", " ", "x\u0301", "y"]
+        assert row.extras == {2: "x\u0301"}
+
+    def test_trailing_colored_blanks_are_kept(self) -> None:
+        screen = _feed_screen("a\x1b[44m  \x1b[0m\r\n" * 5)
+        assert len(screen.history.top[0]) == 3
+
+    def test_history_bytes_track_eviction(self) -> None:
+        screen = TAMEScreen(columns=20, lines=3, history=4)
+        stream = pyte.Stream(screen)
+        stream.feed("".join(f"row{i}\r\n" for i in range(20)))
+        assert len(screen.history.top) == 4
+        assert screen.history_nbytes == sum(r.nbytes for r in screen.history.top)
+        stream.feed("\x1b[3J")
+        assert screen.history_nbytes == 0
+
+    def test_reverse_index_does_not_retain_rows(self) -> None:
+        screen = _feed_screen("a\r\nb\r\nc" + "\x1bM" * 10)
+        assert len(screen.history.bottom) == 0
+
+    def test_compact_history_is_smaller_than_char_dicts(self) -> None:
+        terminal = _TerminalState("s1", rows=24, cols=200)
+        terminal.feed(
+            "".join(f"\x1b[32m{i:05d}\x1b[0m " + "x" * 150 + "\r\n" for i in range(500))
+        )
+        dict_estimate = len(terminal.screen.history.top) * 150 * 112
+        assert terminal.screen.history_nbytes < dict_estimate / 10
+        assert terminal.memory_bytes() > terminal.screen.history_nbytes
+
+    def test_scrolled_render_keeps_colors(self) -> None:
+        viewer = _make_viewer(0)
+        viewer._active_terminal.feed("\x1b[31mred\x1b[0m\r\n" * 30)
+        viewer.scroll_to_top()
+        text = viewer.render()
+        assert str(text).split("\n")[0].rstrip() == "red"
+        assert any(
+            span.style.color and span.style.color.name == "red" for span in text.spans
+        )
+
+
+# ---------------------------------------------------------------------------
+# Viewer navigation
+# ---------------------------------------------------------------------------
+
+
+class TestNavigation:
+    def test_render_scrolled_reads_history_rows(self) -> None:
+        viewer = _make_viewer(100)
+        viewer.scroll_lines(20)
+        top = viewer.first_visible_line
+        assert _visible_lines(viewer)[0] == f"line {top}"
+
+    def test_page_up_and_down(self) -> None:
+        viewer = _make_viewer(100)
+        viewer.scroll_page(up=True)
+        assert viewer._scroll_offset == 9
+        assert not viewer._auto_scroll
+        viewer.scroll_page(up=False)
+        assert viewer._scroll_offset == 0
+        assert viewer._auto_scroll
+
+    def test_home_and_end(self) -> None:
+        viewer = _make_viewer(100)
+        viewer.scroll_to_top()
+        assert viewer.first_visible_line == 0
+        assert _visible_lines(viewer)[0] == "line 0"
+        viewer.scroll_to_bottom()
+        assert viewer._scroll_offset == 0
+        assert viewer._auto_scroll
+
+    def test_scroll_is_clamped(self) -> None:
+        viewer = _make_viewer(30)
+        viewer.scroll_lines(10_000)
+        assert viewer._scroll_offset == viewer.history_length
+        viewer.scroll_lines(-10_000)
+        assert viewer._scroll_offset == 0
+
+    def test_jump_to_line(self) -> None:
+        viewer = _make_viewer(200)
+        viewer.jump_to_line(50)
+        assert "line 50" in _visible_lines(viewer)
+
+    def test_reveal_output_line_finds_text(self) -> None:
+        viewer = _make_viewer(200)
+        # "line 42" is 158 lines before the (empty) last output line
+        assert viewer.reveal_output_line(158, "line 42")
+        assert "line 42" in _visible_lines(viewer)
+
+    def test_scrolled_view_stays_pinned_on_new_output(self, monkeypatch) -> None:
+        viewer = _make_viewer(100)
+        monkeypatch.setattr(viewer, "_schedule_refresh", lambda: None)
+        viewer.jump_to_line(20)
+        before = _visible_lines(viewer)
+        viewer.append_output("".join(f"more {i}\r\n" for i in range(5)))
+        assert _visible_lines(viewer) == before
+
+
+# ---------------------------------------------------------------------------
+# Scrollback derived from the OutputBuffer
+# ---------------------------------------------------------------------------
+
+
+class TestDerivedScrollback:
+    def test_old_rows_come_from_output_buffer(self) -> None:
+        viewer, _ = _load_viewer([f"line {i}" for i in range(300)])
+        terminal = viewer._active_terminal
+        assert len(terminal.screen.history.top) == 20
+        # Rows 291..299 are on the live screen; everything above is seamless
+        assert _scrollback_text(viewer) == [f"line {i}" for i in range(291)]
+        viewer.scroll_to_top()
+        assert _visible_lines(viewer)[0] == "line 0"
+
+    def test_long_lines_wrap_to_viewer_width(self) -> None:
+        lines = [f"{i:03d}" + "x" * (i % 90) for i in range(200)]
+        viewer, _ = _load_viewer(lines, cols=40)
+        rows = _scrollback_text(viewer)
+        first_emulated = viewer._active_terminal.screen.history.top[0].line
+        derived = "".join(rows[: len(rows) - 20])
+        assert derived == "".join(lines[:first_emulated])
+
+    def test_derived_rows_keep_colors(self) -> None:
+        viewer, _ = _load_viewer(["\x1b[31mred\x1b[0m plain"] * 100)
+        row = viewer._active_terminal.scrollback_row(0)
+        table = viewer._active_terminal.screen.attr_table
+        assert row.text(9) == "red plain"
+        assert table.keys[row.attrs[0]][0] == "red"
+
+    def test_seam_moves_as_output_streams(self, monkeypatch) -> None:
+        viewer, buffer = _load_viewer([f"line {i}" for i in range(100)])
+        monkeypatch.setattr(viewer, "_schedule_refresh", lambda: None)
+        for i in range(100, 160):
+            text = f"line {i}\r\n"
+            buffer.append_data(text)
+            viewer.append_output(text)
+        assert _scrollback_text(viewer) == [f"line {i}" for i in range(151)]
+
+    def test_wrapped_output_crossing_the_seam(self, monkeypatch) -> None:
+        lines = [f"{i:03d}" + "x" * (i * 7 % 110) for i in range(150)]
+        viewer, buffer = _load_viewer(lines[:100], cols=40)
+        monkeypatch.setattr(viewer, "_schedule_refresh", lambda: None)
+        for line in lines[100:]:
+            text = f"{line}\r\n"
+            buffer.append_data(text)
+            viewer.append_output(text)
+        screen = viewer._active_terminal.screen
+        rows = _scrollback_text(viewer) + [row.rstrip() for row in screen.display]
+        # Every line exactly once across derived rows, history and the screen
+        assert "".join(rows) == "".join(lines)
+
+    def test_reveal_old_output_line_is_exact(self) -> None:
+        viewer, buffer = _load_viewer([f"entry {i}" for i in range(500)])
+        # "entry 7" without text to refine by: the mapping alone must be exact
+        assert viewer.reveal_output_line(buffer.total_lines_received - 7)
+        assert viewer._row_text(viewer._row_at_line(7)).rstrip() == "entry 7"
+        assert "entry 7" in _visible_lines(viewer)
+
+    def test_display_width(self) -> None:
+        assert _display_width("\x1b[1mbold\x1b[0m") == 4
+        assert _display_width("a\tb") == 9
+        assert _display_width("中文") == 4
+        assert _display_width("progress 10%\rdone") == 12
+
+    def test_cached_terminal_keeps_one_copy(self) -> None:
+        lines = [f"{i:05d} " + "lorem ipsum " * 12 for i in range(3000)]
+        full, _ = _load_viewer(lines, rows=24, cols=120, emulator_rows=10000)
+        derived, _ = _load_viewer(lines, rows=24, cols=120, emulator_rows=200)
+        full_bytes = full._active_terminal.memory_bytes()
+        derived_bytes = derived._active_terminal.memory_bytes()
+        assert derived_bytes < full_bytes / 3
+
+    def test_reload_session_rebuilds_active_terminal(self) -> None:
+        viewer, buffer = _load_viewer([f"line {i}" for i in range(50)])
+        stale = viewer._active_terminal
+        # Output that reached the buffer but never the viewer
+        buffer.append_data("".join(f"late {i}\r\n" for i in range(5)))
+        viewer.reload_session("s1", buffer)
+        assert viewer._active_terminal is not stale
+        assert "late 4" in _visible_lines(viewer)
@@ -10,6 +10,7 @@ from tame.session.pattern_matcher import PatternMatcher
 from tame.session.session import Session
 from tame.session.state import AttentionState, ProcessState, SessionState
 from tame.ui.widgets.session_list_item import ATTENTION_BADGE, SessionListItem
+from tame.ui.widgets.session_sidebar import SessionSidebar
 
 
 @pytest.fixture
@@ -59,7 +60,8 @@ async def test_session_list_item_renders_name_and_status(app: TAMEApp) -> None:
     async with app.run_test() as pilot:
         app._create_session("session-visible")
         await pilot.pause()
-        item = app.query_one(SessionListItem)
+        session_list = app.query_one(SessionSidebar).session_list
+        item = session_list.item("test-session-1")
         rendered = item.render()
         assert "session-visible" in rendered.plain
         assert "ACTIVE" in rendered.plain
@@ -90,3 +92,23 @@ def test_idle_status_has_no_attention_badge() -> None:
     item = SessionListItem(session_id="s4", name="test", status=SessionState.IDLE)
     rendered = item.render()
     assert rendered.plain.rstrip().endswith("IDLE")
+
+
+def test_sparkline_renders_before_resources() -> None:
+    item = SessionListItem(session_id="s5", name="test", status=SessionState.IDLE)
+    assert item.update_resources(12, "40.0MB")
+    assert item.update_sparkline("▁▃█")
+    assert not item.update_sparkline("▁▃█")
+    assert item.render().plain.endswith("IDLE  ▁▃█ 12% 40.0MB")
+
+
+def test_pending_row_shows_queue_position_and_wait() -> None:
+    item = SessionListItem(session_id="s6", name="job", status=SessionState.PENDING)
+    assert item.update_queue(2)
+    assert item.render().plain == "\u25cc job  PENDING #2"
+    assert item.update_queue(2, 30)
+    assert item.render().plain.endswith("PENDING #2 <1m")
+    assert item.update_queue(1, 3900)
+    assert item.render().plain.endswith("PENDING #1 ~1h05m")
+    assert item.update_queue(None)
+    assert item.render().plain.endswith("PENDING")
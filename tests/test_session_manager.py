@@ -1,12 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import asyncio
+import subprocess
+import time
+from datetime import UTC, datetime, timezone
 
-from tame.session.manager import SessionManager
+import psutil
+import pytest
+
+from tame.session.manager import SessionManager, classify_output
 from tame.session.output_buffer import OutputBuffer
 from tame.session.pattern_matcher import PatternMatcher
+from tame.session.resource_class import ResourceClass
 from tame.session.session import Session
-from tame.session.state import AttentionState, ProcessState, SessionState
+from tame.session.state import (
+    AttentionState,
+    OutputKind,
+    ProcessState,
+    SessionState,
+)
 
 
 def _make_manager_with_session() -> tuple[
@@ -412,7 +424,7 @@ def test_prompt_then_error_in_same_chunk_yields_error() -> None:
 def test_split_utf8_multibyte_across_chunks_preserved() -> None:
     seen: list[str] = []
     manager, session, _ = _make_manager_with_session()
-    manager._on_output = lambda _sid, text: seen.append(text)
+    manager._on_output = lambda _sid, text, _kind: seen.append(text)
 
     # '€' split across PTY reads: e2 82 ac
     manager._on_session_output(session.id, b"price: \xe2")
@@ -426,7 +438,7 @@ def test_split_utf8_multibyte_across_chunks_preserved() -> None:
 def test_decoder_flushed_on_eof() -> None:
     seen: list[str] = []
     manager, session, _ = _make_manager_with_session()
-    manager._on_output = lambda _sid, text: seen.append(text)
+    manager._on_output = lambda _sid, text, _kind: seen.append(text)
 
     # Incomplete multibyte code point should emit replacement only at EOF.
     manager._on_session_output(session.id, b"incomplete: \xe2")
@@ -434,3 +446,412 @@ def test_decoder_flushed_on_eof() -> None:
 
     assert "incomplete: \ufffd" in session.output_buffer.get_all_text()
     assert "".join(seen).startswith("incomplete: ")
+
+
+def test_focused_output_is_classified_for_the_ui() -> None:
+    seen: list[tuple[str, OutputKind]] = []
+    manager, session, _ = _make_manager_with_session()
+    manager._on_output = lambda _sid, text, kind: seen.append((text, kind))
+
+    manager._on_session_output(session.id, b"\x1b[2J")
+    manager.focused_session_id = session.id
+    manager._on_session_output(session.id, b"building...\r\n")
+    manager._on_session_output(session.id, b"\r 42%")
+    manager._on_session_output(session.id, b"\x1b[2J\x1b[Hredraw")
+
+    # Unfocused output isn't scanned at all
+    assert [kind for _text, kind in seen] == [
+        OutputKind.BACKGROUND,
+        OutputKind.STREAM,
+        OutputKind.REDRAW,
+        OutputKind.REDRAW,
+    ]
+
+
+def test_classify_output() -> None:
+    assert classify_output("plain text\n") is OutputKind.STREAM
+    assert classify_output("\x1b[31mcolored\x1b[0m\r\n") is OutputKind.STREAM
+    assert classify_output("\x1b[1A") is OutputKind.REDRAW
+    assert classify_output("\x0c") is OutputKind.REDRAW
+    assert classify_output("\x1bc") is OutputKind.REDRAW
+
+
+# ------------------------------------------------------------------
+# Priority lane for the focused session
+# ------------------------------------------------------------------
+
+
+def _add_session(manager: SessionManager, session_id: str) -> Session:
+    now = datetime.now(UTC)
+    session = Session(
+        id=session_id,
+        name=session_id,
+        working_dir=".",
+        process_state=ProcessState.RUNNING,
+        attention_state=AttentionState.NONE,
+        created_at=now,
+        last_activity=now,
+        output_buffer=OutputBuffer(),
+        pattern_matcher=PatternMatcher(manager._patterns),
+        pid=None,
+        pty_process=None,
+    )
+    manager._sessions[session_id] = session
+    return session
+
+
+async def test_background_output_is_deferred_behind_focused() -> None:
+    seen: list[str] = []
+    manager = SessionManager(
+        on_output=lambda sid, _text, _kind: seen.append(sid), state_debounce_ms=0
+    )
+    manager._loop = asyncio.get_running_loop()
+    focused = _add_session(manager, "focused")
+    background = _add_session(manager, "background")
+    manager.focused_session_id = "focused"
+
+    manager._on_session_output("background", b"bg 1\n")
+    manager._on_session_output("focused", b"fg\n")
+    manager._on_session_output("background", b"bg 2\n")
+
+    # The focused session is handled as it is read; background waits a turn
+    assert seen == ["focused"]
+    assert "fg" in focused.output_buffer.get_all_text()
+    assert background.output_buffer.get_all_text() == ""
+
+    await asyncio.sleep(0.01)
+    # Consecutive deferred reads are handled as one chunk
+    assert seen == ["focused", "background"]
+    assert "bg 1\nbg 2" in background.output_buffer.get_all_text()
+    assert manager._deferred_bytes == 0
+    manager.close_all()
+
+
+async def test_deferred_output_is_drained_in_budgeted_slices(monkeypatch) -> None:
+    manager = SessionManager(state_debounce_ms=0)
+    manager._loop = asyncio.get_running_loop()
+    sessions = [_add_session(manager, f"s{i}") for i in range(3)]
+    for i in range(4):
+        for session in sessions:
+            manager._on_session_output(session.id, f"line {i}\n".encode())
+    # A zero budget handles one chunk per slice, taking sessions in turn
+    monkeypatch.setattr(manager, "_BACKGROUND_SLICE_SECONDS", 0.0)
+    monkeypatch.setattr(manager, "_BACKGROUND_BATCH_BYTES", 1)
+    manager._drain_handle.cancel()
+    manager._drain_deferred()
+    assert ["line 0" in s.output_buffer.get_all_text() for s in sessions] == [
+        True,
+        False,
+        False,
+    ]
+    manager._drain_handle.cancel()
+    manager._drain_deferred()
+    manager._drain_deferred()
+    assert all("line 0" in s.output_buffer.get_all_text() for s in sessions)
+    assert not any("line 1" in s.output_buffer.get_all_text() for s in sessions)
+    manager.close_all()
+
+
+async def test_focusing_a_session_catches_up_its_deferred_output() -> None:
+    seen: list[tuple[str, OutputKind]] = []
+    manager = SessionManager(
+        on_output=lambda _sid, text, kind: seen.append((text, kind)),
+        state_debounce_ms=0,
+    )
+    manager._loop = asyncio.get_running_loop()
+    session = _add_session(manager, "s1")
+    manager._on_session_output("s1", b"one\n")
+    manager._on_session_output("s1", b"two\n")
+
+    manager.focused_session_id = "s1"
+
+    assert seen == [("one\n", OutputKind.STREAM), ("two\n", OutputKind.STREAM)]
+    assert session.output_buffer.get_all_text().startswith("one\ntwo")
+    manager._on_session_output("s1", b"three\n")
+    assert seen[-1] == ("three\n", OutputKind.STREAM)
+    manager.close_all()
+
+
+def test_delete_session_drops_deferred_output() -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        manager = SessionManager(state_debounce_ms=0)
+        manager._loop = loop
+        _add_session(manager, "s1")
+        manager._on_session_output("s1", b"x" * 100)
+        manager.delete_session("s1")
+        assert manager._deferred == {}
+        assert manager._deferred_bytes == 0
+        manager._drain_deferred()  # nothing left, no error
+        manager.close_all()
+    finally:
+        loop.close()
+
+
+async def test_deferred_eof_is_not_merged_into_data() -> None:
+    manager = SessionManager(state_debounce_ms=0)
+    manager._loop = asyncio.get_running_loop()
+    session = _add_session(manager, "s1")
+    manager._on_session_output("s1", b"last words\n")
+    manager._on_session_output("s1", b"")
+
+    await asyncio.sleep(0.01)
+
+    assert "last words" in session.output_buffer.get_all_text()
+    assert session.process_state is ProcessState.EXITED
+    manager.close_all()
+
+
+# ---------------------------------------------------------------------------
+# Admission control
+# ---------------------------------------------------------------------------
+
+
+class _SpawnedPTY:
+    _next_pid = 1000
+
+    def __init__(self) -> None:
+        _SpawnedPTY._next_pid += 1
+        self.pid = _SpawnedPTY._next_pid
+        self.is_alive = True
+        self.written: list[str] = []
+        self.exit_code = 0
+
+    def write(self, text: str) -> None:
+        self.written.append(text)
+
+    def pause(self) -> None:
+        pass
+
+    def resume(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.is_alive = False
+
+
+def _make_limited_manager(
+    monkeypatch, limit: int = 2, debounce_ms: int = 0
+) -> tuple[SessionManager, list[tuple[SessionState, SessionState]]]:
+    transitions: list[tuple[SessionState, SessionState]] = []
+
+    def on_status(
+        _sid: str, old: SessionState, new: SessionState, _matched: str = ""
+    ) -> None:
+        transitions.append((old, new))
+
+    spawned: list[tuple[int, int]] = []
+
+    def _spawn(request):
+        spawned.append((request.rows, request.cols))
+        return _SpawnedPTY()
+
+    monkeypatch.setattr(SessionManager, "_spawn", staticmethod(_spawn))
+    manager = SessionManager(
+        on_status_change=on_status,
+        state_debounce_ms=debounce_ms,
+        max_concurrent_sessions=limit,
+    )
+    manager.spawned = spawned  # type: ignore[attr-defined]
+    return manager, transitions
+
+
+def test_sessions_beyond_limit_are_queued(monkeypatch) -> None:
+    manager, _ = _make_limited_manager(monkeypatch)
+    first = manager.create_session("a", ".")
+    manager.create_session("b", ".")
+    third = manager.create_session("c", ".")
+    fourth = manager.create_session("d", ".")
+    assert first.status is SessionState.ACTIVE
+    assert third.status is SessionState.PENDING
+    assert third.pty_process is None and third.pid is None
+    assert manager.pending_count == 2
+    assert manager.pending_queue() == [(third.id, None), (fourth.id, None)]
+
+
+def test_exit_starts_next_queued_session_with_buffered_input(monkeypatch) -> None:
+    manager, transitions = _make_limited_manager(monkeypatch, limit=1)
+    first = manager.create_session("a", ".")
+    queued = manager.create_session("b", ".", rows=24, cols=80)
+    manager.send_input(queued.id, "make test\r")
+    manager.resize_session(queued.id, 40, 120)
+
+    manager.mark_session_exited(first.id)
+
+    assert queued.status is SessionState.ACTIVE
+    assert queued.pty_process.written == ["make test\r"]
+    assert manager.spawned[-1] == (40, 120)
+    assert (SessionState.PENDING, SessionState.ACTIVE) in transitions
+    assert manager.pending_count == 0
+
+
+def test_admission_is_not_debounced(monkeypatch) -> None:
+    manager, transitions = _make_limited_manager(
+        monkeypatch, limit=1, debounce_ms=60_000
+    )
+    first = manager.create_session("a", ".")
+    queued = manager.create_session("b", ".")
+    # A state change just before the slot frees up starts a debounce window
+    manager._stamp_debounce(queued.id)
+
+    manager.mark_session_exited(first.id)
+
+    assert queued.status is SessionState.ACTIVE
+    assert (SessionState.PENDING, SessionState.ACTIVE) in transitions
+
+
+def test_pause_frees_a_slot_but_pause_all_does_not(monkeypatch) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    first = manager.create_session("a", ".")
+    second = manager.create_session("b", ".")
+    third = manager.create_session("c", ".")
+
+    manager.pause_all()
+    assert first.status is SessionState.PAUSED
+    assert second.status is third.status is SessionState.PENDING
+
+    manager.resume_session(first.id)
+    manager.pause_session(first.id)
+    assert second.status is SessionState.ACTIVE
+    assert third.status is SessionState.PENDING
+
+
+def test_delete_updates_the_queue(monkeypatch) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    first = manager.create_session("a", ".")
+    second = manager.create_session("b", ".")
+    third = manager.create_session("c", ".")
+    manager.delete_session(second.id)
+    assert manager.pending_queue() == [(third.id, None)]
+    manager.delete_session(first.id)
+    assert third.status is SessionState.ACTIVE
+
+
+def test_queue_estimates_follow_release_rate(monkeypatch) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    manager.create_session("a", ".")
+    second = manager.create_session("b", ".")
+    third = manager.create_session("c", ".")
+    now = time.monotonic()
+    # Slots freed every 60 s, the last one 20 s ago
+    manager._slot_releases.extend([now - 140, now - 80, now - 20])
+    (_, eta2), (_, eta3) = manager.pending_queue()
+    assert eta2 == pytest.approx(40, abs=1)
+    assert eta3 == pytest.approx(100, abs=1)
+    assert [sid for sid, _ in manager.pending_queue()] == [second.id, third.id]
+
+
+def test_reattached_sessions_bypass_the_queue(monkeypatch) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    manager.create_session("a", ".")
+    restored = manager.create_session("b", ".", queue_if_full=False)
+    assert restored.status is SessionState.ACTIVE
+    assert manager.create_session("c", ".").status is SessionState.PENDING
+
+
+def test_failed_admission_marks_session_error(monkeypatch) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    first = manager.create_session("a", ".")
+    queued = manager.create_session("b", ".")
+
+    def _fail(_request):
+        raise OSError("no such shell")
+
+    monkeypatch.setattr(SessionManager, "_spawn", staticmethod(_fail))
+    manager.mark_session_exited(first.id)
+    assert queued.status is SessionState.ERROR
+    assert manager.pending_count == 0
+
+
+def test_no_limit_never_queues(monkeypatch) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=0)
+    sessions = [manager.create_session(f"s{i}", ".") for i in range(5)]
+    assert all(s.status is SessionState.ACTIVE for s in sessions)
+
+
+@pytest.fixture
+def sleeper():
+    proc = subprocess.Popen(["sleep", "60"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def _wait_for_status(pid: int, status: str) -> bool:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if psutil.Process(pid).status() == status:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_throttled_session_keeps_its_slot(monkeypatch, sleeper) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    first = manager.create_session("a", ".")
+    queued = manager.create_session("b", ".")
+
+    assert manager.throttle_session(first.id, sleeper.pid)
+    assert first.status is SessionState.PAUSED
+    assert queued.status is SessionState.PENDING
+    assert manager.throttled_session_ids == [first.id]
+    assert _wait_for_status(sleeper.pid, psutil.STATUS_STOPPED)
+
+    assert manager.unthrottle_session(first.id)
+    assert first.status is SessionState.ACTIVE
+    assert manager.throttled_session_ids == []
+    assert _wait_for_status(sleeper.pid, psutil.STATUS_SLEEPING)
+    assert queued.status is SessionState.PENDING
+
+
+def test_manual_resume_continues_throttled_tree(monkeypatch, sleeper) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=0)
+    session = manager.create_session("a", ".")
+    manager.throttle_session(session.id, sleeper.pid)
+    assert _wait_for_status(sleeper.pid, psutil.STATUS_STOPPED)
+
+    manager.resume_session(session.id)
+    assert manager.throttled_session_ids == []
+    assert _wait_for_status(sleeper.pid, psutil.STATUS_SLEEPING)
+    # Only the governor's own pauses are its to undo
+    assert not manager.unthrottle_session(session.id)
+
+
+def test_throttled_session_exit_frees_its_slot(monkeypatch, sleeper) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    first = manager.create_session("a", ".")
+    queued = manager.create_session("b", ".")
+    manager.throttle_session(first.id, sleeper.pid)
+
+    manager.mark_session_exited(first.id)
+    assert queued.status is SessionState.ACTIVE
+    assert manager.throttled_session_ids == []
+
+
+def test_only_running_sessions_are_throttled(monkeypatch, sleeper) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    manager.create_session("a", ".")
+    queued = manager.create_session("b", ".")
+    assert not manager.throttle_session(queued.id, sleeper.pid)
+    assert manager.throttled_session_ids == []
+
+
+def test_resource_class_follows_queued_session(monkeypatch, sleeper) -> None:
+    manager, _ = _make_limited_manager(monkeypatch, limit=1)
+    manager._resource_classes = {
+        "batch": ResourceClass("batch", nice=10),
+        "idle": ResourceClass("idle", nice=19),
+    }
+    running = manager.create_session("a", ".", resource_class="batch")
+    queued = manager.create_session("b", ".", resource_class="nope")
+    assert running.resource_class == "batch"
+    assert queued.resource_class == ""
+
+    assert manager.set_resource_class(queued.id, "idle") == []
+    assert queued.resource_class == "idle"
+    assert manager._pending[queued.id].resource_class.nice == 19
+
+    assert manager.set_resource_class(running.id, "idle", sleeper.pid) == []
+    assert psutil.Process(sleeper.pid).nice() == 19
+    with pytest.raises(KeyError):
+        manager.set_resource_class(running.id, "nope")
@@ -9,7 +9,8 @@ from tame.session.output_buffer import OutputBuffer
 from tame.session.pattern_matcher import PatternMatcher
 from tame.session.session import Session
 from tame.session.state import AttentionState, ProcessState
-from tame.ui.widgets.session_list_item import SessionListItem
+from tame.ui.widgets.session_sidebar import SessionList, SessionSidebar
+from textual.strip import Strip
 from textual.widgets import Label
 
 
@@ -69,6 +70,11 @@ def app(tmp_path, monkeypatch) -> TAMEApp:
     return app
 
 
+def _visible_names(app: TAMEApp) -> list[str]:
+    session_list = app.query_one(SessionList)
+    return [session_list.item(sid).name for sid in session_list.visible_session_ids()]
+
+
 @pytest.mark.asyncio
 async def test_search_filters_sessions(app: TAMEApp) -> None:
     """Typing in the search box hides non-matching sessions."""
@@ -78,19 +84,13 @@ async def test_search_filters_sessions(app: TAMEApp) -> None:
         app._create_session("gamma-task")
         await pilot.pause()
 
-        items = app.query(SessionListItem)
-        assert len(items) == 3
-        assert all(item.display for item in items)
+        assert _visible_names(app) == ["alpha-project", "beta-project", "gamma-task"]
 
         search = app.query_one("#session-search")
         search.value = "beta"
         await pilot.pause()
 
-        visible = [i for i in app.query(SessionListItem) if i.display]
-        hidden = [i for i in app.query(SessionListItem) if not i.display]
-        assert len(visible) == 1
-        assert visible[0]._session_name == "beta-project"
-        assert len(hidden) == 2
+        assert _visible_names(app) == ["beta-project"]
 
 
 @pytest.mark.asyncio
@@ -126,11 +126,11 @@ async def test_search_clear_restores_all(app: TAMEApp) -> None:
         search = app.query_one("#session-search")
         search.value = "alpha"
         await pilot.pause()
-        assert sum(1 for i in app.query(SessionListItem) if i.display) == 1
+        assert len(_visible_names(app)) == 1
 
         search.value = ""
         await pilot.pause()
-        assert sum(1 for i in app.query(SessionListItem) if i.display) == 2
+        assert len(_visible_names(app)) == 2
 
 
 @pytest.mark.asyncio
@@ -144,6 +144,75 @@ async def test_search_is_case_insensitive(app: TAMEApp) -> None:
         search.value = "myproject"
         await pilot.pause()
 
-        visible = [i for i in app.query(SessionListItem) if i.display]
-        assert len(visible) == 1
-        assert visible[0]._session_name == "MyProject"
+        assert _visible_names(app) == ["MyProject"]
+
+
+@pytest.mark.asyncio
+async def test_groups_collapse_and_cluster(app: TAMEApp) -> None:
+    """Group members sit under one header; clicking it collapses the group."""
+    async with app.run_test(size=(120, 40)) as pilot:
+        sidebar = app.query_one(SessionSidebar)
+        for name, group in (("a", "web"), ("b", ""), ("c", "web")):
+            session = _make_session(app, name)
+            session.group = group
+            sidebar.add_session(session)
+        await pilot.pause()
+        session_list = sidebar.session_list
+        assert session_list._rows == [
+            (True, "web"),
+            (False, "test-session-1"),
+            (False, "test-session-3"),
+            (False, "test-session-2"),
+        ]
+
+        await pilot.click(SessionList, offset=(2, 0))
+        await pilot.pause()
+        assert session_list.is_collapsed("web")
+        assert _visible_names(app) == ["b"]
+        assert "▶ web" in session_list.render_line(0).text
+
+        # Moving a session into a group regroups it
+        moved = app._session_manager.get_session("test-session-2")
+        moved.group = "web"
+        sidebar.update_session(moved)
+        await pilot.pause()
+        assert session_list._rows == [(True, "web")]
+
+
+@pytest.mark.asyncio
+async def test_sidebar_renders_only_visible_rows_at_500_sessions(
+    app: TAMEApp, monkeypatch
+) -> None:
+    """Hundreds of sessions cost one widget and a screenful of rows."""
+    async with app.run_test(size=(120, 40)) as pilot:
+        sidebar = app.query_one(SessionSidebar)
+        session_list = sidebar.session_list
+        widgets_before = len(sidebar.query("*"))
+        sessions = [_make_session(app, f"agent-{i:03d}") for i in range(500)]
+        for session in sessions:
+            sidebar.add_session(session)
+        await pilot.pause()
+        assert len(sidebar.query("*")) == widgets_before
+        assert len(session_list.visible_session_ids()) == 500
+
+        rendered: list[int] = []
+        original = session_list.render_line
+
+        def _counting_render_line(y: int) -> Strip:
+            rendered.append(y)
+            return original(y)
+
+        monkeypatch.setattr(session_list, "render_line", _counting_render_line)
+        sidebar.update_resources([(s.id, 1.0, "10MB") for s in sessions])
+        sidebar.highlight_session(sessions[-1].id)
+        await pilot.pause()
+        height = session_list.scrollable_content_region.height
+        assert 0 < len(rendered) <= 2 * height
+        assert session_list.scroll_offset.y > 0
+
+        # Incremental filtering narrows the previous matches
+        search = app.query_one("#session-search")
+        for query in ("a", "ag", "agent-4", "agent-49"):
+            search.value = query
+            await pilot.pause()
+        assert _visible_names(app) == [f"agent-49{i}" for i in range(10)]
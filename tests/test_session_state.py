@@ -11,6 +11,7 @@ from tame.session.state import (
 def test_all_session_states_exist() -> None:
     expected = {
         "CREATED",
+        "PENDING",
         "STARTING",
         "ACTIVE",
         "IDLE",
@@ -25,6 +26,7 @@ def test_all_session_states_exist() -> None:
 
 def test_session_state_values() -> None:
     assert SessionState.CREATED.value == "created"
+    assert SessionState.PENDING.value == "pending"
     assert SessionState.STARTING.value == "starting"
     assert SessionState.ACTIVE.value == "active"
     assert SessionState.IDLE.value == "idle"
@@ -35,7 +37,7 @@ def test_session_state_values() -> None:
 
 
 def test_all_process_states_exist() -> None:
-    expected = {"STARTING", "RUNNING", "PAUSED", "EXITED"}
+    expected = {"PENDING", "STARTING", "RUNNING", "PAUSED", "EXITED"}
     actual = {s.name for s in ProcessState}
     assert actual == expected
 
@@ -51,6 +53,13 @@ def test_all_attention_states_exist() -> None:
 # ------------------------------------------------------------------
 
 
+def test_pending_gives_pending() -> None:
+    assert (
+        compute_session_state(ProcessState.PENDING, AttentionState.NEEDS_INPUT)
+        is SessionState.PENDING
+    )
+
+
 def test_starting_gives_starting() -> None:
     assert (
         compute_session_state(ProcessState.STARTING, AttentionState.NONE)
@@ -39,6 +39,13 @@ def test_running_can_go_to_exited() -> None:
     assert is_valid_process_transition(ProcessState.RUNNING, ProcessState.EXITED)
 
 
+def test_pending_can_start_or_be_cancelled() -> None:
+    assert is_valid_process_transition(ProcessState.PENDING, ProcessState.RUNNING)
+    assert is_valid_process_transition(ProcessState.PENDING, ProcessState.EXITED)
+    assert not is_valid_process_transition(ProcessState.PENDING, ProcessState.PAUSED)
+    assert not is_valid_process_transition(ProcessState.RUNNING, ProcessState.PENDING)
+
+
 def test_running_cannot_go_to_starting() -> None:
     assert not is_valid_process_transition(ProcessState.RUNNING, ProcessState.STARTING)
 
@@ -0,0 +1,82 @@
+"""Tests for the tokenizing fast path in _TerminalState.feed and TAMEScreen.draw."""
+
+from __future__ import annotations
+
+import pytest
+
+pyte = pytest.importorskip("pyte")
+
+from tame.ui.widgets.session_viewer import TAMEScreen, _TerminalState
+
+_MIXED_STREAM = (
+    "plain text\r\n"
+    "\x1b[1;31mbold red\x1b[0m and \x1b[38;5;208m256\x1b[39m \x1b[38;2;1;2;3mrgb\x1b[m\r\n"
+    "\x1b]0;window title\x07tabs\there\x08\x08X\r\n"
+    "wide 中文 and x́ combining\r\n"
+    "\x1b[?25l\x1b[5;10Hmoved\x1b[K\x1b[2;3H\x1b[2Pdel\x1b[1@\x1b[?25h\r\n"
+    "\x1b(0charset\x1b(B\x0enull\x00del\x7f\r\n"
+    "\x1b7saved\x1b8\x1b[?1049halt screen\x1b[?1049l\r\n"
+    "\x1b[?7lno autowrap " + "z" * 50 + "\x1b[?7h\r\n"
+    "\x1b[4hinsert\x1b[4l\x1b[3;5r\x1b[3;1Hregion\r\n\r\n\r\n\x1b[r"
+    "\x1b[>c\x1b[2$p"
+) + "".join(f"line {i} " + "w" * (i % 45) + "\r\n" for i in range(30))
+
+
+def _grid(screen: TAMEScreen) -> list[list[tuple]]:
+    return [
+        [tuple(screen.buffer[y][x]) for x in range(screen.columns)]
+        for y in range(screen.lines)
+    ]
+
+
+def _reference(text: str, cols: int = 40, lines: int = 8) -> TAMEScreen:
+    screen = TAMEScreen(columns=cols, lines=lines, history=100)
+    pyte.Stream(screen).feed(text)
+    return screen
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 7, 64, 100_000])
+def test_feed_matches_pyte_stream(chunk: int) -> None:
+    expected = _reference(_MIXED_STREAM)
+    terminal = _TerminalState("s1", rows=8, cols=40)
+    for i in range(0, len(_MIXED_STREAM), chunk):
+        terminal.feed(_MIXED_STREAM[i : i + chunk])
+    screen = terminal.screen
+    assert _grid(screen) == _grid(expected)
+    assert (screen.cursor.x, screen.cursor.y) == (expected.cursor.x, expected.cursor.y)
+    assert screen.cursor.attrs == expected.cursor.attrs
+    assert screen.title == expected.title
+    assert [row.text(40) for row in screen.history.top] == [
+        row.text(40) for row in expected.history.top
+    ]
+
+
+def test_sequence_split_across_chunks() -> None:
+    terminal = _TerminalState("s1", rows=3, cols=20)
+    terminal.feed("\x1b[3")
+    terminal.feed("1mred\x1b")
+    terminal.feed("[0m plain")
+    row = terminal.screen.buffer[0]
+    assert row[0].fg == "red"
+    assert row[4].fg == "default"
+    assert terminal.stream._taking_plain_text
+
+
+def test_ascii_draw_matches_pyte_screen() -> None:
+    text = "\x1b[32m" + "abc " * 30 + "\x1b[0m│中é" + "tail " * 10
+    expected = pyte.Screen(25, 10)
+    pyte.Stream(expected).feed(text)
+    screen = TAMEScreen(columns=25, lines=10, history=100)
+    pyte.Stream(screen).feed(text)
+    assert _grid(screen) == [
+        [tuple(expected.buffer[y][x]) for x in range(25)] for y in range(10)
+    ]
+    assert (screen.cursor.x, screen.cursor.y) == (expected.cursor.x, expected.cursor.y)
+
+
+def test_cursor_visibility_follows_dectcem_after_restore() -> None:
+    terminal = _TerminalState("s1", rows=3, cols=20)
+    terminal.feed("\x1b7\x1b[?25l\x1b8")
+    assert terminal.screen.cursor.hidden
+    terminal.feed("\x1b[?1049h\x1b[?25h\x1b[?1049l")
+    assert not terminal.screen.cursor.hidden
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from tame.utils.timeseries import RingSeries, format_bytes, sparkline
+
+
+def test_ring_series_keeps_newest_samples() -> None:
+    series = RingSeries(4)
+    for i in range(3):
+        series.append(i)
+    assert list(series) == [0, 1, 2]
+    for i in range(3, 10):
+        series.append(i)
+    assert len(series) == 4
+    assert list(series) == [6, 7, 8, 9]
+    assert series.last(2) == [8, 9]
+    assert series.last(10) == [6, 7, 8, 9]
+    assert series.last(0) == []
+
+
+def test_ring_series_memory_is_fixed() -> None:
+    series = RingSeries(120)
+    size = series._values.buffer_info()[1]
+    for i in range(10_000):
+        series.append(i)
+    assert series._values.buffer_info()[1] == size == 120
+    assert series.capacity == 120
+
+
+def test_sparkline_scaling() -> None:
+    assert sparkline([]) == ""
+    # Auto-scaled: a slow climb still spans the full height
+    assert sparkline([100, 101, 102]) == "▁▅█"
+    assert sparkline([5, 5]) == "▁▁"
+    # Fixed bounds for percentages; values above the top stretch it
+    assert sparkline([0, 50, 100], 0, 100) == "▁▅█"
+    assert sparkline([0, 200], 0, 100) == "▁█"
+
+
+def test_format_bytes() -> None:
+    assert format_bytes(512) == "0KB"
+    assert format_bytes(3 * 1024**2) == "3.0MB"
+    assert format_bytes(2.5 * 1024**3) == "2.5GB"
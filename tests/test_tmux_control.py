@@ -0,0 +1,116 @@
+"""Tests for the tmux control-mode client."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import shutil
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from tame.session.tmux_control import TmuxCommandError, TmuxControlClient, _quote
+
+
+def _client() -> tuple[TmuxControlClient, io.BytesIO]:
+    client = TmuxControlClient("tame_control")
+    stdin = io.BytesIO()
+    client._process = SimpleNamespace(stdin=stdin, poll=lambda: None)
+    client._loop = asyncio.get_running_loop()
+    return client, stdin
+
+
+async def test_replies_are_matched_in_order() -> None:
+    client, stdin = _client()
+    first = asyncio.ensure_future(client.command("capture-pane", "-p", "-t", "a"))
+    second = asyncio.ensure_future(client.list_sessions())
+    await asyncio.sleep(0)
+    assert stdin.getvalue() == (
+        b"capture-pane -p -t a\nlist-sessions -F '#{session_name}'\n"
+    )
+
+    client.feed(b"%begin 1 10 0\n%end 1 10 0\n")  # the attach command itself
+    client.feed(b"%session-changed $1 tame_control\n%begin 1 11 1\nhel")
+    client.feed(b"lo\n%end 9 99 1\n\n%end 1 11 1\n%begin 1 12 1\ntame-a\n%end 1 12 1\n")
+
+    # A pane line that merely looks like a guard doesn't end the block
+    assert await first == ["hello", "%end 9 99 1", ""]
+    assert await second == ["tame-a"]
+
+
+async def test_error_reply_raises() -> None:
+    client, _ = _client()
+    pending = asyncio.ensure_future(client.capture_pane("nosuch"))
+    await asyncio.sleep(0)
+    client.feed(b"%begin 1 5 1\ncan't find pane: nosuch\n%error 1 5 1\n")
+    with pytest.raises(TmuxCommandError, match="can't find pane"):
+        await pending
+
+
+async def test_exit_fails_pending_commands() -> None:
+    client, _ = _client()
+    pending = asyncio.ensure_future(client.command("list-sessions"))
+    await asyncio.sleep(0)
+    client.feed(b"%exit\n")
+    with pytest.raises(TmuxCommandError):
+        await pending
+
+
+async def test_pane_pids_by_session() -> None:
+    client, stdin = _client()
+    pending = asyncio.ensure_future(client.pane_pids())
+    await asyncio.sleep(0)
+    assert stdin.getvalue() == (b"list-panes -a -F '#{session_name} #{pane_pid}'\n")
+    client.feed(b"%begin 1 5 1\nmy session 101\nmy session 102\ntame-b 7\n%end 1 5 1\n")
+    assert await pending == {"my session": 101, "tame-b": 7}
+
+
+def test_quote() -> None:
+    assert _quote("tame-s1") == "tame-s1"
+    assert _quote("#{session_name}") == "'#{session_name}'"
+    assert _quote("a b") == "'a b'"
+    assert _quote("it's") == "'it'\\''s'"
+    assert _quote("") == "''"
+
+
+async def test_start_waits_for_attach() -> None:
+    client, _ = _client()
+    client._attached = asyncio.get_running_loop().create_future()
+    client.feed(b"%begin 1 1 0\n")
+    assert not client._attached.done()
+    client.feed(b"%end 1 1 0\n%session-changed $1 tame_control\n")
+    assert client._attached.done()
+
+
+@pytest.fixture
+def tmux_server(tmp_path, monkeypatch):
+    if shutil.which("tmux") is None:
+        pytest.skip("tmux not installed")
+    monkeypatch.delenv("TMUX", raising=False)
+    monkeypatch.setenv("TMUX_TMPDIR", str(tmp_path))
+    subprocess.run(
+        ["tmux", "new-session", "-d", "-s", "tame-live", "printf 'hi there'; cat"],
+        check=True,
+    )
+    yield
+    subprocess.run(["tmux", "kill-server"], check=False)
+
+
+async def test_live_capture(tmux_server) -> None:
+    client = TmuxControlClient("tame_control")
+    try:
+        await client.start()
+        assert "tame-live" in await client.list_sessions()
+        text = ""
+        for _ in range(50):
+            text = await client.capture_pane("tame-live")
+            if "hi there" in text:
+                break
+            await asyncio.sleep(0.05)
+        assert text.startswith("hi there")
+        with pytest.raises(TmuxCommandError):
+            await client.capture_pane("missing")
+    finally:
+        client.close()
+    assert not client.is_running
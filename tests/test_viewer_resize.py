@@ -0,0 +1,91 @@
+"""Tests for debounced viewer resizes and lazy resizing of cached terminals."""
+
+from __future__ import annotations
+
+import signal
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pyte")
+
+from tame.session.output_buffer import OutputBuffer
+from tame.session.pty_process import PTYProcess
+from tame.ui.widgets.session_viewer import SessionViewer, ViewerResized
+
+
+def _resize_event(rows: int, cols: int) -> SimpleNamespace:
+    return SimpleNamespace(size=SimpleNamespace(height=rows, width=cols))
+
+
+def _make_viewer(monkeypatch) -> tuple[SessionViewer, list, list]:
+    viewer = SessionViewer()
+    viewer._rows = 10
+    viewer._cols = 40
+    timers: list = []
+    posted: list = []
+
+    def fake_set_timer(delay, callback, name=None):
+        timer = SimpleNamespace(callback=callback, stopped=False)
+        timer.stop = lambda: setattr(timer, "stopped", True)
+        timers.append(timer)
+        return timer
+
+    monkeypatch.setattr(viewer, "set_timer", fake_set_timer)
+    monkeypatch.setattr(viewer, "post_message", posted.append)
+    monkeypatch.setattr(viewer, "refresh", lambda *a, **k: None)
+    for sid in ("s1", "s2"):
+        buffer = OutputBuffer()
+        buffer.append_data(f"{sid}\r\n")
+        viewer.load_session(sid, buffer)
+    return viewer, timers, posted
+
+
+def _size(viewer: SessionViewer, sid: str) -> tuple[int, int]:
+    screen = viewer._terminals[sid].screen
+    return screen.lines, screen.columns
+
+
+def test_resize_burst_is_debounced(monkeypatch) -> None:
+    viewer, timers, posted = _make_viewer(monkeypatch)
+    for cols in range(41, 61):
+        viewer.on_resize(_resize_event(12, cols))
+
+    # Nothing reaches the emulator or the PTY until the size settles
+    assert _size(viewer, "s2") == (10, 40)
+    assert posted == []
+    assert len(timers) == 20
+    assert all(t.stopped for t in timers[:-1])
+
+    timers[-1].callback()
+    assert _size(viewer, "s2") == (12, 60)
+    assert len(posted) == 1
+    assert isinstance(posted[0], ViewerResized)
+    assert (posted[0].rows, posted[0].cols) == (12, 60)
+
+
+def test_background_terminal_is_resized_on_activation(monkeypatch) -> None:
+    viewer, timers, _ = _make_viewer(monkeypatch)
+    viewer.on_resize(_resize_event(15, 50))
+    timers[-1].callback()
+    assert _size(viewer, "s1") == (10, 40)
+
+    viewer.load_session("s1", OutputBuffer())
+    assert _size(viewer, "s1") == (15, 50)
+
+
+def test_pty_resize_skips_unchanged_size(monkeypatch) -> None:
+    pty_process = PTYProcess()
+    pty_process.start(command=["sleep", "5"], rows=24, cols=80)
+    signals: list[int] = []
+    monkeypatch.setattr(pty_process, "send_signal", signals.append)
+    try:
+        pty_process.resize(24, 80)
+        assert signals == []
+        pty_process.resize(30, 100)
+        pty_process.resize(30, 100)
+        assert signals == [signal.SIGWINCH]
+    finally:
+        monkeypatch.undo()
+        pty_process.terminate(kill_timeout=0.5)
+        pty_process.close()
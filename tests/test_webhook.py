@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import json
-from unittest.mock import patch, MagicMock
+import socket
 
-from tame.notifications.models import EventType, NotificationEvent, Priority
+from tame.notifications.models import Delivery, EventType, NotificationEvent, Priority
 from tame.notifications.webhook import WebhookNotifier
 
 
@@ -30,39 +30,70 @@ def test_webhook_empty_url_does_not_send() -> None:
     assert result is False
 
 
-@patch("tame.notifications.webhook.urllib.request.urlopen")
-def test_webhook_sends_json_payload(mock_urlopen: MagicMock) -> None:
-    mock_urlopen.return_value = MagicMock()
-    notifier = WebhookNotifier(enabled=True, url="http://example.com/hook")
+def test_webhook_sends_json_payload(http_standin) -> None:
+    notifier = WebhookNotifier(enabled=True, url=f"{http_standin.url}/hook?x=1")
     event = _make_event()
     result = notifier.notify(event)
     assert result is True
-    mock_urlopen.assert_called_once()
-    request = mock_urlopen.call_args[0][0]
-    assert request.full_url == "http://example.com/hook"
-    assert request.method == "POST"
-    payload = json.loads(request.data)
+    assert len(http_standin.requests) == 1
+    request = http_standin.requests[0]
+    assert request.path == "/hook?x=1"
+    assert request.headers["Content-Type"] == "application/json"
+    payload = json.loads(request.body)
     assert payload["event_type"] == "error"
     assert payload["session_id"] == "s1"
     assert payload["session_name"] == "test-session"
 
 
-@patch("tame.notifications.webhook.urllib.request.urlopen")
-def test_webhook_includes_custom_headers(mock_urlopen: MagicMock) -> None:
-    mock_urlopen.return_value = MagicMock()
+def test_webhook_includes_custom_headers(http_standin) -> None:
     notifier = WebhookNotifier(
         enabled=True,
-        url="http://example.com/hook",
+        url=f"{http_standin.url}/hook",
         headers={"Authorization": "Bearer tok123"},
     )
     notifier.notify(_make_event())
-    request = mock_urlopen.call_args[0][0]
-    assert request.get_header("Authorization") == "Bearer tok123"
+    assert http_standin.requests[0].headers["Authorization"] == "Bearer tok123"
 
 
-@patch("tame.notifications.webhook.urllib.request.urlopen")
-def test_webhook_handles_exception_gracefully(mock_urlopen: MagicMock) -> None:
-    mock_urlopen.side_effect = Exception("Connection refused")
-    notifier = WebhookNotifier(enabled=True, url="http://example.com/hook")
+def test_webhook_error_status_is_a_failure(http_standin) -> None:
+    http_standin.status = 503
+    notifier = WebhookNotifier(enabled=True, url=f"{http_standin.url}/hook")
+    assert notifier.notify(_make_event()) is False
+
+
+def test_webhook_client_errors_are_permanent(http_standin) -> None:
+    notifier = WebhookNotifier(enabled=True, url=f"{http_standin.url}/hook")
+    outcomes = {}
+    for status in (400, 404, 408, 429, 500, 503):
+        http_standin.status = status
+        outcomes[status] = notifier.send(_make_event())
+    assert outcomes == {
+        400: Delivery.REJECTED,
+        404: Delivery.REJECTED,
+        408: Delivery.RETRY,
+        429: Delivery.RETRY,
+        500: Delivery.RETRY,
+        503: Delivery.RETRY,
+    }
+
+
+def test_webhook_handles_exception_gracefully() -> None:
+    # A port nothing listens on
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    notifier = WebhookNotifier(enabled=True, url=f"http://127.0.0.1:{port}/hook")
     result = notifier.notify(_make_event())
     assert result is False
+
+
+def test_webhook_batch_is_ndjson(http_standin) -> None:
+    notifier = WebhookNotifier(enabled=True, url=f"{http_standin.url}/hook")
+    events = [_make_event(), _make_event()]
+    events[1].session_id = "s2"
+    assert notifier.notify_batch(events) is True
+    assert len(http_standin.requests) == 1
+    request = http_standin.requests[0]
+    assert request.headers["Content-Type"] == "application/x-ndjson"
+    lines = request.body.decode().splitlines()
+    assert [json.loads(line)["session_id"] for line in lines] == ["s1", "s2"]